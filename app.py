@@ -1,4 +1,6 @@
 import os
+import sys
+import asyncio
 import logging
 from dotenv import load_dotenv
 
@@ -14,8 +16,7 @@ from fastapi.responses import Response, RedirectResponse, StreamingResponse, HTM
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from config import LOG_FORMAT, LOG_DATE_FORMAT, get_full_version
-from models import Base, engine # DB 모델 초기화용
+from config import LOG_FORMAT, LOG_DATE_FORMAT, get_full_version, STARTUP_PREWARM_ENABLED
 
 # 로깅 설정
 logging.basicConfig(
@@ -51,6 +52,54 @@ MAINTENANCE_HTML = """
 
 
 
+async def deferred_startup():
+    """
+    포트를 연 뒤 백그라운드에서 실행하는 시작 작업
+    - 지연 로드 대상 모듈 예열 (스레드에서 import -> 이벤트 루프를 막지 않음)
+    - 토큰 예산용 tiktoken 인코딩 적재
+    - LLM 환경변수 설정, S3 / Vector DB 클라이언트 초기화 (네트워크 왕복)
+    """
+    if STARTUP_PREWARM_ENABLED:
+        try:
+            from core.lazy_import import prewarm_heavy_modules
+            await asyncio.to_thread(prewarm_heavy_modules)
+        except Exception as e:
+            logger.error(f"❌ Module prewarm Failed: {e}")
+
+    # 토큰 예산용 tiktoken 인코딩 (BPE 파일 다운로드가 요청 경로에서 일어나지 않도록)
+    try:
+        from core.context_budget import load_encoding, tokenizer_name
+        await asyncio.to_thread(load_encoding)
+        logger.info(f"✅ Context tokenizer ready: {tokenizer_name()}")
+    except Exception as e:
+        logger.error(f"❌ Tokenizer load Failed: {e}")
+
+    # LLM 환경변수는 시작 시 한 번만 설정 (요청마다 os.environ 변경 방지)
+    try:
+        from llm_factory import configure_llm_environment
+        configure_llm_environment()
+    except Exception as e:
+        logger.error(f"❌ LLM environment setup Failed: {e}")
+
+    # S3 클라이언트 초기화
+    try:
+        from core.s3_client import get_s3_client
+        s3_client = get_s3_client()
+        await s3_client.initialize()
+        logger.info("✅ S3 Client initialized.")
+    except Exception as e:
+        logger.error(f"❌ S3 Initialization Failed: {e}")
+
+    # Vector DB 클라이언트 초기화
+    try:
+        from core.vector_db import get_vector_db_client
+        vector_db = get_vector_db_client()
+        await vector_db.initialize()
+        logger.info("✅ Vector DB Client initialized.")
+    except Exception as e:
+        logger.error(f"❌ Vector DB Initialization Failed: {e}")
+
+
 # Lifespan 컨텍스트 (앱 시작/종료 시 실행)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -65,7 +114,7 @@ async def lifespan(app: FastAPI):
         create_tables()
         logger.info("DB Tables created successfully.")
 
-        # [추가] 초기 데이터 마이그레이션 실행
+        # [추가] 초기 데이터 마이그레이션 실행 (schema_version 기준, 최신이면 DDL 없이 통과)
         logger.info("🔄 Running DB migrations...")
         run_migration()
         logger.info("✅ DB Migrations completed.")
@@ -73,34 +122,72 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"DB Creation Failed: {e}")
 
-    # S3 클라이언트 초기화
+    # 외부 클라이언트 초기화 / 모듈 예열은 시작을 막지 않도록 백그라운드로
+    startup_task = asyncio.create_task(deferred_startup())
+
+    # 과금 원장 워커 시작 (TokenLog 배치 기록 / 잔액 재동기화)
     try:
-        from core.s3_client import get_s3_client
-        s3_client = get_s3_client()
-        await s3_client.initialize()
-        logger.info("✅ S3 Client initialized.")
+        from services.billing_service import BillingService
+        BillingService.start()
     except Exception as e:
-        logger.error(f"❌ S3 Initialization Failed: {e}")
+        logger.error(f"❌ Billing worker start Failed: {e}")
 
-    # Vector DB 클라이언트 초기화
+    # 게임 세션 쓰기 병합 워커 시작
     try:
-        from core.vector_db import get_vector_db_client
-        vector_db = get_vector_db_client()
-        await vector_db.initialize()
-        logger.info("✅ Vector DB Client initialized.")
+        from services.session_writer import GameSessionWriter
+        GameSessionWriter.start()
     except Exception as e:
-        logger.error(f"❌ Vector DB Initialization Failed: {e}")
+        logger.error(f"❌ Session writer start Failed: {e}")
+
+    # DB 정리 스케줄러 시작 (세션/Draft/변경 이력 배치 삭제)
+    try:
+        from services.maintenance_service import MaintenanceService
+        MaintenanceService.start()
+    except Exception as e:
+        logger.error(f"❌ Maintenance scheduler start Failed: {e}")
 
     yield
 
-    # 앱 종료 시 Vector DB 연결 종료
+    if not startup_task.done():
+        startup_task.cancel()
+
     try:
-        from core.vector_db import get_vector_db_client
-        vector_db = get_vector_db_client()
-        await vector_db.close()
-        logger.info("👋 Vector DB connection closed.")
+        from services.maintenance_service import MaintenanceService
+        MaintenanceService.shutdown()
+    except Exception as e:
+        logger.error(f"❌ Maintenance scheduler stop Failed: {e}")
+
+    # 앱 종료 시 대기 중인 게임 세션 저장 반영
+    try:
+        from services.session_writer import GameSessionWriter
+        GameSessionWriter.shutdown()
+    except Exception as e:
+        logger.error(f"❌ Session writer flush Failed: {e}")
+
+    # 앱 종료 시 대기 중인 과금 기록 반영
+    try:
+        from services.billing_service import BillingService
+        BillingService.shutdown()
     except Exception as e:
-        logger.error(f"❌ Vector DB Close Failed: {e}")
+        logger.error(f"❌ Billing flush Failed: {e}")
+
+    # 앱 종료 시 공유 LLM 커넥션 풀 정리 (로드된 적 없으면 정리할 것도 없음)
+    if "llm_factory" in sys.modules:
+        try:
+            from llm_factory import LLMClientRegistry
+            await LLMClientRegistry.aclose()
+        except Exception as e:
+            logger.error(f"❌ LLM client close Failed: {e}")
+
+    # 앱 종료 시 Vector DB 연결 종료
+    if "core.vector_db" in sys.modules:
+        try:
+            from core.vector_db import get_vector_db_client
+            vector_db = get_vector_db_client()
+            await vector_db.close()
+            logger.info("👋 Vector DB connection closed.")
+        except Exception as e:
+            logger.error(f"❌ Vector DB Close Failed: {e}")
 
 
 # FastAPI 앱 초기화
@@ -119,8 +206,7 @@ app = FastAPI(
 os.makedirs("static/avatars", exist_ok=True)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# 3. DB 테이블 생성 (앱 시작 시 자동 생성)
-Base.metadata.create_all(bind=engine)
+# DB 테이블 생성은 lifespan(create_tables)에서 한 번만 수행
 
 # 점검 모드 미들웨어
 class MaintenanceMiddleware(BaseHTTPMiddleware):
@@ -0,0 +1,148 @@
+"""
+DB 호출 동시성 비교: async 라우트 안에서 동기 서비스 직접 호출 vs *_async (AsyncSession.run_sync)
+
+- 동시 요청 N개(기본 200)가 시나리오 목록 조회 + 게임 세션 저장/불러오기를 수행
+- 측정: 전체 처리 시간, 요청 지연 p50/p95, 이벤트 루프 지연(5ms 주기 틱의 초과 지연 p95/max)
+  동기 호출은 쿼리 동안 이벤트 루프를 막으므로 다른 요청(SSE 스트림 등)의 틱이 밀림
+- 두 방식의 조회 결과가 다르면 실패 (종료 코드 1)
+- 기본은 임시 SQLite 파일(aiosqlite), --database-url로 PostgreSQL(asyncpg)도 측정 가능
+
+사용 예:
+    python benchmarks/bench_async_db.py --requests 200 --scenarios 300
+    python benchmarks/bench_async_db.py --database-url postgresql://user:pw@localhost/trpg_bench
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200, help="동시 요청 수")
+    parser.add_argument("--scenarios", type=int, default=300, help="시드 시나리오 수")
+    parser.add_argument("--database-url", default=None, help="기본: 임시 SQLite 파일")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+_tmpdir = None
+if ARGS.database_url:
+    os.environ['DATABASE_URL'] = ARGS.database_url
+else:
+    _tmpdir = tempfile.mkdtemp(prefix="trpg_bench_")
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+
+import models  # noqa: E402
+from models import Base, SessionLocal, User, Scenario, run_with_session, run_with_session_async  # noqa: E402
+from services.scenario_service import ScenarioService  # noqa: E402
+from routes.game import save_game_session, load_game_session  # noqa: E402
+
+USER_ID = "bench_user"
+
+
+def seed(n: int):
+    Base.metadata.create_all(bind=models.engine)
+    db = SessionLocal()
+    try:
+        if not db.query(User).filter(User.id == USER_ID).first():
+            db.add(User(id=USER_ID, password_hash="x"))
+        for i in range(n):
+            db.add(Scenario(
+                filename=f"bench-{time.time_ns()}-{i}",
+                title=f"벤치 시나리오 {i}",
+                author_id=USER_ID,
+                is_public=(i % 3 != 0),
+                data={"scenario": {"title": f"벤치 시나리오 {i}", "scenes": [{"scene_id": "s1"}] * 20,
+                                   "endings": [{"ending_id": "e1"}]}},
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def make_state(i: int) -> dict:
+    return {
+        "scenario_id": 1,
+        "current_scene_id": "s1",
+        "player_vars": {"hp": 100 - i % 50, "gold": i, "inventory": ["횃불", "밧줄"]},
+        "history": [f"턴 {t}" for t in range(20)],
+        "world_state": {"turn_count": i, "npcs": {}},
+    }
+
+
+async def ticker(stop: asyncio.Event, lags: list, interval: float = 0.005):
+    """이벤트 루프 지연 측정: sleep이 예정보다 얼마나 늦게 깨어나는지"""
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - t0 - interval)
+
+
+async def handle_sync(i: int):
+    """변경 전: async 라우트에서 동기 서비스/세션 함수를 그대로 호출"""
+    listing = ScenarioService.list_scenarios('newest', USER_ID, 'my')
+    key = run_with_session(save_game_session, make_state(i), USER_ID, f"bench-sync-{i}")
+    loaded = run_with_session(load_game_session, key)
+    return len(listing), loaded['player_vars']['gold']
+
+
+async def handle_async(i: int):
+    """변경 후: *_async 버전"""
+    listing = await ScenarioService.list_scenarios_async('newest', USER_ID, 'my')
+    key = await run_with_session_async(save_game_session, make_state(i), USER_ID, f"bench-async-{i}")
+    loaded = await run_with_session_async(load_game_session, key)
+    return len(listing), loaded['player_vars']['gold']
+
+
+async def run_mode(handler, n: int):
+    stop = asyncio.Event()
+    lags = []
+    tick = asyncio.create_task(ticker(stop, lags))
+    await asyncio.sleep(0.02)
+    latencies = []
+
+    async def one(i):
+        t0 = time.perf_counter()
+        result = await handler(i)
+        latencies.append(time.perf_counter() - t0)
+        return result
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(n)))
+    wall = time.perf_counter() - t0
+    stop.set()
+    await tick
+    if models.async_engine is not None:
+        await models.async_engine.dispose()
+    return results, wall, sorted(latencies), sorted(lags) or [0.0]
+
+
+def main():
+    print(f"database: {models.engine.dialect.name}, async engine: "
+          f"{models.async_engine.dialect.driver if models.async_engine is not None else 'none (threadpool fallback)'}")
+    seed(ARGS.scenarios)
+
+    print(f"\n{ARGS.requests} concurrent requests (list_scenarios + save/load session)")
+    print(f"{'mode':<6} {'wall':>8} {'lat p50':>9} {'lat p95':>9} {'loop lag p95':>13} {'loop lag max':>13}")
+    outputs = {}
+    for name, handler in (('sync', handle_sync), ('async', handle_async)):
+        results, wall, lat, lags = asyncio.run(run_mode(handler, ARGS.requests))
+        outputs[name] = results
+        print(f"{name:<6} {wall * 1000:>6.0f}ms {statistics.median(lat) * 1000:>7.1f}ms "
+              f"{lat[int(len(lat) * 0.95)] * 1000:>7.1f}ms {lags[int(len(lags) * 0.95)] * 1000:>11.1f}ms "
+              f"{lags[-1] * 1000:>11.1f}ms")
+
+    failed = outputs['sync'] != outputs['async']
+    if failed:
+        print("  results differ between sync and async paths")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+WorldState 컨텍스트 / 대화 기록 토큰 절감량 측정: 전체 컨텍스트 vs 토큰 예산 패킹
+
+- benchmarks/data/sample_scenario.json(24 NPC, 10 씬)으로 WorldState를 초기화하고
+  각 씬에서 플레이 도중과 비슷한 상태(인벤토리 증가, 사건 기록, 대화 기록)를 만들어 비교
+- 장면에 등장하는 NPC가 예산 컨텍스트에서 빠지면 실패 (종료 코드 1)
+
+사용 예:
+    python benchmarks/bench_context_budget.py --budget 250 --history-budget 250
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.state import WorldState  # noqa: E402
+from core.context_budget import estimate_tokens, load_encoding, recent_history, tokenizer_name  # noqa: E402
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sample_scenario.json")
+
+
+def make_world(scenario, scene, turn: int) -> WorldState:
+    world = WorldState()
+    world.initialize_from_scenario(scenario)
+    world.location = scene["scene_id"]
+    world.player["gold"] = 20 + turn * 3
+    items = [i["name"] for i in scenario.get("items", [])]
+    world.player["inventory"] = random.sample(items, min(4 + turn % 8, len(items)))
+    for i in range(6):
+        world.add_narrative_event(f"[턴 {turn - i}] 플레이어가 {random.choice(scene['npcs'])}와(과) 대화하며 단서를 얻음")
+    return world
+
+
+def make_history(scene, turn: int):
+    npc = scene["npcs"][0]
+    lines = []
+    for i in range(4):
+        lines.append(f"User: {npc}에게 {random.choice(['길을', '소문을', '보물에 대해', '적에 대해'])} 묻는다 ({turn}-{i})")
+        lines.append(f"NPC({npc}): " + "그건 말이지, 오래전 이 근처에서 있었던 일인데... " * random.randint(2, 8))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=int, default=250)
+    parser.add_argument("--history-budget", type=int, default=250)
+    parser.add_argument("--turns", type=int, default=20, help="씬마다 만들 상태 수")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    load_encoding()  # 서버는 시작 작업에서 적재
+    random.seed(args.seed)
+    with open(DATA_PATH, encoding="utf-8") as f:
+        scenario = json.load(f)
+
+    print(f"scenario: {scenario['title']} ({len(scenario['npcs'])} NPCs, {len(scenario['scenes'])} scenes), "
+          f"tokenizer: {tokenizer_name()}")
+    print(f"{'scene':<10} {'ctx full':>9} {'ctx packed':>11} {'hist full':>10} {'hist packed':>12} {'saved':>7}")
+
+    failed = False
+    totals = [0, 0, 0, 0]
+    samples = 0
+    for scene in scenario["scenes"]:
+        per_scene = [0, 0, 0, 0]
+        for turn in range(args.turns):
+            world = make_world(scenario, scene, turn)
+            user_input = f"{random.choice(scene['npcs'])}에게 말을 건다"
+            full = world.get_llm_context(max_tokens=0)
+            packed = world.get_llm_context(scene=scene, user_input=user_input, max_tokens=args.budget)
+
+            for name in scene["npcs"] + scene["enemies"]:
+                if name in world.npcs and f"- {name}:" not in packed:
+                    print(f"  missing present NPC '{name}' in {scene['scene_id']}")
+                    failed = True
+
+            history = make_history(scene, turn)
+            hist_full = "\n".join(history[-3:])
+            hist_packed = "\n".join(recent_history(history, 3, args.history_budget))
+
+            for i, text in enumerate((full, packed, hist_full, hist_packed)):
+                per_scene[i] += estimate_tokens(text)
+            samples += 1
+
+        saved = 1 - (per_scene[1] + per_scene[3]) / (per_scene[0] + per_scene[2])
+        n = args.turns
+        print(f"{scene['scene_id']:<10} {per_scene[0] / n:>9.0f} {per_scene[1] / n:>11.0f} "
+              f"{per_scene[2] / n:>10.0f} {per_scene[3] / n:>12.0f} {saved:>6.1%}")
+        totals = [a + b for a, b in zip(totals, per_scene)]
+
+    ctx_saved = (totals[0] - totals[1]) / samples
+    hist_saved = (totals[2] - totals[3]) / samples
+    print(f"\naverage prompt tokens saved per NPC call: {ctx_saved + hist_saved:.0f} "
+          f"(world context {ctx_saved:.0f}, history {hist_saved:.0f}; "
+          f"{1 - (totals[1] + totals[3]) / (totals[0] + totals[2]):.1%} of these sections)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
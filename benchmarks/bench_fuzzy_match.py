@@ -0,0 +1,135 @@
+"""
+퍼지 트리거 / NPC 매칭 벤치마크
+
+기존 방식(매 호출마다 정규화 + 모든 후보에 difflib.SequenceMatcher)과
+사전 계산 매처(MatcherCache: 문자 빈도 상한값으로 가지치기 후 difflib)를 비교하고
+결과(인덱스, 비율)가 완전히 같은지 검증한다.
+
+사용 예:
+    python benchmarks/bench_fuzzy_match.py --transitions 200 --npcs 150 --queries 300
+"""
+import argparse
+import difflib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.fuzzy_match import MatcherCache, NUMPY_AVAILABLE  # noqa: E402
+from core.state import WorldState  # noqa: E402
+
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후문열다간다본다"
+WORDS = ["문을", "열고", "들어간다", "동굴", "밖으로", "도망친다", "상자를", "부순다", "계단을", "오른다",
+         "횃불을", "든다", "다리를", "건넌다", "창문으로", "뛰어내린다", "지하실로", "내려간다", "노인에게", "묻는다"]
+
+
+def make_phrase(rng):
+    words = rng.sample(WORDS, rng.randint(2, 4))
+    words.append("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))))
+    return " ".join(words)
+
+
+def mutate(rng, text):
+    chars = list(text)
+    for _ in range(rng.randint(0, 4)):
+        op = rng.random()
+        pos = rng.randrange(len(chars)) if chars else 0
+        if op < 0.4 and chars:
+            del chars[pos]
+        elif op < 0.8:
+            chars.insert(pos, rng.choice(SYLLABLES))
+        elif chars:
+            chars[pos] = rng.choice(SYLLABLES)
+    return "".join(chars)
+
+
+def baseline_trigger(norm_input, triggers):
+    best_idx, highest = -1, 0.0
+    for idx, trigger in enumerate(triggers):
+        trigger = trigger.strip()
+        if not trigger:
+            continue
+        ratio = difflib.SequenceMatcher(None, norm_input, trigger.lower().replace(" ", "")).ratio()
+        if ratio > highest:
+            best_idx, highest = idx, ratio
+    return (best_idx, highest) if highest >= 0.4 else (-1, 0.0)
+
+
+def baseline_npc(query, keys):
+    query_lower = query.lower().replace(" ", "")
+    best, best_ratio = None, 0.0
+    for key in keys:
+        ratio = difflib.SequenceMatcher(None, query_lower, key.lower().replace(" ", "")).ratio()
+        if ratio > best_ratio and ratio >= 0.6:
+            best, best_ratio = key, ratio
+    return best
+
+
+def timed(fn, items):
+    t0 = time.perf_counter()
+    out = [fn(x) for x in items]
+    return time.perf_counter() - t0, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transitions", type=int, default=200)
+    parser.add_argument("--npcs", type=int, default=150)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    triggers = [make_phrase(rng) for _ in range(args.transitions)]
+    queries = [mutate(rng, rng.choice(triggers)) if rng.random() < 0.6 else make_phrase(rng)
+               for _ in range(args.queries)]
+    norm_queries = [q.lower().replace(" ", "") for q in queries]
+
+    # --- 트리거 매칭 (_fast_track_intent_parser) ---
+    t_base, base = timed(lambda q: baseline_trigger(q, triggers), norm_queries)
+    build0 = time.perf_counter()
+    MatcherCache.get([t.strip() for t in triggers])
+    build = time.perf_counter() - build0
+
+    def fast(q):
+        matcher = MatcherCache.get([t.strip() for t in triggers])
+        return matcher.best_ratio(q, floors=[0.4] * len(triggers), skip=[not t.strip() for t in triggers])
+
+    t_fast, fast_out = timed(fast, norm_queries)
+    mismatches = sum(1 for a, b in zip(base, fast_out) if a[0] != b[0] or abs(a[1] - b[1]) > 1e-12)
+
+    print(f"numpy={NUMPY_AVAILABLE} transitions={args.transitions} queries={args.queries}")
+    print(f"  triggers  baseline {t_base / args.queries * 1000:7.3f} ms/query | "
+          f"matcher {t_fast / args.queries * 1000:7.3f} ms/query | x{t_base / t_fast:.1f} | "
+          f"build {build * 1000:.2f} ms | mismatches {mismatches}")
+
+    # --- NPC 매칭 (WorldState.find_npc_key) ---
+    npc_keys = [f"{rng.choice(['노인', '경비병', '상인', '마법사', '기사', '고블린'])} {i}"
+                f"{''.join(rng.choice(SYLLABLES) for _ in range(3))}" for i in range(args.npcs)]
+    npc_queries = [mutate(rng, rng.choice(npc_keys)) for _ in range(args.queries)]
+
+    ws = WorldState()
+    ws.npcs = {k: {"status": "alive"} for k in npc_keys}
+    import logging
+    logging.disable(logging.WARNING)
+
+    t_base, base = timed(lambda q: baseline_npc(q, npc_keys), npc_queries)
+
+    def npc_fuzzy_only(q):
+        # 정확/부분 일치 단계는 같으므로 퍼지 단계만 비교
+        matcher = MatcherCache.get(npc_keys)
+        idx, _ = matcher.best_ratio(q.lower().replace(" ", ""), floors=[0.6] * len(npc_keys))
+        return npc_keys[idx] if idx >= 0 else None
+
+    t_fast, fast_out = timed(npc_fuzzy_only, npc_queries)
+    mismatches = sum(1 for a, b in zip(base, fast_out) if a != b)
+    t_ws, _ = timed(ws.find_npc_key, npc_queries)
+    print(f"  npcs={args.npcs} baseline {t_base / args.queries * 1000:7.3f} ms/query | "
+          f"matcher {t_fast / args.queries * 1000:7.3f} ms/query | x{t_base / t_fast:.1f} | "
+          f"find_npc_key {t_ws / args.queries * 1000:.3f} ms/query | mismatches {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
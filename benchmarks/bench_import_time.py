@@ -0,0 +1,104 @@
+"""
+콜드 스타트 import 시간 측정: `import app` (무거운 모듈 지연 로드) vs 지연 로드 대상까지 모두 import (이전 방식)
+
+- 매 회 새 인터프리터(python -X importtime)를 띄워 측정 (바이트코드 캐시는 첫 회에 생성되므로 첫 회는 제외)
+- 측정: import 시간 중앙값/최대값, 프로세스 실행 시간, -X importtime 누적 시간 상위 모듈
+- `import app`만으로 core.lazy_import.HEAVY_MODULES 중 하나라도 로드되거나
+  import 시간 중앙값이 --budget 초를 넘으면 실패 (종료 코드 1)
+- DATABASE_URL은 임시 SQLite 파일 (import 시점에는 DB에 연결하지 않음)
+
+사용 예:
+    python benchmarks/bench_import_time.py --runs 5 --budget 3.0
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CHILD = """
+import importlib, json, sys, time
+started = time.perf_counter()
+import app
+lazy_s = time.perf_counter() - started
+from core.lazy_import import HEAVY_MODULES
+loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+if {eager}:
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+print("RESULT " + json.dumps({{"import_s": time.perf_counter() - started, "lazy_s": lazy_s, "heavy_loaded": loaded}}))
+"""
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def run_once(eager: bool, env: dict):
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD.format(eager=eager)],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    result = next((json.loads(line[len("RESULT "):]) for line in proc.stdout.splitlines()
+                   if line.startswith("RESULT ")), None)
+    if proc.returncode != 0 or result is None:
+        raise RuntimeError(f"import failed (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+    cumulative = {}
+    for match in _IMPORTTIME_RE.finditer(proc.stderr):
+        cumulative[match.group(4)] = int(match.group(2)) / 1e6
+    result["wall_s"] = wall
+    result["cumulative"] = cumulative
+    return result
+
+
+def summarize(label: str, runs: list):
+    imports = [r["import_s"] for r in runs]
+    walls = [r["wall_s"] for r in runs]
+    print(f"{label:<8} import median {statistics.median(imports):6.2f}s  max {max(imports):6.2f}s  "
+          f"process median {statistics.median(walls):6.2f}s")
+    return statistics.median(imports)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5, help="모드별 측정 횟수 (워밍업 1회 별도)")
+    parser.add_argument("--budget", type=float, default=3.0, help="`import app` 중앙값 허용치(초)")
+    parser.add_argument("--top", type=int, default=15, help="누적 시간 상위 모듈 출력 수")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='trpg_import_'), 'import.db')}"
+    env.setdefault("ASYNC_DB", "false")
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+
+    run_once(True, env)  # 바이트코드 캐시 생성
+    lazy = [run_once(False, env) for _ in range(args.runs)]
+    eager = [run_once(True, env) for _ in range(args.runs)]
+
+    print(f"runs per mode: {args.runs}, python {sys.version.split()[0]}")
+    lazy_median = summarize("lazy", lazy)
+    eager_median = summarize("eager", eager)
+    print(f"saved at startup: {eager_median - lazy_median:.2f}s ({1 - lazy_median / eager_median:.0%})")
+
+    print(f"\ntop {args.top} modules by cumulative import time (lazy, last run):")
+    top = sorted(lazy[-1]["cumulative"].items(), key=lambda item: item[1], reverse=True)[:args.top]
+    for name, seconds in top:
+        print(f"  {seconds * 1000:8.1f}ms  {name}")
+
+    failed = False
+    loaded = sorted({name for r in lazy for name in r["heavy_loaded"]})
+    if loaded:
+        print(f"\n`import app` loaded lazy modules eagerly: {', '.join(loaded)}")
+        failed = True
+    if lazy_median > args.budget:
+        print(f"\n`import app` median {lazy_median:.2f}s exceeds budget {args.budget:.2f}s")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
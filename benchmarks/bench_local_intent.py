@@ -0,0 +1,104 @@
+"""
+로컬 TF-IDF 의도 사전 분류기 정확도 / 지연 시간 벤치마크
+
+benchmarks/data/intent_samples.json 의 기록된 입력(씬 + 정답 의도)에 대해
+- coverage: LLM 호출 없이 로컬에서 확정한 비율
+- precision: 로컬 확정 중 정답 비율 (오판은 LLM보다 나쁜 결과이므로 가장 중요)
+- latency: 색인 생성 / 질의 시간
+- negated: 부정/금지 표현 샘플("negated": true)은 로컬에서 확정되면 안 됨 (하나라도 확정되면 종료 코드 1)
+- speech: 질문/전달/가정 표현 샘플("speech": true)도 로컬에서 확정되면 안 됨 (하나라도 확정되면 종료 코드 1)
+
+샘플은 직접 작성한 소규모 세트라 precision은 회귀 확인용이지 실제 플레이 입력의 정확도를 보장하지 않음
+
+사용 예:
+    python benchmarks/bench_local_intent.py --llm-ms 900
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.intent_index import classify_intent_locally, IntentIndexCache, NUMPY_AVAILABLE  # noqa: E402
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "intent_samples.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--llm-ms", type=float, default=900, help="생략되는 intent_classifier 왕복 시간 가정치")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("numpy is not installed - local intent tier is disabled")
+        return
+
+    with open(args.data, encoding="utf-8") as f:
+        data = json.load(f)
+
+    scenario = {"scenes": data["scenes"], "endings": []}
+    scenes = {s["scene_id"]: s for s in data["scenes"]}
+
+    # 색인 생성 시간 (씬별 1회)
+    build_times = []
+    for scene in data["scenes"]:
+        IntentIndexCache.invalidate("bench")
+        t0 = time.perf_counter()
+        IntentIndexCache.get("bench", scenario, scene)
+        build_times.append(time.perf_counter() - t0)
+    for scene in data["scenes"]:
+        IntentIndexCache.get("bench", scenario, scene)
+
+    resolved = correct = 0
+    negated_total = negated_resolved = 0
+    speech_total = speech_resolved = 0
+    latencies = []
+    for sample in data["samples"]:
+        scene = scenes[sample["scene_id"]]
+        result = None
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            result = classify_intent_locally("bench", scenario, scene, sample["input"])
+            latencies.append(time.perf_counter() - t0)
+
+        if sample.get("negated"):
+            negated_total += 1
+            negated_resolved += bool(result)
+        if sample.get("speech"):
+            speech_total += 1
+            speech_resolved += bool(result)
+
+        if result:
+            resolved += 1
+            ok = (result["intent"] == sample["intent"]
+                  and (sample["intent"] != "transition" or result["transition_index"] == sample["transition_index"]))
+            correct += ok
+            if args.verbose or not ok:
+                mark = "OK " if ok else "BAD"
+                print(f"  [{mark}] {sample['input']!r:30} -> {result['intent']}"
+                      f"#{result['transition_index']} ({result['reasoning']}) expected {sample['intent']}")
+        elif args.verbose:
+            print(f"  [LLM] {sample['input']!r:30} -> deferred (expected {sample['intent']})")
+
+    total = len(data["samples"])
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"samples={total} thresholds: score>={IntentIndexCache.MIN_SCORE} margin>={IntentIndexCache.MIN_MARGIN}")
+    print(f"  coverage   {resolved}/{total} ({resolved / total * 100:.1f}%) resolved without LLM")
+    print(f"  precision  {correct}/{resolved} ({(correct / resolved * 100) if resolved else 0:.1f}%)")
+    print(f"  negated    {negated_resolved}/{negated_total} resolved locally (must be 0)")
+    print(f"  speech     {speech_resolved}/{speech_total} resolved locally (must be 0)")
+    print(f"  index build mean {statistics.mean(build_times) * 1000:.2f} ms / scene")
+    print(f"  query      p50 {statistics.median(latencies) * 1e6:.1f} us  p99 {p99 * 1e6:.1f} us")
+    print(f"  est. saved {resolved / total * args.llm_ms:.0f} ms per turn (assuming {args.llm_ms:.0f} ms classifier)")
+    sys.exit(1 if negated_resolved or speech_resolved else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+NPC 대화 턴 비용 비교: separate(대사 + 요약 2회 호출) vs merged(JSON 1회 호출)
+
+지연 시간 모델: 호출당 왕복(rtt) + 입력 토큰 처리 + 출력 토큰 생성 시간 (스텁 LLM이 실제로 sleep)
+토큰 수는 한국어 기준 대략 1.5자/토큰으로 추정한다.
+
+사용 예:
+    python benchmarks/bench_npc_dialogue.py --rtt-ms 350 --out-tok-ms 12 --prompt-chars 2400
+"""
+import argparse
+import json
+import time
+
+CHARS_PER_TOKEN = 1.5
+
+SUMMARY_PROMPT = """다음 대화를 한 문장으로 간결하게 요약하세요:
+플레이어: "{user_input}"
+NPC ({npc}): "{dialogue}"
+
+요약 형식: "플레이어가 [NPC]에게 [행동/요청]했고, NPC는 [반응]함"
+예시: "플레이어가 노인 J에게 술집을 불태우겠다고 협박하며 지도를 요구했고, 노인은 겁에 질려 반응함"
+
+요약:"""
+
+STRUCTURED_SUFFIX = """**출력 형식 (JSON 객체 하나만 출력, 다른 텍스트 금지):**
+{"dialogue": "NPC의 대사 (위 규칙대로 1-2문장, <mark> 태그 허용)", "summary": "이번 대화 한 문장 요약 (100자 이내)"}
+- summary 형식: "플레이어가 [NPC]에게 [행동/요청]했고, NPC는 [반응]함"
+"""
+
+DIALOGUE = "허허, 젊은이. 그 <mark>지하실 문</mark>은 함부로 열지 않는 게 좋을 게야. 열쇠는 <mark>난로</mark> 근처 어딘가에 있었지."
+SUMMARY = "플레이어가 노인 J에게 지하실에 대해 물었고, 노인은 경고하며 열쇠 위치를 암시함"
+
+
+def tokens(text: str) -> int:
+    return max(1, int(len(text) / CHARS_PER_TOKEN))
+
+
+class StubLLM:
+    def __init__(self, rtt_ms, in_tok_ms, out_tok_ms):
+        self.rtt = rtt_ms / 1000.0
+        self.in_tok = in_tok_ms / 1000.0
+        self.out_tok = out_tok_ms / 1000.0
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def invoke(self, prompt: str, output: str) -> str:
+        t_in, t_out = tokens(prompt), tokens(output)
+        self.calls += 1
+        self.input_tokens += t_in
+        self.output_tokens += t_out
+        time.sleep(self.rtt + t_in * self.in_tok + t_out * self.out_tok)
+        return output
+
+
+def run_separate(llm, base_prompt, user_input):
+    dialogue = llm.invoke(base_prompt, DIALOGUE)
+    llm.invoke(SUMMARY_PROMPT.format(user_input=user_input, npc="노인 J", dialogue=dialogue), SUMMARY)
+
+
+def run_merged(llm, base_prompt, user_input):
+    output = json.dumps({"dialogue": DIALOGUE, "summary": SUMMARY}, ensure_ascii=False)
+    llm.invoke(base_prompt + "\n\n" + STRUCTURED_SUFFIX, output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--rtt-ms", type=float, default=350)
+    parser.add_argument("--in-tok-ms", type=float, default=0.05)
+    parser.add_argument("--out-tok-ms", type=float, default=12)
+    parser.add_argument("--prompt-chars", type=int, default=2400, help="world_context + npc_dialogue 프롬프트 길이")
+    args = parser.parse_args()
+
+    base_prompt = "가" * args.prompt_chars
+    user_input = "노인에게 지하실에 대해 묻는다"
+
+    results = {}
+    for name, fn in (("separate", run_separate), ("merged", run_merged)):
+        llm = StubLLM(args.rtt_ms, args.in_tok_ms, args.out_tok_ms)
+        t0 = time.perf_counter()
+        for _ in range(args.turns):
+            fn(llm, base_prompt, user_input)
+        elapsed = (time.perf_counter() - t0) / args.turns
+        results[name] = (elapsed, llm.calls / args.turns, llm.input_tokens / args.turns, llm.output_tokens / args.turns)
+        print(f"  {name:9} {elapsed * 1000:7.1f} ms/turn | calls {llm.calls / args.turns:.0f} | "
+              f"in {llm.input_tokens / args.turns:6.0f} tok | out {llm.output_tokens / args.turns:4.0f} tok")
+
+    s, m = results["separate"], results["merged"]
+    print(f"  latency  {(m[0] - s[0]) * 1000:+.1f} ms/turn ({(m[0] / s[0] - 1) * 100:+.1f}%)")
+    print(f"  tokens   {(m[2] + m[3]) - (s[2] + s[3]):+.0f} tok/turn "
+          f"({((m[2] + m[3]) / (s[2] + s[3]) - 1) * 100:+.1f}%) "
+          f"- 요약 호출이 재전송하던 대화 원문 대신 출력 형식 지시문이 추가됨")
+
+
+if __name__ == "__main__":
+    main()
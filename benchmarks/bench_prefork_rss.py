@@ -0,0 +1,170 @@
+"""
+워커당 메모리 비교: 워커마다 시나리오 캐시 적재 (uvicorn --workers) vs 마스터가 적재 후 fork (gunicorn.conf.py prefork)
+
+- 시나리오 수 N(기본 0/50/200/400)마다 워커 K개(기본 2)를 fork해서 측정
+  - private: 워커가 직접 시나리오를 만들어 캐시에 적재 (spawn 방식과 같은 상태)
+  - shared: 마스터가 적재한 뒤 fork, freeze 없음
+  - shared+freeze: 마스터가 GC를 끈 채 적재하고 gc.freeze() 후 fork (core/prefork.py와 같은 순서)
+- 워커는 요청 처리처럼 캐시의 일부(--touch 비율)를 읽고, 임시 객체를 만들고, gc.collect()를 돌린 뒤 측정
+- 측정: 워커당 RSS(공유 페이지 포함), USS(워커 전용 페이지 = 워커 하나를 더 띄울 때 늘어나는 메모리)
+- 워커가 읽은 시나리오 내용이 모드마다 다르면 실패 (종료 코드 1), Linux(/proc) 전용
+
+사용 예:
+    python benchmarks/bench_prefork_rss.py --scenarios 0,50,200,400 --workers 2
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+MODES = ("private", "shared", "shared+freeze")
+
+
+def make_scenario(scenario_id: int) -> dict:
+    """실제 시나리오 JSON과 비슷한 모양/크기 (씬 30~60개, NPC, 아이템, 배경)"""
+    rng = random.Random(scenario_id)
+    line = "안개가 짙게 깔린 광장에 낯선 목소리가 울려 퍼진다. "
+    scenes = [{
+        "scene_id": f"scene_{s}",
+        "title": f"장면 {s}",
+        "description": line * rng.randint(4, 12),
+        "background": f"ai-images/bg/{scenario_id}_{s}.png",
+        "npcs": [f"npc_{rng.randint(0, 9)}" for _ in range(rng.randint(0, 3))],
+        "transitions": [{"trigger": f"선택지 {t}: 문을 연다", "target_scene_id": f"scene_{rng.randint(0, 40)}",
+                         "effects": [{"target": "hp", "operation": "add", "value": -rng.randint(0, 5)}]}
+                        for t in range(rng.randint(1, 4))],
+    } for s in range(rng.randint(30, 60))]
+    return {
+        "title": f"시나리오 {scenario_id}",
+        "prologue": line * 20,
+        "scenes": scenes,
+        "endings": [{"ending_id": f"ending_{e}", "title": f"결말 {e}", "description": line * 6} for e in range(3)],
+        "npcs": [{"name": f"npc_{n}", "role": "대장장이", "personality": line * 2, "hp": 50} for n in range(10)],
+        "items": [{"name": f"아이템 {i}", "description": line, "image": f"ai-images/item/{i}.png"} for i in range(20)],
+        "variables": {"hp": 100, "gold": 10, "sanity": 100},
+    }
+
+
+def build_cache(count: int) -> dict:
+    # game_engine._scenario_cache와 같은 구조 (id -> dict)
+    return {scenario_id: make_scenario(scenario_id) for scenario_id in range(1, count + 1)}
+
+
+def memory_kb() -> dict:
+    """현재 프로세스 RSS / USS (kB)"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Private_Clean", "Private_Dirty"):
+                values[key] = int(rest.split()[0])
+    return {"rss": values["Rss"], "uss": values["Private_Clean"] + values["Private_Dirty"]}
+
+
+def serve(cache: dict, touch: float, seed: int) -> int:
+    """요청 처리 흉내: 일부 시나리오의 씬/전이를 읽고 임시 객체를 만든 뒤 GC (읽은 내용의 체크섬 반환)"""
+    rng = random.Random(seed)
+    ids = sorted(cache)
+    checksum = 0
+    for scenario_id in rng.sample(ids, int(len(ids) * touch)):
+        scenario = cache[scenario_id]
+        for scene in scenario["scenes"]:
+            checksum += len(scene["description"]) + len(scene["transitions"])
+        payload = [dict(scene, visited=True) for scene in scenario["scenes"][:5]]
+        checksum += len(json.dumps(payload, ensure_ascii=False)) % 7
+    gc.collect()
+    return checksum
+
+
+def measure(mode: str, count: int, workers: int, touch: float) -> list:
+    """mode로 워커 K개를 fork, 워커별 (rss, uss, checksum) 반환"""
+    cache = None
+    if mode == "shared":
+        cache = build_cache(count)
+    elif mode == "shared+freeze":
+        gc.disable()
+        cache = build_cache(count)
+        gc.freeze()
+
+    pipes, pids = [], []
+    for worker in range(workers):
+        read_fd, write_fd = os.pipe()
+        go_read, go_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.close(go_write)
+            gc.enable()
+            local = cache if cache is not None else build_cache(count)
+            checksum = serve(local, touch, seed=worker)
+            os.write(write_fd, json.dumps(dict(memory_kb(), checksum=checksum)).encode())
+            os.close(write_fd)
+            os.read(go_read, 1)  # 측정이 끝날 때까지 살아 있기 (형제 워커와 페이지 공유 유지)
+            os._exit(0)
+        os.close(write_fd)
+        os.close(go_read)
+        pipes.append((read_fd, go_write))
+        pids.append(pid)
+
+    results = []
+    for read_fd, _ in pipes:
+        chunks = []
+        while True:
+            chunk = os.read(read_fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        os.close(read_fd)
+        results.append(json.loads(b"".join(chunks)))
+    for _, go_write in pipes:
+        os.write(go_write, b"x")
+        os.close(go_write)
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    del cache
+    if mode == "shared+freeze":
+        gc.unfreeze()
+    gc.enable()
+    gc.collect()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", default="0,50,200,400", help="측정할 캐시 시나리오 수 (쉼표 구분)")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--touch", type=float, default=0.2, help="워커가 읽는 시나리오 비율")
+    args = parser.parse_args()
+    if not hasattr(os, "fork") or not os.path.exists("/proc/self/smaps_rollup"):
+        print("requires Linux (os.fork, /proc/self/smaps_rollup)")
+        sys.exit(1)
+
+    failed = False
+    counts = [int(c) for c in args.scenarios.split(",") if c.strip()]
+    print(f"workers: {args.workers}, touched per worker: {args.touch:.0%}")
+    print(f"{'scenarios':>9} {'mode':<14} {'RSS/worker MB':>14} {'USS/worker MB':>14} {'USS vs private':>15}")
+    for count in counts:
+        base_uss = None
+        checksums = {}
+        for mode in MODES:
+            results = measure(mode, count, args.workers, args.touch)
+            rss = sum(r["rss"] for r in results) / len(results) / 1024
+            uss = sum(r["uss"] for r in results) / len(results) / 1024
+            checksums[mode] = [r["checksum"] for r in results]
+            if base_uss is None:
+                base_uss = uss
+            delta = f"{uss / base_uss - 1:+.0%}" if mode != "private" and base_uss else ""
+            print(f"{count:>9} {mode:<14} {rss:>14.1f} {uss:>14.1f} {delta:>15}")
+        if len({tuple(c) for c in checksums.values()}) != 1:
+            print(f"  {count} scenarios: workers read different content across modes")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
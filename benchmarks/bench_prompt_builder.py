@@ -0,0 +1,138 @@
+"""
+프롬프트 조립 시간 비교: template.format(**전체 값) vs PromptBuilder(씬 정적 조각 캐시 + 동적 값만 삽입)
+
+- config/prompt_player.yaml의 실제 템플릿 사용
+- 모든 반복에서 두 결과가 바이트 단위로 같은지 검사 (다르면 종료 코드 1)
+- 기존 방식은 매 턴 transitions 블록 등 정적 문자열도 다시 만드는 비용을 포함
+
+사용 예:
+    python benchmarks/bench_prompt_builder.py --iterations 20000 --transitions 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.prompt_builder import PromptBuilder  # noqa: E402
+
+PROMPT_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'prompt_player.yaml')
+
+
+def make_scene(n_transitions: int):
+    transitions = [
+        {"trigger": f"{verb} {obj}", "target_scene_id": f"scene-{i + 2}" if i else "ending-1"}
+        for i, (verb, obj) in enumerate(
+            (random.choice(["문을", "상자를", "벽을", "제단을"]), random.choice(["연다", "조사한다", "부순다", "만진다"]))
+            for _ in range(n_transitions)
+        )
+    ]
+    return {
+        "scene_id": "scene-1",
+        "title": "버려진 예배당",
+        "type": "normal",
+        "description": "먼지 쌓인 의자와 깨진 스테인드글라스 사이로 희미한 빛이 들어온다. " * 3,
+        "npcs": [{"name": "노인 J"}, "수녀 마리아"],
+        "enemies": ["그림자 늑대"],
+        "transitions": transitions,
+    }
+
+
+def transitions_list(scene):
+    out = "📋 **[AVAILABLE ACTIONS - 이것들이 다음 장면으로 이동 가능한 정답입니다]**\n"
+    out += "다음 키워드들 중 하나와 유사한 입력이 들어오면 transition으로 분류하세요:\n\n"
+    for idx, t in enumerate(scene["transitions"]):
+        target = t["target_scene_id"]
+        label = " 🏁 [엔딩/승리 조건]" if target.startswith("ending") else ""
+        out += f"  {idx}. 트리거: \"{t['trigger'].strip()}\" → {target}{label}\n"
+    return out + "\n⚠️ 유저 입력이 위 트리거와 70% 이상 의미적으로 유사하면 transition으로 분류하세요."
+
+
+def scene_static(scene):
+    names = [n.get("name") if isinstance(n, dict) else n for n in scene["npcs"]]
+    return {
+        "scene_title": scene["title"],
+        "scene_type": scene["type"],
+        "scene_desc": scene["description"],
+        "npc_list": ", ".join(names),
+        "enemy_list": ", ".join(scene["enemies"]),
+        "transitions_list": transitions_list(scene),
+        "available_transitions": "\n".join(f"- {t['trigger']}" for t in scene["transitions"]
+                                           if not t["target_scene_id"].startswith("ending")),
+        "transitions_hints": ", ".join(t["trigger"] for t in scene["transitions"]),
+        "npc_name": "노인 J",
+        "npc_role": "마을 장로",
+        "npc_personality": "의심 많음",
+    }
+
+
+# 프롬프트 키 -> 씬 정적 필드 (game_engine 호출부와 같은 구분)
+STATIC_FIELDS = {
+    "intent_classifier": ["scene_title", "scene_type", "npc_list", "enemy_list", "transitions_list"],
+    "scene_description": ["scene_title", "scene_desc", "npc_list", "available_transitions"],
+    "npc_dialogue": ["npc_name", "npc_role", "npc_personality", "transitions_hints"],
+    "hint_mode": ["scene_title", "transitions_hints"],
+}
+
+
+def dynamic_values(turn: int):
+    return {
+        "player_status": f"- hp: {100 - turn % 50}\n- gold: {turn * 3}\n- 🎒 소지품: 횃불, 녹슨 열쇠",
+        "user_input": random.choice(["문을 열어본다", "노인에게 말을 건다", "주변을 살펴본다"]) + f" ({turn})",
+        "history_context": f"플레이어: 안녕하세요\nNPC: 어서 오게 ({turn})",
+        "stuck_level": turn % 4,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--transitions", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    with open(PROMPT_PATH, encoding="utf-8") as f:
+        prompts = yaml.safe_load(f)
+    scene = make_scene(args.transitions)
+    scenario = {"scenes": [scene]}
+    turns = [dynamic_values(i) for i in range(args.iterations)]
+
+    print(f"{'prompt':<20} {'format us':>10} {'builder us':>11} {'speedup':>8}  identical")
+    failed = False
+    for key, static_fields in STATIC_FIELDS.items():
+        template = prompts.get(key)
+        if not template:
+            print(f"{key:<20} (template missing)")
+            continue
+
+        legacy_out, builder_out = [], []
+
+        t0 = time.perf_counter()
+        for values in turns:
+            legacy_out.append(template.format(**scene_static(scene), **values))
+        legacy = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for values in turns:
+            bound = PromptBuilder.for_scene(
+                "bench", scenario, scene["scene_id"], key, template,
+                lambda: {k: v for k, v in scene_static(scene).items() if k in static_fields}
+            )
+            builder_out.append(bound.render(**values))
+        builder = time.perf_counter() - t0
+
+        identical = legacy_out == builder_out
+        failed |= not identical
+        n = len(turns)
+        print(f"{key:<20} {legacy / n * 1e6:>10.2f} {builder / n * 1e6:>11.2f} {legacy / builder:>7.1f}x  {identical}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
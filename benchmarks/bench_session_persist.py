@@ -0,0 +1,166 @@
+"""
+게임 세션 저장 비교: 기존 save_game_session (deepcopy 2회 + SELECT + ORM UPDATE + commit, 매 턴 동기)
+vs 쓰기 병합 (JSON 스냅샷 + 세션별 최신 스냅샷만 배치 UPDATE)
+
+- 세션 S개(기본 200)가 턴 T번(기본 20) 진행, 턴마다 저장 R번(기본 2: 재시도/연타 등 짧은 간격의 연속 저장)
+- 측정: 저장 호출당 호출 측 CPU(스냅샷 vs deepcopy), 실행된 SQL 문 수, commit 수, 기록 지연 최대값
+- 마지막에 두 방식으로 저장된 세션을 다시 읽어 PlayerState/WorldState가 다르면 실패 (종료 코드 1)
+
+사용 예:
+    python benchmarks/bench_session_persist.py --sessions 200 --turns 20
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+_tmpdir = tempfile.mkdtemp(prefix="trpg_bench_")
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+os.environ.setdefault('ASYNC_DB', 'false')
+
+from sqlalchemy import event  # noqa: E402
+
+import models  # noqa: E402
+from models import Base, SessionLocal, GameSession, Scenario, User  # noqa: E402
+from services.session_writer import GameSessionWriter, build_snapshot  # noqa: E402
+from routes.game import save_game_session, load_game_session  # noqa: E402
+
+STATEMENTS = {"count": 0}
+
+
+@event.listens_for(models.engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    if not statement.lstrip().upper().startswith(("BEGIN", "COMMIT", "ROLLBACK")):
+        STATEMENTS["count"] += 1
+
+
+def make_state(turn: int, scene: str) -> dict:
+    """게임 엔진 한 턴 뒤의 PlayerState와 비슷한 크기/모양"""
+    return {
+        "scenario_id": 1,
+        "current_scene_id": scene,
+        "player_vars": {"hp": 100 - turn, "gold": turn * 3, "inventory": ["횃불", "밧줄", "낡은 지도"],
+                        "flags": {f"flag_{i}": i % 2 == 0 for i in range(20)}},
+        "history": [f"턴 {t}: 플레이어가 주변을 살핀다. 안개 속에서 무언가 움직인다." for t in range(turn)],
+        "chat_log_html": "<div class='narration'>" + "어두운 복도를 따라 걸어간다. " * (turn * 10) + "</div>",
+        "narrator_output": "문이 삐걱거리며 열린다. " * 20,
+        "npc_output": "",
+        "stuck_count": turn % 3,
+        "world_state": {
+            "turn_count": turn,
+            "location": scene,
+            "npcs": {f"npc_{i}": {"hp": 50, "relationship": i * 5, "status": "alive",
+                                  "memory": [f"기억 {m}" for m in range(10)]} for i in range(6)},
+            "global_flags": {f"g_{i}": True for i in range(30)},
+            "history": [{"turn": t, "event": "탐색", "detail": "방을 조사했다"} for t in range(turn)],
+        },
+    }
+
+
+def legacy_save(db, state: dict, session_key: str):
+    """기존 save_game_session 본문 (비교용)"""
+    world_state_data = copy.deepcopy(state.get('world_state', {}))
+    state_for_db = copy.deepcopy(state)
+    state_for_db.pop('world_state', None)
+    world_state_data['location'] = state.get('current_scene_id', '')
+    world_state_data['stuck_count'] = state.get('stuck_count', 0)
+    game_session = db.query(GameSession).filter_by(session_key=session_key).first()
+    game_session.player_state = state_for_db
+    game_session.world_state = world_state_data
+    game_session.current_scene_id = state.get('current_scene_id', '')
+    game_session.turn_count = world_state_data.get('turn_count', 0)
+    game_session.last_played_at = game_session.updated_at = models.datetime.now()
+    db.commit()
+
+
+def seed(keys):
+    Base.metadata.create_all(bind=models.engine)
+    db = SessionLocal()
+    try:
+        db.add(User(id="bench_user", password_hash="x"))
+        db.add(Scenario(id=1, filename="bench", title="벤치", author_id="bench_user", data={}))
+        db.commit()
+        for key in keys:
+            save_game_session(db, make_state(0, "prologue"), "bench_user", key)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=2, help="턴당 저장 횟수")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    legacy_keys = [f"legacy-{i}" for i in range(args.sessions)]
+    new_keys = [f"coalesced-{i}" for i in range(args.sessions)]
+    seed(legacy_keys + new_keys)
+    saves = args.sessions * args.turns * args.repeats
+
+    # 1) 기존 방식
+    STATEMENTS["count"] = 0
+    cpu = 0.0
+    db = SessionLocal()
+    try:
+        for turn in range(1, args.turns + 1):
+            for key in legacy_keys:
+                for _ in range(args.repeats):
+                    state = make_state(turn, f"scene_{turn}")
+                    t0 = time.perf_counter()
+                    legacy_save(db, state, key)
+                    cpu += time.perf_counter() - t0
+    finally:
+        db.close()
+    legacy_stmts, legacy_cpu = STATEMENTS["count"], cpu
+
+    # 2) 쓰기 병합 (호출 측은 스냅샷 생성 + 대기열 적재만, 기록은 워커)
+    STATEMENTS["count"] = 0
+    snapshot_cpu = 0.0
+    GameSessionWriter.start()
+    for turn in range(1, args.turns + 1):
+        for key in new_keys:
+            for _ in range(args.repeats):
+                state = make_state(turn, f"scene_{turn}")
+                t0 = time.perf_counter()
+                GameSessionWriter.enqueue(build_snapshot(state, "bench_user", key))
+                snapshot_cpu += time.perf_counter() - t0
+        time.sleep(0.05)  # 턴 사이 간격
+    GameSessionWriter.shutdown()
+    stats = GameSessionWriter.snapshot()
+    new_stmts = STATEMENTS["count"]
+
+    print(f"{args.sessions} sessions x {args.turns} turns x {args.repeats} saves = {saves} saves")
+    print(f"{'mode':<10} {'caller cpu/save':>16} {'SQL stmts':>10} {'commits':>9} {'rows written':>13}")
+    print(f"{'legacy':<10} {legacy_cpu / saves * 1e6:>14.0f}us {legacy_stmts:>10} {saves:>9} {saves:>13}")
+    print(f"{'coalesced':<10} {snapshot_cpu / saves * 1e6:>14.0f}us {new_stmts:>10} {stats['batches']:>9} "
+          f"{stats['written']:>13}")
+    print(f"coalesced saves: {stats['coalesced']}, failures: {stats['failures']}, "
+          f"max queue->commit lag: {stats['max_lag_ms']:.0f}ms (bound {stats['delay_ms']:.0f}ms + write time)")
+
+    # 정합성: 마지막 상태가 같아야 함
+    failed = stats['failures'] > 0
+    db = SessionLocal()
+    try:
+        for legacy_key, new_key in zip(legacy_keys, new_keys):
+            a = load_game_session(db, legacy_key)
+            b = load_game_session(db, new_key)
+            if json.dumps(a, sort_keys=True) != json.dumps(b, sort_keys=True):
+                print(f"  state mismatch: {legacy_key} vs {new_key}")
+                failed = True
+                break
+    finally:
+        db.close()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
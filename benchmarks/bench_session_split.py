@@ -0,0 +1,128 @@
+"""
+game_sessions 턴당 쓰기 크기 비교: 상태 전체 재작성 vs 작은 상태 컬럼 + 누적 로그 분리(game_session_logs)
+
+- 한 세션을 T턴(기본 200) 진행시키며 PlayerState.history(대화 2줄/턴), WorldState.history(효과 + 직전 스냅샷)를
+  게임 엔진처럼 누적
+- 측정: 턴당 재작성되는 JSON 바이트 (기존: player_state + world_state 전체,
+  분리: 작은 상태 두 컬럼 + 새 로그 행), PostgreSQL TOAST 임계(약 2KB)를 넘는 컬럼 쓰기 횟수
+- 스냅샷을 복원한 상태가 원래 상태와 다르면 실패 (종료 코드 1)
+
+사용 예:
+    python benchmarks/bench_session_split.py --turns 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.session_writer import build_snapshot, LOG_STREAMS  # noqa: E402
+
+TOAST_THRESHOLD = 2032  # PostgreSQL TOAST_TUPLE_THRESHOLD (기본 8KB 페이지)
+
+
+def play(turns: int):
+    """턴마다 상태 dict를 만들어 넘겨줌"""
+    player = {"hp": 100, "gold": 10, "sanity": 100, "inventory": ["횃불", "밧줄"]}
+    world = {
+        "time": {"day": 1, "phase": "morning"},
+        "location": "prologue",
+        "global_flags": {},
+        "turn_count": 0,
+        "npcs": {f"npc_{i}": {"hp": 50, "relationship": 0, "status": "alive", "emotion": "neutral"}
+                 for i in range(5)},
+        "history": [],
+        "narrative_history": [],
+        "player": player,
+        "item_registry": {},
+    }
+    state = {
+        "scenario_id": 1,
+        "current_scene_id": "prologue",
+        "player_vars": player,
+        "history": [],
+        "last_user_input": "",
+        "narrator_output": "",
+        "npc_output": "",
+        "chat_log_html": "",
+        "stuck_count": 0,
+        "world_state": world,
+    }
+    for turn in range(1, turns + 1):
+        world["turn_count"] = turn
+        scene = f"scene_{turn // 8}"
+        state["current_scene_id"] = scene
+        user_input = random.choice(["문을 연다", "대장장이에게 말을 건다", "주변을 살펴본다", "검을 뽑는다"])
+        state["last_user_input"] = user_input
+        state["history"].append(f"User: {user_input}")
+        state["history"].append(f"NPC(대장장이 한): {'그건 위험한 생각이야. ' * random.randint(2, 6)}")
+        state["narrator_output"] = "안개가 짙게 깔린 광장에 낯선 목소리가 울려 퍼진다. " * 6
+        effect = {"hp": -random.randint(0, 5), "gold": random.randint(0, 3)}
+        world["history"].append({"effect": effect,
+                                 "before": {"player": dict(player), "location": world["location"]}})
+        player["hp"] = max(player["hp"] + effect["hp"], 1)
+        player["gold"] += effect["gold"]
+        world["global_flags"][f"flag_{turn % 40}"] = True
+        world["narrative_history"] = (world["narrative_history"] + [f"[Turn {turn}] {user_input}"])[-10:]
+        world["location"] = scene
+        yield turn, state
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--report-every", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    failed = False
+    totals = {"full": 0, "split": 0}
+    toasted = {"full": 0, "split": 0}
+    written_logs = {stream: 0 for stream in LOG_STREAMS}
+
+    print(f"{'turn':>5} {'full bytes/turn':>16} {'split bytes/turn':>17} {'hot columns':>12} {'new log rows':>13}")
+    for turn, state in play(args.turns):
+        # 기존: world_state 제외 player_state 전체 + world_state 전체
+        player_full = json.dumps({k: v for k, v in state.items() if k != 'world_state'}, ensure_ascii=False)
+        world_full = json.dumps(state['world_state'], ensure_ascii=False)
+        full = len(player_full.encode()) + len(world_full.encode())
+        toasted["full"] += (len(player_full.encode()) > TOAST_THRESHOLD) + (len(world_full.encode()) > TOAST_THRESHOLD)
+
+        # 분리: 작은 상태 두 컬럼 + 이번 턴에 늘어난 로그 항목만
+        snapshot = build_snapshot(state, None, "bench")
+        hot = len(snapshot.player_state.encode()) + len(snapshot.world_state.encode())
+        toasted["split"] += ((len(snapshot.player_state.encode()) > TOAST_THRESHOLD)
+                             + (len(snapshot.world_state.encode()) > TOAST_THRESHOLD))
+        new_rows, log_bytes = 0, 0
+        for stream, entries in snapshot.logs.items():
+            for entry in entries[written_logs[stream]:]:
+                log_bytes += len(json.dumps(entry, ensure_ascii=False).encode())
+                new_rows += 1
+            written_logs[stream] = len(entries)
+        split = hot + log_bytes
+
+        totals["full"] += full
+        totals["split"] += split
+        if turn % args.report_every == 0 or turn == 1:
+            print(f"{turn:>5} {full:>16} {split:>17} {hot:>12} {new_rows:>13}")
+
+        # 정합성: 스냅샷 복원 == 원래 상태 (location/stuck_count 미러링 제외한 내용)
+        player_state, world_state = snapshot.restore()
+        expected_player = {k: v for k, v in state.items() if k != 'world_state'}
+        expected_world = dict(state['world_state'], stuck_count=state['stuck_count'])
+        if (json.dumps(player_state, sort_keys=True) != json.dumps(expected_player, sort_keys=True)
+                or json.dumps(world_state, sort_keys=True) != json.dumps(expected_world, sort_keys=True)):
+            print(f"  turn {turn}: restored state differs from original")
+            failed = True
+
+    print(f"\ntotal written over {args.turns} turns: full {totals['full'] / 1024:.0f} KB, "
+          f"split {totals['split'] / 1024:.0f} KB (-{1 - totals['split'] / totals['full']:.1%})")
+    print(f"column writes over TOAST threshold: full {toasted['full']}, split {toasted['split']}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+투기적 서사 스트리밍 벤치마크 (스텁 LLM)
+
+의도 분류(invoke) -> 서사 스트림(stream) 순차 실행과,
+분류와 동시에 유력한 서사를 미리 스트리밍하는 방식의 TTFT / 낭비 토큰 비교.
+
+--engine: 합성 적중률 대신 game_engine 경로를 그대로 실행
+  (_start_speculative_narrative -> _settle_speculation -> scene_stream_generator, 스텁 LLM)
+  전투 씬 battle_action / 일반 씬 hint_mode 적중과 의도 불일치·NPC 대사 시 취소를 확인,
+  기대와 다르면 실패 (종료 코드 1)
+
+사용 예:
+    python benchmarks/bench_speculative_intent.py --classify-ms 800 --ttft-ms 600 --hit-rate 0.7
+    python benchmarks/bench_speculative_intent.py --engine
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.speculation import SpeculativeStream, SpeculationStats  # noqa: E402
+
+
+class StubLLM:
+    """지연 시간을 조절할 수 있는 가짜 LLM (invoke / stream)"""
+
+    def __init__(self, classify_ms: float, ttft_ms: float, token_ms: float, tokens: int):
+        self.classify_s = classify_ms / 1000.0
+        self.ttft_s = ttft_ms / 1000.0
+        self.token_s = token_ms / 1000.0
+        self.tokens = tokens
+
+    def invoke(self, prompt):
+        time.sleep(self.classify_s)
+        return SimpleNamespace(content='{"intent": "%s"}' % prompt)
+
+    def stream(self, prompt):
+        time.sleep(self.ttft_s)
+        for i in range(self.tokens):
+            yield SimpleNamespace(content=f"t{i} ", usage_metadata=None)
+            time.sleep(self.token_s)
+        yield SimpleNamespace(
+            content="",
+            usage_metadata={"input_tokens": 500, "output_tokens": self.tokens}
+        )
+
+
+def first_token(chunks) -> float:
+    for chunk in chunks:
+        if chunk.content:
+            return time.perf_counter()
+    return time.perf_counter()
+
+
+def run_sequential(llm, actual_intent):
+    start = time.perf_counter()
+    llm.invoke(actual_intent)
+    t = first_token(llm.stream(actual_intent))
+    return t - start, 0
+
+
+def run_speculative(llm, guessed_intent, actual_intent):
+    start = time.perf_counter()
+    spec = SpeculativeStream(llm, guessed_intent, guessed_intent, guessed_intent).start()
+    SpeculationStats.record_start()
+    llm.invoke(actual_intent)
+
+    if guessed_intent == actual_intent:
+        t = first_token(spec.iter_chunks())
+        return t - start, 0
+
+    spec.cancel()
+    t = first_token(llm.stream(actual_intent))
+    # 취소 시점까지 받은 청크 수 (실제 API는 요청이 끊길 때까지 생성한 만큼 과금)
+    return t - start, spec.chunk_count
+
+
+ENGINE_SCENARIO = {
+    "title": "투기 실행 점검",
+    "scenes": [
+        {"scene_id": "cellar", "title": "지하 창고", "type": "battle", "enemies": ["염귀"], "npcs": [],
+         "transitions": [{"trigger": "소금을 뿌린다", "target_scene_id": "victory"}]},
+        {"scene_id": "hall", "title": "버려진 복도", "type": "normal", "npcs": [],
+         "transitions": [{"trigger": "문을 연다", "target_scene_id": "cellar"}]},
+    ],
+    "endings": [{"ending_id": "victory", "title": "승리"}],
+    "npcs": [{"name": "염귀", "weakness": "소금"}],
+    "variables": [{"name": "HP", "initial_value": 100}],
+}
+
+# (설명, 씬, 입력, 분류 결과, 기존 stuck_count, npc_output, 기대 결과)
+ENGINE_CASES = [
+    ("battle investigate", "cellar", "주변을 조사한다", "investigate", 0, "", "hit"),
+    ("battle defend", "cellar", "몸을 숨겨 방어한다", "defend", 0, "", "hit"),
+    ("battle guess miss", "cellar", "칼을 휘두른다", "defend", 0, "", "cancel"),
+    ("normal chat (stuck)", "hall", "가만히 기다린다", "chat", 1, "", "hit"),
+    ("normal chat + npc reply", "hall", "가만히 기다린다", "chat", 1, "누군가 대답한다.", "cancel"),
+    ("normal chat (not stuck)", "hall", "가만히 기다린다", "chat", 0, "", "none"),
+]
+
+
+def run_engine_check(llm) -> bool:
+    """game_engine 경로로 투기 실행 적중/취소 확인 (스텁 LLM, 과금 없음)"""
+    import game_engine
+
+    game_engine.SPECULATIVE_NARRATIVE_ENABLED = True
+    game_engine.get_cached_llm = lambda **kwargs: llm
+    scenario_id = -1
+    game_engine._scenario_cache[scenario_id] = ENGINE_SCENARIO
+    scenes = {s["scene_id"]: s for s in ENGINE_SCENARIO["scenes"]}
+
+    ok = True
+    for label, scene_id, user_input, intent, stuck, npc_output, expected in ENGINE_CASES:
+        before = dict(SpeculationStats.snapshot())
+        state = {
+            "scenario_id": scenario_id, "current_scene_id": scene_id, "previous_scene_id": scene_id,
+            "last_user_input": user_input, "player_vars": {"hp": 100}, "stuck_count": stuck,
+            "_internal_flags": {}, "world_state": {}, "npc_output": "", "near_miss_trigger": "",
+            "system_message": "",
+        }
+        game_engine._start_speculative_narrative(state, ENGINE_SCENARIO, scenes[scene_id], user_input)
+        started = bool(state["_internal_flags"].get("speculation_id"))
+
+        # 분류 결과 확정 -> rule_node(씬 유지 시 stuck_count + 1) -> npc_node -> 서사
+        state["parsed_intent"] = intent
+        game_engine._settle_speculation(state)
+        state["stuck_count"] = stuck + 1
+        state["npc_output"] = npc_output
+        output = "".join(c for c in game_engine.scene_stream_generator(state) if not c.startswith("__TOKEN_INFO__"))
+
+        after = SpeculationStats.snapshot()
+        hits = after.get("hits", 0) - before.get("hits", 0)
+        cancels = after.get("cancelled", 0) - before.get("cancelled", 0)
+        actual = "hit" if hits else "cancel" if cancels else "none" if not started else "leaked"
+        mark = "ok" if actual == expected else "FAIL"
+        ok &= actual == expected
+        print(f"  [{mark}] {label:<26} started={started!s:<5} -> {actual:<7} (expected {expected}, "
+              f"{len(output)} chars streamed)")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--classify-ms", type=float, default=800)
+    parser.add_argument("--ttft-ms", type=float, default=600)
+    parser.add_argument("--token-ms", type=float, default=15)
+    parser.add_argument("--tokens", type=int, default=120)
+    parser.add_argument("--hit-rate", type=float, default=0.7, help="키워드 추정이 실제 의도와 맞을 확률")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--engine", action="store_true", help="game_engine 경로로 적중/취소 확인")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    llm = StubLLM(args.classify_ms, args.ttft_ms, args.token_ms, args.tokens)
+
+    if args.engine:
+        print("engine path (game_engine speculation, stub LLM):")
+        sys.exit(0 if run_engine_check(llm) else 1)
+
+    seq_ttft, spec_ttft, wasted = [], [], []
+    for _ in range(args.turns):
+        hit = rng.random() < args.hit_rate
+        guessed, actual = "investigate", ("investigate" if hit else "attack")
+
+        t, _ = run_sequential(llm, actual)
+        seq_ttft.append(t)
+        t, w = run_speculative(llm, guessed, actual)
+        spec_ttft.append(t)
+        wasted.append(w)
+
+    def ms(v):
+        return f"{v * 1000:8.1f} ms"
+
+    print(f"turns={args.turns} classify={args.classify_ms}ms ttft={args.ttft_ms}ms hit_rate={args.hit_rate}")
+    print(f"  sequential   TTFT mean {ms(statistics.mean(seq_ttft))}  p50 {ms(statistics.median(seq_ttft))}")
+    print(f"  speculative  TTFT mean {ms(statistics.mean(spec_ttft))}  p50 {ms(statistics.median(spec_ttft))}")
+    saved = statistics.mean(seq_ttft) - statistics.mean(spec_ttft)
+    print(f"  saved        {ms(saved)} per turn ({saved / statistics.mean(seq_ttft) * 100:.1f}%)")
+    print(f"  extra output tokens: {sum(wasted)} total, {statistics.mean(wasted):.1f} per turn "
+          f"(+{statistics.mean(wasted) / args.tokens * 100:.1f}% of a narrative)")
+    print(f"  stats: {SpeculationStats.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
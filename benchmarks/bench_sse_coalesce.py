@@ -0,0 +1,158 @@
+"""
+서사 스트림 SSE 프레이밍 비교: 청크마다 json.dumps 프레임 vs TokenCoalescer(시간/크기 묶음 + 빠른 이스케이프)
+
+- asyncio로 동시 스트림 N개(기본 500)를 띄워 각 스트림이 1~3자 청크를 LLM처럼 간격을 두고 생성
+  (기본 간격 8~25ms, 일부 스트림은 느린 모델처럼 40~80ms)
+- 측정: 초당 프레임 수, 스트림당 프레이밍 CPU, 전송 바이트(SSE 본문 + HTTP chunked 인코딩 헤더),
+  묶음으로 인한 추가 지연(청크 도착 -> 프레임 방출)
+- 프레임을 디코드해 이어붙인 텍스트가 원문과 다르거나 token_frame 출력이 json.dumps와 다르면 실패 (종료 코드 1)
+
+사용 예:
+    python benchmarks/bench_sse_coalesce.py --streams 500 --chunks 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.sse import TokenCoalescer, token_frame  # noqa: E402
+
+SAMPLE_TEXT = ("안개가 짙게 깔린 광장에 \"낯선 목소리\"가 울려 퍼진다.\n"
+               "대장장이 한은 망치를 내려놓고 당신을 바라본다 — 'Who goes there?' \\ ")
+
+
+def make_chunks(n: int):
+    text = (SAMPLE_TEXT * (n // 20 + 1))
+    chunks, i = [], 0
+    while len(chunks) < n:
+        size = random.randint(1, 3)
+        chunks.append(text[i:i + size])
+        i += size
+    return chunks
+
+
+def wire_bytes(frame: str) -> int:
+    """SSE 본문 + chunked 전송 헤더('<hex len>\\r\\n' ... '\\r\\n')"""
+    body = len(frame.encode('utf-8'))
+    return body + len(f"{body:x}") + 4
+
+
+class Result:
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+        self.framing_cpu = 0.0
+        self.delays = []
+        self.failures = 0
+
+
+async def run_stream(mode: str, chunks, gap_range, result: Result):
+    coalescer = TokenCoalescer() if mode == 'coalesced' else None
+    pending = []
+    out = []
+
+    def emit(frame, now):
+        result.frames += 1
+        result.bytes += wire_bytes(frame)
+        out.append(frame)
+        result.delays.extend(now - t for t in pending)
+        pending.clear()
+
+    for chunk in chunks:
+        await asyncio.sleep(random.uniform(*gap_range))
+        now = time.monotonic()
+        pending.append(now)
+        t0 = time.perf_counter()
+        if coalescer is None:
+            frame = f"data: {json.dumps({'type': 'token', 'content': chunk})}\n\n"
+        else:
+            frame = coalescer.push(chunk)
+        result.framing_cpu += time.perf_counter() - t0
+        if frame:
+            emit(frame, now)
+    if coalescer is not None:
+        frame = coalescer.flush()
+        if frame:
+            emit(frame, time.monotonic())
+
+    decoded = ''.join(json.loads(f[len('data: '):])['content'] for f in out)
+    if decoded != ''.join(chunks):
+        result.failures += 1
+
+
+async def run_mode(mode: str, streams, slow_ratio: float):
+    result = Result()
+    tasks = []
+    for i, chunks in enumerate(streams):
+        gap = (0.040, 0.080) if i < len(streams) * slow_ratio else (0.008, 0.025)
+        tasks.append(run_stream(mode, chunks, gap, result))
+    cpu0, wall0 = time.process_time(), time.monotonic()
+    await asyncio.gather(*tasks)
+    return result, time.process_time() - cpu0, time.monotonic() - wall0
+
+
+def check_escape() -> bool:
+    samples = [SAMPLE_TEXT, "", "\x00\x1f  ", "😀 emoji", "</script>", "\t\r\n\"\\"]
+    samples += [''.join(chr(random.randint(0, 0x2FFF)) for _ in range(40)) for _ in range(500)]
+    for text in samples:
+        if token_frame(text) != f"data: {json.dumps({'type': 'token', 'content': text})}\n\n":
+            print(f"  token_frame mismatch for {text!r}")
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streams", type=int, default=500)
+    parser.add_argument("--chunks", type=int, default=200, help="스트림당 청크 수")
+    parser.add_argument("--slow-ratio", type=float, default=0.1, help="느린 모델 스트림 비율")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    failed = not check_escape()
+    streams = [make_chunks(args.chunks) for _ in range(args.streams)]
+
+    # 순수 프레이밍 비용 (대기 없이 같은 청크를 프레임으로)
+    flat = [c for s in streams[:50] for c in s]
+    t0 = time.perf_counter()
+    for c in flat:
+        f"data: {json.dumps({'type': 'token', 'content': c})}\n\n"
+    dumps_ns = (time.perf_counter() - t0) / len(flat) * 1e9
+    t0 = time.perf_counter()
+    for c in flat:
+        token_frame(c)
+    fast_ns = (time.perf_counter() - t0) / len(flat) * 1e9
+    print(f"framing per chunk: json.dumps {dumps_ns:.0f} ns, token_frame {fast_ns:.0f} ns")
+
+    print(f"\n{args.streams} streams x {args.chunks} chunks ({args.slow_ratio:.0%} slow)")
+    print(f"{'mode':<10} {'frames':>8} {'frames/s':>9} {'cpu/stream':>11} {'framing/stream':>15} "
+          f"{'wire KB':>9} {'delay p95':>10} {'delay max':>10}")
+    rows = {}
+    for mode in ('per-chunk', 'coalesced'):
+        random.seed(args.seed + 1)
+        result, cpu, wall = asyncio.run(run_mode(mode, streams, args.slow_ratio))
+        delays = sorted(result.delays)
+        p95 = delays[int(len(delays) * 0.95)] * 1000
+        rows[mode] = result
+        print(f"{mode:<10} {result.frames:>8} {result.frames / wall:>9.0f} {cpu / args.streams * 1000:>9.2f}ms "
+              f"{result.framing_cpu / args.streams * 1000:>13.3f}ms {result.bytes / 1024:>9.0f} "
+              f"{p95:>8.1f}ms {delays[-1] * 1000:>8.1f}ms")
+        if result.failures:
+            print(f"  {result.failures} streams reassembled incorrectly")
+            failed = True
+
+    base, new = rows['per-chunk'], rows['coalesced']
+    print(f"\nframes -{1 - new.frames / base.frames:.1%}, wire bytes -{1 - new.bytes / base.bytes:.1%}, "
+          f"mean delay {statistics.mean(new.delays) * 1000:.1f}ms")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+턴 종료 상태 전송량 측정: 매 턴 전체 스냅샷 vs 클라이언트 확인 버전 기준 JSON Patch
+
+- benchmarks/data/sample_scenario.json으로 WorldState를 초기화하고 N턴(기본 50) 동안
+  이동/전투/아이템 획득/관계 변화/사건 기록을 섞어 진행하면서 routes/game.py와 같은 모양의
+  stats / world_state / npc_status 페이로드를 만들어 StateSyncRegistry로 전송
+- 클라이언트 쪽은 받은 이벤트(전체 또는 패치)를 적용해 상태를 복원하고, 서버 상태와 다르면 실패 (종료 코드 1)
+- --drop-every N: N턴마다 클라이언트가 버전을 잃은 것처럼(스트림 중단/새로고침) 보내 전체 스냅샷 폴백 확인
+
+사용 예:
+    python benchmarks/bench_state_delta.py --turns 50 --drop-every 20
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.state import WorldState  # noqa: E402
+from core.state_diff import StateSyncRegistry, CHANNELS, apply_patch  # noqa: E402
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sample_scenario.json")
+
+
+def sse_bytes(event) -> int:
+    return len(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+
+
+def build_stats(world: WorldState, items: dict) -> dict:
+    """routes/game.py enrich_inventory와 같은 모양 (인벤토리 -> 상세 dict)"""
+    stats = dict(world.player)
+    stats['inventory'] = [{'name': name, **items.get(name, {})} for name in world.player['inventory']]
+    return stats
+
+
+def build_world_state(world: WorldState, scene_titles: dict, stuck_count: int) -> dict:
+    data = world.to_dict()
+    data['current_scene_id'] = world.location
+    data['current_scene_title'] = scene_titles.get(world.location, '')
+    data['stuck_count'] = stuck_count
+    return data
+
+
+def build_npc_status(world: WorldState, scenario: dict) -> dict:
+    """routes/game.py 턴 종료 NPC 정보 구성과 같은 규칙"""
+    result = {}
+    for npc in scenario.get('npcs', []):
+        result[npc['name']] = {
+            'name': npc['name'], 'role': npc.get('role', 'Unknown'), 'personality': npc.get('personality', '보통'),
+            'hp': npc.get('hp', 100), 'max_hp': npc.get('max_hp', 100), 'status': 'alive',
+            'relationship': 50, 'emotion': 'neutral', 'location': '알 수 없음',
+            'is_hostile': npc.get('isEnemy', False), 'image': npc.get('image'),
+        }
+    for name, state in world.npcs.items():
+        if name in result:
+            result[name].update({
+                'hp': state.get('hp', result[name]['hp']), 'max_hp': state.get('max_hp', result[name]['max_hp']),
+                'status': state.get('status', 'alive'), 'relationship': state.get('relationship', 50),
+                'emotion': state.get('emotion', 'neutral'),
+                'location': state.get('location', result[name]['location']),
+                'is_hostile': state.get('is_hostile', result[name]['is_hostile']),
+            })
+    for scene in scenario.get('scenes', []):
+        for name in scene.get('npcs', []) + scene.get('enemies', []):
+            if name in result and result[name]['location'] == '알 수 없음':
+                result[name]['location'] = scene.get('title', scene['scene_id'])
+    return result
+
+
+def play_turn(world: WorldState, scenario: dict, scenes: dict, turn: int) -> int:
+    """한 턴 진행 (상태 변화 종류를 고르게 섞음), stuck_count 반환"""
+    scene = scenes[world.location]
+    friends = [n for n in scene.get('npcs', []) if n in world.npcs]
+    enemies = [n for n in scene.get('enemies', []) if n in world.npcs and world.npcs[n].get('status') != 'dead']
+    roll = random.random()
+    if enemies and roll < 0.4:
+        target = random.choice(enemies)
+        world.update_npc_hp(target, -random.randint(5, 25))
+        world.update_state({"hp": -random.randint(1, 8)})
+        world.add_narrative_event(f"{target}와(과) 교전")
+    elif friends and roll < 0.7:
+        npc = random.choice(friends)
+        world.update_state({"npc": npc, "relationship": random.choice([5, 10, -5]), "emotion": random.choice(['happy', 'neutral', 'suspicious'])})
+        world.add_narrative_event(f"{npc}와(과) 대화함")
+    else:
+        item = random.choice(scenario['items'])['name']
+        world.update_state([{"item_add": item}, {"gold": random.randint(1, 15)}])
+        world.add_narrative_event(f"{item}을(를) 발견함")
+    if turn % 7 == 0:
+        world.update_state({"global_flag": f"event_{turn}", "value": True})
+
+    stuck = 0
+    if turn % 4 == 0 and scene.get('transitions'):
+        world.location = random.choice(scene['transitions'])['target_scene_id']
+        if world.location not in scenes:
+            world.location = scenario['start_scene_id']
+    else:
+        stuck = turn % 4
+    world.increment_turn()
+    return stuck
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--drop-every", type=int, default=0, help="N턴마다 클라이언트 버전 유실 (0=없음)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    with open(DATA_PATH, encoding="utf-8") as f:
+        scenario = json.load(f)
+    scenes = {s['scene_id']: s for s in scenario['scenes']}
+    scene_titles = {s['scene_id']: s['title'] for s in scenario['scenes']}
+    items = {i['name']: i for i in scenario['items']}
+
+    world = WorldState()
+    world.initialize_from_scenario(scenario)
+    session_id = "bench-session"
+    StateSyncRegistry.forget(session_id)
+
+    client_version = None
+    client_state = {}
+    full_total = delta_total = 0
+    failed = False
+    print(f"scenario: {scenario['title']} ({len(scenario['npcs'])} NPCs), turns: {args.turns}")
+    print(f"{'turn':>4} {'full B':>8} {'sent B':>8} {'kind':>9}")
+
+    for turn in range(1, args.turns + 1):
+        stuck = play_turn(world, scenario, scenes, turn)
+        payloads = {
+            'stats': build_stats(world, items),
+            'world_state': build_world_state(world, scene_titles, stuck),
+            'npc_status': build_npc_status(world, scenario),
+        }
+        if args.drop_every and turn % args.drop_every == 0:
+            client_version = None
+
+        full = sum(sse_bytes({'type': ch, 'content': payloads[ch]}) for ch in CHANNELS)
+        events = StateSyncRegistry.build_events(session_id, client_version, payloads)
+        sent = sum(sse_bytes(e) for e in events)
+        full_total += full
+        delta_total += sent
+
+        # 클라이언트 적용 (api_service.js와 같은 규칙)
+        kind = 'snapshot'
+        for event in json.loads(json.dumps(events)):
+            if event['type'] in CHANNELS:
+                client_state[event['type']] = event['content']
+            elif event['type'] == 'state_version':
+                client_version = event['content']
+            elif event['type'] == 'state_patch':
+                kind = 'patch'
+                if event['base'] != client_version:
+                    client_version = None
+                    continue
+                for ch, ops in event['content'].items():
+                    client_state[ch] = apply_patch(client_state.get(ch, {}), ops)
+                client_version = event['version']
+
+        expected = json.loads(json.dumps(payloads))
+        if client_state != expected:
+            bad = [ch for ch in CHANNELS if client_state.get(ch) != expected[ch]]
+            print(f"  turn {turn}: client state diverged in {bad}")
+            failed = True
+        if turn <= 5 or turn % 10 == 0 or kind == 'snapshot':
+            print(f"{turn:>4} {full:>8} {sent:>8} {kind:>9}")
+
+    n = args.turns
+    print(f"\nbytes/turn: full {full_total / n:.0f} -> delta {delta_total / n:.0f} "
+          f"({1 - delta_total / full_total:.1%} saved)")
+    print(f"registry: {StateSyncRegistry.snapshot()}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
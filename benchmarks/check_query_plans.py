@@ -0,0 +1,192 @@
+"""
+조회 경로 실행 계획 회귀 검사: 자주 실행되는 쿼리마다 EXPLAIN을 돌려 대상 테이블 순차 스캔이 있으면 실패
+
+- 빈 스키마(PostgreSQL: 임시 스키마 plan_check_<pid>, 기본: 임시 SQLite 파일)에
+  models.py 테이블 + migrate_db.HOT_QUERY_INDEXES를 만들고 시드 데이터를 넣은 뒤 ANALYZE
+- 쿼리는 서비스 코드와 같은 ORM 조건으로 만들어 리터럴 바인딩으로 컴파일
+- PostgreSQL은 기본으로 enable_seqscan=off로 검사 (작은 시드에서도 "쓸 수 있는 인덱스가 없음"만 잡아냄),
+  --planner-default로 끄면 실제 비용 기준 계획을 확인 (--rows를 충분히 크게)
+- 순차 스캔(PostgreSQL "Seq Scan", SQLite "SCAN <table>")이 나오면 종료 코드 1
+
+사용 예:
+    python benchmarks/check_query_plans.py
+    python benchmarks/check_query_plans.py --database-url postgresql://user:pw@localhost/trpg_scratch
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default=None, help="기본: 임시 SQLite 파일 (운영 DB를 지정하지 말 것)")
+    parser.add_argument("--rows", type=int, default=2000, help="테이블별 시드 행 수")
+    parser.add_argument("--planner-default", action="store_true", help="PostgreSQL enable_seqscan을 끄지 않음")
+    parser.add_argument("--verbose", action="store_true", help="실행 계획 전체 출력")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+if ARGS.database_url:
+    os.environ['DATABASE_URL'] = ARGS.database_url
+else:
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='trpg_plan_'), 'plan.db')}"
+os.environ.setdefault('ASYNC_DB', 'false')
+
+from sqlalchemy import event, func, text  # noqa: E402
+
+import models  # noqa: E402
+from models import (Base, SessionLocal, User, Scenario, ScenarioLike, TempScenario, ScenarioHistory,  # noqa: E402
+                    GameSession, GameSessionLog)
+from migrate_db import create_hot_query_indexes  # noqa: E402
+
+IS_POSTGRES = models.engine.dialect.name == 'postgresql'
+SCHEMA = f"plan_check_{os.getpid()}"
+
+if IS_POSTGRES:
+    # 이 스크립트의 연결은 모두 임시 스키마만 보도록
+    @event.listens_for(models.engine, "connect")
+    def _set_search_path(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.close()
+        dbapi_conn.commit()
+
+
+def setup_schema():
+    if IS_POSTGRES:
+        with models.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        models.engine.dispose()
+    Base.metadata.create_all(bind=models.engine)
+    create_hot_query_indexes()
+
+
+def drop_schema():
+    if IS_POSTGRES:
+        models.engine.dispose()
+        with models.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+def seed(rows: int):
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        users = [User(id=f"user_{i}", password_hash="x") for i in range(max(rows // 20, 2))]
+        db.add_all(users)
+        db.flush()
+        db.add_all(Scenario(id=i + 1, filename=f"plan-{i}", title=f"시나리오 {i}", author_id=users[i % len(users)].id,
+                            data={"scenario": {}}, is_public=(i % 4 != 0), is_recommended=(i % 50 == 0),
+                            created_at=now - timedelta(minutes=i))
+                   for i in range(rows))
+        db.flush()
+        db.add_all(ScenarioLike(user_id=users[i % len(users)].id, scenario_id=i + 1) for i in range(rows))
+        db.add_all(TempScenario(original_scenario_id=i % rows + 1, editor_id=users[i % len(users)].id,
+                                data={}, updated_at=now - timedelta(days=i % 60))
+                   for i in range(rows))
+        db.add_all(ScenarioHistory(scenario_id=(i // 20) % rows + 1, editor_id=users[(i // 20) % len(users)].id,
+                                   action_type="edit", action_description="편집", snapshot_data={},
+                                   sequence=i % 20, is_current=(i % 20 == 19))
+                   for i in range(rows * 5))
+        db.add_all(GameSession(session_key=f"session-{i}", user_id=users[i % len(users)].id,
+                               scenario_id=i % rows + 1, player_state={}, world_state={},
+                               current_scene_id="prologue", turn_count=i % 30,
+                               last_played_at=now - timedelta(hours=i))
+                   for i in range(rows))
+        db.flush()
+        db.add_all(GameSessionLog(session_key=f"session-{i % rows}", stream="player_history", seq=i // rows,
+                                  entry=f"턴 {i}")
+                   for i in range(rows * 5))
+        db.commit()
+    finally:
+        db.close()
+    with models.engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+
+
+def hot_queries(db):
+    """(이름, 대상 테이블, ORM 쿼리) - 서비스 코드의 조회 조건과 같게 유지"""
+    editor = "user_3"
+    return [
+        ("history.current", "scenario_histories",
+         db.query(ScenarioHistory).filter_by(scenario_id=4, editor_id=editor, is_current=True)),
+        ("history.list", "scenario_histories",
+         db.query(ScenarioHistory).filter_by(scenario_id=4, editor_id=editor).order_by(ScenarioHistory.sequence.desc())),
+        ("history.next", "scenario_histories",
+         db.query(ScenarioHistory).filter(ScenarioHistory.scenario_id == 4, ScenarioHistory.editor_id == editor,
+                                          ScenarioHistory.sequence == 6)),
+        ("history.prune", "scenario_histories",
+         db.query(ScenarioHistory.id).filter(ScenarioHistory.scenario_id == 4, ScenarioHistory.editor_id == editor,
+                                             ScenarioHistory.sequence > 5)),
+        ("draft.get", "temp_scenarios",
+         db.query(TempScenario).filter(TempScenario.original_scenario_id == 4, TempScenario.editor_id == editor)),
+        ("scenarios.public_newest", "scenarios",
+         db.query(Scenario).filter(Scenario.is_public == True).order_by(Scenario.created_at.desc()).limit(50)),  # noqa: E712
+        ("scenarios.mine_newest", "scenarios",
+         db.query(Scenario).filter(Scenario.author_id == editor).order_by(Scenario.created_at.desc())),
+        ("likes.count", "scenario_likes",
+         db.query(func.count(ScenarioLike.scenario_id)).filter(ScenarioLike.scenario_id == 4)),
+        ("likes.mine", "scenario_likes",
+         db.query(ScenarioLike.scenario_id).filter(ScenarioLike.user_id == editor)),
+        ("sessions.by_key", "game_sessions",
+         db.query(GameSession).filter_by(session_key="session-4")),
+        ("session_logs.by_key", "game_session_logs",
+         db.query(GameSessionLog.stream, GameSessionLog.entry).filter(GameSessionLog.session_key == "session-4")
+         .order_by(GameSessionLog.stream, GameSessionLog.seq)),
+    ]
+
+
+def _pg_seq_scans(plan, table, found):
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") == table:
+        found.append(plan)
+    for child in plan.get("Plans", []):
+        _pg_seq_scans(child, table, found)
+    return found
+
+
+def explain(db, query, table):
+    """(순차 스캔 여부, 계획 텍스트)"""
+    sql = str(query.statement.compile(dialect=models.engine.dialect, compile_kwargs={"literal_binds": True}))
+    if IS_POSTGRES:
+        raw = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        plan = (raw if isinstance(raw, list) else json.loads(raw))[0]["Plan"]
+        return bool(_pg_seq_scans(plan, table, [])), json.dumps(plan, indent=2)
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    details = [row[-1] for row in rows]
+    seq = any(d.startswith(f"SCAN {table}") and "USING" not in d for d in details)
+    return seq, "\n".join(details)
+
+
+def main():
+    setup_schema()
+    failed = False
+    try:
+        seed(ARGS.rows)
+        db = SessionLocal()
+        try:
+            if IS_POSTGRES and not ARGS.planner_default:
+                db.execute(text("SET enable_seqscan = off"))
+            print(f"database: {models.engine.dialect.name}, seed rows/table: {ARGS.rows}")
+            for name, table, query in hot_queries(db):
+                seq, plan = explain(db, query, table)
+                status = "SEQ SCAN" if seq else "ok"
+                print(f"  {name:<26} {table:<20} {status}")
+                if seq or ARGS.verbose:
+                    print("    " + plan.replace("\n", "\n    "))
+                failed = failed or seq
+        finally:
+            db.close()
+    finally:
+        drop_schema()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
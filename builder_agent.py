@@ -14,11 +14,13 @@ from langchain_core.runnables import RunnableParallel
 from langgraph.graph import StateGraph, END
 
 from llm_factory import LLMFactory
+from core.llm_limiter import LLMPriority
 from schemas import NPC
 
 # [NEW] 토큰 과금 및 검수 서비스 임포트
 from langchain_community.callbacks import get_openai_callback
 from services.user_service import UserService
+from services.billing_service import BillingService
 
 try:
     from services.ai_audit_service import AiAuditService
@@ -61,7 +63,15 @@ def load_prompts() -> Dict[str, str]:
     return {}
 
 
-PROMPTS = load_prompts()
+# 프롬프트 캐시 (import 시점이 아니라 처음 사용할 때 YAML 로드)
+_prompt_cache: Dict[str, Dict[str, str]] = {}
+
+
+def get_prompts() -> Dict[str, str]:
+    """빌더 프롬프트 반환 (최초 1회 로드 후 캐싱)"""
+    if 'builder' not in _prompt_cache:
+        _prompt_cache['builder'] = load_prompts()
+    return _prompt_cache['builder']
 
 # --- 전역 콜백 ---
 _progress_callback = None
@@ -392,10 +402,10 @@ def parse_graph_to_blueprint(state: BuilderState):
 
 def refine_scenario_info(state: BuilderState):
     report_progress("building", "2/5", "개요 및 설정 기획 중...", 30, phase="worldbuilding")
-    llm = LLMFactory.get_llm(state.get("model_name"))
+    llm = LLMFactory.get_llm(state.get("model_name"), priority=LLMPriority.BUILDER)
     parser = JsonOutputParser(pydantic_object=ScenarioSummary)
     prompt = ChatPromptTemplate.from_messages([
-        ("system", PROMPTS.get("refine_scenario", "Refine scenario summary.")),
+        ("system", get_prompts().get("refine_scenario", "Refine scenario summary.")),
         ("user", "{blueprint}")
     ]).partial(format_instructions=parser.get_format_instructions())
 
@@ -410,13 +420,13 @@ def refine_scenario_info(state: BuilderState):
 
 def generate_full_content(state: BuilderState):
     report_progress("building", "3/5", "세계관 및 NPC 생성 중...", 50, phase="worldbuilding")
-    llm = LLMFactory.get_llm(state.get("model_name"))
+    llm = LLMFactory.get_llm(state.get("model_name"), priority=LLMPriority.BUILDER)
     blueprint = state.get("blueprint", "")
 
     npc_parser = JsonOutputParser(pydantic_object=NPCList)
     npc_chain = (
             ChatPromptTemplate.from_messages([
-                ("system", PROMPTS.get("generate_npc", "Generate NPCs.")),
+                ("system", get_prompts().get("generate_npc", "Generate NPCs.")),
                 ("user", "{blueprint}")
             ]).partial(format_instructions=npc_parser.get_format_instructions())
             | llm | npc_parser
@@ -425,7 +435,7 @@ def generate_full_content(state: BuilderState):
     world_parser = JsonOutputParser(pydantic_object=WorldList)
     world_chain = (
             ChatPromptTemplate.from_messages([
-                ("system", PROMPTS.get("generate_world", "Generate world.")),
+                ("system", get_prompts().get("generate_world", "Generate world.")),
                 ("user", "{blueprint}")
             ]).partial(format_instructions=world_parser.get_format_instructions())
             | llm | world_parser
@@ -465,7 +475,7 @@ def generate_full_content(state: BuilderState):
 
     scene_parser = JsonOutputParser(pydantic_object=SceneData)
     scene_prompt = ChatPromptTemplate.from_messages([
-        ("system", PROMPTS.get("generate_scene", "Generate scenes.")),
+        ("system", get_prompts().get("generate_scene", "Generate scenes.")),
         ("user", f"설계도:\n{blueprint}\n\n[참고: 세계관]\n{world_context}\n\n[참고: NPC]\n{npc_context}")
     ]).partial(format_instructions=scene_parser.get_format_instructions())
 
@@ -559,10 +569,10 @@ def finalize_build(state: BuilderState):
     if stat_rules: final_hidden += "\n\n[스탯 규칙]\n" + str(stat_rules)
 
     # LLM으로 스탯 추가 추출
-    extract_llm = LLMFactory.get_llm(state.get("model_name"), temperature=0.0)
+    extract_llm = LLMFactory.get_llm(state.get("model_name"), temperature=0.0, priority=LLMPriority.BUILDER)
     parser = JsonOutputParser(pydantic_object=InitialStateExtractor)
     extract_prompt = ChatPromptTemplate.from_messages([
-        ("system", PROMPTS.get("extract_stats", "Extract stats.")),
+        ("system", get_prompts().get("extract_stats", "Extract stats.")),
         ("user", "{gm_notes}")
     ]).partial(format_instructions=parser.get_format_instructions())
 
@@ -840,7 +850,7 @@ def generate_scenario_from_graph(api_key, user_data, model_name=None, user_id=No
             total_tokens = prompt_tokens + completion_tokens
             if total_tokens > 0:
                 cost = UserService.calculate_llm_cost(model_name, prompt_tokens, completion_tokens)
-                UserService.deduct_tokens(
+                BillingService.charge(
                     user_id=user_id,
                     cost=cost,
                     action_type="scenario_build",
@@ -863,7 +873,7 @@ def generate_scene_content(scenario_title, scenario_summary, user_request="", mo
     if not model_name:
         model_name = "openai/google/gemini-2.0-flash"
 
-    llm = LLMFactory.get_llm(model_name)
+    llm = LLMFactory.get_llm(model_name, priority=LLMPriority.BUILDER)
     
     # 씬 내용은 간단한 텍스트이므로 JSON 파서 없이 직접 생성
     prompt = ChatPromptTemplate.from_messages([
@@ -888,7 +898,7 @@ def generate_scene_content(scenario_title, scenario_summary, user_request="", mo
             if total_tokens > 0:
                 cost = UserService.calculate_llm_cost(model_name, prompt_tokens, completion_tokens)
                 logger.info(f"[TOKEN DEDUCT] User: {user_id}, Model: {model_name}, Tokens: {total_tokens}, Cost: {cost}")
-                UserService.deduct_tokens(
+                BillingService.charge(
                     user_id=user_id,
                     cost=cost,
                     action_type="scene_gen",
@@ -954,11 +964,11 @@ def generate_single_npc(scenario_title, scenario_summary, user_request="", model
     if not model_name:
         model_name = "openai/google/gemini-2.0-flash-001"
 
-    llm = LLMFactory.get_llm(model_name)
+    llm = LLMFactory.get_llm(model_name, priority=LLMPriority.BUILDER)
     parser = JsonOutputParser(pydantic_object=NPC)
 
     prompt = ChatPromptTemplate.from_messages([
-        ("system", PROMPTS.get("generate_single_npc", "Create a TRPG NPC.")),
+        ("system", get_prompts().get("generate_single_npc", "Create a TRPG NPC.")),
         ("user", f"Title: {scenario_title}\nRequest: {user_request}")
     ]).partial(format_instructions=parser.get_format_instructions())
 
@@ -979,7 +989,7 @@ def generate_single_npc(scenario_title, scenario_summary, user_request="", model
             total_tokens = prompt_tokens + completion_tokens
             if total_tokens > 0:
                 cost = UserService.calculate_llm_cost(model_name, prompt_tokens, completion_tokens)
-                UserService.deduct_tokens(
+                BillingService.charge(
                     user_id=user_id,
                     cost=cost,
                     action_type="npc_gen",
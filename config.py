@@ -77,9 +77,107 @@ class TokenConfig:
         "default": {"input": 1.5, "output": 6.0}
     }
 
+    # [2-1] 프로바이더 프롬프트 캐시 적중 입력 토큰 단가 비율 (일반 입력 단가 대비)
+    # - Anthropic 0.1x, Gemini 0.25x, OpenAI 0.5x 수준 -> 보수적으로 0.5 적용
+    CACHED_INPUT_COST_RATIO = 0.5
+
     # [3] 신규 가입 시 지급 토큰 (1000 Credit = $0.10)
     INITIAL_TOKEN_BALANCE = 1000
 
+    # [4] 과금 파이프라인 (BillingService) 설정
+    BILLING_FLUSH_INTERVAL = 2.0  # TokenLog 배치 기록 주기 (초)
+    BILLING_FLUSH_BATCH_SIZE = 200  # 한 번에 기록할 최대 TokenLog 행 수
+    BILLING_RECONCILE_INTERVAL = 60.0  # Postgres 잔액과 메모리 잔액 재동기화 주기 (초)
+    BILLING_IDLE_EVICT_SECONDS = 600  # 이 시간 동안 사용이 없으면 메모리 잔액 캐시에서 제거
+
+
+# [NEW] 투기적 서사 스트리밍 (의도 분류와 서사 생성을 병렬 실행 - 빗나가면 토큰 일부가 낭비됨)
+SPECULATIVE_NARRATIVE_ENABLED = os.getenv('SPECULATIVE_NARRATIVE', 'false').lower() == 'true'
+
+
+# [NEW] NPC 대화 생성 방식
+# - merged: 대사와 서사 요약을 JSON 한 번의 호출로 생성 (기본)
+# - separate: 대사 생성 후 요약용 LLM 호출을 한 번 더 수행 (기존 방식)
+NPC_DIALOGUE_MODE = os.getenv('NPC_DIALOGUE_MODE', 'merged').lower()
+
+
+# [NEW] 씬 진입 문구(NPC/적 등장, 전투 시작) 변형 풀
+# - 씬/등장인물마다 K개 변형이 채워지면 이후 진입은 LLM 호출 없이 무작위 선택
+# - PREWARM: 시나리오 공개/최종 반영 시 백그라운드에서 미리 생성
+ENTRY_CONTENT_POOL_SIZE = int(os.getenv('ENTRY_CONTENT_POOL_SIZE', '3'))
+ENTRY_CONTENT_PREWARM = os.getenv('ENTRY_CONTENT_PREWARM', 'true').lower() == 'true'
+
+
+# [NEW] 프로바이더 프롬프트 캐시 힌트 (Anthropic/Gemini에 cache_control 전달, 나머지는 자동 prefix 캐시)
+PROMPT_CACHE_CONTROL_ENABLED = os.getenv('PROMPT_CACHE_CONTROL', 'true').lower() == 'true'
+
+
+# [NEW] LLM HTTP 커넥션 풀 (OpenRouter 클라이언트는 (base_url, api_key)마다 하나를 공유)
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv('LLM_HTTP_MAX_CONNECTIONS', '100'))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv('LLM_HTTP_MAX_KEEPALIVE', '20'))
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv('LLM_HTTP_KEEPALIVE_EXPIRY', '90'))  # 초
+LLM_HTTP_CONNECT_TIMEOUT = float(os.getenv('LLM_HTTP_CONNECT_TIMEOUT', '10'))  # 초
+
+# 모델별 LLM 동시 호출 한도 (AIMD: 성공 시 천천히 증가, 429/5xx 시 절반으로 감소)
+LLM_CONCURRENCY_INITIAL = int(os.getenv('LLM_CONCURRENCY_INITIAL', '16'))
+LLM_CONCURRENCY_MIN = int(os.getenv('LLM_CONCURRENCY_MIN', '2'))
+LLM_CONCURRENCY_MAX = int(os.getenv('LLM_CONCURRENCY_MAX', '64'))
+LLM_CONCURRENCY_DECREASE_COOLDOWN = float(os.getenv('LLM_CONCURRENCY_DECREASE_COOLDOWN', '1.0'))  # 초
+
+# 서사 스트리밍 헤지/폴백 (주 모델 첫 토큰이 늦거나 실패하면 예비 모델 스트림 병행)
+# - 기본 꺼짐. 켜도 예비 모델은 유저가 고른 모델보다 비싸지 않은 것만 사용하고, 과금은 고른 모델 기준
+LLM_HEDGE_ENABLED = os.getenv('LLM_HEDGE', 'false').lower() == 'true'
+LLM_HEDGE_AFTER_MS = int(os.getenv('LLM_HEDGE_AFTER_MS', '2500'))
+LLM_HEDGE_MAX_STREAMS = int(os.getenv('LLM_HEDGE_MAX_STREAMS', '32'))  # 헤지 스트림 전용 스레드 풀 크기
+LLM_FALLBACK_MODELS = [m.strip() for m in os.getenv(
+    'LLM_FALLBACK_MODELS',
+    'openai/google/gemini-2.5-flash-lite,openai/openai/gpt-4o-mini,openai/deepseek/deepseek-v3.2'
+).split(',') if m.strip()]
+LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('LLM_CIRCUIT_FAILURE_THRESHOLD', '5'))
+LLM_CIRCUIT_COOLDOWN = float(os.getenv('LLM_CIRCUIT_COOLDOWN', '30'))  # 초
+
+# 결정적 LLM 호출 응답 캐시 (의도 분류, 대화 요약, AI 감수)
+LLM_RESPONSE_CACHE_ENABLED = os.getenv('LLM_RESPONSE_CACHE', 'true').lower() == 'true'
+LLM_RESPONSE_CACHE_BACKEND = os.getenv('LLM_RESPONSE_CACHE_BACKEND', 'auto').lower()  # auto | memory | redis
+LLM_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('LLM_RESPONSE_CACHE_MAX_ENTRIES', '10000'))
+LLM_RESPONSE_CACHE_OPT_OUT = {s.strip() for s in os.getenv('LLM_RESPONSE_CACHE_OPT_OUT', '').split(',') if s.strip()}
+
+# 프롬프트 컨텍스트 토큰 예산 (0이면 제한 없음)
+LLM_CONTEXT_TOKEN_BUDGET = int(os.getenv('LLM_CONTEXT_TOKEN_BUDGET', '250'))  # WorldState 컨텍스트
+LLM_HISTORY_TOKEN_BUDGET = int(os.getenv('LLM_HISTORY_TOKEN_BUDGET', '250'))  # 최근 대화 기록
+
+# 턴 종료 상태 델타 전송 (클라이언트 확인 버전 기준 JSON Patch, 불일치 시 전체 스냅샷)
+SSE_STATE_DELTA_ENABLED = os.getenv('SSE_STATE_DELTA', 'true').lower() == 'true'
+SSE_STATE_DELTA_MAX_SESSIONS = int(os.getenv('SSE_STATE_DELTA_MAX_SESSIONS', '5000'))
+
+# 서사 스트림 토큰 묶음 전송 (시간 창 또는 글자 수 기준, 청크 간격이 창보다 길면 즉시 전송)
+SSE_COALESCE_ENABLED = os.getenv('SSE_COALESCE', 'true').lower() == 'true'
+SSE_COALESCE_WINDOW_MS = float(os.getenv('SSE_COALESCE_WINDOW_MS', '30'))
+SSE_COALESCE_MAX_CHARS = int(os.getenv('SSE_COALESCE_MAX_CHARS', '256'))
+
+# 게임 세션 저장 쓰기 병합 (턴 종료 시 세션별 최신 상태만 모아 배치 UPDATE)
+# - SESSION_WRITE_DELAY_MS: 큐에 들어간 상태가 DB에 반영되기까지의 최대 지연 (프로세스 비정상 종료 시 손실 가능 구간)
+SESSION_WRITE_COALESCE_ENABLED = os.getenv('SESSION_WRITE_COALESCE', 'true').lower() == 'true'
+SESSION_WRITE_DELAY_MS = float(os.getenv('SESSION_WRITE_DELAY_MS', '250'))
+SESSION_WRITE_BATCH_SIZE = int(os.getenv('SESSION_WRITE_BATCH_SIZE', '200'))
+
+# DB 정리 스케줄러 (오래된 게임 세션 / 방치된 Draft / 고아 변경 이력을 작은 배치로 나눠 삭제)
+MAINTENANCE_ENABLED = os.getenv('MAINTENANCE', 'true').lower() == 'true'
+MAINTENANCE_INTERVAL_SECONDS = float(os.getenv('MAINTENANCE_INTERVAL_SECONDS', '3600'))
+MAINTENANCE_INITIAL_DELAY_SECONDS = float(os.getenv('MAINTENANCE_INITIAL_DELAY_SECONDS', '120'))
+MAINTENANCE_BATCH_SIZE = int(os.getenv('MAINTENANCE_BATCH_SIZE', '500'))
+MAINTENANCE_BATCH_PAUSE_MS = float(os.getenv('MAINTENANCE_BATCH_PAUSE_MS', '200'))  # 배치 사이 대기 (잠금/WAL 분산)
+MAINTENANCE_MAX_BATCHES = int(os.getenv('MAINTENANCE_MAX_BATCHES', '200'))  # 작업당 1회 실행 최대 배치 (나머지는 다음 주기)
+SESSION_RETENTION_DAYS = float(os.getenv('SESSION_RETENTION_DAYS', '7'))
+DRAFT_RETENTION_DAYS = float(os.getenv('DRAFT_RETENTION_DAYS', '30'))
+HISTORY_ORPHAN_RETENTION_DAYS = float(os.getenv('HISTORY_ORPHAN_RETENTION_DAYS', '7'))
+
+# 서버 시작 (무거운 모듈은 지연 로드, 포트를 연 뒤 백그라운드에서 예열 + S3/Vector DB 클라이언트 초기화)
+STARTUP_PREWARM_ENABLED = os.getenv('STARTUP_PREWARM', 'true').lower() == 'true'
+
+# prefork 배포 모드 (gunicorn -c gunicorn.conf.py): 마스터가 fork 전에 적재해 워커끼리 copy-on-write로 공유할 공개 시나리오 수
+PREFORK_PRELOAD_SCENARIOS = int(os.getenv('PREFORK_PRELOAD_SCENARIOS', '200'))
+
 
 # 버전 정보 설정
 VERSION_NUMBER = 0
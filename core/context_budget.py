@@ -0,0 +1,145 @@
+"""
+토큰 예산 기반 LLM 컨텍스트 패킹
+- WorldState 컨텍스트(NPC 상태, 인벤토리, 최근 사건)와 대화 기록을 토큰 예산 안에 맞춤
+- 항목마다 현재 장면과의 관련도 점수를 매겨 높은 순으로 채우고, 출력은 원래 순서를 유지
+  (장면에 있는 NPC, 입력/트리거에서 언급된 아이템이 우선, 무관한 NPC는 개수만 남김)
+- 예산이 0이면 제한 없음 (기존과 같은 전체 컨텍스트)
+
+토큰 수는 tiktoken이 있으면 cl100k_base로, 없으면 문자 종류별 근사치로 계산한다.
+(인코딩은 시작 작업에서 load_encoding()으로 적재하고, 적재 전 요청은 근사치 사용)
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple, Iterable
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+REQUIRED = float('inf')
+
+_encoding = None
+_encoding_failed = False
+_HANGUL = re.compile(r'[가-힣]')
+
+
+def load_encoding():
+    """
+    tiktoken 인코딩 적재 (처음 한 번 BPE 파일을 내려받을 수 있으므로 시작 작업/예열 스레드에서 호출)
+    - 실패하면 이후로는 근사치 사용
+    """
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed and TIKTOKEN_AVAILABLE:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding_failed = True
+    return _encoding
+
+
+def _get_encoding():
+    """요청 경로용 - 적재가 끝나기 전에는 None (근사치 사용, 여기서 내려받지 않음)"""
+    return _encoding
+
+
+def tokenizer_name() -> str:
+    return "tiktoken cl100k_base" if _get_encoding() is not None else "heuristic"
+
+
+def estimate_tokens(text: str) -> int:
+    """프롬프트 토큰 수 추정"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # 근사: 한글 음절 ≈ 1토큰, 그 외 문자 ≈ 4자당 1토큰
+    hangul = len(_HANGUL.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+@dataclass
+class ContextFact:
+    section: str
+    text: str
+    score: float
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text) + 1  # 줄바꿈/구분자
+
+
+def pack_facts(facts: List[ContextFact], max_tokens: int) -> Tuple[List[ContextFact], List[ContextFact]]:
+    """
+    점수 높은 순으로 예산 안에 담고 (필수 항목은 항상 포함), 원래 순서대로 반환
+    Returns:
+        (포함된 항목, 제외된 항목)
+    """
+    if not max_tokens or max_tokens <= 0:
+        return list(facts), []
+
+    order = sorted(range(len(facts)), key=lambda i: facts[i].score, reverse=True)
+    used = 0
+    kept = set()
+    for i in order:
+        cost = facts[i].tokens
+        if facts[i].score == REQUIRED or used + cost <= max_tokens:
+            kept.add(i)
+            used += cost
+    return ([f for i, f in enumerate(facts) if i in kept],
+            [f for i, f in enumerate(facts) if i not in kept])
+
+
+def _names(entries: Iterable[Any]) -> List[str]:
+    return [e.get('name') if isinstance(e, dict) else e for e in entries or [] if e]
+
+
+def scene_focus(scene: Optional[Dict[str, Any]], user_input: str = "") -> Dict[str, Any]:
+    """장면 관련도 판단 재료: 등장 인물 이름 + 아이템 언급 여부를 볼 텍스트"""
+    if not scene:
+        return {"scene_id": None, "present": set(), "text": user_input or ""}
+    texts = [scene.get('title') or '', scene.get('description') or '', user_input or '']
+    for t in scene.get('transitions', []) or []:
+        texts.append(str(t.get('trigger') or ''))
+        texts.append(str(t.get('condition') or ''))
+    return {
+        "scene_id": scene.get('scene_id') or scene.get('ending_id'),
+        "present": set(_names(scene.get('npcs'))) | set(_names(scene.get('enemies'))),
+        "text": "\n".join(texts),
+    }
+
+
+def npc_score(name: str, npc_data: Dict[str, Any], focus: Dict[str, Any], alive: bool) -> float:
+    if name in focus["present"]:
+        return 100
+    if name and name in focus["text"]:
+        return 95
+    if focus["scene_id"] and npc_data.get("location") == focus["scene_id"]:
+        return 80
+    if alive and npc_data.get("is_hostile"):
+        return 40
+    return 25 if alive else 15
+
+
+def item_score(item: str, focus: Dict[str, Any]) -> float:
+    return 90 if item and item in focus["text"] else 30
+
+
+def recent_history(history: List[str], max_lines: int = 3, max_tokens: int = 0) -> List[str]:
+    """최근 대화 기록을 최대 max_lines줄, max_tokens 토큰 안에서 최신 순으로 선택 (최소 1줄 보장)"""
+    recent = history[-max_lines:] if history else []
+    if not max_tokens or max_tokens <= 0:
+        return recent
+
+    picked: List[str] = []
+    used = 0
+    for line in reversed(recent):
+        cost = estimate_tokens(line) + 1
+        if picked and used + cost > max_tokens:
+            break
+        picked.append(line)
+        used += cost
+    return list(reversed(picked))
@@ -0,0 +1,91 @@
+"""
+씬 진입 문구 캐시
+- battle_start / npc_appearance / enemy_appearance 응답은 씬 제목, 이름, 역할에만 의존
+- (scenario_id, scene_id, 종류, 이름)마다 최대 K개의 변형을 모아두고,
+  풀이 가득 차면 LLM 호출 없이 무작위로 하나를 골라 사용
+- 풀은 첫 K명의 진입에서 채워지거나(lazy), 시나리오 공개 시 미리 생성(prewarm)
+
+프롬프트 해시를 키에 포함하므로 템플릿이나 씬 정보가 바뀌면 자연히 새 풀을 사용한다.
+"""
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+
+from config import ENTRY_CONTENT_POOL_SIZE
+
+# (scenario_id, scene_id, kind, name, prompt_hash)
+EntryKey = Tuple[str, str, str, str, str]
+
+
+def make_entry_key(scenario_id: Any, scene_id: str, kind: str, name: str, prompt: str) -> EntryKey:
+    digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:12]
+    return str(scenario_id), str(scene_id), kind, name, digest
+
+
+class EntryContentCache:
+    """진입 문구 변형 풀 (프로세스 단위 LRU, 스레드 안전)"""
+
+    MAX_KEYS = 4096
+
+    _lock = threading.Lock()
+    _pools: "OrderedDict[EntryKey, List[str]]" = OrderedDict()
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def pool_size(cls) -> int:
+        return max(ENTRY_CONTENT_POOL_SIZE, 1)
+
+    @classmethod
+    def pick(cls, key: EntryKey) -> Optional[str]:
+        """풀이 가득 찼으면 무작위 변형, 아니면 None (LLM으로 채워야 함)"""
+        with cls._lock:
+            pool = cls._pools.get(key)
+            if pool is not None and len(pool) >= cls.pool_size():
+                cls._pools.move_to_end(key)
+                cls.hits += 1
+                return random.choice(pool)
+            cls.misses += 1
+            return None
+
+    @classmethod
+    def missing(cls, key: EntryKey) -> int:
+        """풀을 채우기 위해 더 필요한 변형 수"""
+        with cls._lock:
+            return max(cls.pool_size() - len(cls._pools.get(key, ())), 0)
+
+    @classmethod
+    def add(cls, key: EntryKey, text: str):
+        if not text:
+            return
+        with cls._lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls._pools[key] = []
+            else:
+                cls._pools.move_to_end(key)
+            if len(pool) < cls.pool_size() and text not in pool:
+                pool.append(text)
+            while len(cls._pools) > cls.MAX_KEYS:
+                cls._pools.popitem(last=False)
+
+    @classmethod
+    def invalidate(cls, scenario_id: Any):
+        sid = str(scenario_id)
+        with cls._lock:
+            for key in [k for k in cls._pools if k[0] == sid]:
+                del cls._pools[key]
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        with cls._lock:
+            total = cls.hits + cls.misses
+            return {
+                "pools": len(cls._pools),
+                "full_pools": sum(1 for p in cls._pools.values() if len(p) >= cls.pool_size()),
+                "hits": cls.hits,
+                "misses": cls.misses,
+                "hit_rate": round(cls.hits / total, 3) if total else 0.0,
+            }
@@ -0,0 +1,138 @@
+"""
+사전 계산형 퍼지 문자열 매처
+- 후보 문자열(트리거, NPC 이름)을 한 번만 정규화하고 문자 빈도 행렬로 보관
+- 질의 시 NumPy로 모든 후보의 SequenceMatcher.ratio() 상한값을 한 번에 계산해
+  임계값에 못 미치는 후보는 건너뛰고, 남은 후보만 실제 difflib 비율을 계산
+
+상한값: ratio = 2*M / (len_a + len_b), M(일치 문자 수) <= 문자 빈도 교집합 크기
+=> 결과는 기존 difflib 전수 비교와 완전히 동일 (동점이면 앞선 후보 우선)
+"""
+import difflib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, List, Tuple, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+
+def normalize_key(text: str) -> str:
+    """공백 제거 + 소문자 (game_engine.normalize_text / find_npc_key와 동일)"""
+    return text.lower().replace(" ", "")
+
+
+class FuzzyMatcher:
+    """후보 목록 하나에 대한 정규화 문자열 + 문자 빈도 행렬"""
+
+    def __init__(self, candidates: Sequence[str]):
+        self.raw: List[str] = list(candidates)
+        self.normalized: List[str] = [normalize_key(c) for c in self.raw]
+        self.lengths = [len(n) for n in self.normalized]
+
+        self._vocab: Dict[str, int] = {}
+        self._counts = None
+        if NUMPY_AVAILABLE and self.normalized:
+            for text in self.normalized:
+                for ch in text:
+                    if ch not in self._vocab:
+                        self._vocab[ch] = len(self._vocab)
+            counts = np.zeros((len(self.normalized), max(len(self._vocab), 1)), dtype=np.int32)
+            for row, text in enumerate(self.normalized):
+                for ch in text:
+                    counts[row, self._vocab[ch]] += 1
+            self._counts = counts
+            self._lengths_arr = np.asarray(self.lengths, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.normalized)
+
+    def upper_bounds(self, query_norm: str):
+        """모든 후보에 대한 ratio 상한값 (NumPy 배열)"""
+        q = np.zeros(self._counts.shape[1], dtype=np.int32)
+        for ch in query_norm:
+            col = self._vocab.get(ch)
+            if col is not None:
+                q[col] += 1
+        overlap = np.minimum(self._counts, q).sum(axis=1)
+        total = self._lengths_arr + len(query_norm)
+        total[total == 0] = 1.0
+        return 2.0 * overlap / total
+
+    def best_ratio(self, query_norm: str, floors: Optional[Sequence[float]] = None,
+                   skip: Optional[Sequence[bool]] = None) -> Tuple[int, float]:
+        """
+        difflib.SequenceMatcher(None, query, candidate).ratio()가 가장 높은 후보
+
+        Args:
+            floors: 후보별 최소 비율 (미만이면 후보에서 제외, 예: 전투 엔딩 트리거는 0.8)
+            skip: True인 후보는 제외
+        Returns:
+            (index, ratio) / 후보가 없으면 (-1, 0.0)
+        """
+        n = len(self.normalized)
+        if n == 0:
+            return -1, 0.0
+
+        if self._counts is None:
+            order = range(n)
+            bounds = None
+        else:
+            bounds = self.upper_bounds(query_norm)
+            # 상한값 내림차순, 동점이면 앞선 인덱스 먼저
+            order = sorted(range(n), key=lambda i: (-bounds[i], i))
+
+        best_idx, best = -1, 0.0
+        for i in order:
+            if skip is not None and skip[i]:
+                continue
+            floor = floors[i] if floors is not None else 0.0
+            if bounds is not None:
+                ub = bounds[i]
+                if ub < best:
+                    break  # 이후 후보들은 모두 현재 최고점보다 낮음
+                if ub < floor:
+                    continue
+            ratio = difflib.SequenceMatcher(None, query_norm, self.normalized[i]).ratio()
+            if ratio < floor:
+                continue
+            # 기존 순차 루프의 '>' 비교와 같은 결과: 동점이면 인덱스가 작은 후보
+            if ratio > best or (ratio == best and best_idx != -1 and i < best_idx):
+                best_idx, best = i, ratio
+        return best_idx, best
+
+
+class MatcherCache:
+    """
+    후보 목록 -> FuzzyMatcher 캐시 (LRU, 스레드 안전)
+    시나리오 트리거/NPC 목록은 거의 바뀌지 않으므로 목록 자체를 키로 사용
+    """
+
+    MAX_ENTRIES = 512
+
+    _lock = threading.Lock()
+    _matchers: "OrderedDict[Tuple[str, ...], FuzzyMatcher]" = OrderedDict()
+
+    @classmethod
+    def get(cls, candidates: Sequence[str]) -> FuzzyMatcher:
+        key = tuple(candidates)
+        with cls._lock:
+            matcher = cls._matchers.get(key)
+            if matcher is not None:
+                cls._matchers.move_to_end(key)
+                return matcher
+
+        matcher = FuzzyMatcher(key)
+        with cls._lock:
+            cls._matchers[key] = matcher
+            while len(cls._matchers) > cls.MAX_ENTRIES:
+                cls._matchers.popitem(last=False)
+        return matcher
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._matchers.clear()
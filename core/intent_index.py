@@ -0,0 +1,259 @@
+"""
+로컬 의도 사전 분류기 (CPU 전용, LLM 호출 없음)
+- 씬의 transition 트리거 + 의도 예문을 문자 n-gram TF-IDF 벡터로 색인
+- 유저 입력과의 코사인 유사도가 충분히 높고 2위와 격차가 크면 바로 의도 확정
+- 애매하면 None을 반환해 기존 LLM 분류기로 넘김
+- 부정/금지 표현("공격하지 않는다", "가지 말자")은 n-gram이 긍정문과 거의 같아 반대 의도로 확정되므로 항상 LLM
+- 질문/전달/가정 표현("~청한다고 말한다", "~가면 어떻게 돼?")도 트리거 n-gram을 그대로 포함하므로 항상 LLM
+- 트리거/공격 판정은 입력이 일치한 문장보다 훨씬 길면(색인 문장에 없는 n-gram이 많으면) LLM
+
+색인은 시나리오/씬 단위로 한 번만 생성하고, 시나리오 캐시 객체가 교체되면 다시 만든다.
+"""
+import logging
+import re
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# 의도 예문 (트리거가 없는 의도를 로컬에서 판정하기 위한 기준 문장)
+DEFAULT_INTENT_EXEMPLARS: Dict[str, List[str]] = {
+    'attack': [
+        "공격한다", "적을 공격한다", "검을 휘두른다", "칼로 벤다", "주먹으로 때린다", "찌른다",
+        "활을 쏜다", "내려친다", "달려들어 공격한다", "attack",
+    ],
+    'investigate': [
+        "주변을 조사한다", "주위를 살펴본다", "둘러본다", "방을 조사한다", "자세히 살펴본다",
+        "단서를 찾는다", "뒤져본다", "관찰한다", "주변을 탐색한다", "look around",
+    ],
+    'defend': [
+        "방어한다", "막는다", "방패로 막는다", "공격을 피한다", "회피한다", "몸을 숨긴다",
+        "방어 자세를 취한다", "defend",
+    ],
+}
+
+# 아이템 행동은 item_name 추출이 필요하므로 로컬에서 판정하지 않음
+ITEM_ACTION_KEYWORDS = [
+    "줍", "주워", "챙기", "챙긴", "획득", "얻", "가져", "집어", "사용", "쓴다", "뿌리", "뿌린",
+    "먹", "마시", "마신", "착용", "장착", "버리", "버린", "던지", "던진", "내려놓",
+]
+
+# 부정/금지 표현 (~지 않다, 안 ~, 못 ~, ~지 말자/말고/마라, 금지, 그만) - 로컬에서 판정하지 않음
+# "안"/"못"은 "안으로", "못을" 같은 명사와 구분하려고 단독 어절일 때만
+NEGATION_PATTERN = re.compile(
+    r"않|(?:^|\s)안\s|(?:^|\s)못\s|지\s*못|말자|말고|마라|말아|지\s*마(?:\s|$|요|세요)|금지|그만"
+    r"|\b(?:not|never|don't|dont|no)\b"
+)
+
+
+# 질문/전달/가정/제안 표현 (?, ~까, 말한다/묻는다/물어, ~자고, ~면, ~다고) - 명령이 아니므로 로컬에서 판정하지 않음
+SPEECH_PATTERN = re.compile(
+    r"\?|까(?:\s|$|요)|말(?:한|하|해|했)|묻(?:는|고|다|었)|물(?:어|었)"
+    r"|(?:자|다|라)고(?:\s|$|요|하|했)|면(?:\s|$|서)"
+    r"|\b(?:say|says|ask|asks|tell|tells|if|whether)\b"
+)
+
+
+def has_negation(text: str) -> bool:
+    return bool(NEGATION_PATTERN.search(text.lower()))
+
+
+def has_speech_marker(text: str) -> bool:
+    return bool(SPEECH_PATTERN.search(text.lower()))
+
+
+def _normalize(text: str) -> str:
+    """game_engine.normalize_text와 동일한 정규화 (공백 제거, 소문자)"""
+    return text.lower().replace(" ", "")
+
+
+def char_ngrams(text: str, sizes: Tuple[int, ...] = (2, 3)) -> List[str]:
+    """경계 표시를 붙인 문자 n-gram (짧은 한국어 명령문에 맞춰 2~3gram)"""
+    padded = f"^{_normalize(text)}$"
+    grams = []
+    for n in sizes:
+        if len(padded) < n:
+            continue
+        grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+class SceneIntentIndex:
+    """
+    한 씬의 TF-IDF 색인
+    labels[i] = (intent, transition_index) / transition이 아니면 index는 -1
+    """
+
+    def __init__(self, docs: List[Tuple[str, int, str]]):
+        self.labels: List[Tuple[str, int]] = [(intent, idx) for intent, idx, _ in docs]
+        self.texts: List[str] = [text for _, _, text in docs]
+
+        doc_grams = [char_ngrams(text) for text in self.texts]
+        self.doc_gram_sets = [set(grams) for grams in doc_grams]
+        vocab: Dict[str, int] = {}
+        for grams in doc_grams:
+            for g in grams:
+                if g not in vocab:
+                    vocab[g] = len(vocab)
+        self.vocab = vocab
+
+        n_docs = len(docs)
+        tf = np.zeros((n_docs, len(vocab)), dtype=np.float32)
+        for row, grams in enumerate(doc_grams):
+            for g in grams:
+                tf[row, vocab[g]] += 1.0
+
+        df = (tf > 0).sum(axis=0)
+        self.idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+
+        matrix = tf * self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = matrix / norms
+
+    def _vectorize(self, text: str):
+        vec = np.zeros(len(self.vocab), dtype=np.float32)
+        for g in char_ngrams(text):
+            col = self.vocab.get(g)
+            if col is not None:
+                vec[col] += 1.0
+        vec *= self.idf
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    def query(self, text: str) -> Optional[Tuple[str, int, float, float]]:
+        """
+        Returns:
+            (intent, transition_index, score, margin, extra) / 색인이 비었거나 겹치는 n-gram이 없으면 None
+            margin = 1위 점수 - 다른 판정(다른 의도 또는 다른 트리거) 중 최고 점수
+            extra = 1위 문장에 없는 입력 n-gram 수 / 1위 문장의 n-gram 수 (입력이 문장보다 얼마나 더 긴지)
+        """
+        if not self.labels:
+            return None
+        vec = self._vectorize(text)
+        if not vec.any():
+            return None
+
+        scores = self.matrix @ vec
+        best = int(np.argmax(scores))
+        best_label = self.labels[best]
+        best_score = float(scores[best])
+
+        runner_up = 0.0
+        for i, label in enumerate(self.labels):
+            if label != best_label and scores[i] > runner_up:
+                runner_up = float(scores[i])
+
+        doc_grams = self.doc_gram_sets[best]
+        extra = len(set(char_ngrams(text)) - doc_grams) / max(len(doc_grams), 1)
+        return best_label[0], best_label[1], best_score, best_score - runner_up, extra
+
+
+class IntentIndexCache:
+    """시나리오/씬 단위 색인 캐시 (스레드 안전)"""
+
+    MIN_SCORE = 0.72  # 이 이상이어야 로컬 판정
+    MIN_MARGIN = 0.12  # 2위 판정과의 최소 격차
+    MAX_EXTRA = 1.0  # transition/attack: 일치한 문장에 없는 입력 n-gram이 문장 길이를 넘으면 LLM
+
+    _lock = threading.Lock()
+    # (scenario_id, scene_id) -> (scenario 객체, 색인)
+    _indexes: Dict[Tuple[Any, str], Tuple[Dict[str, Any], SceneIntentIndex]] = {}
+
+    @staticmethod
+    def _build(curr_scene: Dict[str, Any], exemplars: Dict[str, List[str]]) -> SceneIntentIndex:
+        docs: List[Tuple[str, int, str]] = []
+        for idx, trans in enumerate(curr_scene.get('transitions', [])):
+            trigger = (trans.get('trigger') or '').strip()
+            if trigger:
+                docs.append(('transition', idx, trigger))
+
+        for intent, sentences in exemplars.items():
+            for sentence in sentences:
+                docs.append((intent, -1, sentence))
+
+        # 적 이름이 들어간 공격 예문 (예: "고블린을 공격한다")
+        for enemy in curr_scene.get('enemies', []):
+            name = enemy.get('name') if isinstance(enemy, dict) else enemy
+            if name and 'attack' in exemplars:
+                docs.append(('attack', -1, f"{name} 공격"))
+                docs.append(('attack', -1, f"{name}을 공격한다"))
+
+        return SceneIntentIndex(docs)
+
+    @classmethod
+    def get(cls, scenario_id: Any, scenario: Dict[str, Any], curr_scene: Dict[str, Any],
+            exemplars: Optional[Dict[str, List[str]]] = None) -> Optional[SceneIntentIndex]:
+        if not NUMPY_AVAILABLE:
+            return None
+        key = (scenario_id, curr_scene.get('scene_id', ''))
+        cached = cls._indexes.get(key)
+        # 시나리오 캐시가 새로고침되면 객체가 바뀌므로 그때만 재생성
+        if cached and cached[0] is scenario:
+            return cached[1]
+
+        index = cls._build(curr_scene, exemplars or DEFAULT_INTENT_EXEMPLARS)
+        with cls._lock:
+            cls._indexes[key] = (scenario, index)
+        return index
+
+    @classmethod
+    def invalidate(cls, scenario_id: Any):
+        with cls._lock:
+            for key in [k for k in cls._indexes if k[0] == scenario_id]:
+                del cls._indexes[key]
+
+
+def classify_intent_locally(scenario_id: Any, scenario: Dict[str, Any], curr_scene: Dict[str, Any],
+                            user_input: str, exemplars: Optional[Dict[str, List[str]]] = None
+                            ) -> Optional[Dict[str, Any]]:
+    """
+    확신이 높을 때만 intent_classifier LLM과 같은 형태의 결과 dict 반환, 아니면 None
+
+    transition / attack / investigate / defend 만 판정 (chat, item_action, 부정/금지, 질문/전달 표현은 항상 LLM)
+    """
+    if not NUMPY_AVAILABLE or not user_input:
+        return None
+
+    lowered = user_input.lower()
+    if any(k in lowered for k in ITEM_ACTION_KEYWORDS):
+        return None
+    if has_negation(lowered):
+        logger.debug(f"[LOCAL INTENT] Negation in '{user_input}', deferring to LLM")
+        return None
+    if has_speech_marker(lowered):
+        logger.debug(f"[LOCAL INTENT] Question/speech in '{user_input}', deferring to LLM")
+        return None
+
+    index = IntentIndexCache.get(scenario_id, scenario, curr_scene, exemplars)
+    if index is None:
+        return None
+
+    result = index.query(user_input)
+    if not result:
+        return None
+
+    intent, transition_index, score, margin, extra = result
+    if score < IntentIndexCache.MIN_SCORE or margin < IntentIndexCache.MIN_MARGIN:
+        logger.debug(f"[LOCAL INTENT] Low confidence ({intent}, score={score:.2f}, margin={margin:.2f})")
+        return None
+    # 트리거 n-gram을 포함할 뿐 그 명령이 아닌 긴 문장 (장면 전환/전투는 오판 비용이 큼)
+    if intent in ('transition', 'attack') and extra > IntentIndexCache.MAX_EXTRA:
+        logger.debug(f"[LOCAL INTENT] Input much longer than matched '{intent}' document (extra={extra:.2f})")
+        return None
+
+    return {
+        'intent': intent,
+        'transition_index': transition_index,
+        'confidence': round(score, 3),
+        'reasoning': f"local tf-idf (score={score:.2f}, margin={margin:.2f})",
+        'target_npc': None,
+        'item_name': None,
+    }
@@ -0,0 +1,70 @@
+"""
+무거운 모듈 지연 로드
+- 라우터 모듈이 game_engine / builder_agent / LangChain / LangGraph / google.genai / qdrant_client / aioboto3를
+  import 시점에 끌어오지 않도록, 첫 속성 접근 때 실제 import
+- 서버 시작 후에는 prewarm_heavy_modules()를 백그라운드에서 돌려 첫 요청이 import 비용을 내지 않게 함
+"""
+import importlib
+import logging
+import time
+from types import ModuleType
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# 지연 로드 대상 (시작 후 예열 순서)
+HEAVY_MODULES = (
+    "llm_factory",
+    "game_engine",
+    "builder_agent",
+    "services.ai_audit_service",
+    "services.chatbot_service",
+    "services.npc_service",
+    "services.image_service",
+    "core.vector_db",
+    "core.s3_client",
+)
+
+
+class LazyModule:
+    """
+    모듈 프록시 - `game_engine = LazyModule("game_engine")` 후 `game_engine.create_game_graph()`처럼 사용
+    (import 잠금은 importlib가 처리하므로 여러 스레드에서 동시에 접근해도 한 번만 로드됨)
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def prewarm_heavy_modules() -> Dict[str, float]:
+    """
+    HEAVY_MODULES를 순서대로 import (스레드에서 실행)
+
+    Returns:
+        모듈별 import 시간(ms), 실패한 모듈은 제외
+    """
+    timings = {}
+    for name in HEAVY_MODULES:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.warning(f"⚠️ [STARTUP] Prewarm import failed for {name}: {e}")
+            continue
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    total = sum(timings.values())
+    logger.info(f"🔥 [STARTUP] Prewarmed {len(timings)} modules in {total:.0f}ms")
+    return timings
@@ -0,0 +1,279 @@
+"""
+모델별 적응형 LLM 동시 실행 제한기 (AIMD + 우선순위 대기열)
+- 모델마다 동시 호출 한도를 두고, 성공하면 한도를 천천히 올리고(가산 증가)
+  429/5xx를 받으면 절반으로 줄임(승산 감소) -> 트래픽 급증이 429 폭주로 번지지 않게 함
+- 대기열은 우선순위 순 (실시간 게임 플레이 > 챗봇/기타 > 빌더 > 감수)
+  낮은 우선순위는 한도의 일부만 쓸 수 있어 게임 플레이 몫이 항상 남음
+- 대기 시간 초과 시 LLMOverloadedError (호출 측은 재시도 대신 폴백으로 처리)
+
+동기 호출(LangGraph 노드, 스레드 풀)과 비동기 호출(라우트의 ainvoke) 모두 같은 한도를 공유한다.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+from enum import IntEnum
+from typing import Dict, Any, Optional, List
+
+from config import (
+    LLM_CONCURRENCY_INITIAL, LLM_CONCURRENCY_MIN, LLM_CONCURRENCY_MAX, LLM_CONCURRENCY_DECREASE_COOLDOWN,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LLMPriority(IntEnum):
+    GAMEPLAY = 0  # 플레이어 턴 (의도 분류, NPC, 서사 스트리밍)
+    INTERACTIVE = 1  # 챗봇 등 사용자가 기다리는 기타 요청 (기본값)
+    BUILDER = 2  # 시나리오 생성/NPC 생성
+    AUDIT = 3  # AI 감수
+
+
+# 우선순위별로 사용할 수 있는 한도 비율 / 최대 대기 시간(초)
+PRIORITY_SHARE = {
+    LLMPriority.GAMEPLAY: 1.0,
+    LLMPriority.INTERACTIVE: 1.0,
+    LLMPriority.BUILDER: 0.75,
+    LLMPriority.AUDIT: 0.5,
+}
+PRIORITY_TIMEOUT = {
+    LLMPriority.GAMEPLAY: 20.0,
+    LLMPriority.INTERACTIVE: 30.0,
+    LLMPriority.BUILDER: 180.0,
+    LLMPriority.AUDIT: 180.0,
+}
+
+OUTCOME_OK = "ok"
+OUTCOME_OVERLOAD = "overload"  # 429 / 5xx -> 한도 감소
+OUTCOME_ERROR = "error"  # 그 외 실패 (한도 유지)
+
+
+class LLMOverloadedError(RuntimeError):
+    """대기열에서 제한 시간 안에 슬롯을 받지 못함"""
+
+
+def classify_exception(e: BaseException) -> str:
+    """openai/httpx 예외의 상태 코드로 과부하 여부 판정"""
+    status = getattr(e, 'status_code', None)
+    if status is None:
+        response = getattr(e, 'response', None)
+        status = getattr(response, 'status_code', None)
+    if status == 429 or (isinstance(status, int) and status >= 500):
+        return OUTCOME_OVERLOAD
+    return OUTCOME_ERROR
+
+
+class _Waiter:
+    __slots__ = ('priority', 'enqueued_at', 'event', 'loop', 'future', 'granted', 'cancelled')
+
+    def __init__(self, priority: int, loop=None, future=None):
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.event = threading.Event() if future is None else None
+        self.loop = loop
+        self.future = future
+        self.granted = False
+        self.cancelled = False
+
+    def grant(self):
+        self.granted = True
+        if self.future is not None:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+        else:
+            self.event.set()
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(True)
+
+
+class AdaptiveLimiter:
+    """한 모델의 AIMD 한도 + 우선순위 대기열"""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.limit = float(LLM_CONCURRENCY_INITIAL)
+        self.in_flight = 0
+
+        self._lock = threading.Lock()
+        self._queue: List[tuple] = []  # (priority, seq, waiter)
+        self._seq = itertools.count()
+        self._last_decrease = 0.0
+
+        # 지표
+        self.acquired = 0
+        self.rejected = 0
+        self.overloads = 0
+        self.max_queue_depth = 0
+        self.wait_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # 내부 (모두 _lock 보유 상태에서 호출)
+    # ------------------------------------------------------------------
+    def _admissible(self, priority: int) -> bool:
+        return self.in_flight < max(int(self.limit * PRIORITY_SHARE.get(priority, 1.0)), 1)
+
+    def _dispatch(self):
+        while self._queue:
+            priority, _, waiter = self._queue[0]
+            if waiter.cancelled:
+                heapq.heappop(self._queue)
+                continue
+            # 맨 앞(최고 우선순위)이 못 들어가면 뒤의 낮은 우선순위도 못 들어감
+            if not self._admissible(priority):
+                break
+            heapq.heappop(self._queue)
+            self.in_flight += 1
+            self.acquired += 1
+            self.wait_seconds += time.monotonic() - waiter.enqueued_at
+            waiter.grant()
+
+    def _enqueue(self, waiter: _Waiter):
+        heapq.heappush(self._queue, (waiter.priority, next(self._seq), waiter))
+        depth = sum(1 for _, _, w in self._queue if not w.cancelled)
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._dispatch()
+
+    def _give_up(self, waiter: _Waiter) -> bool:
+        """대기 포기 처리. 이미 슬롯을 받았으면 False (호출 측이 그대로 사용)"""
+        if waiter.granted:
+            return False
+        waiter.cancelled = True
+        self.rejected += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+    def acquire(self, priority: int = LLMPriority.INTERACTIVE, timeout: Optional[float] = None):
+        waiter = _Waiter(priority)
+        with self._lock:
+            self._enqueue(waiter)
+        if waiter.granted:
+            return
+
+        timeout = PRIORITY_TIMEOUT.get(priority, 30.0) if timeout is None else timeout
+        if not waiter.event.wait(timeout):
+            with self._lock:
+                if self._give_up(waiter):
+                    raise LLMOverloadedError(
+                        f"LLM queue timeout ({self.model_name}, priority={LLMPriority(priority).name})")
+
+    async def acquire_async(self, priority: int = LLMPriority.INTERACTIVE, timeout: Optional[float] = None):
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, loop=loop, future=loop.create_future())
+        with self._lock:
+            self._enqueue(waiter)
+        if waiter.granted:
+            return
+
+        timeout = PRIORITY_TIMEOUT.get(priority, 30.0) if timeout is None else timeout
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if self._give_up(waiter):
+                    raise LLMOverloadedError(
+                        f"LLM queue timeout ({self.model_name}, priority={LLMPriority(priority).name})")
+        except BaseException:
+            # 태스크 취소 등: 이미 받은 슬롯은 반납
+            with self._lock:
+                if not self._give_up(waiter):
+                    self.in_flight -= 1
+                    self._dispatch()
+            raise
+
+    def release(self, outcome: str = OUTCOME_OK):
+        with self._lock:
+            self.in_flight = max(self.in_flight - 1, 0)
+            if outcome == OUTCOME_OK:
+                # 가산 증가: 한도만큼 성공하면 약 +1
+                self.limit = min(self.limit + 1.0 / self.limit, float(LLM_CONCURRENCY_MAX))
+            elif outcome == OUTCOME_OVERLOAD:
+                self.overloads += 1
+                now = time.monotonic()
+                # 같은 버스트의 429가 연달아 와도 한 번만 감소
+                if now - self._last_decrease >= LLM_CONCURRENCY_DECREASE_COOLDOWN:
+                    self._last_decrease = now
+                    self.limit = max(self.limit * 0.5, float(LLM_CONCURRENCY_MIN))
+                    logger.warning(f"⚠️ [LLM LIMIT] {self.model_name} overloaded -> limit {self.limit:.1f}")
+            self._dispatch()
+
+    @property
+    def congested(self) -> bool:
+        """최근 과부하로 한도가 줄었고 대기열이 쌓여 있음 (재시도 억제 판단용)"""
+        with self._lock:
+            waiting = any(not w.cancelled for _, _, w in self._queue)
+            return waiting and self.limit < LLM_CONCURRENCY_INITIAL
+
+    @contextmanager
+    def slot(self, priority: int = LLMPriority.INTERACTIVE, timeout: Optional[float] = None):
+        self.acquire(priority, timeout)
+        outcome = OUTCOME_OK
+        try:
+            yield
+        except BaseException as e:
+            outcome = classify_exception(e)
+            raise
+        finally:
+            self.release(outcome)
+
+    @asynccontextmanager
+    async def slot_async(self, priority: int = LLMPriority.INTERACTIVE, timeout: Optional[float] = None):
+        await self.acquire_async(priority, timeout)
+        outcome = OUTCOME_OK
+        try:
+            yield
+        except BaseException as e:
+            outcome = classify_exception(e)
+            raise
+        finally:
+            self.release(outcome)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            depth: Dict[str, int] = {}
+            for priority, _, waiter in self._queue:
+                if not waiter.cancelled:
+                    name = LLMPriority(priority).name.lower()
+                    depth[name] = depth.get(name, 0) + 1
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "queue_depth": depth,
+                "max_queue_depth": self.max_queue_depth,
+                "acquired": self.acquired,
+                "rejected": self.rejected,
+                "overloads": self.overloads,
+                "avg_wait_ms": round(self.wait_seconds / self.acquired * 1000, 1) if self.acquired else 0.0,
+            }
+
+
+class LLMConcurrencyLimiter:
+    """모델명 -> AdaptiveLimiter 레지스트리"""
+
+    _lock = threading.Lock()
+    _limiters: Dict[str, AdaptiveLimiter] = {}
+
+    @classmethod
+    def for_model(cls, model_name: str) -> AdaptiveLimiter:
+        limiter = cls._limiters.get(model_name)
+        if limiter is None:
+            with cls._lock:
+                limiter = cls._limiters.setdefault(model_name, AdaptiveLimiter(model_name))
+        return limiter
+
+    @classmethod
+    def is_congested(cls, model_name: str) -> bool:
+        limiter = cls._limiters.get(model_name)
+        return bool(limiter and limiter.congested)
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        with cls._lock:
+            limiters = list(cls._limiters.items())
+        return {name: limiter.snapshot() for name, limiter in limiters}
@@ -0,0 +1,211 @@
+"""
+결정적 LLM 호출 응답 캐시
+- 호출 지점(site)마다 '결과에 영향을 주는 값'만으로 명시적인 키를 만든다
+  (예: 의도 분류 = 모델 + 규칙/씬 정적 블록 해시 + 정규화된 입력 + 인벤토리/상태 플래그)
+- SITE_TTL에 등록된 호출 지점만 캐시 (서사/NPC 대사/등장 문구 같은 창작 호출은 등록하지 않음 = opt-out)
+- 환경변수 LLM_RESPONSE_CACHE_OPT_OUT 으로 호출 지점별 비활성화 가능
+- 1차: 프로세스 메모리 LRU + TTL, 2차(선택): Redis (여러 워커가 결과 공유)
+
+Redis는 LangGraph 노드(동기 스레드)에서 조회하므로 redis.asyncio가 아닌 동기 클라이언트를 짧은 타임아웃으로 사용.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+
+from config import (
+    LLM_RESPONSE_CACHE_ENABLED, LLM_RESPONSE_CACHE_BACKEND, LLM_RESPONSE_CACHE_MAX_ENTRIES,
+    LLM_RESPONSE_CACHE_OPT_OUT,
+)
+
+try:
+    import redis as redis_sync
+    REDIS_SYNC_AVAILABLE = True
+except ImportError:
+    redis_sync = None
+    REDIS_SYNC_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 캐시 허용 호출 지점 -> TTL(초)
+SITE_TTL = {
+    "intent_classifier": 6 * 3600,
+    "ai_audit_coherence": 24 * 3600,
+    "ai_audit_trigger": 24 * 3600,
+    "ai_audit_recommendation": 24 * 3600,
+}
+
+_TRAILING_PUNCT = re.compile(r'[\s.!?~…]+$')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_user_input(text: str) -> str:
+    """공백/대소문자/끝 문장부호 차이만 있는 입력을 같은 키로 모음"""
+    text = unicodedata.normalize('NFKC', text or '').strip().lower()
+    text = _WHITESPACE.sub(' ', text)
+    return _TRAILING_PUNCT.sub('', text)
+
+
+def digest(text: str) -> str:
+    return hashlib.sha1((text or '').encode('utf-8')).hexdigest()[:16]
+
+
+class _MemoryBackend:
+    """LRU + TTL (스레드 안전)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class _RedisBackend:
+    """동기 Redis (조회 실패는 캐시 미스로 처리)"""
+
+    PREFIX = "llmcache:"
+
+    def __init__(self, url: str):
+        self._client = redis_sync.Redis.from_url(
+            url, decode_responses=True, socket_connect_timeout=0.5, socket_timeout=0.2
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            return self._client.get(self.PREFIX + key)
+        except Exception as e:
+            logger.debug(f"[LLM CACHE] Redis get failed: {e}")
+            return None
+
+    def set(self, key: str, value: str, ttl: int):
+        try:
+            self._client.setex(self.PREFIX + key, ttl, value)
+        except Exception as e:
+            logger.debug(f"[LLM CACHE] Redis set failed: {e}")
+
+
+class LLMResponseCache:
+    """호출 지점별 명시 키 응답 캐시 + 적중률 집계"""
+
+    _lock = threading.Lock()
+    _memory = _MemoryBackend(LLM_RESPONSE_CACHE_MAX_ENTRIES)
+    _redis: Optional[_RedisBackend] = None
+    _redis_checked = False
+    _stats: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def enabled(cls, site: str) -> bool:
+        return LLM_RESPONSE_CACHE_ENABLED and site in SITE_TTL and site not in LLM_RESPONSE_CACHE_OPT_OUT
+
+    @classmethod
+    def _redis_backend(cls) -> Optional[_RedisBackend]:
+        if cls._redis_checked:
+            return cls._redis
+        with cls._lock:
+            if not cls._redis_checked:
+                url = os.getenv("REDIS_URL")
+                use_redis = LLM_RESPONSE_CACHE_BACKEND == 'redis' or (LLM_RESPONSE_CACHE_BACKEND == 'auto' and url)
+                if use_redis and url and REDIS_SYNC_AVAILABLE:
+                    cls._redis = _RedisBackend(url)
+                    logger.info("✅ [LLM CACHE] Redis backend enabled")
+                cls._redis_checked = True
+        return cls._redis
+
+    @staticmethod
+    def make_key(site: str, *parts: Any) -> str:
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return f"{site}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    @classmethod
+    def _count(cls, site: str, field: str):
+        with cls._lock:
+            stats = cls._stats.setdefault(site, {"hits": 0, "misses": 0, "stores": 0})
+            stats[field] += 1
+
+    @classmethod
+    def get(cls, site: str, key: str) -> Optional[str]:
+        if not cls.enabled(site):
+            return None
+        value = cls._memory.get(key)
+        if value is None:
+            redis_backend = cls._redis_backend()
+            if redis_backend is not None:
+                value = redis_backend.get(key)
+                if value is not None:
+                    cls._memory.set(key, value, SITE_TTL[site])
+        cls._count(site, "hits" if value is not None else "misses")
+        return value
+
+    @classmethod
+    def put(cls, site: str, key: str, value: str):
+        if not cls.enabled(site) or not value:
+            return
+        ttl = SITE_TTL[site]
+        cls._memory.set(key, value, ttl)
+        redis_backend = cls._redis_backend()
+        if redis_backend is not None:
+            redis_backend.set(key, value, ttl)
+        cls._count(site, "stores")
+
+    @classmethod
+    def get_or_call(cls, site: str, key: str, call: Callable[[], str],
+                    validate: Optional[Callable[[str], bool]] = None, refresh: bool = False) -> str:
+        """캐시에 없으면 call() 결과를 반환하고, validate를 통과한 응답만 저장 (refresh=True면 조회 없이 다시 호출해 덮어씀)"""
+        if not refresh:
+            cached = cls.get(site, key)
+            if cached is not None:
+                return cached
+        value = call()
+        if validate is None or validate(value):
+            cls.put(site, key, value)
+        return value
+
+    @classmethod
+    def clear(cls):
+        cls._memory.clear()
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        with cls._lock:
+            sites = {}
+            for site, stats in cls._stats.items():
+                total = stats["hits"] + stats["misses"]
+                sites[site] = {**stats, "hit_rate": round(stats["hits"] / total, 3) if total else 0.0}
+        return {
+            "enabled": LLM_RESPONSE_CACHE_ENABLED,
+            "backend": "memory+redis" if cls._redis is not None else "memory",
+            "entries": len(cls._memory),
+            "opt_out": sorted(LLM_RESPONSE_CACHE_OPT_OUT),
+            "sites": sites,
+        }
@@ -0,0 +1,398 @@
+"""
+서사 스트리밍 모델 라우터 (헤지 요청 + 헬스 점수 + 서킷 브레이커)
+- 주 모델이 일정 시간(기본 LLM_HEDGE_AFTER_MS, 충분한 표본이 쌓이면 TTFT p95) 안에 첫 토큰을 못 주면
+  예비 모델 스트림을 추가로 시작하고, 먼저 첫 토큰을 준 쪽을 채택 (나머지는 즉시 취소)
+- 주 모델이 첫 토큰 전에 실패/빈 응답으로 끝나면 전체 실패를 기다리지 않고 바로 예비 모델로 전환
+- 연속 실패가 쌓인 모델은 서킷을 열어 일정 시간 라우팅에서 제외 (이후 한 번의 탐색 요청으로 복구 확인)
+- 모델별 TTFT p50/p95/p99, 성공률, 헤지 승리 횟수 집계
+
+- 예비 모델은 주 모델보다 단가가 비싸지 않은 것만 후보 (유저가 고른 모델 요금을 넘지 않도록)
+- 헤지 스트림은 공용 스레드 풀에서 실행하고, 풀이 가득 차면 헤지 없이 호출 스레드에서 바로 스트리밍
+
+스트림 청크는 (실제 응답한 모델명, 청크)로 반환된다 (과금은 호출 측에서 유저가 고른 모델 기준).
+LLM 객체는 llm.stream(prompt) 만 있으면 되므로 테스트/벤치마크용 스텁도 그대로 사용 가능.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Iterator, Callable, Tuple, List
+
+from config import (
+    LLM_HEDGE_ENABLED, LLM_HEDGE_AFTER_MS, LLM_HEDGE_MAX_STREAMS, LLM_FALLBACK_MODELS,
+    LLM_CIRCUIT_FAILURE_THRESHOLD, LLM_CIRCUIT_COOLDOWN,
+)
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+# 헤지 스트림 전용 스레드 풀 (스트림마다 스레드를 새로 만들지 않음) + 빈 자리 계수
+_executor = ThreadPoolExecutor(max_workers=LLM_HEDGE_MAX_STREAMS, thread_name_prefix="hedge")
+_stream_slots = threading.BoundedSemaphore(LLM_HEDGE_MAX_STREAMS)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(int(round(q * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[idx]
+
+
+class ModelHealth:
+    """모델 하나의 TTFT 표본 / 성공률(EWMA) / 서킷 상태"""
+
+    WINDOW = 256  # TTFT 표본 수
+    MIN_SAMPLES = 20  # 적응형 헤지 지연에 필요한 최소 표본
+    EWMA_ALPHA = 0.1
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._ttft: deque = deque(maxlen=self.WINDOW)
+
+        self.success_rate = 1.0
+        self.requests = 0
+        self.failures = 0
+        self.hedges = 0  # 이 모델이 주 모델일 때 예비 스트림을 띄운 횟수
+        self.hedge_wins = 0  # 이 모델이 예비로 투입되어 채택된 횟수
+
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    # ------------------------------------------------------------------
+    # 서킷 브레이커
+    # ------------------------------------------------------------------
+    def allow(self) -> bool:
+        """이 모델로 요청을 보내도 되는지 (반열림 상태에서는 탐색 요청 1건만 허용)"""
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_OPEN:
+                if time.monotonic() - self.opened_at < LLM_CIRCUIT_COOLDOWN:
+                    return False
+                self.state = CIRCUIT_HALF_OPEN
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def peek_available(self) -> bool:
+        """상태를 바꾸지 않고 라우팅 후보가 될 수 있는지만 확인"""
+        with self._lock:
+            if self.state == CIRCUIT_OPEN:
+                return time.monotonic() - self.opened_at >= LLM_CIRCUIT_COOLDOWN
+            return not (self.state == CIRCUIT_HALF_OPEN and self._probe_in_flight)
+
+    # ------------------------------------------------------------------
+    # 결과 기록
+    # ------------------------------------------------------------------
+    def record_ttft(self, seconds: float):
+        with self._lock:
+            self._ttft.append(seconds)
+
+    def record_success(self):
+        with self._lock:
+            self.requests += 1
+            self.success_rate += self.EWMA_ALPHA * (1.0 - self.success_rate)
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+            if self.state != CIRCUIT_CLOSED:
+                logger.info(f"✅ [MODEL ROUTER] Circuit closed: {self.model_name}")
+            self.state = CIRCUIT_CLOSED
+
+    def record_failure(self, reason: str = ""):
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.success_rate += self.EWMA_ALPHA * (0.0 - self.success_rate)
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == CIRCUIT_HALF_OPEN or self.consecutive_failures >= LLM_CIRCUIT_FAILURE_THRESHOLD:
+                if self.state != CIRCUIT_OPEN:
+                    logger.warning(f"⚠️ [MODEL ROUTER] Circuit opened: {self.model_name} "
+                                   f"({self.consecutive_failures} consecutive failures, last: {reason})")
+                self.state = CIRCUIT_OPEN
+                self.opened_at = time.monotonic()
+
+    def record_hedge(self):
+        with self._lock:
+            self.hedges += 1
+
+    def record_hedge_win(self):
+        with self._lock:
+            self.hedge_wins += 1
+
+    def record_abandoned(self):
+        """헤지에서 져서 취소됨 - 성공/실패로 세지 않음 (탐색 슬롯만 반납)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    # ------------------------------------------------------------------
+    # 지표
+    # ------------------------------------------------------------------
+    def ttft_quantiles(self) -> Tuple[int, float, float, float]:
+        with self._lock:
+            samples = sorted(self._ttft)
+        return (len(samples), _percentile(samples, 0.5), _percentile(samples, 0.95),
+                _percentile(samples, 0.99))
+
+    def score(self) -> float:
+        """예비 모델 선택용 점수: 성공률이 높고 첫 토큰이 빠를수록 높음"""
+        n, p50, _, _ = self.ttft_quantiles()
+        typical = p50 if n else LLM_HEDGE_AFTER_MS / 1000.0
+        return self.success_rate / (1.0 + typical)
+
+    def snapshot(self) -> Dict[str, Any]:
+        n, p50, p95, p99 = self.ttft_quantiles()
+        with self._lock:
+            return {
+                "circuit": self.state,
+                "requests": self.requests,
+                "failures": self.failures,
+                "success_rate": round(self.success_rate, 3),
+                "ttft_samples": n,
+                "ttft_p50_ms": round(p50 * 1000, 1),
+                "ttft_p95_ms": round(p95 * 1000, 1),
+                "ttft_p99_ms": round(p99 * 1000, 1),
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+            }
+
+
+def _has_content(chunk: Any) -> bool:
+    return bool(getattr(chunk, 'content', None))
+
+
+class _HedgeWorker:
+    """백그라운드 스레드에서 llm.stream()을 소비해 공유 이벤트 큐로 넘김"""
+
+    def __init__(self, model_name: str, llm, prompt: Any, events: "queue.Queue"):
+        self.model_name = model_name
+        self.llm = llm
+        self.prompt = prompt
+        self.events = events
+        self.buffer: List[Any] = []  # 첫 본문 청크 이전의 메타 청크
+        self.finished = False
+        self._cancelled = threading.Event()
+
+    def start(self) -> bool:
+        """풀에 빈 자리가 있으면 시작 (없으면 False - 대기열에 쌓여 첫 토큰이 늦어지는 것보다 헤지 생략이 나음)"""
+        if not _stream_slots.acquire(blocking=False):
+            return False
+        _executor.submit(self._run)
+        return True
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run(self):
+        health = ModelRouter.health(self.model_name)
+        started = time.monotonic()
+        got_content = False
+        stream = None
+        try:
+            stream = self.llm.stream(self.prompt)
+            for chunk in stream:
+                if self._cancelled.is_set():
+                    break
+                if not got_content and _has_content(chunk):
+                    got_content = True
+                    health.record_ttft(time.monotonic() - started)
+                self.events.put((self, chunk))
+            if self._cancelled.is_set():
+                health.record_abandoned()
+            elif got_content:
+                health.record_success()
+            else:
+                health.record_failure("empty stream")
+        except Exception as e:
+            if self._cancelled.is_set():
+                health.record_abandoned()
+            else:
+                health.record_failure(type(e).__name__)
+                self.events.put((self, e))
+        finally:
+            # 제너레이터를 닫아야 HTTP 스트림 연결이 정리됨
+            close = getattr(stream, 'close', None)
+            if close:
+                try:
+                    close()
+                except Exception:
+                    pass
+            self.events.put((self, _DONE))
+            _stream_slots.release()
+
+
+class ModelRouter:
+    """모델별 헬스 레지스트리 + 헤지 스트리밍"""
+
+    _lock = threading.Lock()
+    _health: Dict[str, ModelHealth] = {}
+
+    @classmethod
+    def health(cls, model_name: str) -> ModelHealth:
+        health = cls._health.get(model_name)
+        if health is None:
+            with cls._lock:
+                health = cls._health.setdefault(model_name, ModelHealth(model_name))
+        return health
+
+    @classmethod
+    def hedge_delay(cls, model_name: str) -> float:
+        """헤지 시작까지 기다릴 시간(초) - 표본이 충분하면 TTFT p95 (설정값의 0.5~2배 범위)"""
+        base = LLM_HEDGE_AFTER_MS / 1000.0
+        n, _, p95, _ = cls.health(model_name).ttft_quantiles()
+        if n < ModelHealth.MIN_SAMPLES:
+            return base
+        return min(max(p95, base * 0.5), base * 2.0)
+
+    @staticmethod
+    def _not_pricier(primary: str, candidate: str) -> bool:
+        from services.token_usage import ModelCostResolver
+        primary_cost = ModelCostResolver.resolve(primary)
+        candidate_cost = ModelCostResolver.resolve(candidate)
+        return (candidate_cost["input"] <= primary_cost["input"]
+                and candidate_cost["output"] <= primary_cost["output"])
+
+    @classmethod
+    def pick_backup(cls, primary: str) -> Optional[str]:
+        """서킷이 닫힌 예비 후보 중 주 모델보다 비싸지 않고 점수가 가장 높은 모델"""
+        candidates = [m for m in LLM_FALLBACK_MODELS
+                      if m != primary and cls._not_pricier(primary, m) and cls.health(m).peek_available()]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda m: cls.health(m).score())
+
+    @classmethod
+    def stream(cls, model_name: str, prompt_for: Callable[[str], Any],
+               llm_for: Callable[[str], Any]) -> Iterator[Tuple[str, Any]]:
+        """
+        (응답 모델명, 청크) 스트림
+        - prompt_for(model): 모델별 프롬프트 (cache_control 지원 여부가 모델마다 다름)
+        - llm_for(model): 스트리밍 LLM 인스턴스
+        첫 본문 청크 이후의 실패는 그대로 예외로 전달 (이미 일부 출력이 나갔으므로 호출 측 재시도 로직이 처리)
+        """
+        primary = model_name
+        if not cls.health(primary).allow():
+            backup = cls.pick_backup(primary)
+            if backup and cls.health(backup).allow():
+                logger.warning(f"⚠️ [MODEL ROUTER] {primary} circuit open -> routing to {backup}")
+                primary = backup
+            # 대안이 없으면 열린 서킷이라도 주 모델로 시도
+
+        backup = cls.pick_backup(primary) if LLM_HEDGE_ENABLED else None
+        events: "queue.Queue" = queue.Queue()
+        first = _HedgeWorker(primary, llm_for(primary), prompt_for(primary), events) if backup else None
+        if first is None or not first.start():
+            yield from cls._stream_direct(primary, llm_for(primary), prompt_for(primary))
+            return
+
+        workers = [first]
+        hedge_at = time.monotonic() + cls.hedge_delay(primary)
+        winner: Optional[_HedgeWorker] = None
+        last_error: Optional[BaseException] = None
+
+        def launch_backup(reason: str):
+            nonlocal backup
+            if backup and cls.health(backup).allow():
+                worker = _HedgeWorker(backup, llm_for(backup), prompt_for(backup), events)
+                if worker.start():
+                    cls.health(primary).record_hedge()
+                    logger.info(f"🔀 [MODEL ROUTER] Hedging {primary} -> {backup} ({reason})")
+                    workers.append(worker)
+                else:
+                    cls.health(backup).record_abandoned()
+                    if all(w.finished for w in workers):
+                        raise last_error or RuntimeError(f"Empty response from {primary}")
+            backup = None
+
+        try:
+            # 1) 첫 본문 청크를 가장 먼저 준 스트림 선택
+            while winner is None:
+                timeout = max(hedge_at - time.monotonic(), 0.0) if backup else None
+                try:
+                    worker, item = events.get(timeout=timeout)
+                except queue.Empty:
+                    launch_backup("slow first token")
+                    continue
+
+                if item is _DONE or isinstance(item, Exception):
+                    if isinstance(item, Exception):
+                        last_error = item
+                    if item is _DONE:
+                        worker.finished = True
+                        if backup:
+                            launch_backup("primary failed")
+                        elif all(w.finished for w in workers):
+                            raise last_error or RuntimeError(f"Empty response from {worker.model_name}")
+                    continue
+
+                if not _has_content(item):
+                    worker.buffer.append(item)
+                    continue
+                winner = worker
+                worker.buffer.append(item)
+
+            # 2) 나머지 스트림 취소
+            for worker in workers:
+                if worker is not winner:
+                    worker.cancel()
+            if winner.model_name != primary:
+                cls.health(winner.model_name).record_hedge_win()
+                logger.info(f"🔀 [MODEL ROUTER] Backup {winner.model_name} won over {primary}")
+
+            for chunk in winner.buffer:
+                yield winner.model_name, chunk
+            while True:
+                worker, item = events.get()
+                if worker is not winner:
+                    continue
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield winner.model_name, item
+        finally:
+            # 진 스트림 + 소비 측이 중간에 닫은 경우의 채택 스트림 정리 (이미 끝난 스트림에는 영향 없음)
+            for worker in workers:
+                worker.cancel()
+
+    @classmethod
+    def _stream_direct(cls, model_name: str, llm, prompt: Any) -> Iterator[Tuple[str, Any]]:
+        """예비 후보가 없을 때: 호출 스레드에서 그대로 스트리밍 (지표만 기록)"""
+        health = cls.health(model_name)
+        started = time.monotonic()
+        got_content = False
+        outcome = None
+        try:
+            for chunk in llm.stream(prompt):
+                if not got_content and _has_content(chunk):
+                    got_content = True
+                    health.record_ttft(time.monotonic() - started)
+                yield model_name, chunk
+            outcome = "ok" if got_content else "empty stream"
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            if outcome == "ok":
+                health.record_success()
+            elif outcome is None:
+                health.record_abandoned()  # 소비 측이 중간에 닫음
+            else:
+                health.record_failure(outcome)
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        with cls._lock:
+            items = list(cls._health.items())
+        return {name: health.snapshot() for name, health in items}
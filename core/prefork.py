@@ -0,0 +1,75 @@
+"""
+prefork 배포 모드 지원 (gunicorn preload_app + UvicornWorker, 설정은 gunicorn.conf.py)
+- 마스터 프로세스가 fork 전에 무거운 모듈 / 프롬프트 템플릿 / 공개 시나리오 캐시를 한 번만 적재
+  -> 워커는 같은 물리 페이지를 copy-on-write로 공유 (uvicorn --workers는 spawn 방식이라 워커마다 따로 적재)
+- 적재 동안 GC를 끄고(빈 구멍 없이 조밀하게 할당) fork 직전 gc.freeze()로 영구 세대에 옮겨,
+  워커의 GC가 공유 객체 헤더를 건드려 페이지를 복사하지 않게 함 (워커는 post_fork에서 GC 재개)
+"""
+import gc
+import logging
+import time
+from typing import Dict, Any
+
+from config import PREFORK_PRELOAD_SCENARIOS
+
+logger = logging.getLogger(__name__)
+
+
+def preload_shared_state(scenario_limit: int = PREFORK_PRELOAD_SCENARIOS) -> Dict[str, Any]:
+    """
+    마스터에서 fork 전에 호출 - 워커가 물려받을 읽기 전용 데이터 적재
+
+    Returns:
+        적재 통계 (모듈 수, 시나리오 수, 소요 시간)
+    """
+    started = time.perf_counter()
+    gc.disable()
+    try:
+        from core.lazy_import import prewarm_heavy_modules
+        modules = prewarm_heavy_modules()
+
+        from core.context_budget import load_encoding
+        load_encoding()
+
+        import game_engine
+        import builder_agent
+        game_engine.load_player_prompts()
+        builder_agent.get_prompts()
+
+        scenarios = 0
+        try:
+            scenarios = game_engine.preload_scenarios(scenario_limit)
+        except Exception as e:
+            logger.error(f"❌ [PREFORK] Scenario preload failed: {e}")
+
+        # 마스터가 연 DB 연결을 워커들이 물려받아 같은 소켓을 쓰지 않도록 풀 정리
+        from models import engine
+        engine.dispose()
+
+        stats = {
+            "modules": len(modules),
+            "scenarios": scenarios,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        logger.info(f"✅ [PREFORK] Preloaded {stats['modules']} modules, {scenarios} scenarios "
+                    f"in {stats['duration_ms']:.0f}ms")
+        return stats
+    finally:
+        # freeze_for_fork 전에 마스터 GC 재개 (적재 실패 시에도), 워커는 post_fork에서 다시 켬
+        gc.enable()
+
+
+def freeze_for_fork() -> int:
+    """
+    fork 직전(마스터) 호출 - 지금까지 만든 객체를 GC 추적에서 제외
+
+    Returns:
+        freeze된 객체 수
+    """
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def resume_gc_in_worker():
+    """fork 직후(워커) 호출 - 워커 자신이 만드는 객체는 평소대로 GC"""
+    gc.enable()
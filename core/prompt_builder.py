@@ -0,0 +1,177 @@
+"""
+프롬프트 조립 캐시
+- prompt_player.yaml 템플릿을 한 번만 파싱해 (리터럴, 필드) 조각 목록으로 보관
+- 씬마다 바뀌지 않는 값(씬 제목, 트리거 목록, NPC 명단 등)은 미리 리터럴에 합쳐 두고
+  호출 시에는 동적인 값(플레이어 상태, 유저 입력 등)만 끼워 넣음
+
+결과 문자열은 template.format(**values)와 바이트 단위로 동일해야 한다.
+단순 필드({name}, {name!r}, {name:spec})가 아닌 템플릿은 str.format으로 그대로 위임.
+"""
+import string
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, Callable, Union
+
+_formatter = string.Formatter()
+
+# 조각: 리터럴 문자열 또는 (필드명, 변환, 포맷 스펙)
+Part = Union[str, Tuple[str, Optional[str], str]]
+
+
+def _convert(value: Any, conversion: Optional[str]) -> Any:
+    if conversion is None:
+        return value
+    if conversion == 'r':
+        return repr(value)
+    if conversion == 's':
+        return str(value)
+    if conversion == 'a':
+        return ascii(value)
+    raise ValueError(f"Unknown conversion specifier {conversion}")
+
+
+class CompiledTemplate:
+    """파싱된 템플릿 (bind로 정적 값을 미리 합친 사본을 만들 수 있음)"""
+
+    __slots__ = ('source', '_parts', '_bound', 'simple')
+
+    def __init__(self, source: str, parts: Optional[List[Part]] = None, bound: Optional[Dict[str, Any]] = None):
+        self.source = source
+        self._bound = bound or {}
+        if parts is not None:
+            self._parts = parts
+            self.simple = True
+            return
+
+        parts = []
+        simple = True
+        for literal, field, spec, conversion in _formatter.parse(source):
+            if literal:
+                parts.append(literal)
+            if field is None:
+                continue
+            # 위치 인자, 속성/인덱스 접근, 중첩 스펙은 str.format에 위임
+            if not field.isidentifier() or (spec and '{' in spec):
+                simple = False
+                break
+            parts.append((field, conversion, spec or ''))
+        self._parts = self._merge(parts) if simple else []
+        self.simple = simple
+
+    @staticmethod
+    def _merge(parts: List[Part]) -> List[Part]:
+        """인접한 리터럴을 하나로 합침"""
+        merged: List[Part] = []
+        for part in parts:
+            if isinstance(part, str) and merged and isinstance(merged[-1], str):
+                merged[-1] += part
+            else:
+                merged.append(part)
+        return merged
+
+    @property
+    def fields(self) -> List[str]:
+        return [p[0] for p in self._parts if not isinstance(p, str)]
+
+    def bind(self, **static: Any) -> "CompiledTemplate":
+        """정적 값을 리터럴로 치환한 새 템플릿 (남은 필드만 render에서 채움)"""
+        if not self.simple:
+            return CompiledTemplate(self.source, None, {**self._bound, **static})
+
+        parts: List[Part] = []
+        for part in self._parts:
+            if not isinstance(part, str) and part[0] in static:
+                name, conversion, spec = part
+                parts.append(format(_convert(static[name], conversion), spec))
+            else:
+                parts.append(part)
+        return CompiledTemplate(self.source, self._merge(parts))
+
+    def render(self, **values: Any) -> str:
+        if not self.simple:
+            return self.source.format(**{**self._bound, **values})
+
+        out = []
+        for part in self._parts:
+            if isinstance(part, str):
+                out.append(part)
+            else:
+                name, conversion, spec = part
+                value = values[name]  # 없으면 str.format과 같은 KeyError
+                if conversion is None and not spec and type(value) is str:
+                    out.append(value)
+                else:
+                    out.append(format(_convert(value, conversion), spec))
+        return ''.join(out)
+
+    @property
+    def static_prefix(self) -> str:
+        """첫 번째 미결정 필드 앞까지의 리터럴 (렌더링 결과는 항상 이 문자열로 시작)"""
+        if self.simple and self._parts and isinstance(self._parts[0], str):
+            return self._parts[0]
+        return ""
+
+    def render_split(self, **values: Any) -> Tuple[str, str]:
+        """
+        (안정 prefix, 가변 suffix)로 나눠 렌더링 - prefix + suffix == render(**values)
+        prefix는 첫 번째 미결정 필드 앞까지의 리터럴 (정적 값은 bind로 이미 합쳐져 있음)
+        """
+        prefix = self.static_prefix
+        if not prefix:
+            return "", self.render(**values)
+        return prefix, CompiledTemplate(self.source, self._parts[1:]).render(**values)
+
+
+class PromptBuilder:
+    """
+    템플릿 컴파일 캐시 + 씬 단위 정적 조각 캐시 (스레드 안전)
+
+    씬 캐시는 (scenario_id, scene_id, 프롬프트 키)로 보관하고,
+    시나리오 캐시 객체나 템플릿 문자열이 바뀌면 다시 만든다 (IntentIndexCache와 같은 방식).
+    """
+
+    MAX_TEMPLATES = 128
+    MAX_SCENE_ENTRIES = 4096
+
+    _lock = threading.Lock()
+    _templates: "OrderedDict[str, CompiledTemplate]" = OrderedDict()
+    # (scenario_id, scene_id, key) -> (scenario 객체, 템플릿 원문, 정적 값이 합쳐진 템플릿)
+    _scene_templates: "OrderedDict[Tuple[Any, str, str], Tuple[Any, str, CompiledTemplate]]" = OrderedDict()
+
+    @classmethod
+    def compile(cls, template: str) -> CompiledTemplate:
+        compiled = cls._templates.get(template)
+        if compiled is not None:
+            return compiled
+        compiled = CompiledTemplate(template)
+        with cls._lock:
+            cls._templates[template] = compiled
+            while len(cls._templates) > cls.MAX_TEMPLATES:
+                cls._templates.popitem(last=False)
+        return compiled
+
+    @classmethod
+    def for_scene(cls, scenario_id: Any, scenario: Any, scene_id: str, key: str, template: str,
+                  static_factory: Callable[[], Dict[str, Any]]) -> CompiledTemplate:
+        """
+        씬 정적 값이 미리 합쳐진 템플릿 반환
+        static_factory는 캐시 미스일 때만 호출됨 (트리거 목록 등 무거운 문자열 조립)
+        """
+        cache_key = (scenario_id, scene_id, key)
+        cached = cls._scene_templates.get(cache_key)
+        if cached and cached[0] is scenario and cached[1] is template:
+            return cached[2]
+
+        bound = cls.compile(template).bind(**static_factory())
+        with cls._lock:
+            cls._scene_templates[cache_key] = (scenario, template, bound)
+            cls._scene_templates.move_to_end(cache_key)
+            while len(cls._scene_templates) > cls.MAX_SCENE_ENTRIES:
+                cls._scene_templates.popitem(last=False)
+        return bound
+
+    @classmethod
+    def invalidate(cls, scenario_id: Any):
+        with cls._lock:
+            for key in [k for k in cls._scene_templates if k[0] == scenario_id]:
+                del cls._scene_templates[key]
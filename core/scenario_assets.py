@@ -0,0 +1,125 @@
+"""
+시나리오 이미지/제목 조회 맵 (시나리오 버전마다 한 번만 생성)
+- 아이템 이름 -> 상세 정보(이미지 URL 해석 완료): 매 턴 stats 이벤트와 /session_state 조회의 인벤토리 보강용
+- 위치(scene_id/ending_id) -> 배경 이미지 URL, 제목: 턴 종료 bg_update / world_state 용
+
+예전에는 호출마다 raw_graph.items, raw_graph.nodes[*].data.items, scenes/endings/nodes를 선형 탐색했음.
+탐색 규칙(먼저 나온 항목 우선, 이미지 보강 순서, 노드 ID 대소문자 무시)은 그대로 유지한다.
+시나리오 캐시가 새로고침되면 객체가 바뀌므로 객체 동일성으로 버전을 판단 (IntentIndexCache와 같은 방식).
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class ScenarioAssets:
+    """시나리오 하나의 조회 맵"""
+
+    __slots__ = ('items', 'backgrounds', 'node_backgrounds', 'titles')
+
+    def __init__(self, scenario: Dict[str, Any], resolve_url: Callable[[str, str], str]):
+        raw_graph = (scenario.get('raw_graph') or {}) if scenario else {}
+        self.items = self._build_items(raw_graph, resolve_url)
+
+        # scenes + endings: 먼저 나온 ID 우선 (배경이 비어 있어도 그 항목으로 확정)
+        self.backgrounds: Dict[str, str] = {}
+        self.titles: Dict[str, str] = {}
+        for loc in (scenario.get('scenes', []) + scenario.get('endings', [])) if scenario else []:
+            loc_id = loc.get('scene_id') or loc.get('ending_id')
+            if loc_id in self.backgrounds:
+                continue
+            bg = loc.get('background_image', '') or loc.get('image', '') or loc.get('image_prompt', '')
+            self.backgrounds[loc_id] = resolve_url('bg', bg) if bg else ''
+            self.titles[loc_id] = loc.get('title') or loc.get('name', '')
+
+        # raw_graph 노드: 소문자 ID(노드 ID 또는 data.scene_id/ending_id) -> 배경이 있는 첫 노드
+        self.node_backgrounds: Dict[str, str] = {}
+        for node in raw_graph.get('nodes', []) or []:
+            data = node.get('data')
+            if not data:
+                continue
+            bg = data.get('background_image', '') or data.get('image', '')
+            if not bg:
+                continue
+            url = resolve_url('bg', bg)
+            self.node_backgrounds.setdefault((node.get('id') or '').lower(), url)
+            data_id = data.get('scene_id') or data.get('ending_id')
+            if data_id:
+                self.node_backgrounds.setdefault(str(data_id).lower(), url)
+
+    @staticmethod
+    def _build_items(raw_graph: Dict[str, Any], resolve_url: Callable[[str, str], str]) -> Dict[str, Dict[str, Any]]:
+        items: Dict[str, Dict[str, Any]] = {}
+        # raw_graph.items: 먼저 나온 항목 우선, 이미지가 없으면 뒤 항목의 이미지로 보강
+        for item in raw_graph.get('items', []) or []:
+            if isinstance(item, dict) and 'name' in item:
+                name = item['name'].strip()
+                if name not in items:
+                    items[name] = dict(item)
+                elif 'image' not in items[name] and 'image' in item:
+                    items[name]['image'] = item['image']
+
+        # raw_graph.nodes[*].data.items: 이미지가 있는 항목만 추가/보강
+        for node in raw_graph.get('nodes', []) or []:
+            for item in (node.get('data') or {}).get('items', []) or []:
+                if isinstance(item, dict) and 'name' in item and item.get('image'):
+                    name = item['name'].strip()
+                    if name not in items:
+                        items[name] = dict(item)
+                    elif 'image' not in items[name]:
+                        items[name]['image'] = item['image']
+
+        for name, item in items.items():
+            if item.get('image'):
+                item['image'] = resolve_url('ai-images/item', item['image'])
+                logger.debug(f"🖼️ [INVENTORY] Resolved scenario image URL for '{name}': {item['image']}")
+        return items
+
+    def item(self, name: str) -> Dict[str, Any]:
+        """인벤토리 아이템 상세 정보 (호출자가 수정해도 되는 사본)"""
+        item_data = {'name': name}
+        detail = self.items.get(name)
+        if detail:
+            item_data.update(detail)
+        return item_data
+
+    def background(self, location_id: str) -> str:
+        url = self.backgrounds.get(location_id, '')
+        if not url and location_id:
+            url = self.node_backgrounds.get(location_id.lower(), '')
+        return url
+
+    def title(self, location_id: str) -> str:
+        return self.titles.get(location_id, '')
+
+
+class ScenarioAssetCache:
+    """시나리오 객체별 ScenarioAssets 캐시 (스레드 안전, LRU)"""
+
+    MAX_ENTRIES = 256
+
+    _lock = threading.Lock()
+    # id(scenario) -> (scenario 객체, 맵)
+    _entries: "OrderedDict[int, tuple]" = OrderedDict()
+
+    @classmethod
+    def get(cls, scenario: Optional[Dict[str, Any]], resolve_url: Callable[[str, str], str]) -> ScenarioAssets:
+        if not scenario:
+            return ScenarioAssets({}, resolve_url)
+        key = id(scenario)
+        cached = cls._entries.get(key)
+        if cached and cached[0] is scenario:
+            return cached[1]
+
+        assets = ScenarioAssets(scenario, resolve_url)
+        with cls._lock:
+            cls._entries[key] = (scenario, assets)
+            cls._entries.move_to_end(key)
+            while len(cls._entries) > cls.MAX_ENTRIES:
+                cls._entries.popitem(last=False)
+        logger.info(f"🗂️ [SCENARIO ASSETS] Built maps: {len(assets.items)} items, "
+                    f"{len(assets.backgrounds)} locations, {len(assets.node_backgrounds)} node backgrounds")
+        return assets
@@ -0,0 +1,182 @@
+"""
+투기적(Speculative) 서사 스트림
+- 의도 분류 LLM 호출과 동시에 '가장 유력한' 서사 프롬프트를 미리 스트리밍
+- 분류 결과가 일치하면 이미 받아둔 청크부터 이어서 사용 (TTFT 단축)
+- 불일치하면 즉시 취소 (스트림 연결 종료)
+
+LLM 객체는 llm.stream(prompt) 만 있으면 되므로 테스트/벤치마크용 스텁도 그대로 사용 가능.
+"""
+import logging
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Iterator
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+# 투기 스트림 전용 스레드 풀 (요청 스레드와 분리)
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="speculative")
+
+
+class SpeculativeStream:
+    """백그라운드 스레드에서 llm.stream()을 소비해 큐에 적재하는 핸들"""
+
+    def __init__(self, llm, prompt: str, intent: str, prompt_key: str, meta: Optional[Dict[str, Any]] = None):
+        self.id = str(uuid.uuid4())
+        self.llm = llm
+        self.prompt = prompt
+        self.intent = intent
+        self.prompt_key = prompt_key
+        self.meta = meta or {}
+
+        self.created_at = time.monotonic()
+        self.first_chunk_at: Optional[float] = None
+        self.chunk_count = 0
+        self.usage: Dict[str, int] = {}
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._cancelled = threading.Event()
+        self._claimed = False
+        self._future = None
+
+    def start(self) -> "SpeculativeStream":
+        self._future = _executor.submit(self._run)
+        return self
+
+    def _run(self):
+        stream = None
+        try:
+            stream = self.llm.stream(self.prompt)
+            for chunk in stream:
+                if self._cancelled.is_set():
+                    break
+                if self.first_chunk_at is None:
+                    self.first_chunk_at = time.monotonic()
+                self.chunk_count += 1
+                usage = getattr(chunk, 'usage_metadata', None)
+                if usage:
+                    self.usage = dict(usage)
+                self._queue.put(chunk)
+        except Exception as e:
+            self._queue.put(e)
+        finally:
+            # 제너레이터를 닫아야 HTTP 스트림 연결이 정리됨
+            close = getattr(stream, 'close', None)
+            if close:
+                try:
+                    close()
+                except Exception:
+                    pass
+            self._queue.put(_DONE)
+
+    def cancel(self):
+        """결과를 쓰지 않기로 확정 (낭비 토큰은 통계로만 기록)"""
+        if self._cancelled.is_set() or self._claimed:
+            return
+        self._cancelled.set()
+        SpeculationStats.record_cancel(self)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def iter_chunks(self) -> Iterator[Any]:
+        """
+        이미 받은 청크부터 순서대로 반환 (llm.stream()과 같은 청크 객체)
+        - 스트림 도중 예외는 그대로 다시 발생시켜 호출 측 폴백 로직을 탐
+        """
+        self._claimed = True
+        SpeculationStats.record_hit(self)
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+class SpeculationRegistry:
+    """
+    진행 중인 투기 스트림 보관소
+    PlayerState는 Redis/DB에 직렬화되므로 상태에는 id 문자열만 저장하고 객체는 여기 둔다.
+    """
+
+    TTL_SECONDS = 60.0
+
+    _lock = threading.Lock()
+    _streams: Dict[str, SpeculativeStream] = {}
+
+    @classmethod
+    def register(cls, stream: SpeculativeStream) -> str:
+        with cls._lock:
+            cls._reap_locked()
+            cls._streams[stream.id] = stream
+        return stream.id
+
+    @classmethod
+    def pop(cls, stream_id: Optional[str]) -> Optional[SpeculativeStream]:
+        if not stream_id:
+            return None
+        with cls._lock:
+            return cls._streams.pop(stream_id, None)
+
+    @classmethod
+    def get(cls, stream_id: Optional[str]) -> Optional[SpeculativeStream]:
+        if not stream_id:
+            return None
+        with cls._lock:
+            return cls._streams.get(stream_id)
+
+    @classmethod
+    def _reap_locked(cls):
+        """소비되지 않고 방치된 스트림 정리 (스트리밍 없이 끝난 턴 등)"""
+        now = time.monotonic()
+        expired = [sid for sid, s in cls._streams.items() if now - s.created_at > cls.TTL_SECONDS]
+        for sid in expired:
+            cls._streams.pop(sid).cancel()
+
+
+class SpeculationStats:
+    """투기 실행 적중률 / 선행 시간 / 낭비 토큰 집계"""
+
+    _lock = threading.Lock()
+    started = 0
+    hits = 0
+    cancelled = 0
+    wasted_chunks = 0
+    head_start_seconds = 0.0
+
+    @classmethod
+    def record_start(cls):
+        with cls._lock:
+            cls.started += 1
+
+    @classmethod
+    def record_hit(cls, stream: SpeculativeStream):
+        # 소비 시작 시점까지 먼저 흘러간 시간 = 순차 실행 대비 앞당겨진 시간 (상한값)
+        with cls._lock:
+            cls.hits += 1
+            cls.head_start_seconds += time.monotonic() - stream.created_at
+
+    @classmethod
+    def record_cancel(cls, stream: SpeculativeStream):
+        with cls._lock:
+            cls.cancelled += 1
+            cls.wasted_chunks += stream.usage.get('output_tokens', stream.chunk_count)
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        with cls._lock:
+            return {
+                "started": cls.started,
+                "hits": cls.hits,
+                "cancelled": cls.cancelled,
+                "hit_rate": round(cls.hits / cls.started, 3) if cls.started else 0.0,
+                "wasted_output_tokens": cls.wasted_chunks,
+                "avg_head_start_ms": round(cls.head_start_seconds / cls.hits * 1000, 1) if cls.hits else 0.0,
+            }
@@ -0,0 +1,94 @@
+"""
+SSE 토큰 프레이밍
+- LLM 청크(보통 1~3자)마다 프레임을 만들지 않고, 시간(기본 30ms) 또는 크기 기준으로 모아서 한 프레임으로 보냄
+- 응답 생성기는 다음 청크가 와야 깨어나는 pull 방식이라, 청크 간격이 창보다 길어지면(느린 모델)
+  모으지 않고 바로 보냄 -> 첫 토큰과 느린 스트림의 체감 지연은 그대로
+- token 프레임은 dict + json.dumps 대신 C 구현 문자열 이스케이프(encode_basestring_ascii)로 직접 조립
+  (json.dumps({'type': 'token', 'content': text}) 와 바이트 단위로 같은 출력)
+"""
+import json
+import time
+from json.encoder import encode_basestring_ascii
+from typing import Iterator, Optional
+
+from config import SSE_COALESCE_ENABLED, SSE_COALESCE_WINDOW_MS, SSE_COALESCE_MAX_CHARS
+
+_TOKEN_PREFIX = 'data: {"type": "token", "content": '
+_FRAME_SUFFIX = '}\n\n'
+
+
+def token_frame(text: str) -> str:
+    """token 이벤트 SSE 프레임"""
+    return _TOKEN_PREFIX + encode_basestring_ascii(text) + _FRAME_SUFFIX
+
+
+def event_frame(event: dict) -> str:
+    """그 외 이벤트 SSE 프레임"""
+    return f"data: {json.dumps(event)}\n\n"
+
+
+class TokenCoalescer:
+    """토큰 청크를 시간/크기 기준으로 모아 프레임 단위로 방출"""
+
+    def __init__(self, window_ms: float = SSE_COALESCE_WINDOW_MS, max_chars: int = SSE_COALESCE_MAX_CHARS,
+                 enabled: bool = SSE_COALESCE_ENABLED, clock=time.monotonic):
+        self.window = window_ms / 1000.0
+        self.max_chars = max_chars
+        self.enabled = enabled and window_ms > 0
+        self._clock = clock
+        self._parts = []
+        self._size = 0
+        self._first_at = 0.0
+        self._last_at: Optional[float] = None
+        self._gap = 0.0  # 청크 간격 EWMA
+
+    def push(self, chunk: str) -> Optional[str]:
+        """청크 추가, 내보낼 프레임이 있으면 반환"""
+        if not chunk:
+            return None
+        now = self._clock()
+        first_chunk = self._last_at is None
+        if not first_chunk:
+            gap = now - self._last_at
+            self._gap = gap if self._gap == 0.0 else 0.8 * self._gap + 0.2 * gap
+        self._last_at = now
+
+        if not self.enabled or first_chunk or self._gap >= self.window:
+            # 첫 청크 / 느린 스트림: 모아 봐야 지연만 늘어나므로 즉시 전송
+            return self._emit(chunk)
+
+        if not self._parts:
+            self._first_at = now
+        self._parts.append(chunk)
+        self._size += len(chunk)
+        # 다음 청크까지 기다리면 창을 넘길 것 같으면 지금 보냄 (추가 지연 상한 ≈ 창 크기)
+        if self._size >= self.max_chars or now - self._first_at + self._gap >= self.window:
+            return self.flush()
+        return None
+
+    def _emit(self, chunk: str) -> str:
+        if self._parts:
+            self._parts.append(chunk)
+            return self.flush()
+        return token_frame(chunk)
+
+    def flush(self) -> Optional[str]:
+        """모인 청크를 한 프레임으로 (다른 이벤트를 보내기 전/스트림 끝에 호출)"""
+        if not self._parts:
+            return None
+        text = ''.join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        return token_frame(text)
+
+
+def coalesce_tokens(chunks: Iterator[str], **kwargs) -> Iterator[str]:
+    """청크 이터레이터 -> token SSE 프레임 이터레이터"""
+    coalescer = TokenCoalescer(**kwargs)
+    for chunk in chunks:
+        frame = coalescer.push(chunk)
+        if frame:
+            yield frame
+    frame = coalescer.flush()
+    if frame:
+        yield frame
@@ -2,11 +2,12 @@
 게임 상태 관리 클래스
 """
 from typing import Dict, Any, Optional, List, Union
-from config import DEFAULT_CONFIG
+from config import DEFAULT_CONFIG, LLM_CONTEXT_TOKEN_BUDGET
 import copy
 import re
 import logging
-import difflib
+from core.fuzzy_match import MatcherCache
+from core.context_budget import ContextFact, REQUIRED, pack_facts, scene_focus, npc_score, item_score
 
 logger = logging.getLogger(__name__)
 
@@ -864,30 +865,25 @@ class WorldState:
 
         query_lower = query_name.lower().replace(" ", "")
 
+        # NPC 키 정규화 결과는 키 목록 단위로 캐시 (세션마다 WorldState를 새로 복원하므로)
+        npc_keys = list(self.npcs.keys())
+        matcher = MatcherCache.get(npc_keys)
+
         # 1. 정확한 일치 확인
-        for npc_key in self.npcs.keys():
-            if npc_key.lower().replace(" ", "") == query_lower:
+        for npc_key, npc_key_normalized in zip(npc_keys, matcher.normalized):
+            if npc_key_normalized == query_lower:
                 logger.info(f"🎯 [NPC MATCH] Exact match: '{query_name}' -> '{npc_key}'")
                 return npc_key
 
         # 2. 부분 일치 확인 (query가 npc_key에 포함)
-        for npc_key in self.npcs.keys():
-            npc_key_normalized = npc_key.lower().replace(" ", "")
+        for npc_key, npc_key_normalized in zip(npc_keys, matcher.normalized):
             if query_lower in npc_key_normalized or npc_key_normalized in query_lower:
                 logger.info(f"🎯 [NPC MATCH] Partial match: '{query_name}' -> '{npc_key}'")
                 return npc_key
 
-        # 3. 유사도 기반 매칭 (difflib)
-        best_match = None
-        best_ratio = 0.0
-
-        for npc_key in self.npcs.keys():
-            npc_key_normalized = npc_key.lower().replace(" ", "")
-            ratio = difflib.SequenceMatcher(None, query_lower, npc_key_normalized).ratio()
-
-            if ratio > best_ratio and ratio >= 0.6:  # 60% 이상 유사도
-                best_ratio = ratio
-                best_match = npc_key
+        # 3. 유사도 기반 매칭 (difflib, 60% 이상 유사도)
+        best_idx, best_ratio = matcher.best_ratio(query_lower, floors=[0.6] * len(npc_keys))
+        best_match = npc_keys[best_idx] if best_idx >= 0 else None
 
         if best_match:
             logger.info(f"🎯 [NPC MATCH] Fuzzy match ({best_ratio:.2f}): '{query_name}' -> '{best_match}'")
@@ -1075,7 +1071,8 @@ class WorldState:
     # 6. LLM 컨텍스트 생성 (get_llm_context)
     # ========================================
 
-    def get_llm_context(self) -> str:
+    def get_llm_context(self, scene: Optional[Dict[str, Any]] = None, user_input: str = "",
+                        max_tokens: Optional[int] = None) -> str:
         """
         현재 LLM 프롬프트에 주입할 단단한 진실 컨텍스트
         - 플레이어 현재 스탯
@@ -1084,50 +1081,75 @@ class WorldState:
 
         LLM은 이 정보를 토대로 무시할 수 없으며
         서사 생성 시 반드시 이 데이터를 기준으로 작성해야 함
-        """
-        lines = ["=== 🌍 WORLD STATE (단단한 진실) ===\n"]
 
-        # 플레이어 상태
-        lines.append("[플레이어 상태]")
-        lines.append(f"- HP: {self.player['hp']}/{self.player['max_hp']}")
+        [토큰 예산] max_tokens(기본 LLM_CONTEXT_TOKEN_BUDGET) 안에서 현재 장면(scene)과
+        관련도가 높은 NPC/아이템/최근 사건부터 채움. 플레이어 스탯은 항상 포함, 0이면 제한 없음.
+        """
+        budget = LLM_CONTEXT_TOKEN_BUDGET if max_tokens is None else max_tokens
+        focus = scene_focus(scene, user_input)
 
+        # 플레이어 상태 (필수)
+        facts = [ContextFact("player", f"- HP: {self.player['hp']}/{self.player['max_hp']}", REQUIRED)]
         if self.player.get('gold', 0) > 0:
-            lines.append(f"- 골드: {self.player['gold']}")
-
+            facts.append(ContextFact("player", f"- 골드: {self.player['gold']}", REQUIRED))
         for key, value in self.player.get("custom_stats", {}).items():
-            lines.append(f"- {key}: {value}")
+            facts.append(ContextFact("player", f"- {key}: {value}", REQUIRED))
+
+        for item in self.player["inventory"]:
+            facts.append(ContextFact("item", str(item), item_score(str(item), focus)))
+
+        # NPC 생존 상태 (핵심만 표시 - 환각 방지)
+        for npc_name, npc_data in self.npcs.items():
+            status = npc_data.get("status", "alive")
+            hp_raw = npc_data.get("hp", 100)
+
+            # ✅ 작업 3: HP 값을 정수로 강제 변환 (타입 에러 방지)
+            try:
+                hp = int(float(hp_raw))
+            except (ValueError, TypeError):
+                logger.warning(f"Invalid HP value for NPC '{npc_name}': {hp_raw}, using default 100")
+                hp = 100
 
-        if self.player["inventory"]:
-            lines.append(f"- 보유중: {', '.join(self.player['inventory'])}")
+            alive = status != "dead" and hp > 0
+            if alive:
+                line = f"- {npc_name}: 생존 (HP: {hp})"
+            else:
+                line = f"- {npc_name}: 전투 사망 (HP: 0) - 더이상 무력/불가능"
+            facts.append(ContextFact("npc", line, npc_score(npc_name, npc_data, focus, alive)))
+
+        # 최근 서사 이벤트 (최근 5개, 최신일수록 높은 점수)
+        recent_events = self.narrative_history[-5:]
+        for i, event in enumerate(recent_events):
+            facts.append(ContextFact("event", event, 60 - (len(recent_events) - 1 - i) * 8))
+
+        kept, dropped = pack_facts(facts, budget)
+
+        lines = ["=== 🌍 WORLD STATE (단단한 진실) ===\n"]
+
+        # 플레이어 상태
+        lines.append("[플레이어 상태]")
+        lines.extend(f.text for f in kept if f.section == "player")
+
+        items = [f.text for f in kept if f.section == "item"]
+        dropped_items = sum(1 for f in dropped if f.section == "item")
+        if items:
+            lines.append(f"- 보유중: {', '.join(items)}" + (f" 외 {dropped_items}개" if dropped_items else ""))
+        elif dropped_items:
+            lines.append(f"- 보유중: 아이템 {dropped_items}개")
         else:
             lines.append("- 보유중: 없음")
 
-        # NPC 생존 상태 (핵심만 표시 - 환각 방지)
         if self.npcs:
             lines.append("\n[NPC/적 상태]")
-            for npc_name, npc_data in self.npcs.items():
-                status = npc_data.get("status", "alive")
-                hp_raw = npc_data.get("hp", 100)
-
-                # ✅ 작업 3: HP 값을 정수로 강제 변환 (타입 에러 방지)
-                try:
-                    hp = int(float(hp_raw))
-                except (ValueError, TypeError):
-                    logger.warning(f"Invalid HP value for NPC '{npc_name}': {hp_raw}, using default 100")
-                    hp = 100
-
-                if status == "dead":
-                    lines.append(f"- {npc_name}: 전투 사망 (HP: 0) - 더이상 무력/불가능")
-                elif hp <= 0:
-                    lines.append(f"- {npc_name}: 전투 사망 (HP: 0) - 더이상 무력/불가능")
-                else:
-                    lines.append(f"- {npc_name}: 생존 (HP: {hp})")
+            lines.extend(f.text for f in kept if f.section == "npc")
+            dropped_npcs = sum(1 for f in dropped if f.section == "npc")
+            if dropped_npcs:
+                lines.append(f"- (이 장면과 무관한 NPC {dropped_npcs}명 생략)")
 
-        # 최근 서사 이벤트 (최근 5개)
-        if self.narrative_history:
+        events = [f.text for f in kept if f.section == "event"]
+        if events:
             lines.append("\n[최근 사건 요약]")
-            recent_events = self.narrative_history[-5:]
-            for i, event in enumerate(recent_events, 1):
+            for i, event in enumerate(events, 1):
                 lines.append(f"{i}. {event}")
 
         return "\n".join(lines)
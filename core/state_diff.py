@@ -0,0 +1,189 @@
+"""
+턴 종료 상태(stats / world_state / npc_status) 델타 전송
+- 클라이언트가 마지막으로 적용한 버전(state_version)을 요청에 실어 보내면,
+  서버가 같은 버전의 스냅샷을 가지고 있을 때만 JSON Patch(RFC 6902 부분집합: add/replace/remove)로 바뀐 필드만 보냄
+- 버전이 다르거나(다른 워커, 스트림 중단, 새로고침) 패치가 전체보다 크면 전체 스냅샷 + 새 버전을 보냄
+- 버전은 '{epoch}:{seq}' 형식이고 epoch은 스냅샷을 새로 만들 때마다 무작위로 정하므로
+  다른 워커가 가진 같은 seq와 우연히 일치할 수 없음
+"""
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Dict, Any, List, Optional
+
+from config import SSE_STATE_DELTA_ENABLED, SSE_STATE_DELTA_MAX_SESSIONS
+
+CHANNELS = ('stats', 'world_state', 'npc_status')
+
+
+def _escape(key: Any) -> str:
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def _same(a: Any, b: Any) -> bool:
+    # True == 1 같은 타입 변화도 변경으로 취급 (list/dict 안쪽 값까지 재귀로 비교: [True] != [1])
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return len(a) == len(b) and all(key in b and _same(value, b[key]) for key, value in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    old -> new 패치 연산 목록
+    - dict는 키 단위로 재귀
+    - list는 뒤에 추가만 된 경우 '/-' add, 그 외 변경은 리스트 통째로 replace
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({'op': 'add', 'path': child, 'value': value})
+            elif not _same(old[key], value):
+                ops.extend(json_diff(old[key], value, child))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        if _same(old, new):
+            return []
+        if len(new) > len(old) and _same(new[:len(old)], old):
+            return [{'op': 'add', 'path': f"{path}/-", 'value': v} for v in new[len(old):]]
+        # 슬라이딩 윈도우(narrative_history 등): 앞에서 k개 빠지고 뒤에 추가된 경우
+        for k in range(1, len(old)):
+            kept = len(old) - k
+            if len(new) >= kept and _same(old[k:], new[:kept]):
+                return ([{'op': 'remove', 'path': f"{path}/0"}] * k +
+                        [{'op': 'add', 'path': f"{path}/-", 'value': v} for v in new[kept:]])
+        return [{'op': 'replace', 'path': path, 'value': new}]
+
+    if _same(old, new):
+        return []
+    return [{'op': 'replace', 'path': path, 'value': new}]
+
+
+def apply_patch(doc: Any, ops: List[Dict[str, Any]]) -> Any:
+    """json_diff 결과를 적용한 새 문서 반환 (원본은 변경하지 않음)"""
+    doc = deepcopy(doc)
+    for op in ops:
+        tokens = [_unescape(t) for t in op['path'].split('/')[1:]]
+        if not tokens:
+            if op['op'] == 'remove':
+                doc = None
+            else:
+                doc = deepcopy(op['value'])
+            continue
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            if op['op'] == 'remove':
+                del parent[int(last)]
+            elif last == '-':
+                parent.append(deepcopy(op['value']))
+            elif op['op'] == 'add':
+                parent.insert(int(last), deepcopy(op['value']))
+            else:
+                parent[int(last)] = deepcopy(op['value'])
+        elif op['op'] == 'remove':
+            parent.pop(last, None)
+        else:
+            parent[last] = deepcopy(op['value'])
+    return doc
+
+
+def _size(obj: Any) -> int:
+    return len(json.dumps(obj).encode('utf-8'))
+
+
+class StateSyncRegistry:
+    """세션별 마지막 전송 스냅샷 + 버전 (LRU, 프로세스 로컬)"""
+
+    _lock = threading.Lock()
+    _entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    _stats = {"patches": 0, "snapshots": 0, "sent_bytes": 0, "full_bytes": 0}
+
+    @staticmethod
+    def _version(entry: Dict[str, Any]) -> str:
+        return f"{entry['epoch']}:{entry['seq']}"
+
+    @classmethod
+    def build_events(cls, session_id: Optional[str], client_version: Optional[str],
+                     payloads: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        이번 턴 상태로 보낼 SSE 이벤트 목록
+        Args:
+            payloads: 채널명 -> 전체 내용 (이번 턴에 보낼 채널만)
+        Returns:
+            패치면 [{'type': 'state_patch', ...}], 전체면 채널별 이벤트 + {'type': 'state_version'}
+        """
+        payloads = {ch: v for ch, v in payloads.items() if ch in CHANNELS and v is not None}
+        full_events = [{'type': ch, 'content': v} for ch, v in payloads.items()]
+        if not SSE_STATE_DELTA_ENABLED or not session_id:
+            return full_events
+
+        # 이후 턴에서 원본이 바뀌어도 비교 기준이 흔들리지 않도록 JSON 사본으로 보관
+        snapshot = json.loads(json.dumps(payloads))
+        full_bytes = sum(_size(e) for e in full_events)
+
+        with cls._lock:
+            entry = cls._entries.get(session_id)
+            events = None
+            if entry is not None and client_version and client_version == cls._version(entry):
+                patch = {}
+                for ch, value in snapshot.items():
+                    ops = json_diff(entry['state'].get(ch), value)
+                    if ops:
+                        patch[ch] = ops
+                entry['seq'] += 1
+                event = {'type': 'state_patch', 'base': client_version,
+                         'version': cls._version(entry), 'content': patch}
+                if _size(event) < full_bytes:
+                    events = [event]
+                    cls._stats["patches"] += 1
+
+            if events is None:
+                entry = {'epoch': uuid.uuid4().hex[:8], 'seq': 1, 'state': {}}
+                events = full_events + [{'type': 'state_version', 'content': cls._version(entry)}]
+                cls._stats["snapshots"] += 1
+
+            entry['state'].update(snapshot)
+            cls._entries[session_id] = entry
+            cls._entries.move_to_end(session_id)
+            while len(cls._entries) > SSE_STATE_DELTA_MAX_SESSIONS:
+                cls._entries.popitem(last=False)
+
+            cls._stats["sent_bytes"] += sum(_size(e) for e in events)
+            cls._stats["full_bytes"] += full_bytes
+        return events
+
+    @classmethod
+    def forget(cls, session_id: str):
+        with cls._lock:
+            cls._entries.pop(session_id, None)
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        with cls._lock:
+            stats = dict(cls._stats)
+            sessions = len(cls._entries)
+        full = stats["full_bytes"]
+        return {
+            "enabled": SSE_STATE_DELTA_ENABLED,
+            "sessions": sessions,
+            **stats,
+            "saved_ratio": round(1 - stats["sent_bytes"] / full, 3) if full else 0.0,
+        }
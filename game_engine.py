@@ -3,18 +3,30 @@ import json
 import logging
 import os
 import re
-import difflib
 import yaml
 import urllib.parse
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 from typing import TypedDict, List, Dict, Any, Optional, Generator
 from langgraph.graph import StateGraph, END
-from llm_factory import LLMFactory
+from llm_factory import LLMFactory, OpenRouterLLM
 from dotenv import load_dotenv
 from core.state import WorldState
+from core.speculation import SpeculativeStream, SpeculationRegistry, SpeculationStats
+from core.intent_index import classify_intent_locally, IntentIndexCache
+from core.fuzzy_match import MatcherCache
+from core.entry_content_cache import EntryContentCache, make_entry_key
+from core.prompt_builder import PromptBuilder
+from core.llm_limiter import LLMPriority, LLMConcurrencyLimiter, LLMOverloadedError
+from core.model_router import ModelRouter
+from core.llm_response_cache import LLMResponseCache, normalize_user_input, digest
+from core.context_budget import recent_history
 
 # [NEW] 토큰 추적 및 과금 처리를 위한 임포트
-from langchain_community.callbacks import get_openai_callback
 from services.user_service import UserService
+from services.billing_service import BillingService
+from services.token_usage import TokenUsageStats
+from config import SPECULATIVE_NARRATIVE_ENABLED, NPC_DIALOGUE_MODE, LLM_HISTORY_TOKEN_BUDGET
 
 # =============================================================================
 # [NEW] MinIO 이미지 URL 생성 유틸리티
@@ -106,6 +118,19 @@ logger = logging.getLogger(__name__)
 _scenario_cache: Dict[int, Dict[str, Any]] = {}
 
 
+def _normalize_scenario_data(scenario_data: Dict[str, Any]) -> Dict[str, Any]:
+    # [Fix] 중첩된 scenario 구조 처리
+    if 'scenario' in scenario_data and isinstance(scenario_data['scenario'], dict):
+        scenario_data = scenario_data['scenario']
+
+    # [Fix] 필수 키가 없으면 기본값 설정
+    if 'scenes' not in scenario_data:
+        scenario_data['scenes'] = []
+    if 'endings' not in scenario_data:
+        scenario_data['endings'] = []
+    return scenario_data
+
+
 def get_scenario_by_id(scenario_id: int) -> Dict[str, Any]:
     """
     시나리오 ID로 데이터 조회 (캐싱)
@@ -121,18 +146,7 @@ def get_scenario_by_id(scenario_id: int) -> Dict[str, Any]:
     try:
         scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
         if scenario:
-            scenario_data = scenario.data
-
-            # [Fix] 중첩된 scenario 구조 처리
-            if 'scenario' in scenario_data and isinstance(scenario_data['scenario'], dict):
-                scenario_data = scenario_data['scenario']
-
-            # [Fix] 필수 키가 없으면 기본값 설정
-            if 'scenes' not in scenario_data:
-                scenario_data['scenes'] = []
-            if 'endings' not in scenario_data:
-                scenario_data['endings'] = []
-
+            scenario_data = _normalize_scenario_data(scenario.data)
             _scenario_cache[scenario_id] = scenario_data
             return scenario_data
         else:
@@ -149,6 +163,31 @@ def get_scenario_by_id(scenario_id: int) -> Dict[str, Any]:
 # [NEW] Cache Management
 # =============================================================================
 
+def preload_scenarios(limit: int) -> int:
+    """
+    추천/조회수 상위 공개 시나리오를 미리 캐시에 적재 (prefork 마스터에서 fork 전에 호출 -> 워커가 페이지 공유)
+
+    Returns:
+        적재한 시나리오 수
+    """
+    if limit <= 0:
+        return 0
+    from models import SessionLocal, Scenario
+
+    db = SessionLocal()
+    try:
+        rows = (db.query(Scenario.id, Scenario.data)
+                .filter(Scenario.is_public == True)  # noqa: E712
+                .order_by(Scenario.is_recommended.desc(), Scenario.view_count.desc(), Scenario.created_at.desc())
+                .limit(limit).all())
+        for scenario_id, data in rows:
+            if isinstance(data, dict):
+                _scenario_cache[scenario_id] = _normalize_scenario_data(data)
+        logger.info(f"📦 [CACHE] Preloaded {len(rows)} scenarios")
+        return len(rows)
+    finally:
+        db.close()
+
 def invalidate_scenario_cache(scenario_id: str):
     """
     시나리오 캐시 무효화 - 데이터 일관성 보장
@@ -156,6 +195,9 @@ def invalidate_scenario_cache(scenario_id: str):
     if scenario_id in _scenario_cache:
         del _scenario_cache[scenario_id]
         logger.info(f"🗑️ [CACHE] Scenario cache invalidated: {scenario_id}")
+    IntentIndexCache.invalidate(scenario_id)
+    EntryContentCache.invalidate(scenario_id)
+    PromptBuilder.invalidate(scenario_id)
 
 def refresh_scenario_cache(scenario_id: str):
     """
@@ -188,16 +230,18 @@ _llm_cache: Dict[str, Any] = {}
 _llm_streaming_cache: Dict[str, Any] = {}
 
 
-def get_cached_llm(api_key: str, model_name: str, streaming: bool = False):
-    """LLM 인스턴스 캐싱으로 재생성 비용 절감"""
+def get_cached_llm(api_key: str, model_name: str, streaming: bool = False,
+                   priority: int = LLMPriority.GAMEPLAY):
+    """LLM 인스턴스 캐싱으로 재생성 비용 절감 (기본 우선순위: 게임 플레이)"""
     cache = _llm_streaming_cache if streaming else _llm_cache
-    cache_key = f"{model_name}_{streaming}"
+    cache_key = f"{model_name}_{streaming}" if priority == LLMPriority.GAMEPLAY else f"{model_name}_{streaming}_{priority}"
 
     if cache_key not in cache:
         cache[cache_key] = LLMFactory.get_llm(
             api_key=api_key,
             model_name=model_name,
-            streaming=streaming
+            streaming=streaming,
+            priority=priority
         )
         logger.info(f"🔧 [LLM CACHE] Created new instance: {model_name} (streaming={streaming})")
 
@@ -353,6 +397,12 @@ def filter_negative_transitions(transitions: list, scenario: dict) -> list:
     return filtered if filtered else []  # 적합한 게 없으면 빈 리스트 반환
 
 
+def _available_transitions_block(curr_scene: Dict[str, Any], scenario: Dict[str, Any]) -> str:
+    """부정적 엔딩 경로를 뺀 선택지 목록 ("- 트리거" 줄 단위, 없으면 빈 문자열)"""
+    filtered_transitions = filter_negative_transitions(curr_scene.get('transitions', []), scenario)
+    return "\n".join([f"- {t.get('trigger', '')}" for t in filtered_transitions])
+
+
 # 서사적 내레이션 힌트 (관찰자 시점) - YAML에서 로드
 def get_narrative_hint_messages() -> List[str]:
     prompts = load_player_prompts()
@@ -393,14 +443,16 @@ def get_battle_stalemate_messages() -> List[str]:
     ])
 
 
-def get_npc_weakness_hint(scenario: Dict[str, Any], enemy_names: List[str]) -> str:
+def get_npc_weakness_hint(scenario: Dict[str, Any], enemy_names: List[str], seed: Optional[str] = None) -> str:
     """
     NPC 데이터에서 약점을 찾아 서사적 힌트로 변환
     절대 직접적으로 '약점을 써라'라고 하지 않고, 환경 묘사로 힌트 제공
+    - seed: 같은 턴 안에서 같은 문구를 고르도록 고정 (투기 실행 프롬프트와 최종 프롬프트 일치)
     """
     prompts = load_player_prompts()
     weakness_hints = prompts.get('weakness_hints', {})
     npcs = scenario.get('npcs', [])
+    rng = random.Random(seed) if seed is not None else random
 
     # 🔴 [CRITICAL] enemy_names 리스트 정규화: 딕셔너리면 name 필드 추출
     normalized_enemies = [e.get('name') if isinstance(e, dict) else e for e in enemy_names]
@@ -414,19 +466,19 @@ def get_npc_weakness_hint(scenario: Dict[str, Any], enemy_names: List[str]) -> s
 
                 if '소금' in weakness_lower or 'salt' in weakness_lower or '염' in weakness_lower:
                     hints = weakness_hints.get('salt', ["바닥에 쏟아진 짠물이 발밑에서 번들거립니다."])
-                    return random.choice(hints)
+                    return rng.choice(hints)
                 elif '빛' in weakness_lower or 'light' in weakness_lower:
                     hints = weakness_hints.get('light', ["천장의 조명이 깜빡이며 강렬한 빛을 내뿜습니다."])
-                    return random.choice(hints)
+                    return rng.choice(hints)
                 elif '불' in weakness_lower or 'fire' in weakness_lower or '화염' in weakness_lower:
                     hints = weakness_hints.get('fire', ["근처에 라이터가 떨어져 있습니다."])
-                    return random.choice(hints)
+                    return rng.choice(hints)
                 elif '물' in weakness_lower or 'water' in weakness_lower:
                     hints = weakness_hints.get('water', ["파열된 수도관에서 물이 뿜어져 나오고 있습니다."])
-                    return random.choice(hints)
+                    return rng.choice(hints)
                 elif '전기' in weakness_lower or 'electric' in weakness_lower:
                     hints = weakness_hints.get('electric', ["노출된 전선이 스파크를 일으키고 있습니다."])
-                    return random.choice(hints)
+                    return rng.choice(hints)
                 else:
                     default_hint = weakness_hints.get('default', "주변을 둘러보니, {weakness}과(와) 관련된 무언가가 눈에 들어옵니다.")
                     return default_hint.format(weakness=weakness)
@@ -457,23 +509,248 @@ def check_victory_condition(user_input: str, scenario: Dict[str, Any], curr_scen
                         return True
 
     # transition에 명시된 승리 trigger와 정확히 일치하는지 확인
-    for trans in transitions:
-        trigger = trans.get('trigger', '').lower()
+    triggers = [trans.get('trigger', '') for trans in transitions]
+    skip = []
+    for trans, trigger in zip(transitions, triggers):
         target = trans.get('target_scene_id', '').lower()
-
         # 긍정적 엔딩(승리)으로 가는 경로인지 확인
-        if 'victory' in target or 'win' in target or '승리' in trigger:
-            # 유사도가 매우 높을 때만 승리 인정 (0.8 이상)
-            norm_input = normalize_text(user_input)
-            norm_trigger = normalize_text(trigger)
-            similarity = difflib.SequenceMatcher(None, norm_input, norm_trigger).ratio()
-            if similarity >= 0.8:
-                return True
+        skip.append(not ('victory' in target or 'win' in target or '승리' in trigger.lower()))
+
+    if triggers and not all(skip):
+        # 유사도가 매우 높을 때만 승리 인정 (0.8 이상)
+        best_idx, _ = MatcherCache.get(triggers).best_ratio(
+            normalize_text(user_input), floors=[0.8] * len(triggers), skip=skip
+        )
+        if best_idx >= 0:
+            return True
 
     return False
 
 
+# 전투 씬 의도별 서사 (MODE 1) - config/prompt_player.yaml의 통합 전투 프롬프트(battle_action)에 행동 유형만 바꿔 사용
+# 투기 실행과 실제 스트리밍이 같은 문자열을 만들도록 공용화
+_INTENT_NARRATIVE_PROMPTS = {
+    'investigate': ('battle_action', '조사'),
+    'attack': ('battle_action', '공격'),
+    'defend': ('battle_action', '방어'),
+}
+
+_DEFAULT_WEAKNESS_HINT = "주변을 살펴보니 활용할 수 있는 것이 보입니다."
+
+# 투기 실행 대상 추정용 키워드 (분류 LLM의 결과를 미리 짐작하는 용도일 뿐, 판정에는 쓰지 않음)
+_SPECULATIVE_INTENT_KEYWORDS = {
+    'attack': ['공격', '베', '찌르', '때리', '쏜', '쏘', '휘두', '내려친', 'attack', 'hit', 'strike'],
+    'defend': ['방어', '막', '피하', '회피', '숨', 'defend', 'block', 'dodge'],
+    'investigate': ['조사', '살펴', '살핀', '둘러', '찾', '확인', '뒤지', '관찰', 'search', 'look', 'inspect'],
+}
+
+
+def weakness_hint_for_turn(scenario: Dict[str, Any], scenario_id: Any, scene_id: str, enemy_names: List[str],
+                           user_input: str) -> str:
+    """이번 턴의 약점 힌트 (시나리오/씬/입력으로 시드를 고정해 의도 분류 전후에 같은 문구 선택)"""
+    seed = f"{scenario_id}_{scene_id}_{user_input}"
+    return get_npc_weakness_hint(scenario, enemy_names, seed=seed) or _DEFAULT_WEAKNESS_HINT
+
+
+def build_intent_narrative_prompt(prompts: Dict[str, Any], intent: str, user_input: str, scene_title: str,
+                                  weakness_hint: str, player_status: str):
+    """
+    의도별 서사 프롬프트 생성 (전투 씬)
+    Returns:
+        (prompt_key, prompt_template, narrative_prompt) - 템플릿이 없으면 narrative_prompt는 ""
+    """
+    prompt_key, action_type = _INTENT_NARRATIVE_PROMPTS.get(intent, (None, None))
+    if not prompt_key:
+        return None, None, ""
+    prompt_template = prompts.get(prompt_key, '')
+    if not prompt_template:
+        return prompt_key, prompt_template, ""
+    narrative_prompt = PromptBuilder.compile(prompt_template).render(
+        user_input=user_input,
+        scene_title=scene_title,
+        action_type=action_type,
+        weakness_hint=weakness_hint,
+        player_status=player_status
+    )
+    return prompt_key, prompt_template, narrative_prompt
+
+
+def build_hint_mode_prompt(prompts: Dict[str, Any], scenario_id: Any, scenario: Dict[str, Any], curr_id: str,
+                           curr_scene: Dict[str, Any], user_input: str, player_status: str, stuck_level: int):
+    """
+    일반 씬 chat 서사 (hint_mode) 프롬프트 생성
+    Returns:
+        (prefix, suffix) - 템플릿이 없거나 이동 가능한 전이가 없으면 ("", "")
+    """
+    hint_mode_template = prompts.get('hint_mode', '')
+    if not hint_mode_template or not filter_negative_transitions(curr_scene.get('transitions', []), scenario):
+        return "", ""
+    # 씬 제목/트리거 힌트는 씬 단위로 미리 합쳐둔 템플릿 사용
+    scene_title = curr_scene.get('title', curr_scene.get('name', curr_id))
+    return PromptBuilder.for_scene(
+        scenario_id, scenario, curr_id, 'hint_mode', hint_mode_template,
+        lambda: {
+            'scene_title': scene_title,
+            'transitions_hints': _available_transitions_block(curr_scene, scenario),
+        }
+    ).render_split(
+        user_input=user_input,
+        player_status=player_status,
+        stuck_level=stuck_level
+    )
+
+
+def _speculation_matches(spec: SpeculativeStream, prompt_text: str) -> bool:
+    """미리 시작한 스트림이 최종 프롬프트와 같은 문자열로 보내졌는지 (프롬프트 캐시용 메시지 분할과 무관하게 비교)"""
+    return bool(prompt_text) and spec.meta.get('text', spec.prompt) == prompt_text
+
+
+def _guess_speculative_intent(user_input: str, curr_scene: Dict[str, Any], stuck_count: int) -> Optional[str]:
+    """
+    가장 유력한 의도 추정
+    - 전투 씬: 키워드로 investigate/attack/defend, 없으면 attack
+    - 일반 씬: 이미 막혀 있고(stuck) NPC가 없으며 행동 키워드도 없으면 chat (hint_mode 서사)
+      NPC가 있으면 npc_node가 대답하고 서사를 생략하므로 투기 실행 안 함
+    """
+    lowered = user_input.lower()
+    keyword_intent = next((intent for intent, keywords in _SPECULATIVE_INTENT_KEYWORDS.items()
+                           if any(k in lowered for k in keywords)), None)
+    if curr_scene.get('type', 'normal') == 'battle':
+        return keyword_intent or 'attack'
+    if keyword_intent or curr_scene.get('npcs') or stuck_count <= 0:
+        return None
+    return 'chat'
+
+
+def _start_speculative_narrative(state: PlayerState, scenario: Dict[str, Any], curr_scene: Dict[str, Any],
+                                 user_input: str):
+    """
+    의도 분류 LLM 호출과 동시에 유력한 서사 스트림을 미리 시작
+    - 결과 청크는 SpeculationRegistry에 보관, state에는 id만 기록
+    - 최종 프롬프트는 rule_node 이후 상태로 다시 만들어 비교하므로, 그 사이 상태가 바뀌면 취소됨
+    """
+    if not SPECULATIVE_NARRATIVE_ENABLED:
+        return
+
+    curr_id = state.get('current_scene_id', '')
+    stuck_count = state.get('stuck_count', 0)
+    intent = _guess_speculative_intent(user_input, curr_scene, stuck_count)
+    if not intent:
+        return
+
+    try:
+        api_key = os.getenv("OPENROUTER_API_KEY")
+        model_name = state.get('model', 'openai/tngtech/deepseek-r1t2-chimera:free')
+        prompts = load_player_prompts()
+        player_status = format_player_status(scenario, state.get('player_vars', {}))
+
+        if intent == 'chat':
+            # 씬 유지(전이 실패) 시 rule_node가 stuck_count를 1 올린 뒤 서사를 만듦
+            prompt_key = 'hint_mode'
+            prefix, suffix = build_hint_mode_prompt(
+                prompts, state.get('scenario_id'), scenario, curr_id, curr_scene, user_input,
+                player_status, stuck_count + 1
+            )
+            prompt_text = prefix + suffix
+            prompt = OpenRouterLLM.compose_prompt(model_name, prefix, suffix)
+        else:
+            scene_title = curr_scene.get('title', curr_scene.get('name', curr_id))
+            weakness_hint = weakness_hint_for_turn(
+                scenario, state.get('scenario_id'), curr_id, curr_scene.get('enemies', []), user_input
+            )
+            prompt_key, _, prompt_text = build_intent_narrative_prompt(
+                prompts, intent, user_input, scene_title, weakness_hint, player_status
+            )
+            prompt = prompt_text
+        if not prompt_text:
+            return
+
+        llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=True)
+        spec = SpeculativeStream(llm, prompt, intent, prompt_key, meta={'text': prompt_text}).start()
+        SpeculationRegistry.register(spec)
+        SpeculationStats.record_start()
+
+        if '_internal_flags' not in state or state['_internal_flags'] is None:
+            state['_internal_flags'] = {}
+        state['_internal_flags']['speculation_id'] = spec.id
+        logger.info(f"🔮 [SPECULATIVE] Started '{prompt_key}' narrative in parallel with intent classifier")
+    except Exception as e:
+        logger.warning(f"⚠️ [SPECULATIVE] Failed to start speculative narrative: {e}")
+
+
+def _settle_speculation(state: PlayerState):
+    """의도가 확정되면 빗나간 투기 스트림을 즉시 취소"""
+    flags = state.get('_internal_flags') or {}
+    spec_id = flags.get('speculation_id')
+    if not spec_id:
+        return
+    spec = SpeculationRegistry.get(spec_id)
+    if spec and spec.intent == state.get('parsed_intent'):
+        return
+    flags.pop('speculation_id', None)
+    spec = SpeculationRegistry.pop(spec_id)
+    if spec:
+        spec.cancel()
+        logger.info(f"🔮 [SPECULATIVE] Cancelled '{spec.prompt_key}' (intent: {state.get('parsed_intent')})")
+
+
+def _format_transitions_list(transitions: List[Dict[str, Any]], endings: Dict[str, Any]) -> str:
+    """intent_classifier용 transitions 목록 블록"""
+    transitions_list = ""
+    if transitions:
+        transitions_list += "📋 **[AVAILABLE ACTIONS - 이것들이 다음 장면으로 이동 가능한 정답입니다]**\n"
+        transitions_list += "다음 키워드들 중 하나와 유사한 입력이 들어오면 transition으로 분류하세요:\n\n"
+        for idx, trans in enumerate(transitions):
+            trigger = trans.get('trigger', '').strip()
+            target = trans.get('target_scene_id', '')
+
+            # [FIX] 엔딩/승리 트리거 명시적 강조 (LLM 인식률 향상)
+            label = ""
+            if target.startswith('ending') or target in endings or 'win' in target.lower() or 'victory' in target.lower():
+                label = " 🏁 [엔딩/승리 조건]"
+
+            transitions_list += f"  {idx}. 트리거: \"{trigger}\" → {target}{label}\n"
+        transitions_list += "\n⚠️ 유저 입력이 위 트리거와 70% 이상 의미적으로 유사하면 transition으로 분류하세요."
+    else:
+        transitions_list = "없음 (이동 불가)"
+    return transitions_list
+
+
+def _intent_relevant_facts(player_vars: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    의도 분류 결과에 영향을 주는 상태 (응답 캐시 키용)
+    - 인벤토리(아이템 사용 검증 규칙)와 문자열 상태 플래그만 포함, 매 턴 바뀌는 수치(hp, gold 등)는 제외
+    """
+    player_vars = player_vars or {}
+    inventory = player_vars.get('inventory') or []
+    return {
+        "inventory": sorted(str(item) for item in inventory) if isinstance(inventory, list) else [],
+        "flags": {k: v for k, v in sorted(player_vars.items()) if k != 'inventory' and isinstance(v, str)},
+    }
+
+
+def _intent_classifier_static(curr_scene: Dict[str, Any], endings: Dict[str, Any]) -> Dict[str, Any]:
+    """intent_classifier 템플릿의 씬 정적 값 (PromptBuilder 캐시 미스 시에만 계산)"""
+    # [FIX] npc_names와 enemy_names가 딕셔너리일 경우 안전하게 이름 추출
+    safe_npc_names = [n.get('name', str(n)) if isinstance(n, dict) else str(n) for n in curr_scene.get('npcs', [])]
+    safe_enemy_names = [e.get('name', str(e)) if isinstance(e, dict) else str(e) for e in curr_scene.get('enemies', [])]
+    return {
+        'scene_title': curr_scene.get('title', 'Untitled'),
+        'scene_type': curr_scene.get('type', 'normal'),
+        'npc_list': ', '.join(safe_npc_names) if safe_npc_names else '없음',
+        'enemy_list': ', '.join(safe_enemy_names) if safe_enemy_names else '없음',
+        'transitions_list': _format_transitions_list(curr_scene.get('transitions', []), endings),
+    }
+
+
 def intent_parser_node(state: PlayerState):
+    """의도 파싱 노드 (투기 실행된 서사 스트림이 있으면 의도 확정 후 정리)"""
+    state = _intent_parser(state)
+    _settle_speculation(state)
+    return state
+
+
+def _intent_parser(state: PlayerState):
     """
     [계층형 파서로 업그레이드]
     우선순위:
@@ -604,63 +881,62 @@ def intent_parser_node(state: PlayerState):
     logger.info(
         f"🎯 [HARDCODE FILTER END] No hardcode match found in scene '{curr_scene_id}', proceeding to LLM classifier")
 
+    # =============================================================================
+    # [작업 1.5] 로컬 TF-IDF 사전 분류 (확신이 높으면 LLM 호출 생략)
+    # =============================================================================
+    scenario = get_scenario_by_id(scenario_id)
+    local_result = classify_intent_locally(scenario_id, scenario, curr_scene, user_input)
+
     # =============================================================================
     # [작업 2] LLM을 통한 의도 분류 (2단계 API 호출)
     # =============================================================================
 
     try:
-        # transitions 목록을 문자열로 포맷팅
-        transitions_list = ""
-        if transitions:
-            transitions_list += "📋 **[AVAILABLE ACTIONS - 이것들이 다음 장면으로 이동 가능한 정답입니다]**\n"
-            transitions_list += "다음 키워드들 중 하나와 유사한 입력이 들어오면 transition으로 분류하세요:\n\n"
-            for idx, trans in enumerate(transitions):
-                trigger = trans.get('trigger', '').strip()
-                target = trans.get('target_scene_id', '')
-                
-                # [FIX] 엔딩/승리 트리거 명시적 강조 (LLM 인식률 향상)
-                label = ""
-                if target.startswith('ending') or target in endings or 'win' in target.lower() or 'victory' in target.lower():
-                     label = " 🏁 [엔딩/승리 조건]"
-                
-                transitions_list += f"  {idx}. 트리거: \"{trigger}\" → {target}{label}\n"
-            transitions_list += "\n⚠️ 유저 입력이 위 트리거와 70% 이상 의미적으로 유사하면 transition으로 분류하세요."
+        if local_result:
+            # LLM 응답과 같은 JSON 형태로 넘겨 아래 의도 처리 로직을 그대로 사용
+            response = json.dumps(local_result, ensure_ascii=False)
+            logger.info(f"⚡ [LOCAL INTENT] {local_result['intent']} resolved without LLM ({local_result['reasoning']})")
         else:
-            transitions_list = "없음 (이동 불가)"
-
-        # YAML에서 intent_classifier 프롬프트 로드
-        prompts = load_player_prompts()
-        intent_classifier_template = prompts.get('intent_classifier', '')
-
-        if not intent_classifier_template:
-            logger.warning("⚠️ intent_classifier prompt not found, falling back to fast-track")
-            return _fast_track_intent_parser(state, user_input, curr_scene, get_scenario_by_id(scenario_id), endings)
-
-        # 프롬프트 생성
-        scenario = get_scenario_by_id(scenario_id)
-        player_status = format_player_status(scenario, state.get('player_vars', {}))
-
-        # [FIX] npc_names와 enemy_names가 딕셔너리일 경우 안전하게 이름 추출
-        safe_npc_names = [n.get('name', str(n)) if isinstance(n, dict) else str(n) for n in npc_names]
-        safe_enemy_names = [e.get('name', str(e)) if isinstance(e, dict) else str(e) for e in enemy_names]
+            # YAML에서 intent_classifier 프롬프트 로드
+            prompts = load_player_prompts()
+            intent_classifier_template = prompts.get('intent_classifier', '')
+
+            if not intent_classifier_template:
+                logger.warning("⚠️ intent_classifier prompt not found, falling back to fast-track")
+                return _fast_track_intent_parser(state, user_input, curr_scene, get_scenario_by_id(scenario_id), endings)
+
+            # 프롬프트 생성 (씬 정적 조각은 캐시, 플레이어 상태/입력만 매 턴 삽입)
+            player_status = format_player_status(scenario, state.get('player_vars', {}))
+            intent_prefix, intent_suffix = PromptBuilder.for_scene(
+                scenario_id, scenario, curr_scene_id, 'intent_classifier', intent_classifier_template,
+                lambda: _intent_classifier_static(curr_scene, endings)
+            ).render_split(player_status=player_status, user_input=user_input)
+
+            # [RESPONSE CACHE] 같은 씬(규칙+정적 블록) + 같은 입력 + 같은 인벤토리/상태 플래그면 분류 결과 재사용
+            model_name = state.get('model', 'openai/tngtech/deepseek-r1t2-chimera:free')
+            cache_key = LLMResponseCache.make_key(
+                'intent_classifier', model_name, digest(intent_prefix), normalize_user_input(user_input),
+                _intent_relevant_facts(state.get('player_vars', {}))
+            )
+            response = LLMResponseCache.get('intent_classifier', cache_key)
 
-        intent_prompt = intent_classifier_template.format(
-            player_status=player_status,
-            scene_title=scene_title,
-            scene_type=scene_type,
-            npc_list=', '.join(safe_npc_names) if safe_npc_names else '없음',
-            enemy_list=', '.join(safe_enemy_names) if safe_enemy_names else '없음',
-            transitions_list=transitions_list,
-            user_input=user_input
-        )
+            if response is not None:
+                logger.info(f"⚡ [LLM CACHE] Intent classification reused for '{user_input}'")
+            else:
+                # [SPECULATIVE] 분류 결과를 기다리는 동안 유력한 서사 프롬프트를 미리 스트리밍
+                _start_speculative_narrative(state, scenario, curr_scene, user_input)
 
-        # LLM 호출 (non-streaming)
-        api_key = os.getenv("OPENROUTER_API_KEY")
-        model_name = state.get('model', 'openai/tngtech/deepseek-r1t2-chimera:free')
-        llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=False)
+                # LLM 호출 (non-streaming)
+                api_key = os.getenv("OPENROUTER_API_KEY")
+                llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=False)
 
-        # [TOKEN] invoke 호출 시 상위 context manager가 있으면 토큰이 추적됨
-        response = llm.invoke(intent_prompt).content.strip()
+                # [TOKEN] invoke 호출 시 상위 context manager가 있으면 토큰이 추적됨
+                # [PROMPT CACHE] 규칙 + 씬 정적 블록을 prefix로, 플레이어 상태/입력만 suffix로 전송
+                response = llm.invoke(
+                    OpenRouterLLM.compose_prompt(model_name, intent_prefix, intent_suffix)).content.strip()
+                # JSON이 포함된 정상 응답만 저장
+                if re.search(r'\{.*}', response, re.DOTALL):
+                    LLMResponseCache.put('intent_classifier', cache_key, response)
         logger.info(f"🤖 [INTENT CLASSIFIER] Raw response: {response}")
 
         # JSON 파싱 시도
@@ -811,15 +1087,18 @@ def _fast_track_intent_parser(state: PlayerState, user_input: str, curr_scene: D
             state['_internal_flags']['battle_attack'] = True
             return state
 
-    # Fast-Track 매칭
-    best_idx = -1
-    highest_ratio = 0.0
-    best_trigger_text = ""
+    # Fast-Track 매칭 (트리거 정규화/문자 빈도 행렬은 MatcherCache에서 재사용)
+    triggers = [trans.get('trigger', '').strip() for trans in transitions]
+    matcher = MatcherCache.get(triggers)
+    skip = []
+    floors = []
 
     for idx, trans in enumerate(transitions):
-        trigger = trans.get('trigger', '').strip()
+        trigger = triggers[idx]
+        skip.append(not trigger)
+        floors.append(0.4)
         if not trigger: continue
-        norm_trigger = normalize_text(trigger)
+        norm_trigger = matcher.normalized[idx]
         target = trans.get('target_scene_id', '').lower()
         is_ending_transition = target.startswith('ending') or target in endings
 
@@ -828,6 +1107,7 @@ def _fast_track_intent_parser(state: PlayerState, user_input: str, curr_scene: D
             if len(norm_input) >= 2:
                 if scene_type == 'battle' and is_ending_transition:
                     if not check_victory_condition(user_input, scenario, curr_scene):
+                        skip[idx] = True
                         continue
 
                 logger.info(f"⚡ [FAST-TRACK] Direct Match: '{user_input}' matched '{trigger}'")
@@ -835,17 +1115,13 @@ def _fast_track_intent_parser(state: PlayerState, user_input: str, curr_scene: D
                 state['parsed_intent'] = 'transition'
                 return state
 
-        # 유사도 계산
-        similarity = difflib.SequenceMatcher(None, norm_input, norm_trigger).ratio()
-
+        # 전투 씬 엔딩 트리거는 0.8 이상 유사해야 후보
         if scene_type == 'battle' and is_ending_transition:
-            if similarity < 0.8:
-                continue
+            floors[idx] = 0.8
 
-        if similarity > highest_ratio:
-            highest_ratio = similarity
-            best_idx = idx
-            best_trigger_text = trigger
+    # 유사도 계산 (상한값으로 가지치기 후 difflib 비율 - 0.4 미만은 어차피 '매칭 실패')
+    best_idx, highest_ratio = matcher.best_ratio(norm_input, floors=floors, skip=skip)
+    best_trigger_text = triggers[best_idx] if best_idx >= 0 else ""
 
     # 0.6 이상: 성공
     if highest_ratio >= 0.6:
@@ -1428,6 +1704,57 @@ def rule_node(state: PlayerState):
     return state
 
 
+# merged 모드에서 YAML 지시문이 없을 때 사용하는 기본 출력 형식
+_NPC_STRUCTURED_SUFFIX_DEFAULT = (
+    '**출력 형식 (JSON 객체 하나만 출력):**\n'
+    '{"dialogue": "NPC의 대사 (1-2문장)", "summary": "플레이어가 [NPC]에게 [행동/요청]했고, NPC는 [반응]함"}'
+)
+
+
+def _parse_npc_structured_response(raw: str):
+    """
+    merged 모드 응답 파싱
+    Returns:
+        (dialogue, summary) - JSON이 아니면 원문 전체를 대사로 보고 summary는 None
+    """
+    json_match = re.search(r'\{.*}', raw, re.DOTALL)
+    if json_match:
+        try:
+            parsed = json.loads(json_match.group(0))
+            dialogue = str(parsed.get('dialogue') or '').strip()
+            summary = str(parsed.get('summary') or '').strip() or None
+            if dialogue:
+                return dialogue, summary
+        except (ValueError, AttributeError):
+            pass
+
+    # 잘린 JSON 등: dialogue 필드만이라도 추출 (JSON 원문이 유저에게 노출되지 않도록)
+    dialogue_match = re.search(r'"dialogue"\s*:\s*"((?:[^"\\]|\\.)*)', raw)
+    if dialogue_match and dialogue_match.group(1).strip():
+        return _decode_json_fragment(dialogue_match.group(1)).strip(), None
+    return raw, None
+
+
+def _decode_json_fragment(fragment: str) -> str:
+    """JSON 문자열 내부 조각의 이스케이프(\\n, \\", \\\\, \\uXXXX) 해제 - 잘려서 끝난 이스케이프는 버리고 재시도"""
+    for candidate in (fragment, re.sub(r'\\(u[0-9a-fA-F]{0,3})?$', '', fragment)):
+        try:
+            return json.loads('"' + candidate + '"', strict=False)
+        except ValueError:
+            continue
+    return fragment.replace('\\"', '"').replace('\\n', '\n').replace('\\\\', '\\')
+
+
+def _npc_transitions_hints(curr_scene: Optional[Dict[str, Any]]) -> str:
+    """npc_dialogue용 트리거 힌트 (쉼표 구분)"""
+    transitions_list = []
+    if curr_scene:
+        for t in curr_scene.get('transitions', []):
+            trigger = t.get('trigger', '알 수 없음')
+            transitions_list.append(trigger)
+    return ", ".join(transitions_list) if transitions_list else "힌트 없음"
+
+
 def npc_node(state: PlayerState):
     """NPC 대화 (이동 아닐 때만 발동)"""
 
@@ -1880,16 +2207,9 @@ def npc_node(state: PlayerState):
             break
 
     history = state.get('history', [])
-    history_context = "\n".join(history[-3:]) if history else "대화 시작"
-
-    # [추가] 현재 장면의 transitions_hints와 stuck_level 추출
-    transitions_list = []
-    if curr_scene:
-        for t in curr_scene.get('transitions', []):
-            trigger = t.get('trigger', '알 수 없음')
-            transitions_list.append(trigger)
+    history_context = "\n".join(recent_history(history, 3, LLM_HISTORY_TOKEN_BUDGET)) if history else "대화 시작"
 
-    transitions_hints = ", ".join(transitions_list) if transitions_list else "힌트 없음"
+    # [추가] 현재 장면의 stuck_level 추출 (transitions_hints는 씬 정적 조각으로 캐시)
     stuck_level = state.get('stuck_count', 0)
 
     # YAML에서 프롬프트 로드
@@ -1897,28 +2217,39 @@ def npc_node(state: PlayerState):
     prompt_template = prompts.get('npc_dialogue', '')
 
     # ✅ WorldState 컨텍스트 추가
-    world_context = world_state.get_llm_context()
+    world_context = world_state.get_llm_context(scene=curr_scene, user_input=user_input)
 
     if prompt_template:
         scenario = get_scenario_by_id(scenario_id)
         player_status = format_player_status(scenario, state.get('player_vars', {}))
 
-        # [수정] WorldState 컨텍스트를 프롬프트에 포함
-        prompt = f"""{world_context}
+        # NPC 정보/트리거 힌트는 씬 단위로 미리 합쳐둔 템플릿 사용
+        npc_template = PromptBuilder.for_scene(
+            scenario_id, scenario, curr_id, f"npc_dialogue:{npc_info['name']}", prompt_template,
+            lambda: {
+                'npc_name': npc_info['name'],
+                'npc_role': npc_info['role'],
+                'npc_personality': npc_info['personality'],
+                'transitions_hints': _npc_transitions_hints(curr_scene),
+            }
+        )
 
-{prompt_template.format(
+        # [PROMPT CACHE] 규칙 + NPC 정보는 안정 prefix, WorldState/플레이어 상태/입력은 가변 suffix
+        prompt_prefix, dynamic_part = npc_template.render_split(
             player_status=player_status,
-            npc_name=npc_info['name'],
-            npc_role=npc_info['role'],
-            npc_personality=npc_info['personality'],
             history_context=history_context,
             user_input=user_input,
-            transitions_hints=transitions_hints,
             stuck_level=stuck_level
-        )}"""
+        )
+
+        # [수정] WorldState 컨텍스트를 프롬프트에 포함
+        prompt = f"""{world_context}
+
+{dynamic_part}"""
     else:
         # 폴백 프롬프트 (YAML 로드 실패 시)
         logger.warning("⚠️ Failed to load npc_dialogue from YAML, using fallback")
+        prompt_prefix = ""
         prompt = f"""{world_context}
 
 당신은 텍스트 RPG의 NPC입니다.
@@ -1926,11 +2257,20 @@ def npc_node(state: PlayerState):
 플레이어: "{user_input}"
 NPC로서 1-2문장으로 응답하세요."""
 
+    # [MERGED] 대사 + 서사 요약을 한 번의 호출로 생성 (요약 전용 호출 제거)
+    merged_mode = NPC_DIALOGUE_MODE == 'merged'
+    if merged_mode:
+        prompt += "\n\n" + prompts.get('npc_dialogue_structured_suffix', _NPC_STRUCTURED_SUFFIX_DEFAULT)
+
     try:
         api_key = os.getenv("OPENROUTER_API_KEY")
         model_name = state.get('model', 'openai/tngtech/deepseek-r1t2-chimera:free')
         llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=False)
-        response = llm.invoke(prompt).content.strip()
+        response = llm.invoke(OpenRouterLLM.compose_prompt(model_name, prompt_prefix, prompt)).content.strip()
+
+        merged_summary = None
+        if merged_mode:
+            response, merged_summary = _parse_npc_structured_response(response)
 
         # [추가] 응답 검증 - 사용자 입력을 그대로 반복하는 경우 LLM으로 재생성
         normalized_input = user_input.lower().replace(" ", "")
@@ -1947,13 +2287,19 @@ NPC로서 1-2문장으로 응답하세요."""
                     user_input=user_input
                 )
                 response = llm.invoke(fallback_prompt).content.strip()
+                merged_summary = None  # 폐기된 대사 기준 요약이므로 사용하지 않음
 
         state['npc_output'] = response
 
         # ✅ 작업 2: NPC 대화 서사 요약 및 기록 - LLM을 활용하여 대화 핵심 내용 요약
+        conversation_summary = None  # 비어 있으면 아래 템플릿 요약 사용
         try:
-            # 대화 요약 프롬프트 생성
-            summary_prompt = f"""다음 대화를 한 문장으로 간결하게 요약하세요:
+            if merged_mode:
+                # merged 모드: 같은 응답에 포함된 요약 사용, 없으면 추가 호출 없이 템플릿으로 대체
+                conversation_summary = merged_summary
+            else:
+                # 대화 요약 프롬프트 생성
+                summary_prompt = f"""다음 대화를 한 문장으로 간결하게 요약하세요:
 플레이어: "{user_input}"
 NPC ({target_npc_name}): "{response}"
 
@@ -1962,19 +2308,21 @@ NPC ({target_npc_name}): "{response}"
 
 요약:"""
 
-            summary_llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=False)
-            conversation_summary = summary_llm.invoke(summary_prompt).content.strip()
+                summary_llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=False)
+                conversation_summary = summary_llm.invoke(summary_prompt).content.strip()
 
+        except Exception as summary_error:
+            logger.warning(f"⚠️ Failed to generate conversation summary: {summary_error}")
+
+        if conversation_summary:
             # 요약이 너무 길면 잘라내기
             if len(conversation_summary) > 100:
                 conversation_summary = conversation_summary[:97] + "..."
 
             world_state.add_narrative_event(conversation_summary)
             logger.info(f"📖 [NPC DIALOGUE] Summary added to narrative: {conversation_summary}")
-
-        except Exception as summary_error:
-            # 요약 실패 시 간단한 템플릿 사용
-            logger.warning(f"⚠️ Failed to generate conversation summary: {summary_error}")
+        else:
+            # 요약 실패/누락 시 간단한 템플릿 사용
             fallback_summary = f"플레이어가 '{target_npc_name}'와 대화함 (주제: {user_input[:20]}...)"
             world_state.add_narrative_event(fallback_summary)
 
@@ -2039,41 +2387,147 @@ NPC ({target_npc_name}): "{response}"
     return state
 
 
-def check_npc_appearance(state: PlayerState) -> str:
-    """NPC 및 적 등장 (LLM 기반 생성)"""
-    scenario_id = state['scenario_id']
-    curr_id = state['current_scene_id']
+# 등장 메시지 동시 생성 설정 (씬 진입 시 NPC/적 수만큼 LLM 호출이 발생)
+APPEARANCE_MAX_CONCURRENCY = 4  # 호출(씬 진입) 하나가 동시에 실행하는 최대 항목 수
+APPEARANCE_ITEM_TIMEOUT = 8.0  # 항목별 최대 실행 시간(초, 실행 시작 기준) - 초과 항목은 정적 문구 사용
+APPEARANCE_QUEUE_TIMEOUT = 4.0  # 이 시간(초, 호출 기준) 안에 실행을 시작하지 못한 항목은 정적 문구 사용
+# 플레이어 공용 풀 - 제한 시간을 넘겨 버려진 호출도 끝날 때까지 스레드를 잡으므로 호출당 동시 실행 수보다 넉넉하게
+_appearance_executor = ThreadPoolExecutor(max_workers=APPEARANCE_MAX_CONCURRENCY * 4,
+                                          thread_name_prefix="appearance")
 
-    # 씬 변경 없으면 등장 메시지 생략
-    if state.get('previous_scene_id') == curr_id:
-        return ""
+# 변형 풀 미리 채우기 전용 (플레이 중인 진입 요청과 스레드를 나누지 않고, 적은 동시 실행으로 천천히)
+ENTRY_PREWARM_CONCURRENCY = 2
+ENTRY_PREWARM_ITEM_TIMEOUT = 60.0
+_prewarm_executor = ThreadPoolExecutor(max_workers=ENTRY_PREWARM_CONCURRENCY, thread_name_prefix="entry-prewarm")
 
-    scenario = get_scenario_by_id(scenario_id)
-    all_scenes = {s['scene_id']: s for s in scenario['scenes']}
-    curr_scene = all_scenes.get(curr_id)
-    if not curr_scene: return ""
 
+def _invoke_concurrently(llm, prompts: List[str], timeout: float = APPEARANCE_ITEM_TIMEOUT,
+                         executor: Optional[ThreadPoolExecutor] = None,
+                         max_concurrency: int = APPEARANCE_MAX_CONCURRENCY,
+                         queue_timeout: Optional[float] = APPEARANCE_QUEUE_TIMEOUT,
+                         on_late=None) -> List[Any]:
+    """
+    여러 프롬프트를 동시에 invoke (이 호출에서는 최대 max_concurrency개씩만 제출)
+    - 항목별 제한 시간은 실제 실행이 시작된 시점부터 계산 (풀 대기 시간은 queue_timeout으로 따로 제한)
+    - 제한 시간을 넘긴 항목은 기다리지 않고, 나중에 끝나면 on_late(index, 응답)으로 전달 (캐시 적재용)
+    Returns:
+        입력 순서대로 응답 문자열 또는 Exception (타임아웃 포함)
+    """
+    if not prompts:
+        return []
+    executor = executor or _appearance_executor
+    called_at = time.monotonic()
+    queue_deadline = called_at + queue_timeout if queue_timeout is not None else None
+    started_at: Dict[int, float] = {}
+
+    def run(i: int) -> str:
+        started_at[i] = time.monotonic()
+        return llm.invoke(prompts[i]).content.strip()
+
+    def deliver_late(i: int, future: Future):
+        if on_late and not future.cancelled() and future.exception() is None:
+            on_late(i, future.result())
+
+    results: List[Any] = [None] * len(prompts)
+    waiting = list(range(len(prompts)))
+    running: Dict[Future, int] = {}
+    while waiting or running:
+        now = time.monotonic()
+        if queue_deadline is not None and now >= queue_deadline:
+            for i in waiting:
+                results[i] = TimeoutError(f"appearance generation not started within {queue_timeout}s")
+            waiting = []
+        while waiting and len(running) < max_concurrency:
+            i = waiting.pop(0)
+            running[executor.submit(run, i)] = i
+        if not running:
+            break
+
+        # 가장 먼저 오는 마감: 실행 중이면 시작 + timeout, 아직 풀에서 대기 중이면 queue_deadline
+        deadlines = [started_at[i] + timeout if i in started_at else queue_deadline for i in running.values()]
+        deadlines = [d for d in deadlines if d is not None]
+        wait_for = max(min(deadlines) - now, 0) if deadlines else None
+        done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+        for future in done:
+            i = running.pop(future)
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                results[i] = e
+
+        now = time.monotonic()
+        for future, i in list(running.items()):
+            if i in started_at:
+                if now >= started_at[i] + timeout:
+                    # 실행 중인 LLM 호출은 멈출 수 없으므로 결과만 포기 (끝나면 on_late로 재활용)
+                    running.pop(future)
+                    results[i] = TimeoutError(f"appearance generation exceeded {timeout}s")
+                    future.add_done_callback(lambda f, i=i: deliver_late(i, f))
+            elif queue_deadline is not None and now >= queue_deadline and future.cancel():
+                running.pop(future)
+                results[i] = TimeoutError(f"appearance generation not started within {queue_timeout}s")
+    return results
+
+
+def _battle_alert_html(message: str) -> str:
+    return f"""
+                <div class='battle-alert text-red-400 font-bold my-3 p-3 bg-red-900/30 rounded border-2 border-red-500 animate-pulse'>
+                    ⚔️ {message}
+                </div>
+                """
+
+
+def _npc_intro_html(npc_name: str, image_url: str, action: Optional[str]) -> str:
+    # action이 없으면 정적 문구
+    body = (f'<span class="text-green-300 italic">👀 {action}</span>' if action else
+            f"""<div class="text-green-300 italic">
+                        👀 <span class='font-bold'>{npc_name}</span>이(가) 당신을 바라봅니다.
+                    </div>""")
+    return f"""
+                <div class='npc-intro flex items-center gap-3 my-2 p-3 bg-green-900/20 rounded border-l-2 border-green-500'>
+                    <div class="relative w-12 h-12 flex-shrink-0">
+                        <img src="{image_url}" class="w-12 h-12 rounded-full border-2 border-green-500 shadow-green-500/50 object-cover block" alt="{npc_name}">
+                    </div>
+                    {body}
+                </div>
+                """
+
+
+def _enemy_intro_html(enemy_name: str, image_url: str, action: Optional[str]) -> str:
+    body = (f'<span class="text-red-400 font-bold">⚔️ {action}</span>' if action else
+            f"""<div class="text-red-400 font-bold">
+                        ⚔️ <span class='font-bold'>{enemy_name}</span>이(가) 나타났습니다!
+                    </div>""")
+    return f"""
+                <div class='enemy-intro flex items-center gap-3 my-2 p-3 bg-red-900/30 rounded border-l-2 border-red-500'>
+                    <div class="relative w-12 h-12 flex-shrink-0">
+                        <img src="{image_url}" class="w-12 h-12 rounded-full border-2 border-red-500 shadow-red-500/50 object-cover block" alt="{enemy_name}">
+                    </div>
+                    {body}
+                </div>
+                """
+
+
+def _collect_entry_items(scenario_id: str, scenario: Dict[str, Any], curr_scene: Dict[str, Any],
+                         prompts: Dict[str, Any]) -> List[tuple]:
+    """
+    씬 진입 문구 항목 수집 (전투 알림 -> NPC -> 적 순서)
+    Returns:
+        [(kind, 캐시 키 또는 None, 프롬프트 또는 None, 응답 -> HTML 렌더러), ...]
+    """
+    curr_id = curr_scene.get('scene_id', '')
     # [FIX] NPC와 적을 모두 처리
     # 🔴 [CRITICAL] 단순히 이름만 추출하면 이미지 정보를 잃게 됨 -> 원본 객체 유지
     npc_names = curr_scene.get('npcs', [])
-    # npc_names = [n.get('name') if isinstance(n, dict) else n for n in raw_npcs] # <-- 이 줄이 원인임 (삭제)
     enemy_names = curr_scene.get('enemies', [])
     scene_type = curr_scene.get('type', 'normal')
     scene_title = curr_scene.get('title', 'Untitled')
 
-    if not npc_names and not enemy_names: return ""
-
-    scene_history_key = f"npc_appeared_{curr_id}"
-    player_vars = state.get('player_vars', {})
-    if player_vars.get(scene_history_key): return ""
-
-    state['player_vars'][scene_history_key] = True
-    introductions = []
+    items = []
 
-    # YAML에서 프롬프트 로드
-    prompts = load_player_prompts()
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    model_name = state.get('model', 'openai/tngtech/deepseek-r1t2-chimera:free')
+    def _add(kind, name, prompt, render):
+        key = make_entry_key(scenario_id, curr_id, kind, name, prompt) if prompt else None
+        items.append((kind, key, prompt, render))
 
     # [FIX] 장면 유형에 따른 메시지 - LLM으로 생성
     if scene_type == 'battle':
@@ -2083,152 +2537,184 @@ def check_npc_appearance(state: PlayerState) -> str:
                 scene_title=scene_title,
                 enemy_names=', '.join(enemy_names) if enemy_names else '알 수 없는 적'
             )
-            try:
-                llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=False)
-                battle_msg = llm.invoke(battle_start_prompt).content.strip()
-                introductions.append(f"""
-                <div class='battle-alert text-red-400 font-bold my-3 p-3 bg-red-900/30 rounded border-2 border-red-500 animate-pulse'>
-                    ⚔️ {battle_msg}
-                </div>
-                """)
-            except Exception as e:
-                logger.error(f"Battle start message generation error: {e}")
-                introductions.append("""
-                <div class='battle-alert text-red-400 font-bold my-3 p-3 bg-red-900/30 rounded border-2 border-red-500 animate-pulse'>
-                    ⚔️ 전투가 시작됩니다!
-                </div>
-                """)
+            _add("battle_start", "", battle_start_prompt,
+                 lambda msg: _battle_alert_html(msg or "전투가 시작됩니다!"))
 
     # NPC 등장 - LLM으로 생성
-    if npc_names:
-        npc_appearance_template = prompts.get('npc_appearance', '')
-        for npc_data in npc_names:
-            # 🔴 [CRITICAL] NPC 데이터 정규화 및 이미지 추출
-            if isinstance(npc_data, dict):
-                real_npc_name = npc_data.get('name', 'Unknown NPC')
-                if 'image' in npc_data and npc_data['image']:
-                    # [FIX] 내부 URL 치환을 위해 get_minio_url 호출
-                    minio_npc_url = get_minio_url('npcs', npc_data['image'])
-                else:
-                    minio_npc_url = get_minio_url('npcs', real_npc_name)
+    npc_appearance_template = prompts.get('npc_appearance', '')
+    for npc_data in npc_names:
+        # 🔴 [CRITICAL] NPC 데이터 정규화 및 이미지 추출
+        if isinstance(npc_data, dict):
+            real_npc_name = npc_data.get('name', 'Unknown NPC')
+            if 'image' in npc_data and npc_data['image']:
+                # [FIX] 내부 URL 치환을 위해 get_minio_url 호출
+                minio_npc_url = get_minio_url('npcs', npc_data['image'])
             else:
-                real_npc_name = str(npc_data)
                 minio_npc_url = get_minio_url('npcs', real_npc_name)
+        else:
+            real_npc_name = str(npc_data)
+            minio_npc_url = get_minio_url('npcs', real_npc_name)
 
+        npc_prompt = None
+        if npc_appearance_template:
             # NPC 역할 찾기
             npc_role = "Unknown"
-            for npc in get_scenario_by_id(scenario_id).get('npcs', []):
+            for npc in scenario.get('npcs', []):
                 if npc.get('name') == real_npc_name:
                     npc_role = npc.get('role', 'Unknown')
                     break
-
-            if npc_appearance_template:
-                npc_prompt = npc_appearance_template.format(
-                    scene_title=scene_title,
-                    npc_name=real_npc_name,
-                    npc_role=npc_role
-                )
-                try:
-                    llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=False)
-                    npc_action = llm.invoke(npc_prompt).content.strip()
-                    intro_html = f"""
-                    <div class='npc-intro flex items-center gap-3 my-2 p-3 bg-green-900/20 rounded border-l-2 border-green-500'>
-                        <div class="relative w-12 h-12 flex-shrink-0">
-                            <img src="{minio_npc_url}" class="w-12 h-12 rounded-full border-2 border-green-500 shadow-green-500/50 object-cover block" alt="{real_npc_name}">
-                        </div>
-                        <span class="text-green-300 italic">👀 {npc_action}</span>
-                    </div>
-                    """
-                    introductions.append(intro_html)
-                except Exception as e:
-                    logger.error(f"NPC appearance generation error: {e}")
-                    intro_html = f"""
-                    <div class='npc-intro flex items-center gap-3 my-2 p-3 bg-green-900/20 rounded border-l-2 border-green-500'>
-                        <div class="relative w-12 h-12 flex-shrink-0">
-                            <img src="{minio_npc_url}" class="w-12 h-12 rounded-full border-2 border-green-500 shadow-green-500/50 object-cover block" alt="{real_npc_name}">
-                        </div>
-                        <div class="text-green-300 italic">
-                            👀 <span class='font-bold'>{real_npc_name}</span>이(가) 당신을 바라봅니다.
-                        </div>
-                    </div>
-                    """
-                    introductions.append(intro_html)
-            else:
-                intro_html = f"""
-                <div class='npc-intro flex items-center gap-3 my-2 p-3 bg-green-900/20 rounded border-l-2 border-green-500'>
-                    <div class="relative w-12 h-12 flex-shrink-0">
-                        <img src="{minio_npc_url}" class="w-12 h-12 rounded-full border-2 border-green-500 shadow-green-500/50 object-cover block" alt="{real_npc_name}">
-                    </div>
-                    <div class="text-green-300 italic">
-                        👀 <span class='font-bold'>{real_npc_name}</span>이(가) 당신을 바라봅니다.
-                    </div>
-                </div>
-                """
-                introductions.append(intro_html)
+            npc_prompt = npc_appearance_template.format(
+                scene_title=scene_title,
+                npc_name=real_npc_name,
+                npc_role=npc_role
+            )
+        _add("npc_appearance", real_npc_name, npc_prompt,
+             lambda action, n=real_npc_name, u=minio_npc_url: _npc_intro_html(n, u, action))
 
     # [FIX] 적 등장 처리 - LLM으로 생성
-    if enemy_names:
-        enemy_appearance_template = prompts.get('enemy_appearance', '')
-        for enemy_data in enemy_names:
-            # 🔴 [CRITICAL] enemy_data가 딕셔너리인지 문자열인지 확인하여 정규화
-            if isinstance(enemy_data, dict):
-                real_enemy_name = enemy_data.get('name', 'Unknown Enemy')
-                # 딕셔너리에 image 필드가 있으면 우선 사용, 없으면 MinIO 생성
-                if 'image' in enemy_data and enemy_data['image']:
-                    # [FIX] 내부 URL 치환을 위해 get_minio_url 호출
-                    minio_enemy_url = get_minio_url('enemies', enemy_data['image'])
-                else:
-                    minio_enemy_url = get_minio_url('enemies', real_enemy_name)
+    enemy_appearance_template = prompts.get('enemy_appearance', '')
+    for enemy_data in enemy_names:
+        # 🔴 [CRITICAL] enemy_data가 딕셔너리인지 문자열인지 확인하여 정규화
+        if isinstance(enemy_data, dict):
+            real_enemy_name = enemy_data.get('name', 'Unknown Enemy')
+            # 딕셔너리에 image 필드가 있으면 우선 사용, 없으면 MinIO 생성
+            if 'image' in enemy_data and enemy_data['image']:
+                # [FIX] 내부 URL 치환을 위해 get_minio_url 호출
+                minio_enemy_url = get_minio_url('enemies', enemy_data['image'])
             else:
-                real_enemy_name = str(enemy_data)
                 minio_enemy_url = get_minio_url('enemies', real_enemy_name)
+        else:
+            real_enemy_name = str(enemy_data)
+            minio_enemy_url = get_minio_url('enemies', real_enemy_name)
 
-            if enemy_appearance_template:
-                enemy_prompt = enemy_appearance_template.format(
-                    scene_title=scene_title,
-                    enemy_name=real_enemy_name
-                )
-                try:
-                    llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=False)
-                    enemy_action = llm.invoke(enemy_prompt).content.strip()
-                    intro_html = f"""
-                    <div class='enemy-intro flex items-center gap-3 my-2 p-3 bg-red-900/30 rounded border-l-2 border-red-500'>
-                        <div class="relative w-12 h-12 flex-shrink-0">
-                            <img src="{minio_enemy_url}" class="w-12 h-12 rounded-full border-2 border-red-500 shadow-red-500/50 object-cover block" alt="{real_enemy_name}">
-                        </div>
-                        <span class="text-red-400 font-bold">⚔️ {enemy_action}</span>
-                    </div>
-                    """
-                    introductions.append(intro_html)
-                except Exception as e:
-                    logger.error(f"Enemy appearance generation error: {e}")
-                    intro_html = f"""
-                    <div class='enemy-intro flex items-center gap-3 my-2 p-3 bg-red-900/30 rounded border-l-2 border-red-500'>
-                        <div class="relative w-12 h-12 flex-shrink-0">
-                            <img src="{minio_enemy_url}" class="w-12 h-12 rounded-full border-2 border-red-500 shadow-red-500/50 object-cover block" alt="{real_enemy_name}">
-                        </div>
-                        <div class="text-red-400 font-bold">
-                            ⚔️ <span class='font-bold'>{real_enemy_name}</span>이(가) 나타났습니다!
-                        </div>
-                    </div>
-                    """
-                    introductions.append(intro_html)
-            else:
-                intro_html = f"""
-                <div class='enemy-intro flex items-center gap-3 my-2 p-3 bg-red-900/30 rounded border-l-2 border-red-500'>
-                    <div class="relative w-12 h-12 flex-shrink-0">
-                        <img src="{minio_enemy_url}" class="w-12 h-12 rounded-full border-2 border-red-500 shadow-red-500/50 object-cover block" alt="{real_enemy_name}">
-                    </div>
-                    <div class="text-red-400 font-bold">
-                        ⚔️ <span class='font-bold'>{real_enemy_name}</span>이(가) 나타났습니다!
-                    </div>
-                </div>
-                """
-                introductions.append(intro_html)
+        enemy_prompt = None
+        if enemy_appearance_template:
+            enemy_prompt = enemy_appearance_template.format(
+                scene_title=scene_title,
+                enemy_name=real_enemy_name
+            )
+        _add("enemy_appearance", real_enemy_name, enemy_prompt,
+             lambda action, n=real_enemy_name, u=minio_enemy_url: _enemy_intro_html(n, u, action))
+
+    return items
+
+
+def check_npc_appearance(state: PlayerState) -> str:
+    """
+    NPC 및 적 등장 (LLM 기반 생성)
+    - 변형 풀(EntryContentCache)이 가득 찬 항목은 LLM 호출 없이 무작위 선택
+    - 나머지 battle_start / npc_appearance / enemy_appearance 호출은 한 번에 동시 실행하고 풀에 적재
+    - 결과는 원래 순서(전투 알림 -> NPC -> 적)대로 조립, 실패/타임아웃 항목은 정적 문구
+    """
+    scenario_id = state['scenario_id']
+    curr_id = state['current_scene_id']
+
+    # 씬 변경 없으면 등장 메시지 생략
+    if state.get('previous_scene_id') == curr_id:
+        return ""
+
+    scenario = get_scenario_by_id(scenario_id)
+    all_scenes = {s['scene_id']: s for s in scenario['scenes']}
+    curr_scene = all_scenes.get(curr_id)
+    if not curr_scene: return ""
+
+    if not curr_scene.get('npcs') and not curr_scene.get('enemies'): return ""
+
+    scene_history_key = f"npc_appeared_{curr_id}"
+    player_vars = state.get('player_vars', {})
+    if player_vars.get(scene_history_key): return ""
+
+    state['player_vars'][scene_history_key] = True
+
+    # YAML에서 프롬프트 로드
+    prompts = load_player_prompts()
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    model_name = state.get('model', 'openai/tngtech/deepseek-r1t2-chimera:free')
+
+    # 1) 항목 수집
+    items = _collect_entry_items(scenario_id, scenario, curr_scene, prompts)
+
+    # 2) 캐시된 변형 우선 사용, 나머지만 LLM으로 동시 실행 (순서 유지)
+    responses: Dict[int, Any] = {}
+    pending = []
+    for idx, (_, key, prompt, _) in enumerate(items):
+        if not prompt:
+            continue
+        cached = EntryContentCache.pick(key)
+        if cached is not None:
+            responses[idx] = cached
+        else:
+            pending.append(idx)
+
+    if pending:
+        llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=False)
+        # 제한 시간을 넘긴 항목도 끝나면 변형 풀에 적재 (이번 진입은 정적 문구, 다음 진입부터 사용)
+        late = lambda j, text: EntryContentCache.add(items[pending[j]][1], text)
+        for idx, result in zip(pending, _invoke_concurrently(llm, [items[i][2] for i in pending], on_late=late)):
+            responses[idx] = result
+            if not isinstance(result, Exception):
+                EntryContentCache.add(items[idx][1], result)
+    elif responses:
+        logger.info(f"♻️ [ENTRY CACHE] Scene '{curr_id}' entry served from cache ({len(responses)} items)")
+
+    # 3) 원래 순서대로 조립 (실패/타임아웃은 정적 문구)
+    introductions = []
+    for idx, (kind, _, _, render) in enumerate(items):
+        result = responses.get(idx)
+        if isinstance(result, Exception):
+            logger.error(f"{kind} generation error: {result}")
+            result = None
+        introductions.append(render(result))
 
     return "\n".join(introductions)
 
 
+def prewarm_entry_content(scenario_id: str, model_name: Optional[str] = None) -> int:
+    """
+    시나리오의 모든 씬 진입 문구 변형 풀을 미리 채움 (공개/최종 반영 시 백그라운드 실행)
+    Returns:
+        새로 생성한 변형 수
+    """
+    prompts = load_player_prompts()
+    if not any(prompts.get(k) for k in ('battle_start', 'npc_appearance', 'enemy_appearance')):
+        # 기본 config/prompt_player.yaml에는 이 템플릿들이 없음 (진입 문구는 정적 문구) -> 미리 생성할 것 없음
+        logger.debug(f"[ENTRY CACHE] No entry templates in prompt_player.yaml, prewarm skipped for {scenario_id}")
+        return 0
+
+    scenario = get_scenario_by_id(scenario_id)
+    if not scenario:
+        return 0
+
+    jobs = []  # (캐시 키, 프롬프트)
+    for scene in scenario.get('scenes', []):
+        if not scene.get('npcs') and not scene.get('enemies'):
+            continue
+        for _, key, prompt, _ in _collect_entry_items(scenario_id, scenario, scene, prompts):
+            if prompt:
+                jobs.extend((key, prompt) for _ in range(EntryContentCache.missing(key)))
+    if not jobs:
+        return 0
+
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    # 백그라운드 작업이므로 빌더 우선순위 (플레이 중인 요청에 밀림)
+    llm = get_cached_llm(api_key=api_key, model_name=model_name or 'openai/tngtech/deepseek-r1t2-chimera:free',
+                         streaming=False, priority=LLMPriority.BUILDER)
+
+    generated = 0
+    results = _invoke_concurrently(llm, [p for _, p in jobs], timeout=ENTRY_PREWARM_ITEM_TIMEOUT,
+                                   executor=_prewarm_executor, max_concurrency=ENTRY_PREWARM_CONCURRENCY,
+                                   queue_timeout=None)
+    for (key, _), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            logger.warning(f"⚠️ [ENTRY CACHE] Prewarm item failed: {result}")
+            continue
+        EntryContentCache.add(key, result)
+        generated += 1
+
+    logger.info(f"✅ [ENTRY CACHE] Prewarmed scenario {scenario_id}: {generated}/{len(jobs)} variants")
+    return generated
+
+
 def narrator_node(state: PlayerState):
     """내레이터 - GM 나레이션 (최종 출력 생성)"""
 
@@ -2372,17 +2858,34 @@ def get_narrative_fallback_message(scenario: Dict[str, Any]) -> str:
     return fallback_messages.get('default', "")
 
 
-def _stream_and_track(llm, prompt, user_id, model_name):
+def _stream_and_track(llm, prompt, user_id, model_name, stream=None):
     """
     LLM 스트리밍 및 토큰 과금 헬퍼
+    - prompt: 프롬프트 또는 모델명 -> 프롬프트 함수 (예비 모델로 헤지될 때 모델별로 다시 구성)
+    - stream: 이미 시작된 청크 이터레이터 (투기 실행 스트림 재사용 시)
+    - 새 스트림은 ModelRouter를 거침 (첫 토큰 지연/실패 시 같은 가격대 이하 예비 모델로 헤지)
+    - 과금은 예비 모델이 응답해도 유저가 고른 모델(model_name) 기준
     """
     prompt_tokens = 0
     completion_tokens = 0
+    cached_tokens = 0
     total_cost = 0
 
+    if stream is not None:
+        routed = ((model_name, chunk) for chunk in stream)
+    else:
+        prompt_for = prompt if callable(prompt) else (lambda _model: prompt)
+        api_key = os.getenv("OPENROUTER_API_KEY")
+        requested_model = model_name
+        routed = ModelRouter.stream(
+            requested_model, prompt_for,
+            lambda m: llm if m == requested_model else get_cached_llm(api_key=api_key, model_name=m, streaming=True)
+        )
+
     # stream
     content_chunks = []
-    for chunk in llm.stream(prompt):
+    served_model = model_name
+    for served_model, chunk in routed:
         if chunk.content:
             content_chunk = chunk.content
             content_chunks.append(content_chunk)
@@ -2393,22 +2896,29 @@ def _stream_and_track(llm, prompt, user_id, model_name):
             # Usually the last chunk has the total
             prompt_tokens = chunk.usage_metadata.get('input_tokens', 0)
             completion_tokens = chunk.usage_metadata.get('output_tokens', 0)
+            # [PROMPT CACHE] 프로바이더 prefix 캐시 적중 토큰 (prompt_tokens_details.cached_tokens)
+            cached_tokens = (chunk.usage_metadata.get('input_token_details') or {}).get('cache_read', 0) or 0
 
     # Billing
     if user_id and (prompt_tokens > 0 or completion_tokens > 0):
         try:
-            cost = UserService.calculate_llm_cost(model_name, prompt_tokens, completion_tokens)
+            cost = UserService.calculate_llm_cost(model_name, prompt_tokens, completion_tokens, cached_tokens)
             total_cost = cost
-            UserService.deduct_tokens(user_id, cost, "narrative_stream", model_name, prompt_tokens + completion_tokens)
+            # [BILLING] 메모리 원장에 차감 (TokenLog는 백그라운드에서 배치 기록 - 스트림을 막지 않음)
+            BillingService.charge(user_id, cost, "narrative_stream", model_name, prompt_tokens + completion_tokens)
+            TokenUsageStats.record_cached(model_name, "narrative_stream", cached_tokens)
             
             # [NEW] 토큰 소모 정보 로깅
-            logger.info(f"[GAME TOKEN] User: {user_id}, Model: {model_name}, Cost: {cost} CR, Tokens: {prompt_tokens + completion_tokens}")
+            served = f" (served by {served_model})" if served_model != model_name else ""
+            logger.info(f"[GAME TOKEN] User: {user_id}, Model: {model_name}{served}, Cost: {cost} CR, "
+                        f"Tokens: {prompt_tokens + completion_tokens} (cached input: {cached_tokens})")
         except Exception as e:
             logger.error(f"Billing error in stream: {e}")
     
     # [NEW] 토큰 소모 정보 반환 (프론트에서 표시용)
     token_info = {
         "tokens_used": prompt_tokens + completion_tokens,
+        "cached_tokens": cached_tokens,
         "cost": total_cost,
         "model": model_name
     }
@@ -2440,6 +2950,12 @@ def scene_stream_generator(state: PlayerState, retry_count: int = 0, max_retries
     all_scenes = {s['scene_id']: s for s in scenario['scenes']}
     all_endings = {e['ending_id']: e for e in scenario.get('endings', [])}
 
+    # [SPECULATIVE] 의도 분류 중 미리 시작된 서사 스트림 회수 (MODE 1 동일 의도일 때만 사용)
+    speculative = SpeculationRegistry.pop((state.get('_internal_flags') or {}).pop('speculation_id', None))
+    if speculative and not (prev_id == curr_id and user_input and parsed_intent == speculative.intent):
+        speculative.cancel()
+        speculative = None
+
     # WorldState 인스턴스 가져오기
     world_state = WorldState()
     if 'world_state' in state and state['world_state']:
@@ -2520,45 +3036,19 @@ def scene_stream_generator(state: PlayerState, retry_count: int = 0, max_retries
     # =============================================================================
     if prev_id == curr_id and user_input:
         prompts = load_player_prompts()
-        weakness_hint = get_npc_weakness_hint(scenario, enemy_names) or "주변을 살펴보니 활용할 수 있는 것이 보입니다."
+        weakness_hint = weakness_hint_for_turn(scenario, scenario_id, curr_id, enemy_names, user_input)
 
         # [2단계] parsed_intent에 따라 전용 프롬프트 선택
         prompt_template = None
         prompt_key = None
         narrative_prompt = ""  # 초기화
 
-        if parsed_intent == 'investigate':
-            # 조사/탐색 행동
-            prompt_key = 'battle_investigation' if scene_type == 'battle' else 'battle_investigation'
-            prompt_template = prompts.get(prompt_key, '')
-            if prompt_template:
-                narrative_prompt = prompt_template.format(
-                    user_input=user_input,
-                    scene_title=scene_title,
-                    weakness_hint=weakness_hint if weakness_hint else "주변을 살펴보니 특이한 물건이 눈에 띕니다."
-                )
-
-        elif parsed_intent == 'attack':
-            # 공격 행동 (승리 조건 미충족)
-            prompt_key = 'battle_attack_result'
-            prompt_template = prompts.get(prompt_key, '')
-            if prompt_template:
-                narrative_prompt = prompt_template.format(
-                    user_input=user_input,
-                    scene_title=scene_title,
-                    weakness_hint=weakness_hint
-                )
-
-        elif parsed_intent == 'defend':
-            # 방어 행동
-            prompt_key = 'battle_defense'
-            prompt_template = prompts.get(prompt_key, '')
-            if prompt_template:
-                narrative_prompt = prompt_template.format(
-                    user_input=user_input,
-                    scene_title=scene_title,
-                    weakness_hint=weakness_hint
-                )
+        # 전투 씬의 조사/탐색(investigate), 공격(attack, 승리 조건 미충족), 방어(defend)
+        if scene_type == 'battle' and parsed_intent in _INTENT_NARRATIVE_PROMPTS:
+            prompt_key, prompt_template, narrative_prompt = build_intent_narrative_prompt(
+                prompts, parsed_intent, user_input, scene_title, weakness_hint,
+                format_player_status(scenario, state.get('player_vars', {}))
+            )
 
         # Near Miss 처리
         near_miss = state.get('near_miss_trigger')
@@ -2568,13 +3058,19 @@ def scene_stream_generator(state: PlayerState, retry_count: int = 0, max_retries
             if prompt_template:
                 player_status = format_player_status(scenario, state.get('player_vars', {}))
 
-                narrative_prompt = prompt_template.format(
+                narrative_prompt = PromptBuilder.compile(prompt_template).render(
                     user_input=user_input,
                     player_status=player_status,
                     near_miss_trigger=near_miss
                 )
                 logger.info(f"🎬 [NARRATIVE] Using prompt: near_miss for near miss situation")
 
+        # [SPECULATIVE] 최종 프롬프트가 미리 시작한 것과 다르면 폐기 (hint_mode 스트림은 아래 chat 분기에서 비교)
+        if speculative and (narrative_prompt or speculative.prompt_key != 'hint_mode') \
+                and not _speculation_matches(speculative, narrative_prompt):
+            speculative.cancel()
+            speculative = None
+
         # 의도별 프롬프트가 설정되었으면 LLM 스트리밍
         if prompt_template and 'narrative_prompt' in locals() and narrative_prompt:
             try:
@@ -2584,11 +3080,26 @@ def scene_stream_generator(state: PlayerState, retry_count: int = 0, max_retries
 
                 logger.info(f"🎬 [NARRATIVE] Using prompt: {prompt_key} for intent: {parsed_intent}")
 
+                # [SPECULATIVE] 미리 받아둔 청크부터 이어서 사용
+                stream_source = None
+                if speculative:
+                    stream_source = speculative.iter_chunks()
+                    speculative = None
+                    logger.info(f"🔮 [SPECULATIVE] Reusing in-flight '{prompt_key}' stream")
+
                 # [NEW] _stream_and_track 사용 및 토큰 정보 수집
                 token_info = None
                 content_chunks = []
                 
-                for chunk in _stream_and_track(llm, narrative_prompt, user_id, model_name):
+                # [PROMPT CACHE] 템플릿 정적 부분을 prefix로 분리 (투기 스트림은 이미 같은 문자열로 전송됨)
+                if stream_source is None:
+                    narrative_prefix = PromptBuilder.compile(prompt_template).static_prefix
+                    narrative_input = lambda m: OpenRouterLLM.compose_prompt(
+                        m, narrative_prefix, narrative_prompt[len(narrative_prefix):])
+                else:
+                    narrative_input = narrative_prompt
+
+                for chunk in _stream_and_track(llm, narrative_input, user_id, model_name, stream=stream_source):
                     if isinstance(chunk, dict):
                         # 토큰 정보 수신
                         token_info = chunk
@@ -2642,6 +3153,8 @@ def scene_stream_generator(state: PlayerState, retry_count: int = 0, max_retries
         # NPC 대화가 있으면 나레이션 스킵
         npc_output = state.get('npc_output', '')
         if npc_output:
+            if speculative:
+                speculative.cancel()
             yield ""
             return
 
@@ -2690,64 +3203,62 @@ def scene_stream_generator(state: PlayerState, retry_count: int = 0, max_retries
 
         # 
         if parsed_intent == 'chat' and not npc_output:
-            transitions = curr_scene.get('transitions', [])
-            filtered_transitions = filter_negative_transitions(transitions, scenario)
-
-            if filtered_transitions:
-                # transitions_hints 생성
-                transitions_hints = "\n".join([f"- {t.get('trigger', '')}" for t in filtered_transitions])
-
-                hint_mode_template = prompts.get('hint_mode', '')
-                if hint_mode_template:
-                    player_status = format_player_status(scenario, state.get('player_vars', {}))
-
-                    # [추가] stuck_count를 stuck_level로 전달
-                    stuck_level = state.get('stuck_count', 0)
-
-                    hint_prompt = hint_mode_template.format(
-                        user_input=user_input,
-                        player_status=player_status,
-                        scene_title=scene_title,
-                        transitions_hints=transitions_hints,
-                        stuck_level=stuck_level
-                    )
-                    try:
-                        api_key = os.getenv("OPENROUTER_API_KEY")
-                        model_name = state.get('model', 'openai/tngtech/deepseek-r1t2-chimera:free')
-                        llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=True)
+            player_status = format_player_status(scenario, state.get('player_vars', {}))
 
-                        logger.info(f"💡 [HINT MODE] stuck_level: {stuck_level}")
+            # [추가] stuck_count를 stuck_level로 전달
+            stuck_level = state.get('stuck_count', 0)
 
-                        # [NEW] _stream_and_track 사용 및 토큰 정보 수집
-                        token_info = None
-                        content_chunks = []
-                        
-                        for chunk in _stream_and_track(llm, hint_prompt, user_id, model_name):
-                            if isinstance(chunk, dict):
-                                # 토큰 정보 수신
-                                token_info = chunk
-                            else:
-                                # 일반 콘텐츠
-                                content_chunks.append(chunk)
-                                yield chunk
-                        
-                        # 🔥 [NEW] 토큰 소모 정보 전송 (프론트 표시용)
-                        if token_info and token_info.get('cost', 0) > 0:
-                            token_data = {
-                                "type": "token_usage",
-                                "tokens_used": token_info.get('tokens_used', 0),
-                                "cost": token_info.get('cost', 0),
-                                "model": token_info.get('model', 'unknown'),
-                                "action": "hint_mode"
-                            }
-                            yield f"__TOKEN_INFO__{json.dumps(token_data)}__"
-                        
-                        return
-                    except Exception as e:
-                        logger.error(f"Hint mode generation error: {e}")
-                        # 폴백
-                        yield "주변을 둘러보니 여러 가지 시도해볼 수 있을 것 같습니다."
-                        return
+            hint_prefix, hint_suffix = build_hint_mode_prompt(
+                prompts, scenario_id, scenario, curr_id, curr_scene, user_input, player_status, stuck_level
+            )
+            if hint_prefix or hint_suffix:
+                # [SPECULATIVE] 의도 분류 중 미리 시작한 hint_mode 스트림이 같은 프롬프트면 이어서 사용
+                stream_source = None
+                if speculative:
+                    if _speculation_matches(speculative, hint_prefix + hint_suffix):
+                        stream_source = speculative.iter_chunks()
+                        logger.info("🔮 [SPECULATIVE] Reusing in-flight 'hint_mode' stream")
+                    else:
+                        speculative.cancel()
+                    speculative = None
+                try:
+                    api_key = os.getenv("OPENROUTER_API_KEY")
+                    model_name = state.get('model', 'openai/tngtech/deepseek-r1t2-chimera:free')
+                    llm = get_cached_llm(api_key=api_key, model_name=model_name, streaming=True)
+
+                    logger.info(f"💡 [HINT MODE] stuck_level: {stuck_level}")
+
+                    # [NEW] _stream_and_track 사용 및 토큰 정보 수집
+                    token_info = None
+                    content_chunks = []
+                    
+                    hint_prompt = OpenRouterLLM.compose_prompt(model_name, hint_prefix, hint_suffix)
+                    for chunk in _stream_and_track(llm, hint_prompt, user_id, model_name, stream=stream_source):
+                        if isinstance(chunk, dict):
+                            # 토큰 정보 수신
+                            token_info = chunk
+                        else:
+                            # 일반 콘텐츠
+                            content_chunks.append(chunk)
+                            yield chunk
+                    
+                    # 🔥 [NEW] 토큰 소모 정보 전송 (프론트 표시용)
+                    if token_info and token_info.get('cost', 0) > 0:
+                        token_data = {
+                            "type": "token_usage",
+                            "tokens_used": token_info.get('tokens_used', 0),
+                            "cost": token_info.get('cost', 0),
+                            "model": token_info.get('model', 'unknown'),
+                            "action": "hint_mode"
+                        }
+                        yield f"__TOKEN_INFO__{json.dumps(token_data)}__"
+                    
+                    return
+                except Exception as e:
+                    logger.error(f"Hint mode generation error: {e}")
+                    # 폴백
+                    yield "주변을 둘러보니 여러 가지 시도해볼 수 있을 것 같습니다."
+                    return
         # =============================================================================
 
 
@@ -2755,6 +3266,9 @@ def scene_stream_generator(state: PlayerState, retry_count: int = 0, max_retries
 
     # [MODE 2] 씬 변경됨 -> 장면 묘사
     # =============================================================================
+    # [SPECULATIVE] 씬 유지 서사를 쓰지 않았으면 미리 시작한 스트림 폐기
+    if speculative:
+        speculative.cancel()
     
     # [FLICKER FIX] 배경과 NPC 등장을 하나의 HTML 덩어리로 묶어서 전송
     prefix_html_buffer = ""
@@ -2828,18 +3342,19 @@ def scene_stream_generator(state: PlayerState, retry_count: int = 0, max_retries
     if scene_prompt_template:
         player_status = format_player_status(scenario, state.get('player_vars', {}))
 
-        # [추가] transitions 리스트 생성 - 장면 묘사에 포함할 선택지들
-        transitions = curr_scene.get('transitions', [])
-        available_transitions = ""
-        if transitions:
-            # 부정적 엔딩으로 가는 transition 제외
-            filtered_transitions = filter_negative_transitions(transitions, scenario)
-            if filtered_transitions:
-                available_transitions = "\n".join([f"- {t.get('trigger', '')}" for t in filtered_transitions])
-            else:
-                available_transitions = ""
-        else:
-            available_transitions = ""
+        # 씬 제목/설명/NPC 목록/선택지는 씬 단위로 미리 합쳐둔 템플릿 사용
+        scene_template = PromptBuilder.for_scene(
+            scenario_id, scenario, curr_id, 'scene_description', scene_prompt_template,
+            lambda: {
+                'scene_title': scene_title,
+                'scene_desc': scene_desc,
+                'npc_list': npc_list,
+                'available_transitions': _available_transitions_block(curr_scene, scenario),
+            }
+        )
+
+        # [PROMPT CACHE] 규칙 + 장면 정보는 안정 prefix, NPC 상태/유저 입력/플레이어 상태는 가변 suffix
+        scene_prefix, scene_dynamic = scene_template.render_split(player_status=player_status)
 
         # 씬 변경 시 유저 입력 컨텍스트 포함
         if user_input:
@@ -2847,25 +3362,14 @@ def scene_stream_generator(state: PlayerState, retry_count: int = 0, max_retries
 
 """
             # 작업 2: 죽은 NPC 상태 컨텍스트 주입
-            prompt = npc_status_context + context_prefix + scene_prompt_template.format(
-                player_status=player_status,
-                scene_title=scene_title,
-                scene_desc=scene_desc,
-                npc_list=npc_list,
-                available_transitions=available_transitions
-            )
+            prompt = npc_status_context + context_prefix + scene_dynamic
         else:
             # 작업 2: 죽은 NPC 상태 컨텍스트 주입
-            prompt = npc_status_context + scene_prompt_template.format(
-                player_status=player_status,
-                scene_title=scene_title,
-                scene_desc=scene_desc,
-                npc_list=npc_list,
-                available_transitions=available_transitions
-            )
+            prompt = npc_status_context + scene_dynamic
     else:
         # 폴백 프롬프트
         # 작업 2: 죽은 NPC 상태 컨텍스트 주입
+        scene_prefix = ""
         prompt = npc_status_context + f"""당신은 텍스트 기반 RPG의 게임 마스터입니다.
 
 **장면 정보:**
@@ -2888,7 +3392,8 @@ def scene_stream_generator(state: PlayerState, retry_count: int = 0, max_retries
         token_info = None
         content_chunks = []
         
-        for chunk in _stream_and_track(llm, prompt, user_id, model_name):
+        for chunk in _stream_and_track(llm, lambda m: OpenRouterLLM.compose_prompt(m, scene_prefix, prompt),
+                                       user_id, model_name):
             if isinstance(chunk, dict):
                 # 토큰 정보 수신
                 token_info = chunk
@@ -2916,7 +3421,10 @@ def scene_stream_generator(state: PlayerState, retry_count: int = 0, max_retries
     except Exception as e:
         logger.error(f"Scene Streaming Error (attempt {retry_count + 1}): {e}")
 
-        if retry_count < max_retries:
+        # 대기열 초과/모델 과부하 중에는 재시도가 429를 키우므로 바로 폴백
+        overloaded = isinstance(e, LLMOverloadedError) or LLMConcurrencyLimiter.is_congested(
+            state.get('model', 'openai/tngtech/deepseek-r1t2-chimera:free'))
+        if retry_count < max_retries and not overloaded:
             yield f"__RETRY_SIGNAL__"
             return
 
@@ -2984,73 +3492,3 @@ def create_game_graph():
     workflow.add_edge("narrator", END)
 
     return workflow.compile()
-
-
-# --- [NEW] Game Engine Wrapper for Token Management ---
-
-class GameEngine:
-    """
-    게임 로직 실행 및 토큰 과금 관리 래퍼 클래스
-    """
-
-    def __init__(self):
-        self.workflow = create_game_graph()
-
-    def run_turn(self, user_id: str, current_state: Dict[str, Any], user_input: str) -> Dict[str, Any]:
-        """
-        한 턴을 진행하고 토큰 비용을 정산하는 메인 메서드 (Sync Logic)
-        """
-        # 1. 잔액 확인 (최소 비용 체크)
-        current_balance = UserService.get_user_balance(user_id)
-        if current_balance <= 0:
-            return {
-                "error": "토큰이 부족합니다. 충전 후 이용해주세요.",
-                "balance": 0
-            }
-
-        # 입력 상태 준비
-        inputs = current_state
-        inputs['user_input'] = user_input
-        # [NEW] user_id 주입 (state를 통해 전파)
-        inputs['user_id'] = user_id
-
-        # 모델명 (추후 유저 설정이나 시나리오 설정에서 로드)
-        model_name = inputs.get('model', 'openai/google/gemini-2.0-flash-001')
-
-        prompt_tokens = 0
-        completion_tokens = 0
-        final_state = None
-
-        try:
-            # [핵심] LangChain Callback으로 입/출력 토큰 분리 측정 (Intent Parser, NPC Chat 등)
-            with get_openai_callback() as cb:
-                # 실제 게임 그래프 실행 (Blocking)
-                final_state = self.workflow.invoke(inputs)
-
-                # 사용량 집계 (Callback에서 추출)
-                prompt_tokens = cb.prompt_tokens
-                completion_tokens = cb.completion_tokens
-
-            # 3. 비용 계산 및 차감 (1K 단위 분리 계산)
-            total_tokens = prompt_tokens + completion_tokens
-
-            if total_tokens > 0:
-                cost = UserService.calculate_llm_cost(model_name, prompt_tokens, completion_tokens)
-
-                UserService.deduct_tokens(
-                    user_id=user_id,
-                    cost=cost,
-                    action_type="game_turn",
-                    model_name=model_name,
-                    llm_tokens_used=total_tokens
-                )
-
-            # 결과 반환
-            return final_state
-
-        except ValueError as ve:
-            logger.warning(f"Game turn interrupted: {ve}")
-            return {"error": str(ve)}
-        except Exception as e:
-            logger.error(f"Game turn failed: {e}")
-            return {"error": "게임 진행 중 오류가 발생했습니다."}
@@ -0,0 +1,39 @@
+"""
+prefork 배포 모드 (gunicorn 마스터 + UvicornWorker)
+
+    gunicorn app:app -c gunicorn.conf.py
+
+- preload_app: 마스터가 app을 import하고 when_ready에서 시나리오 캐시/프롬프트 템플릿을 적재 + gc.freeze() 후 워커 fork
+  -> 워커끼리 읽기 전용 데이터 페이지를 공유 (기본 Procfile의 uvicorn --workers는 워커마다 따로 적재)
+- 앱 lifespan(DB 마이그레이션, 과금/세션/정리 워커 스레드)은 fork 이후 워커마다 실행
+- 공유할 시나리오 수: PREFORK_PRELOAD_SCENARIOS (config.py), 워커 수: WEB_CONCURRENCY
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+keepalive = 600  # Procfile의 --timeout-keep-alive 600과 동일 (UvicornWorker가 timeout_keep_alive로 사용)
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+
+
+def when_ready(server):
+    # 첫 워커 fork 전, 마스터에서 한 번
+    from core.prefork import preload_shared_state, freeze_for_fork
+    try:
+        preload_shared_state()
+    except Exception as e:
+        server.log.error(f"❌ [PREFORK] Preload failed, workers will load on demand: {e}")
+    frozen = freeze_for_fork()
+    server.log.info(f"🧊 [PREFORK] Froze {frozen} objects before forking {workers} workers")
+
+
+def post_fork(server, worker):
+    from core.prefork import resume_gc_in_worker
+    resume_gc_in_worker()
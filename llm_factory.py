@@ -1,8 +1,24 @@
 import os
 import logging
-from typing import Dict, Any, Generator
+import threading
+from contextvars import ContextVar
+from typing import Dict, Any, Generator, List, Union, Tuple
+import httpx
 from dotenv import load_dotenv
+from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
+from config import (
+    PROMPT_CACHE_CONTROL_ENABLED, LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_MAX_KEEPALIVE,
+    LLM_HTTP_KEEPALIVE_EXPIRY, LLM_HTTP_CONNECT_TIMEOUT,
+)
+from core.llm_limiter import LLMConcurrencyLimiter, LLMPriority
+
+# HTTP/2는 h2 패키지(httpx[http2])가 있을 때만 사용
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # .env 파일 활성화
 load_dotenv()
@@ -64,6 +80,15 @@ AVAILABLE_MODELS = {
 # 기본 모델
 DEFAULT_MODEL = "openai/tngtech/deepseek-r1t2-chimera:free"
 
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# 명시적 cache_control 브레이크포인트가 있어야 프롬프트 캐시가 동작하는 프로바이더
+# (OpenAI / DeepSeek / xAI 등은 동일 prefix를 자동 캐시하므로 순서만 지키면 됨)
+CACHE_CONTROL_PROVIDERS = {"Anthropic", "Google"}
+
+# 이미 동시 실행 슬롯을 잡은 호출 안에서의 중첩 호출(_generate -> _stream 등)은 다시 대기하지 않음
+_slot_held: ContextVar[bool] = ContextVar("llm_slot_held", default=False)
+
 
 class OpenRouterLLM(ChatOpenAI):
     """
@@ -71,8 +96,11 @@ class OpenRouterLLM(ChatOpenAI):
 
     1. CrewAI(LiteLLM) 검사 통과용: 초기화할 때는 'openai/' 접두사가 붙은 모델명을 가짐.
     2. OpenRouter 전송용: 실제 API 호출 시(_default_params)에는 접두사를 떼고 보냄.
+    3. 모델별 동시 호출 한도(LLMConcurrencyLimiter)를 거쳐 호출 - priority로 대기열 순서 결정
     """
 
+    priority: int = int(LLMPriority.INTERACTIVE)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -85,10 +113,148 @@ class OpenRouterLLM(ChatOpenAI):
             params["model"] = params["model"].replace("openai/", "")
         return params
 
+    def _limiter(self):
+        return LLMConcurrencyLimiter.for_model(self.model_name)
+
+    def _generate(self, *args, **kwargs):
+        if _slot_held.get():
+            return super()._generate(*args, **kwargs)
+        with self._limiter().slot(self.priority):
+            token = _slot_held.set(True)
+            try:
+                return super()._generate(*args, **kwargs)
+            finally:
+                _slot_held.reset(token)
+
+    def _stream(self, *args, **kwargs):
+        if _slot_held.get():
+            yield from super()._stream(*args, **kwargs)
+            return
+        # 스트림이 끝나거나 소비 측이 닫을 때까지 슬롯 유지
+        with self._limiter().slot(self.priority):
+            yield from super()._stream(*args, **kwargs)
+
+    async def _agenerate(self, *args, **kwargs):
+        if _slot_held.get():
+            return await super()._agenerate(*args, **kwargs)
+        async with self._limiter().slot_async(self.priority):
+            token = _slot_held.set(True)
+            try:
+                return await super()._agenerate(*args, **kwargs)
+            finally:
+                _slot_held.reset(token)
+
+    async def _astream(self, *args, **kwargs):
+        if _slot_held.get():
+            async for chunk in super()._astream(*args, **kwargs):
+                yield chunk
+            return
+        async with self._limiter().slot_async(self.priority):
+            async for chunk in super()._astream(*args, **kwargs):
+                yield chunk
+
+    @staticmethod
+    def supports_cache_control(model_name: str) -> bool:
+        """OpenRouter가 cache_control 힌트를 프로바이더에 전달하는 모델인지"""
+        info = AVAILABLE_MODELS.get(model_name or DEFAULT_MODEL, {})
+        return PROMPT_CACHE_CONTROL_ENABLED and info.get("provider") in CACHE_CONTROL_PROVIDERS
+
+    @classmethod
+    def compose_prompt(cls, model_name: str, prefix: str, suffix: str) -> Union[str, List[HumanMessage]]:
+        """
+        안정 prefix + 가변 suffix로 프롬프트 구성
+        - cache_control 지원 모델: prefix 블록 끝에 캐시 브레이크포인트를 단 메시지 하나
+        - 그 외: 기존과 같은 단일 문자열 (prefix가 앞에 오므로 자동 prefix 캐시에 유리)
+        """
+        if not prefix or not cls.supports_cache_control(model_name):
+            return prefix + suffix
+        blocks = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+        if suffix:
+            blocks.append({"type": "text", "text": suffix})
+        return [HumanMessage(content=blocks)]
+
+
+class LLMClientRegistry:
+    """
+    (base_url, api_key)별 공유 httpx 클라이언트
+    - 모델/온도/스트리밍 여부가 달라도 같은 커넥션 풀(keep-alive)을 재사용해 TLS 핸드셰이크 반복 제거
+    - 빌더/감수/챗봇 등 get_cached_llm을 거치지 않는 경로도 LLMFactory.get_llm을 통해 공유
+    """
+
+    _lock = threading.Lock()
+    _sync_clients: Dict[Tuple[str, str], httpx.Client] = {}
+    _async_clients: Dict[Tuple[str, str], httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _client_kwargs() -> Dict[str, Any]:
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "limits": httpx.Limits(
+                max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            # 요청별 타임아웃은 openai 클라이언트가 지정하므로 여기서는 연결 타임아웃만 조정
+            "timeout": httpx.Timeout(600.0, connect=LLM_HTTP_CONNECT_TIMEOUT),
+        }
+
+    @classmethod
+    def get_clients(cls, base_url: str, api_key: str) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        key = (base_url, api_key)
+        sync_client = cls._sync_clients.get(key)
+        async_client = cls._async_clients.get(key)
+        if sync_client is not None and async_client is not None:
+            return sync_client, async_client
+
+        with cls._lock:
+            if key not in cls._sync_clients:
+                cls._sync_clients[key] = httpx.Client(**cls._client_kwargs())
+                cls._async_clients[key] = httpx.AsyncClient(**cls._client_kwargs())
+                logger.info(f"✅ [LLM HTTP] Pooled client created for {base_url} "
+                            f"(http2={HTTP2_AVAILABLE}, pools={len(cls._sync_clients)})")
+            return cls._sync_clients[key], cls._async_clients[key]
+
+    @classmethod
+    async def aclose(cls):
+        """앱 종료 시 커넥션 정리"""
+        with cls._lock:
+            sync_clients = list(cls._sync_clients.values())
+            async_clients = list(cls._async_clients.values())
+            cls._sync_clients = {}
+            cls._async_clients = {}
+        for client in sync_clients:
+            client.close()
+        for client in async_clients:
+            await client.aclose()
+
+
+_env_lock = threading.Lock()
+_env_configured = False
+
+
+def configure_llm_environment(api_key: str = None):
+    """
+    [중요] CrewAI를 속이기 위한 환경변수 설정 - 프로세스 시작 시 한 번만 수행
+    (요청마다 os.environ을 바꾸면 스레드 안전하지 않음)
+    """
+    global _env_configured
+    if _env_configured:
+        return
+    with _env_lock:
+        if _env_configured:
+            return
+        api_key = api_key or os.getenv("OPENROUTER_API_KEY") or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            return
+        os.environ["OPENAI_API_KEY"] = api_key
+        os.environ["OPENAI_API_BASE"] = OPENROUTER_BASE_URL
+        _env_configured = True
+
 
 class LLMFactory:
     @staticmethod
-    def get_llm(model_name: str = None, api_key: str = None, temperature: float = 0.7, streaming: bool = False):
+    def get_llm(model_name: str = None, api_key: str = None, temperature: float = 0.7, streaming: bool = False,
+                priority: int = LLMPriority.INTERACTIVE):
         # 모델 유효성 검사
         if not model_name or model_name == 'None':
             model_name = DEFAULT_MODEL
@@ -106,22 +272,27 @@ class LLMFactory:
         if not api_key:
             raise ValueError("API Key가 없습니다. .env 파일을 확인해주세요.")
 
-        # [중요] CrewAI를 속이기 위한 환경변수 설정
-        os.environ["OPENAI_API_KEY"] = api_key
-        os.environ["OPENAI_API_BASE"] = "https://openrouter.ai/api/v1"
+        # 앱 시작 시 이미 설정됨 - 스크립트 등에서 직접 호출된 경우에만 최초 1회 설정
+        configure_llm_environment(api_key)
 
         # [NEW] 스트리밍 시 토큰 사용량 정보 포함 (토큰 경제 시스템 연동용)
         model_kwargs = {}
         if streaming:
             model_kwargs["stream_options"] = {"include_usage": True}
 
+        # 공유 커넥션 풀 (모델/온도 무관하게 같은 키면 같은 클라이언트)
+        http_client, http_async_client = LLMClientRegistry.get_clients(OPENROUTER_BASE_URL, api_key)
+
         return OpenRouterLLM(
-            base_url="https://openrouter.ai/api/v1",
+            base_url=OPENROUTER_BASE_URL,
             api_key=api_key,
+            http_client=http_client,
+            http_async_client=http_async_client,
             model=model_name,  # 여기엔 'openai/'가 붙은 이름이 들어옴
             temperature=temperature,
             streaming=streaming,
             model_kwargs=model_kwargs,
+            priority=int(priority),
             default_headers={
                 "HTTP-Referer": "https://github.com/crewAIInc/crewAI",
                 "X-Title": "CrewAI TRPG"
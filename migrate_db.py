@@ -3,7 +3,8 @@
 Railway PostgreSQL 데이터베이스 마이그레이션 스크립트
 
 실행 방법:
-    python migrate_db.py
+    python migrate_db.py            # 기록된 스키마 버전 이후 단계만
+    python migrate_db.py --force    # 모든 단계 재실행
 """
 import logging
 from sqlalchemy import text
@@ -16,133 +17,281 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# 적용된 마이그레이션 버전 기록 테이블 (부팅마다 ALTER TABLE을 다시 실행하지 않도록)
+SCHEMA_VERSION_TABLE = "schema_version"
+# pg_advisory_lock 키 (임의의 고정값)
+_MIGRATION_LOCK_KEY = 7_140_049
 
-def run_migration():
-    """데이터베이스 마이그레이션 실행"""
-    db = SessionLocal()
+# 자주 실행되는 조회용 복합 인덱스 (models.py __table_args__와 동일하게 유지)
+# (인덱스 이름, 테이블, 컬럼)
+HOT_QUERY_INDEXES = [
+    ("ix_scenario_histories_current", "scenario_histories", ("scenario_id", "editor_id", "is_current")),
+    ("ix_scenario_histories_sequence", "scenario_histories", ("scenario_id", "editor_id", "sequence")),
+    ("ix_temp_scenarios_scenario_editor", "temp_scenarios", ("original_scenario_id", "editor_id")),
+    ("ix_scenarios_public_created", "scenarios", ("is_public", "created_at")),
+    ("ix_scenarios_author_created", "scenarios", ("author_id", "created_at")),
+    ("ix_scenario_likes_scenario", "scenario_likes", ("scenario_id",)),
+]
+
+
+def create_hot_query_indexes() -> bool:
+    """
+    복합 인덱스 생성 (이미 있으면 건너뜀)
+    - PostgreSQL: CREATE INDEX CONCURRENTLY (테이블 쓰기 잠금 없음, 트랜잭션 밖에서 실행)
+      이전 시도가 중간에 실패해 INVALID로 남은 인덱스는 지우고 다시 생성
 
+    Returns:
+        모든 인덱스가 준비됐는지 여부
+    """
+    is_postgres = engine.dialect.name == 'postgresql'
+    ok = True
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, table, columns in HOT_QUERY_INDEXES:
+            try:
+                if is_postgres:
+                    invalid = conn.execute(text("""
+                        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                        WHERE c.relname = :name AND NOT i.indisvalid
+                    """), {"name": name}).first()
+                    if invalid:
+                        logger.warning(f"⚠️ Rebuilding invalid index {name}")
+                        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                concurrently = "CONCURRENTLY " if is_postgres else ""
+                conn.execute(text(
+                    f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+                ))
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to create index {name}: {e}")
+                ok = False
+    logger.info("✅ Hot query indexes checked")
+    return ok
+
+
+def _migrate_base_schema(db) -> bool:
+    """v1: scenarios.filename 컬럼, 기본 인덱스, scenario_histories 테이블 이름 변경"""
+    # 1. scenarios 테이블에 filename 컬럼 추가 (없으면)
+    logger.info("📋 Adding filename column to scenarios table...")
     try:
-        logger.info("🚀 Starting database migration...")
+        db.execute(text("""
+            ALTER TABLE scenarios 
+            ADD COLUMN IF NOT EXISTS filename VARCHAR(100) UNIQUE;
+        """))
+        db.commit()
+        logger.info("✅ filename column added successfully")
+    except Exception as e:
+        logger.warning(f"⚠️ filename column might already exist: {e}")
+        db.rollback()
 
-        # 1. scenarios 테이블에 filename 컬럼 추가 (없으면)
-        logger.info("📋 Adding filename column to scenarios table...")
-        try:
-            db.execute(text("""
-                ALTER TABLE scenarios 
-                ADD COLUMN IF NOT EXISTS filename VARCHAR(100) UNIQUE;
-            """))
-            db.commit()
-            logger.info("✅ filename column added successfully")
-        except Exception as e:
-            logger.warning(f"⚠️ filename column might already exist: {e}")
-            db.rollback()
-
-        # 2. 기존 데이터에 filename 값 생성 (UUID)
-        logger.info("📋 Generating filename values for existing scenarios...")
-        try:
-            db.execute(text("""
-                UPDATE scenarios 
-                SET filename = CONCAT('scenario_', id::text, '_', 
-                    substr(md5(random()::text), 1, 8))
-                WHERE filename IS NULL;
-            """))
-            db.commit()
-            logger.info("✅ filename values generated successfully")
-        except Exception as e:
-            logger.warning(f"⚠️ Failed to generate filename values: {e}")
-            db.rollback()
-
-        # 3. scenarios 테이블에 인덱스 추가
-        logger.info("📋 Adding indexes to scenarios table...")
-        try:
-            db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_scenarios_id ON scenarios(id);
-            """))
-            db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_scenarios_filename ON scenarios(filename);
-            """))
-            db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_scenarios_title ON scenarios(title);
-            """))
-            db.commit()
-            logger.info("✅ Indexes added successfully")
-        except Exception as e:
-            logger.warning(f"⚠️ Indexes might already exist: {e}")
-            db.rollback()
-
-        # 4. presets 테이블에 인덱스 추가
-        logger.info("📋 Adding indexes to presets table...")
-        try:
-            db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_presets_id ON presets(id);
-            """))
-            db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_presets_name ON presets(name);
-            """))
-            db.commit()
-            logger.info("✅ Presets indexes added successfully")
-        except Exception as e:
-            logger.warning(f"⚠️ Presets indexes might already exist: {e}")
-            db.rollback()
-
-        # 5. custom_npcs 테이블에 인덱스 추가
-        logger.info("📋 Adding indexes to custom_npcs table...")
-        try:
-            db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_custom_npcs_id ON custom_npcs(id);
-            """))
-            db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_custom_npcs_name ON custom_npcs(name);
-            """))
-            db.commit()
-            logger.info("✅ Custom NPCs indexes added successfully")
-        except Exception as e:
-            logger.warning(f"⚠️ Custom NPCs indexes might already exist: {e}")
-            db.rollback()
-
-        # 6. temp_scenarios 테이블에 인덱스 추가
-        logger.info("📋 Adding indexes to temp_scenarios table...")
-        try:
-            db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_temp_scenarios_id ON temp_scenarios(id);
-            """))
-            db.commit()
-            logger.info("✅ Temp scenarios indexes added successfully")
-        except Exception as e:
-            logger.warning(f"⚠️ Temp scenarios indexes might already exist: {e}")
-            db.rollback()
-
-        # 7. scenario_histories 테이블 이름 확인 및 인덱스 추가
-        logger.info("📋 Adding indexes to scenario_histories table...")
-        try:
-            # 먼저 scenario_history 테이블이 있는지 확인
-            result = db.execute(text("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'scenario_history'
-                );
-            """))
-            has_old_table = result.scalar()
-
-            if has_old_table:
-                # 기존 테이블 이름 변경
-                logger.info("📋 Renaming scenario_history to scenario_histories...")
-                db.execute(text("""
-                    ALTER TABLE scenario_history 
-                    RENAME TO scenario_histories;
-                """))
-                db.commit()
-                logger.info("✅ Table renamed successfully")
+    # 2. 기존 데이터에 filename 값 생성 (UUID)
+    logger.info("📋 Generating filename values for existing scenarios...")
+    try:
+        db.execute(text("""
+            UPDATE scenarios 
+            SET filename = CONCAT('scenario_', id::text, '_', 
+                substr(md5(random()::text), 1, 8))
+            WHERE filename IS NULL;
+        """))
+        db.commit()
+        logger.info("✅ filename values generated successfully")
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to generate filename values: {e}")
+        db.rollback()
 
+    # 3. scenarios 테이블에 인덱스 추가
+    logger.info("📋 Adding indexes to scenarios table...")
+    try:
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_scenarios_id ON scenarios(id);
+        """))
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_scenarios_filename ON scenarios(filename);
+        """))
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_scenarios_title ON scenarios(title);
+        """))
+        db.commit()
+        logger.info("✅ Indexes added successfully")
+    except Exception as e:
+        logger.warning(f"⚠️ Indexes might already exist: {e}")
+        db.rollback()
+
+    # 4. presets 테이블에 인덱스 추가
+    logger.info("📋 Adding indexes to presets table...")
+    try:
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_presets_id ON presets(id);
+        """))
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_presets_name ON presets(name);
+        """))
+        db.commit()
+        logger.info("✅ Presets indexes added successfully")
+    except Exception as e:
+        logger.warning(f"⚠️ Presets indexes might already exist: {e}")
+        db.rollback()
+
+    # 5. custom_npcs 테이블에 인덱스 추가
+    logger.info("📋 Adding indexes to custom_npcs table...")
+    try:
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_custom_npcs_id ON custom_npcs(id);
+        """))
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_custom_npcs_name ON custom_npcs(name);
+        """))
+        db.commit()
+        logger.info("✅ Custom NPCs indexes added successfully")
+    except Exception as e:
+        logger.warning(f"⚠️ Custom NPCs indexes might already exist: {e}")
+        db.rollback()
+
+    # 6. temp_scenarios 테이블에 인덱스 추가
+    logger.info("📋 Adding indexes to temp_scenarios table...")
+    try:
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_temp_scenarios_id ON temp_scenarios(id);
+        """))
+        db.commit()
+        logger.info("✅ Temp scenarios indexes added successfully")
+    except Exception as e:
+        logger.warning(f"⚠️ Temp scenarios indexes might already exist: {e}")
+        db.rollback()
+
+    # 7. scenario_histories 테이블 이름 확인 및 인덱스 추가
+    logger.info("📋 Adding indexes to scenario_histories table...")
+    try:
+        # 먼저 scenario_history 테이블이 있는지 확인
+        result = db.execute(text("""
+            SELECT EXISTS (
+                SELECT FROM information_schema.tables 
+                WHERE table_name = 'scenario_history'
+            );
+        """))
+        has_old_table = result.scalar()
+
+        if has_old_table:
+            # 기존 테이블 이름 변경
+            logger.info("📋 Renaming scenario_history to scenario_histories...")
             db.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_scenario_histories_id 
-                ON scenario_histories(id);
+                ALTER TABLE scenario_history 
+                RENAME TO scenario_histories;
             """))
             db.commit()
-            logger.info("✅ Scenario histories indexes added successfully")
-        except Exception as e:
-            logger.warning(f"⚠️ Scenario histories migration issue: {e}")
-            db.rollback()
+            logger.info("✅ Table renamed successfully")
+
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_scenario_histories_id 
+            ON scenario_histories(id);
+        """))
+        db.commit()
+        logger.info("✅ Scenario histories indexes added successfully")
+    except Exception as e:
+        logger.warning(f"⚠️ Scenario histories migration issue: {e}")
+        db.rollback()
+
+    return True
+
+
+def _migrate_hot_query_indexes(db) -> bool:
+    """v2: 조회 경로별 복합 인덱스"""
+    return create_hot_query_indexes()
+
+
+def _migrate_late_columns(db) -> bool:
+    """v3: 모델에 나중에 추가된 컬럼 (기존에는 create_tables()가 부팅마다 ALTER TABLE 실행)"""
+    try:
+        db.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS avatar_url VARCHAR(255)"))
+        db.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS email VARCHAR(120)"))
+        db.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS token_balance INTEGER DEFAULT 1000 NOT NULL"))
+        db.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS tutorial_completed BOOLEAN DEFAULT FALSE"))
+        db.execute(text("ALTER TABLE scenarios ADD COLUMN IF NOT EXISTS is_recommended BOOLEAN DEFAULT FALSE"))
+        db.execute(text("ALTER TABLE scenarios ADD COLUMN IF NOT EXISTS view_count INTEGER DEFAULT 0"))
+        db.commit()
+        logger.info("✅ Checked/Added late columns on users and scenarios")
+    except Exception as e:
+        logger.warning(f"⚠️ Column migration warning (SQLite or already exists): {e}")
+        db.rollback()
+    return True
+
+
+# (버전, 설명, 함수) - 새 단계는 다음 번호로 뒤에 추가 (이미 배포된 단계는 수정하지 말 것)
+# 함수가 False를 반환하면 버전을 기록하지 않아 다음 부팅 때 다시 시도
+MIGRATIONS = [
+    (1, "scenarios.filename + base indexes", _migrate_base_schema),
+    (2, "composite indexes for hot queries", _migrate_hot_query_indexes),
+    (3, "late columns on users and scenarios", _migrate_late_columns),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def _ensure_version_table(db):
+    db.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR(200),
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    db.commit()
+
+
+def get_schema_version(db) -> int:
+    """적용된 마지막 마이그레이션 버전 (기록이 없으면 0)"""
+    return db.execute(text(f"SELECT COALESCE(MAX(version), 0) FROM {SCHEMA_VERSION_TABLE}")).scalar() or 0
+
+
+class _MigrationLock:
+    """여러 워커가 동시에 부팅해도 마이그레이션은 한 곳에서만 (PostgreSQL advisory lock, 끝날 때까지 대기)"""
+
+    def __init__(self):
+        self.conn = None
+
+    def __enter__(self):
+        if engine.dialect.name == 'postgresql':
+            self.conn = engine.connect()
+            self.conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.conn is not None:
+            try:
+                self.conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+            finally:
+                self.conn.close()
+        return False
+
+
+def run_migration(force: bool = False):
+    """
+    데이터베이스 마이그레이션 실행
+    - schema_version 테이블에 기록된 버전 이후 단계만 실행 (이미 최신이면 DDL 없이 바로 반환)
+    - force=True면 모든 단계를 다시 실행 (각 단계는 IF NOT EXISTS 등으로 멱등)
+    """
+    db = SessionLocal()
+
+    try:
+        with _MigrationLock():
+            _ensure_version_table(db)
+            current = 0 if force else get_schema_version(db)
+            db.commit()  # CREATE INDEX CONCURRENTLY가 이 세션의 열린 트랜잭션을 기다리지 않도록
+            if current >= SCHEMA_VERSION:
+                logger.info(f"✅ Database schema is up to date (version {current})")
+                return True
+
+            logger.info(f"🚀 Starting database migration (version {current} -> {SCHEMA_VERSION})...")
+            for version, description, migrate in MIGRATIONS:
+                if version <= current:
+                    continue
+                logger.info(f"📋 [v{version}] {description}")
+                if not migrate(db):
+                    logger.warning(f"⚠️ Migration v{version} incomplete, will retry on next start")
+                    return False
+                db.execute(text(f"DELETE FROM {SCHEMA_VERSION_TABLE} WHERE version = :version"),
+                           {"version": version})
+                db.execute(text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, description) "
+                                f"VALUES (:version, :description)"),
+                           {"version": version, "description": description})
+                db.commit()
 
         logger.info("✅ Database migration completed successfully!")
         return True
@@ -159,6 +308,8 @@ def run_migration():
 
 
 if __name__ == "__main__":
-    success = run_migration()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--force", action="store_true", help="기록된 스키마 버전과 관계없이 모든 단계 재실행")
+    success = run_migration(force=parser.parse_args().force)
     exit(0 if success else 1)
-
@@ -1,12 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, create_engine, text
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, UniqueConstraint, Index, create_engine
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.types import JSON
 from datetime import datetime
+import asyncio
 import os
 import uuid
 import logging
 
+try:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    ASYNC_SQLALCHEMY_AVAILABLE = True
+except ImportError:
+    ASYNC_SQLALCHEMY_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # SQLAlchemy Base
@@ -46,6 +53,38 @@ except Exception as e:
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+
+def _to_async_url(url: str) -> str:
+    """동기 URL -> 비동기 드라이버 URL (PostgreSQL: asyncpg, 로컬 SQLite: aiosqlite)"""
+    if url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        # asyncpg는 sslmode 쿼리 파라미터 대신 ssl을 사용
+        return url.replace("sslmode=", "ssl=")
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    return url
+
+
+# 비동기 Engine 및 Session 생성 (드라이버가 없으면 None -> 스레드풀에서 동기 세션으로 대체)
+async_engine = None
+AsyncSessionLocal = None
+if ASYNC_SQLALCHEMY_AVAILABLE and os.getenv('ASYNC_DB', 'true').lower() == 'true':
+    try:
+        _async_url = _to_async_url(DATABASE_URL)
+        _async_options = dict(pool_pre_ping=True, pool_recycle=3600, echo=False)
+        if not _async_url.startswith("sqlite"):
+            _async_options.update(pool_size=10, max_overflow=20)
+        async_engine = create_async_engine(_async_url, **_async_options)
+        AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False,
+                                               autoflush=False)
+        logger.info(f"✅ Async database engine created: {async_engine.dialect.name}+{async_engine.dialect.driver}")
+    except Exception as e:
+        # asyncpg/aiosqlite/greenlet 미설치 등
+        logger.warning(f"⚠️ Async database engine unavailable, falling back to threadpool: {e}")
+        async_engine = None
+        AsyncSessionLocal = None
+
+
 # Dependency - DB Session
 def get_db():
     db = SessionLocal()
@@ -55,6 +94,27 @@ def get_db():
         db.close()
 
 
+def run_with_session(fn, *args, **kwargs):
+    """새 동기 세션으로 fn(db, *args, **kwargs) 실행 후 세션 종료"""
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+async def run_with_session_async(fn, *args, **kwargs):
+    """
+    fn(db, *args, **kwargs)를 비동기 엔진 세션에서 실행
+    - AsyncSession.run_sync: 같은 ORM 코드를 greenlet 위에서 돌리며, 쿼리 I/O 동안 이벤트 루프에 양보
+    - 비동기 엔진이 없으면 스레드풀에서 동기 세션으로 실행 (어느 쪽이든 이벤트 루프를 막지 않음)
+    """
+    if AsyncSessionLocal is None:
+        return await asyncio.to_thread(run_with_session, fn, *args, **kwargs)
+    async with AsyncSessionLocal() as session:
+        return await session.run_sync(fn, *args, **kwargs)
+
+
 class User(Base):
     __tablename__ = 'users'
 
@@ -127,6 +187,12 @@ class Scenario(Base):
     drafts = relationship('TempScenario', back_populates='original_scenario', cascade="all, delete-orphan")
     history_entries = relationship('ScenarioHistory', back_populates='scenario', cascade="all, delete-orphan")
 
+    # 목록 조회: 공개 시나리오 최신순 / 내 시나리오 최신순
+    __table_args__ = (
+        Index('ix_scenarios_public_created', 'is_public', 'created_at'),
+        Index('ix_scenarios_author_created', 'author_id', 'created_at'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -191,6 +257,11 @@ class TempScenario(Base):
     # 관계 설정
     original_scenario = relationship('Scenario', back_populates='drafts')
 
+    # Draft 조회는 항상 (원본 시나리오, 편집자) 기준
+    __table_args__ = (
+        Index('ix_temp_scenarios_scenario_editor', 'original_scenario_id', 'editor_id'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -252,6 +323,12 @@ class ScenarioHistory(Base):
     # 관계 설정
     scenario = relationship('Scenario', back_populates='history_entries')
 
+    # 현재 위치 조회(is_current)와 Undo/Redo/가지치기(sequence 범위, 정렬)
+    __table_args__ = (
+        Index('ix_scenario_histories_current', 'scenario_id', 'editor_id', 'is_current'),
+        Index('ix_scenario_histories_sequence', 'scenario_id', 'editor_id', 'sequence'),
+    )
+
 
 class GameSession(Base):
     """
@@ -276,10 +353,11 @@ class GameSession(Base):
     # 시나리오 정보 (인덱스 추가)
     scenario_id = Column(Integer, ForeignKey('scenarios.id', ondelete='CASCADE'), nullable=False, index=True)
 
-    # 게임 상태 (PlayerState 전체 직렬화) - JSONB로 효율적 저장
+    # 게임 상태 (PlayerState 직렬화, 누적 로그 제외) - JSONB로 효율적 저장
     player_state = Column(JSON_TYPE, nullable=False)
 
-    # WorldState 스냅샷 (규칙 기반 상태) - JSONB로 효율적 저장
+    # WorldState 스냅샷 (규칙 기반 상태, 누적 로그 제외) - JSONB로 효율적 저장
+    # history처럼 계속 늘어나는 목록은 game_session_logs에 행 단위로 저장 (매 턴 큰 JSONB 재작성 방지)
     world_state = Column(JSON_TYPE, nullable=False)
 
     # 메타 정보
@@ -307,6 +385,32 @@ class GameSession(Base):
         }
 
 
+class GameSessionLog(Base):
+    """
+    🛠️ 게임 세션 누적 로그 (append-only)
+
+    PlayerState.history, WorldState.history처럼 턴마다 뒤에만 추가되는 목록을 항목당 한 행으로 저장
+    - game_sessions에는 매 턴 덮어쓰는 작은 상태만 남음
+    - 턴마다 새 항목만 INSERT (기존 행은 다시 쓰지 않음)
+    """
+    __tablename__ = 'game_session_logs'
+
+    id = Column(Integer, primary_key=True)
+    session_key = Column(String(100), ForeignKey('game_sessions.session_key', ondelete='CASCADE'), nullable=False)
+
+    # 로그 종류 (player_history / world_history)
+    stream = Column(String(20), nullable=False)
+    # 목록 내 위치 (0부터)
+    seq = Column(Integer, nullable=False)
+    entry = Column(JSON_TYPE, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.now)
+
+    __table_args__ = (
+        UniqueConstraint('session_key', 'stream', 'seq', name='uq_game_session_logs_seq'),
+    )
+
+
 # models.py 파일 내 적절한 위치에 추가 (Base 클래스 정의 이후)
 class ScenarioLike(Base):
     __tablename__ = "scenario_likes"
@@ -314,6 +418,11 @@ class ScenarioLike(Base):
     scenario_id = Column(Integer, ForeignKey("scenarios.id"), primary_key=True)
     created_at = Column(DateTime, default=datetime.now)
 
+    # PK (user_id, scenario_id)는 시나리오별 좋아요 수 집계에 쓸 수 없음
+    __table_args__ = (
+        Index('ix_scenario_likes_scenario', 'scenario_id'),
+    )
+
 
 # 테이블 생성 함수
 def create_tables():
@@ -322,56 +431,23 @@ def create_tables():
         Base.metadata.create_all(bind=engine)
         logger.info("✅ All database tables created successfully")
 
-        # 2. [추가] users 테이블에 avatar_url 및 token_balance 컬럼이 없으면 추가 (Auto Migration)
-        with engine.connect() as conn:
-            try:
-                # PostgreSQL 쿼리로 컬럼 추가 시도
-                conn.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS avatar_url VARCHAR(255)"))
-                conn.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS email VARCHAR(120)"))
-
-                # [NEW] token_balance 추가
-                conn.execute(
-                    text("ALTER TABLE users ADD COLUMN IF NOT EXISTS token_balance INTEGER DEFAULT 1000 NOT NULL"))
-                
-                # [NEW] tutorial_completed 추가
-                conn.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS tutorial_completed BOOLEAN DEFAULT FALSE"))
-
-                # [NEW] scenarios 테이블에 is_recommended 추가
-                conn.execute(text("ALTER TABLE scenarios ADD COLUMN IF NOT EXISTS is_recommended BOOLEAN DEFAULT FALSE"))
-
-                # ▼▼▼ [추가] view_count 컬럼 자동 추가 (마이그레이션) ▼▼▼
-                conn.execute(text("ALTER TABLE scenarios ADD COLUMN IF NOT EXISTS view_count INTEGER DEFAULT 0"))
-
-                conn.commit()
-                logger.info("✅ Checked/Added 'avatar_url', 'email', 'token_balance' columns to 'users' table.")
-            except Exception as ex:
-                logger.warning(f"⚠️ Column migration warning (SQLite or already exists): {ex}")
-
+        # 나중에 추가된 컬럼(users.avatar_url/email/token_balance/tutorial_completed,
+        # scenarios.is_recommended/view_count)은 migrate_db.py v3에서 한 번만 추가
     except Exception as e:
         logger.error(f"❌ Failed to create tables: {e}")
         raise
 
 
 # 오래된 세션 정리 함수 (Railway 리소스 최적화)
-def cleanup_old_sessions(days=7):
+def cleanup_old_sessions(days: int = None):
     """
-    N일 이상 접근하지 않은 세션 삭제
-
-    Args:
-        days: 보관 기간 (기본 7일)
+    SESSION_RETENTION_DAYS(days를 주면 이번 호출에만 그 값) 이상 접근하지 않은 세션(+ 세션 로그) 삭제
+    - 배치 단위 삭제는 MaintenanceService가 담당 (앱 lifespan에서 주기적으로 실행됨)
     """
     try:
-        from datetime import timedelta
-        db = SessionLocal()
-        cutoff_date = datetime.now() - timedelta(days=days)
-
-        deleted_count = db.query(GameSession).filter(
-            GameSession.last_played_at < cutoff_date
-        ).delete()
-
-        db.commit()
-        db.close()
-
+        from services.maintenance_service import MaintenanceService
+        MaintenanceService.purge("game_session_logs", days=days)
+        deleted_count = MaintenanceService.purge("game_sessions", days=days)
         logger.info(f"🧹 Cleaned up {deleted_count} old game sessions")
         return deleted_count
     except Exception as e:
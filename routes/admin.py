@@ -1,3 +1,4 @@
+import asyncio
 
 from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
@@ -5,6 +6,16 @@ from typing import List
 
 from models import get_db, Scenario
 from routes.auth import get_current_user, CurrentUser
+from services.token_usage import TokenUsageStats, ModelCostResolver
+from core.speculation import SpeculationStats
+from core.entry_content_cache import EntryContentCache
+from core.llm_limiter import LLMConcurrencyLimiter
+from core.model_router import ModelRouter
+from core.llm_response_cache import LLMResponseCache
+from core.state_diff import StateSyncRegistry
+from services.session_writer import GameSessionWriter
+from services.maintenance_service import MaintenanceService
+from services.billing_service import BillingService
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -53,3 +64,61 @@ async def set_recommended_scenarios(
     
     db.commit()
     return {"success": True, "count": len(scenario_ids)}
+
+
+@router.get("/token-usage", summary="모델/액션별 토큰 사용량 집계")
+async def get_token_usage(
+    reset: bool = False,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    if current_user.id != '11':
+        raise HTTPException(status_code=403, detail="관리자 권한이 없습니다.")
+
+    stats = TokenUsageStats.snapshot()
+    if reset:
+        TokenUsageStats.reset()
+    return stats
+
+
+@router.post("/token-usage/reload-costs", summary="모델 단가표 재구성 (TokenConfig 변경 반영)")
+async def reload_model_costs(
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    if current_user.id != '11':
+        raise HTTPException(status_code=403, detail="관리자 권한이 없습니다.")
+
+    ModelCostResolver.reload()
+    return {"success": True}
+
+
+@router.get("/runtime-stats", summary="서브시스템별 런타임 통계 (캐시/추측 실행/동시성/라우팅/저장/정리/과금)")
+async def get_runtime_stats(
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    if current_user.id != '11':
+        raise HTTPException(status_code=403, detail="관리자 권한이 없습니다.")
+
+    return {
+        "speculation": SpeculationStats.snapshot(),
+        "entry_content_cache": EntryContentCache.snapshot(),
+        "llm_response_cache": LLMResponseCache.snapshot(),
+        "llm_concurrency": LLMConcurrencyLimiter.snapshot(),
+        "model_router": ModelRouter.snapshot(),
+        "state_delta": StateSyncRegistry.snapshot(),
+        "session_writes": GameSessionWriter.snapshot(),
+        "maintenance": MaintenanceService.snapshot(),
+        "billing": {"uncollected_total": BillingService.uncollected_total()},
+    }
+
+
+@router.post("/maintenance/run", summary="DB 정리(세션/Draft/변경 이력) 즉시 실행")
+async def run_maintenance(
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    if current_user.id != '11':
+        raise HTTPException(status_code=403, detail="관리자 권한이 없습니다.")
+
+    deleted = await asyncio.to_thread(MaintenanceService.run_once)
+    if deleted is None:
+        return {"success": False, "error": "다른 정리 작업이 실행 중입니다."}
+    return {"success": True, "deleted": deleted, "stats": MaintenanceService.snapshot()}
@@ -7,7 +7,7 @@ import glob
 import shutil
 import uuid
 from core.state import WorldState
-from routes.game import save_game_session
+from routes.game import save_game_session_async
 from pathlib import Path
 from passlib.context import CryptContext
 # [추가] 11번 계정(scrypt) 지원을 위한 라이브러리
@@ -24,20 +24,26 @@ from sqlalchemy import func, or_, desc
 from starlette.concurrency import run_in_threadpool
 
 # 빌더 에이전트 및 코어 유틸리티
-from builder_agent import generate_scenario_from_graph, set_progress_callback, generate_single_npc, generate_scene_content
 from core.state import GameState
 from core.utils import parse_request_data, pick_start_scene_id, validate_scenario_graph, can_publish_scenario
-from game_engine import create_game_graph
+from core.lazy_import import LazyModule
+
+# LangChain/LangGraph/google.genai/qdrant/aioboto3를 끌어오는 모듈은 처음 사용할 때 import (서버 시작 시간 단축)
+builder_agent = LazyModule("builder_agent")
+game_engine = LazyModule("game_engine")
+audit_service = LazyModule("services.ai_audit_service")
+npc_service = LazyModule("services.npc_service")
+image_module = LazyModule("services.image_service")
+chatbot_service = LazyModule("services.chatbot_service")
+s3_module = LazyModule("core.s3_client")
 
 # 서비스 계층 임포트
 from services.scenario_service import ScenarioService
 from services.user_service import UserService
+from services.billing_service import BillingService
 from services.draft_service import DraftService
-from services.ai_audit_service import AIAuditService
 from services.history_service import HistoryService
-from services.npc_service import save_custom_npc
 from services.mermaid_service import MermaidService
-from services.image_service import get_image_service
 from services.preset_service import PresetService  # 누락된 임포트 추가
 
 # 인증 및 모델
@@ -49,14 +55,8 @@ from authlib.integrations.starlette_client import OAuth
 from starlette.config import Config
 from starlette.middleware.sessions import SessionMiddleware
 
-# 기존 임포트 아래에 추가
-from services.chatbot_service import ChatbotService  # <--- 경로 변경됨
-
 # [routes/api.py 상단 임포트 부분에 추가]
-from config import TokenConfig
-
-# [수정] 로컬 파일 저장이 아닌 S3 업로드로 변경하여 배포 후에도 이미지 유지
-from core.s3_client import get_s3_client  # 필요한 시점에 임포트
+from config import TokenConfig, ENTRY_CONTENT_PREWARM
 
 print("=========================================")
 print(f"👉 DEBUG: KAKAO_CLIENT_ID = [{os.getenv('KAKAO_CLIENT_ID')}]")
@@ -163,6 +163,7 @@ class AuditRequest(BaseModel):
     scene_id: Optional[str] = None
     audit_type: str = 'full'
     model: Optional[str] = None
+    refresh: bool = False  # True면 캐시된 감수 결과를 쓰지 않고 다시 검사
 
 
 class ImageGenerateRequest(BaseModel):
@@ -201,7 +202,7 @@ async def mypage_view(
             user = db_user  # 템플릿에 전달할 user 객체를 DB 객체로 교체
 
             # [추가] 사용자의 시나리오 통계 조회
-            stats = ScenarioService.get_user_statistics(user.id)
+            stats = await ScenarioService.get_user_statistics_async(user.id)
 
     # [수정] stats 데이터를 템플릿 context에 포함하여 전달
     return templates.TemplateResponse("mypage.html", {"request": request, "user": user, "stats": stats})
@@ -405,7 +406,7 @@ async def update_profile(
     if avatar and avatar.filename:
         try:
 
-            s3 = get_s3_client()
+            s3 = s3_module.get_s3_client()
             # S3 세션이 초기화되지 않았을 경우 안전장치
             if not s3._session:
                 await s3.initialize()
@@ -456,7 +457,7 @@ async def serve_image(file_path: str):
     S3에 저장된 이미지를 프록시하여 클라이언트에 제공합니다.
     DB에는 '/image/serve/avatars/filename.png' 형태로 저장됩니다.
     """
-    s3 = get_s3_client()
+    s3 = s3_module.get_s3_client()
 
     # S3 초기화 확인
     if not s3._session:
@@ -646,7 +647,7 @@ async def get_user_status(user: CurrentUser = Depends(get_current_user), db: Ses
     return {
         "success": True,
         "username": db_user.id,
-        "balance": db_user.token_balance,
+        "balance": BillingService.get_balance(db_user.id),
         "tutorial_completed": getattr(db_user, 'tutorial_completed', False),
         "avatar_url": getattr(db_user, 'avatar_url', None)
     }
@@ -916,7 +917,7 @@ async def toggle_scenario_public(scenario_id: int, user: CurrentUser = Depends(g
     if not user.is_authenticated:
         return HTMLResponse("Login required", status_code=401)
 
-    success, msg, new_state = ScenarioService.toggle_public(scenario_id, user.id)
+    success, msg, new_state = await ScenarioService.toggle_public_async(scenario_id, user.id)
 
     if not success:
         return HTMLResponse(f"<script>alert('{msg}');</script>", status_code=400)
@@ -925,7 +926,7 @@ async def toggle_scenario_public(scenario_id: int, user: CurrentUser = Depends(g
     button_html = _generate_lock_button(scenario_id, new_state)
 
     # 2. [추가됨] 최신 통계(Private 개수) 다시 계산
-    stats = ScenarioService.get_user_statistics(user.id)
+    stats = await ScenarioService.get_user_statistics_async(user.id)
 
     # 3. [추가됨] 통계 숫자 업데이트용 HTML (OOB Swap)
     # id="stat-private-count"인 태그를 찾아서 이 내용으로 바꿔치기합니다.
@@ -950,7 +951,7 @@ async def generate_scenario(request: GenerateRequest, user: CurrentUser = Depend
         return JSONResponse({"success": False, "error": "Login required"}, status_code=401)
 
     # 잔액 확인
-    balance = UserService.get_user_balance(user.id)
+    balance = BillingService.get_balance(user.id)
     if balance <= 0:
         return JSONResponse({"success": False, "error": "토큰이 부족합니다. 충전 후 이용해주세요."}, status_code=402)
 
@@ -960,7 +961,7 @@ async def generate_scenario(request: GenerateRequest, user: CurrentUser = Depend
     try:
         # [수정] user.id를 전달하여 토큰 과금 수행
         result = await run_in_threadpool(
-            generate_scenario_from_graph,
+            builder_agent.generate_scenario_from_graph,
             api_key="",
             user_data=request.graph_data,
             model_name=request.model,
@@ -970,7 +971,7 @@ async def generate_scenario(request: GenerateRequest, user: CurrentUser = Depend
         progress_data = {"status": "complete", "message": "완료!", "percent": 100}
 
         # 남은 잔액 조회
-        new_balance = UserService.get_user_balance(user.id)
+        new_balance = BillingService.get_balance(user.id)
 
         return {"success": True, "data": result, "remaining_balance": new_balance}
 
@@ -999,7 +1000,7 @@ async def generate_npc(request: NpcGenRequest, user: CurrentUser = Depends(get_c
     try:
         # [수정] user.id 전달
         npc_data = await run_in_threadpool(
-            generate_single_npc,
+            builder_agent.generate_single_npc,
             scenario_title=request.scenario_title,
             scenario_summary=request.scenario_summary,
             user_request=request.user_request,
@@ -1311,39 +1312,27 @@ async def get_scenarios_data(
 ):
     """빌더 모달용 JSON 응답 API"""
     user_id = user.id if user.is_authenticated else None
-    file_infos = ScenarioService.list_scenarios(sort, user_id, filter)
+    file_infos = await ScenarioService.list_scenarios_async(sort, user_id, filter)
     return file_infos
 
 
 @api_router.post('/load_scenario')
 async def load_scenario(
         filename: str = Form(...),
-        user: CurrentUser = Depends(get_current_user_optional),
-        db: Session = Depends(get_db)
+        user: CurrentUser = Depends(get_current_user_optional)
 ):
     import uuid
     from core.state import WorldState
 
     user_id = user.id if user.is_authenticated else None
-    result, error = ScenarioService.load_scenario(filename, user_id)
+    result, error = await ScenarioService.load_scenario_async(filename, user_id)
     if error:
         return JSONResponse({"error": error}, status_code=400)
 
     scenario = result['scenario']
 
     # [수정] 안전한 조회수 증가 로직 (컬럼이 없으면 pass)
-    try:
-        # DB 세션 내의 객체를 확실하게 가져옴
-        db_scenario = db.query(Scenario).filter(Scenario.id == scenario.get('id')).first()
-
-        if db_scenario:
-            # hasattr로 컬럼 존재 여부 확인 후 증가
-            if hasattr(db_scenario, 'view_count'):
-                current_views = db_scenario.view_count if db_scenario.view_count else 0
-                db_scenario.view_count = current_views + 1
-                db.commit()
-    except Exception as e:
-        logger.error(f"View count update failed: {e}")
+    await ScenarioService.increment_view_count_async(scenario.get('id'))
 
     start_id = pick_start_scene_id(scenario)
 
@@ -1385,10 +1374,10 @@ async def load_scenario(
         "state": player_state
     }
 
-    from routes.game import save_game_session
+    from routes.game import save_game_session_async
 
     try:
-        saved_key = save_game_session(db, player_state, user_id=user_id, session_key=new_session_key)
+        saved_key = await save_game_session_async(player_state, user_id=user_id, session_key=new_session_key)
         logger.info(f"✅ [LOAD_SCENARIO] Session persisted to DB: {saved_key} (scenario_id={scenario_id})")
     except Exception as e:
         logger.error(f"❌ [LOAD_SCENARIO] Failed to save session to DB: {e}")
@@ -1404,21 +1393,43 @@ async def load_scenario(
     }
 
 
+def _schedule_entry_prewarm(scenario_id):
+    """씬 진입 문구 변형 풀을 백그라운드에서 미리 생성 (응답은 기다리지 않음)"""
+    if not ENTRY_CONTENT_PREWARM:
+        return
+    try:
+        scenario_id = int(scenario_id)
+    except (TypeError, ValueError):
+        logger.warning(f"⚠️ [ENTRY CACHE] Prewarm skipped, invalid scenario id: {scenario_id!r}")
+        return
+
+    def _run():
+        try:
+            game_engine.prewarm_entry_content(scenario_id)
+        except Exception as e:
+            logger.warning(f"⚠️ [ENTRY CACHE] Prewarm failed for {scenario_id}: {e}")
+
+    threading.Thread(target=_run, name=f"entry-prewarm-{scenario_id}", daemon=True).start()
+
+
 @api_router.post('/publish_scenario')
 async def publish_scenario(data: ScenarioIdRequest, user: CurrentUser = Depends(get_current_user)):
-    success, msg = ScenarioService.publish_scenario(data.filename, user.id)
+    success, msg, is_public = await ScenarioService.publish_scenario_async(data.filename, user.id)
+    # 공개로 전환된 경우에만 진입 문구 미리 생성
+    if success and is_public:
+        _schedule_entry_prewarm(data.filename)
     return {"success": success, "message": msg, "error": msg}
 
 
 @api_router.post('/delete_scenario')
 async def delete_scenario(data: ScenarioIdRequest, user: CurrentUser = Depends(get_current_user)):
-    success, msg = ScenarioService.delete_scenario(data.filename, user.id)
+    success, msg = await ScenarioService.delete_scenario_async(data.filename, user.id)
     return {"success": success, "message": msg, "error": msg}
 
 
 @api_router.get('/scenario/{scenario_id}/edit')
 async def get_scenario_for_edit(scenario_id: str, user: CurrentUser = Depends(get_current_user)):
-    result, error = ScenarioService.get_scenario_for_edit(scenario_id, user.id)
+    result, error = await ScenarioService.get_scenario_for_edit_async(scenario_id, user.id)
     if error:
         return JSONResponse({"success": False, "error": error}, status_code=403)
     return {"success": True, "data": result}
@@ -1427,7 +1438,7 @@ async def get_scenario_for_edit(scenario_id: str, user: CurrentUser = Depends(ge
 @api_router.post('/scenario/{scenario_id}/update')
 async def update_scenario(scenario_id: str, request: Request, user: CurrentUser = Depends(get_current_user)):
     data = await request.json()
-    success, error = ScenarioService.update_scenario(scenario_id, data, user.id)
+    success, error = await ScenarioService.update_scenario_async(scenario_id, data, user.id)
     if not success:
         return JSONResponse({"success": False, "error": error}, status_code=400)
     return {"success": True, "message": "저장되었습니다."}
@@ -1448,20 +1459,20 @@ async def init_game(request: Request, user: CurrentUser = Depends(get_current_us
     update_build_progress(status="building", step="0/5", detail="준비 중...", progress=0)
 
     try:
-        set_progress_callback(update_build_progress)
+        builder_agent.set_progress_callback(update_build_progress)
 
         # [수정] user.id 전달하여 토큰 과금
         user_id = user.id if user.is_authenticated else None
 
         scenario_json = await run_in_threadpool(
-            generate_scenario_from_graph,
+            builder_agent.generate_scenario_from_graph,
             api_key,
             react_flow_data,
             model_name=selected_model,
             user_id=user_id  # 추가
         )
 
-        fid, error = ScenarioService.save_scenario(scenario_json, user_id=user_id)
+        fid, error = await ScenarioService.save_scenario_async(scenario_json, user_id=user_id)
 
         if error:
             update_build_progress(status="error", detail=f"저장 오류: {error}")
@@ -1533,7 +1544,7 @@ async def generate_npc_api(data: NPCGenerateRequest, user: CurrentUser = Depends
     try:
         # [수정] user.id 전달
         npc_data = await run_in_threadpool(
-            generate_single_npc,
+            builder_agent.generate_single_npc,
             scenario_title=data.scenario_title,
             scenario_summary=data.scenario_summary,
             user_request=data.request,
@@ -1557,7 +1568,7 @@ async def generate_scene_content_api(data: NPCGenerateRequest, user: CurrentUser
     try:
         # builder_agent.py의 씬 생성 함수 호출
         scene_data = await run_in_threadpool(
-            generate_scene_content,
+            builder_agent.generate_scene_content,
             scenario_title=data.scenario_title,
             scenario_summary=data.scenario_summary,
             user_request=data.request,
@@ -1577,7 +1588,7 @@ async def generate_image_api(data: ImageGenerateRequest, user: CurrentUser = Dep
         return JSONResponse({"success": False, "error": "Login required"}, status_code=401)
 
     try:
-        image_service = get_image_service()
+        image_service = image_module.get_image_service()
 
         if not image_service.is_available:
             return JSONResponse({
@@ -1615,7 +1626,7 @@ async def chat_api(request: ChatRequest):
     설명: FastAPI 방식의 올바른 구현입니다. 이 부분은 유지하세요.
     """
     # chatbot_service.py의 generate_response 호출
-    response_data = await ChatbotService.generate_response(request.message, request.history)
+    response_data = await chatbot_service.ChatbotService.generate_response(request.message, request.history)
     return response_data
 
 
@@ -1626,7 +1637,7 @@ async def save_npc(request: Request, user: CurrentUser = Depends(get_current_use
         data = await request.json()
         if not data:
             return JSONResponse({"success": False, "error": "No data provided"}, status_code=400)
-        saved_entity = save_custom_npc(data, user.id if user.is_authenticated else None)
+        saved_entity = npc_service.save_custom_npc(data, user.id if user.is_authenticated else None)
         return {"success": True, "message": "저장되었습니다.", "data": saved_entity}
     except Exception as e:
         logger.error(f"NPC Save Error: {e}")
@@ -1751,7 +1762,7 @@ def _generate_mermaid_for_response(scenario_data):
 
 @api_router.get('/draft/{scenario_id}')
 async def get_draft(scenario_id: int, user: CurrentUser = Depends(get_current_user)):
-    result, error = DraftService.get_draft(scenario_id, user.id)
+    result, error = await DraftService.get_draft_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=403)
     mermaid_code = _generate_mermaid_for_response(result['scenario'])
     return {"success": True, "mermaid_code": mermaid_code, **result}
@@ -1767,11 +1778,11 @@ async def save_draft(scenario_id: int, request: Request, user: CurrentUser = Dep
         data['scenes'] = scenes
         data['endings'] = endings
 
-    success, error = DraftService.save_draft(scenario_id, user.id, data)
+    success, error = await DraftService.save_draft_async(scenario_id, user.id, data)
     if not success: return JSONResponse({"success": False, "error": error}, status_code=400)
 
     # 자동 히스토리 추가 (성공 시에만)
-    history_success, history_error = HistoryService.add_history(scenario_id, user.id, "draft_save", "Draft 저장", data)
+    history_success, history_error = await HistoryService.add_history_async(scenario_id, user.id, "draft_save", "Draft 저장", data)
     if not history_success:
         logger.warning(f"History save failed: {history_error}")
     
@@ -1782,22 +1793,25 @@ async def save_draft(scenario_id: int, request: Request, user: CurrentUser = Dep
 async def publish_draft(scenario_id: int, request: Request, user: CurrentUser = Depends(get_current_user)):
     data = await request.json() if await request.body() else {}
     force = data.get('force', False)
-    success, error, validation_result = DraftService.publish_draft(scenario_id, user.id, force=force)
+    success, error, validation_result = await DraftService.publish_draft_async(scenario_id, user.id, force=force)
     if not success:
         return JSONResponse({"success": False, "error": error, "validation": validation_result}, status_code=400)
+    # 반영된 내용으로 게임 엔진 캐시를 갱신하고 진입 문구 풀 재생성
+    game_engine.invalidate_scenario_cache(scenario_id)
+    _schedule_entry_prewarm(scenario_id)
     return {"success": True, "message": "시나리오에 최종 반영되었습니다.", "validation": validation_result}
 
 
 @api_router.post('/draft/{scenario_id}/discard')
 async def discard_draft(scenario_id: int, user: CurrentUser = Depends(get_current_user)):
-    success, error = DraftService.discard_draft(scenario_id, user.id)
+    success, error = await DraftService.discard_draft_async(scenario_id, user.id)
     if not success: return JSONResponse({"success": False, "error": error}, status_code=400)
     return {"success": True, "message": "변경사항이 취소되었습니다."}
 
 
 @api_router.post('/draft/{scenario_id}/reorder')
 async def reorder_scene_ids(scenario_id: int, user: CurrentUser = Depends(get_current_user)):
-    result, error = DraftService.get_draft(scenario_id, user.id)
+    result, error = await DraftService.get_draft_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=403)
 
     scenario_data = result['scenario']
@@ -1806,7 +1820,7 @@ async def reorder_scene_ids(scenario_id: int, user: CurrentUser = Depends(get_cu
     if not id_mapping:
         return {"success": True, "message": "재정렬할 필요가 없습니다.", "changes": 0}
 
-    success, save_error = DraftService.save_draft(scenario_id, user.id, reordered_data)
+    success, save_error = await DraftService.save_draft_async(scenario_id, user.id, reordered_data)
     if not success: return JSONResponse({"success": False, "error": save_error}, status_code=400)
 
     return {"success": True, "message": f"{len(id_mapping)}개의 씬 ID가 재정렬되었습니다.", "id_mapping": id_mapping,
@@ -1817,7 +1831,7 @@ async def reorder_scene_ids(scenario_id: int, user: CurrentUser = Depends(get_cu
 async def check_scene_references(scenario_id: int, data: DraftSceneRequest,
                                  user: CurrentUser = Depends(get_current_user)):
     if not data.scene_id: return JSONResponse({"success": False, "error": "scene_id 필요"}, status_code=400)
-    result, error = DraftService.get_draft(scenario_id, user.id)
+    result, error = await DraftService.get_draft_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=403)
     references = DraftService.check_scene_references(result['scenario'], data.scene_id)
     return {"success": True, "scene_id": data.scene_id, "references": references, "has_references": len(references) > 0}
@@ -1825,11 +1839,11 @@ async def check_scene_references(scenario_id: int, data: DraftSceneRequest,
 
 @api_router.post('/draft/{scenario_id}/add-scene')
 async def add_scene(scenario_id: int, data: DraftSceneRequest, user: CurrentUser = Depends(get_current_user)):
-    result, error = DraftService.get_draft(scenario_id, user.id)
+    result, error = await DraftService.get_draft_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=403)
 
     updated_scenario = DraftService.add_scene(result['scenario'], data.scene or {}, data.after_scene_id)
-    success, save_error = DraftService.save_draft(scenario_id, user.id, updated_scenario)
+    success, save_error = await DraftService.save_draft_async(scenario_id, user.id, updated_scenario)
     if not success: return JSONResponse({"success": False, "error": save_error}, status_code=400)
 
     # 추가된 씬 찾기
@@ -1839,11 +1853,11 @@ async def add_scene(scenario_id: int, data: DraftSceneRequest, user: CurrentUser
 
 @api_router.post('/draft/{scenario_id}/add-ending')
 async def add_ending(scenario_id: int, data: DraftEndingRequest, user: CurrentUser = Depends(get_current_user)):
-    result, error = DraftService.get_draft(scenario_id, user.id)
+    result, error = await DraftService.get_draft_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=403)
 
     updated_scenario = DraftService.add_ending(result['scenario'], data.ending or {})
-    success, save_error = DraftService.save_draft(scenario_id, user.id, updated_scenario)
+    success, save_error = await DraftService.save_draft_async(scenario_id, user.id, updated_scenario)
     if not success: return JSONResponse({"success": False, "error": save_error}, status_code=400)
 
     added_ending = updated_scenario['endings'][-1]
@@ -1853,11 +1867,11 @@ async def add_ending(scenario_id: int, data: DraftEndingRequest, user: CurrentUs
 @api_router.post('/draft/{scenario_id}/delete-scene')
 async def delete_scene(scenario_id: int, data: DraftSceneRequest, user: CurrentUser = Depends(get_current_user)):
     if not data.scene_id: return JSONResponse({"success": False, "error": "scene_id 필요"}, status_code=400)
-    result, error = DraftService.get_draft(scenario_id, user.id)
+    result, error = await DraftService.get_draft_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=403)
 
     updated_scenario, warnings = DraftService.delete_scene(result['scenario'], data.scene_id, data.handle_mode)
-    success, save_error = DraftService.save_draft(scenario_id, user.id, updated_scenario)
+    success, save_error = await DraftService.save_draft_async(scenario_id, user.id, updated_scenario)
     if not success: return JSONResponse({"success": False, "error": save_error}, status_code=400)
 
     return {"success": True, "message": "씬 삭제 완료", "warnings": warnings, "scenario": updated_scenario}
@@ -1866,11 +1880,11 @@ async def delete_scene(scenario_id: int, data: DraftSceneRequest, user: CurrentU
 @api_router.post('/draft/{scenario_id}/delete-ending')
 async def delete_ending(scenario_id: int, data: DraftEndingRequest, user: CurrentUser = Depends(get_current_user)):
     if not data.ending_id: return JSONResponse({"success": False, "error": "ending_id 필요"}, status_code=400)
-    result, error = DraftService.get_draft(scenario_id, user.id)
+    result, error = await DraftService.get_draft_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=403)
 
     updated_scenario, warnings = DraftService.delete_ending(result['scenario'], data.ending_id)
-    success, save_error = DraftService.save_draft(scenario_id, user.id, updated_scenario)
+    success, save_error = await DraftService.save_draft_async(scenario_id, user.id, updated_scenario)
     if not success: return JSONResponse({"success": False, "error": save_error}, status_code=400)
 
     return {"success": True, "message": "엔딩 삭제 완료", "warnings": warnings, "scenario": updated_scenario}
@@ -1882,25 +1896,20 @@ async def delete_ending(scenario_id: int, data: DraftEndingRequest, user: Curren
 @api_router.post('/draft/{scenario_id}/ai-audit')
 async def ai_audit_scene(scenario_id: int, data: AuditRequest, user: CurrentUser = Depends(get_current_user)):
     if not data.scene_id: return JSONResponse({"success": False, "error": "scene_id 필요"}, status_code=400)
-    result, error = DraftService.get_draft(scenario_id, user.id)
+    result, error = await DraftService.get_draft_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=403)
 
     # 비동기 실행으로 서버 블로킹 방지
-    method = AIAuditService.full_audit
+    method = audit_service.AIAuditService.full_audit
     if data.audit_type == 'coherence':
-        method = AIAuditService.audit_scene_coherence
+        method = audit_service.AIAuditService.audit_scene_coherence
     elif data.audit_type == 'trigger':
-        method = AIAuditService.audit_trigger_consistency
+        method = audit_service.AIAuditService.audit_trigger_consistency
 
+    # 잔액만 선점하고, 실제로 LLM을 호출한 경우에만 확정 (캐시된 감수 결과 재사용은 무료)
+    cost = TokenConfig.COST_AI_AUDIT
     try:
-        cost = TokenConfig.COST_AI_AUDIT
-        UserService.deduct_tokens(
-            user_id=user.id,
-            cost=cost,
-            action_type="ai_audit",
-            model_name=data.model
-        )
-        logger.info(f"💰 Audit token deducted for {user.id}: -{cost}")
+        reservation_id = BillingService.reserve(user.id, cost)
     except ValueError as e:
         logger.warning(f"🚫 Audit 거부 (잔액 부족): {user.id} - {e}")
         return JSONResponse({"success": False, "error": "Insufficient tokens"}, status_code=402)
@@ -1908,7 +1917,19 @@ async def ai_audit_scene(scenario_id: int, data: AuditRequest, user: CurrentUser
         logger.error(f"❌ Audit 토큰 처리 중 오류: {e}")
         return JSONResponse({"success": False, "error": "Token processing failed"}, status_code=500)
 
-    audit_result = await run_in_threadpool(method, result['scenario'], data.scene_id, data.model)
+    try:
+        audit_result = await run_in_threadpool(method, result['scenario'], data.scene_id, data.model, data.refresh)
+    except Exception:
+        BillingService.release(reservation_id)
+        raise
+
+    llm_called = audit_result['llm_called'] if isinstance(audit_result, dict) else audit_result.llm_called
+    if llm_called:
+        BillingService.commit(reservation_id, cost, action_type="ai_audit", model_name=data.model)
+        logger.info(f"💰 Audit token deducted for {user.id}: -{cost}")
+    else:
+        BillingService.release(reservation_id)
+        logger.info(f"♻️ Audit made no LLM call (cached) for {user.id}, no charge")
 
     return {"success": True, "audit_type": data.audit_type, "result": audit_result}
 
@@ -1939,7 +1960,7 @@ async def audit_builder_scene(data: BuilderAuditRequest, user: CurrentUser = Dep
         # 2-A. 단일 씬 검수
         if data.scene_id:
             audit_res = await run_in_threadpool(
-                AIAuditService.full_audit,
+                audit_service.AIAuditService.full_audit,
                 temp_scenario,
                 data.scene_id,
                 data.model
@@ -1955,7 +1976,7 @@ async def audit_builder_scene(data: BuilderAuditRequest, user: CurrentUser = Dep
 
             for scene in scenes:
                 res = await run_in_threadpool(
-                    AIAuditService.full_audit,
+                    audit_service.AIAuditService.full_audit,
                     temp_scenario,
                     scene['scene_id'],
                     data.model
@@ -1980,11 +2001,11 @@ async def audit_builder_scene(data: BuilderAuditRequest, user: CurrentUser = Dep
 @api_router.post('/draft/{scenario_id}/audit-recommend')
 async def audit_recommend(scenario_id: int, request: Request, user: CurrentUser = Depends(get_current_user)):
     data = await request.json() if await request.body() else {}
-    result, error = DraftService.get_draft(scenario_id, user.id)
+    result, error = await DraftService.get_draft_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=403)
 
-    recommendation_result = await run_in_threadpool(AIAuditService.recommend_audit_targets, result['scenario'],
-                                                    data.get('model'))
+    recommendation_result = await run_in_threadpool(audit_service.AIAuditService.recommend_audit_targets, result['scenario'],
+                                                    data.get('model'), bool(data.get('refresh')))
     if not recommendation_result.get("success"): return JSONResponse(recommendation_result, status_code=500)
     return recommendation_result
 
@@ -1994,24 +2015,24 @@ async def audit_recommend(scenario_id: int, request: Request, user: CurrentUser
 # ==========================================
 @api_router.get('/draft/{scenario_id}/history')
 async def get_history_list(scenario_id: int, user: CurrentUser = Depends(get_current_user)):
-    history_list, current_sequence, error = HistoryService.get_history_list(scenario_id, user.id)
+    history_list, current_sequence, error = await HistoryService.get_history_list_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=400)
-    undo_redo_status = HistoryService.get_undo_redo_status(scenario_id, user.id)
+    undo_redo_status = await HistoryService.get_undo_redo_status_async(scenario_id, user.id)
     return {"success": True, "history": history_list, "current_sequence": current_sequence,
             "undo_redo_status": undo_redo_status}
 
 
 @api_router.get('/draft/{scenario_id}/history/status')
 async def get_history_status(scenario_id: int, user: CurrentUser = Depends(get_current_user)):
-    status = HistoryService.get_undo_redo_status(scenario_id, user.id)
+    status = await HistoryService.get_undo_redo_status_async(scenario_id, user.id)
     return {"success": True, **status}
 
 
 @api_router.post('/draft/{scenario_id}/history/init')
 async def init_history(scenario_id: int, user: CurrentUser = Depends(get_current_user)):
-    result, error = DraftService.get_draft(scenario_id, user.id)
+    result, error = await DraftService.get_draft_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=403)
-    success, hist_error = HistoryService.initialize_history(scenario_id, user.id, result['scenario'])
+    success, hist_error = await HistoryService.initialize_history_async(scenario_id, user.id, result['scenario'])
     if not success: return JSONResponse({"success": False, "error": hist_error}, status_code=400)
     return {"success": True, "message": "History Initialized"}
 
@@ -2020,43 +2041,43 @@ async def init_history(scenario_id: int, user: CurrentUser = Depends(get_current
 async def add_history(scenario_id: int, data: HistoryAddRequest, user: CurrentUser = Depends(get_current_user)):
     snapshot = data.snapshot
     if not snapshot:
-        result, error = DraftService.get_draft(scenario_id, user.id)
+        result, error = await DraftService.get_draft_async(scenario_id, user.id)
         if error: return JSONResponse({"success": False, "error": error}, status_code=403)
         snapshot = result['scenario']
 
-    success, hist_error = HistoryService.add_history(scenario_id, user.id, data.action_type, data.action_description,
+    success, hist_error = await HistoryService.add_history_async(scenario_id, user.id, data.action_type, data.action_description,
                                                      snapshot)
     if not success: return JSONResponse({"success": False, "error": hist_error}, status_code=400)
-    undo_redo_status = HistoryService.get_undo_redo_status(scenario_id, user.id)
+    undo_redo_status = await HistoryService.get_undo_redo_status_async(scenario_id, user.id)
     return {"success": True, "message": "History Added", "undo_redo_status": undo_redo_status}
 
 
 @api_router.post('/draft/{scenario_id}/history/undo')
 async def undo_history(scenario_id: int, user: CurrentUser = Depends(get_current_user)):
-    restored_data, error = HistoryService.undo(scenario_id, user.id)
+    restored_data, error = await HistoryService.undo_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=400)
     mermaid_code = _generate_mermaid_for_response(restored_data)
-    undo_redo_status = HistoryService.get_undo_redo_status(scenario_id, user.id)
+    undo_redo_status = await HistoryService.get_undo_redo_status_async(scenario_id, user.id)
     return {"success": True, "scenario": restored_data, "mermaid_code": mermaid_code,
             "undo_redo_status": undo_redo_status}
 
 
 @api_router.post('/draft/{scenario_id}/history/redo')
 async def redo_history(scenario_id: int, user: CurrentUser = Depends(get_current_user)):
-    restored_data, error = HistoryService.redo(scenario_id, user.id)
+    restored_data, error = await HistoryService.redo_async(scenario_id, user.id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=400)
     mermaid_code = _generate_mermaid_for_response(restored_data)
-    undo_redo_status = HistoryService.get_undo_redo_status(scenario_id, user.id)
+    undo_redo_status = await HistoryService.get_undo_redo_status_async(scenario_id, user.id)
     return {"success": True, "scenario": restored_data, "mermaid_code": mermaid_code,
             "undo_redo_status": undo_redo_status}
 
 
 @api_router.post('/draft/{scenario_id}/history/restore/{history_id}')
 async def restore_history(scenario_id: int, history_id: int, user: CurrentUser = Depends(get_current_user)):
-    restored_data, error = HistoryService.restore_to_point(scenario_id, user.id, history_id)
+    restored_data, error = await HistoryService.restore_to_point_async(scenario_id, user.id, history_id)
     if error: return JSONResponse({"success": False, "error": error}, status_code=400)
     mermaid_code = _generate_mermaid_for_response(restored_data)
-    undo_redo_status = HistoryService.get_undo_redo_status(scenario_id, user.id)
+    undo_redo_status = await HistoryService.get_undo_redo_status_async(scenario_id, user.id)
     return {"success": True, "scenario": restored_data, "mermaid_code": mermaid_code,
             "undo_redo_status": undo_redo_status}
 
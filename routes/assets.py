@@ -7,7 +7,10 @@ from fastapi.responses import JSONResponse
 from typing import Optional
 import logging
 
-from core.s3_client import get_s3_client
+from core.lazy_import import LazyModule
+
+# aioboto3/botocore는 첫 업로드 요청 시 import
+s3_module = LazyModule("core.s3_client")
 
 router = APIRouter(prefix="/api/assets", tags=["Assets"])
 logger = logging.getLogger(__name__)
@@ -36,7 +39,7 @@ async def upload_image(
     }
     ```
     """
-    s3_client = get_s3_client()
+    s3_client = s3_module.get_s3_client()
 
     # S3가 구성되지 않은 경우
     if not s3_client.is_available:
@@ -114,7 +117,7 @@ async def upload_scenario_image(
 
     시나리오 ID가 제공되면 'scenario_{id}/' 폴더에 저장
     """
-    s3_client = get_s3_client()
+    s3_client = s3_module.get_s3_client()
 
     if not s3_client.is_available:
         raise HTTPException(
@@ -185,7 +188,7 @@ async def upload_scenario_image(
 @router.get("/health")
 async def check_s3_health():
     """S3 스토리지 상태 확인"""
-    s3_client = get_s3_client()
+    s3_client = s3_module.get_s3_client()
 
     return {
         "s3_available": s3_client.is_available,
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
-from services.chatbot_service import ChatbotService
+from core.lazy_import import LazyModule
+
+# LLM/Vector DB 클라이언트를 끌어오므로 첫 요청 시 import
+chatbot_service = LazyModule("services.chatbot_service")
 
 router = APIRouter(prefix="/api/chatbot", tags=["chatbot"])
 
@@ -19,7 +22,7 @@ async def query_chatbot(req: ChatRequest):
     - 사용자의 질문을 받아 적절한 답변과 추가 선택지를 반환합니다.
     """
     try:
-        response = await ChatbotService.generate_response(req.query)
+        response = await chatbot_service.ChatbotService.generate_response(req.query)
         return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,25 +1,36 @@
 import logging
 import json
 import traceback
+import random
 from datetime import datetime
 import asyncio
-from langchain_core.messages import SystemMessage, HumanMessage
 from fastapi import APIRouter, Request, Form, Depends, BackgroundTasks, Query
 from fastapi.responses import StreamingResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool, iterate_in_threadpool
 from sqlalchemy.orm import Session
 
 from core.state import GameState, WorldState as WorldStateManager
-import game_engine
+from core.state_diff import StateSyncRegistry
+from core.sse import TokenCoalescer, coalesce_tokens
+from core.scenario_assets import ScenarioAssetCache
+from core.lazy_import import LazyModule
 from routes.auth import get_current_user_optional, CurrentUser
-from models import GameSession, get_db
+from models import GameSession, run_with_session_async
+from services.session_writer import GameSessionWriter, build_snapshot, load_session_logs, merge_session_logs
 from schemas import GameAction
 
 logger = logging.getLogger(__name__)
 
+# LangGraph/LangChain을 끌어오므로 첫 사용 시 import
+game_engine = LazyModule("game_engine")
+
 game_router = APIRouter(prefix="/game", tags=["game"])
 
 # 최대 재시도 횟수
 MAX_RETRIES = 2
+# 재시도 간 대기 (지수 백오프 + 지터) - 여러 세션이 동시에 재시도해 429가 몰리는 것 방지
+RETRY_BACKOFF_BASE = 0.5  # 초
+RETRY_BACKOFF_MAX = 2.0  # 초
 
 
 def enrich_world_state(world_state: dict, player_state: dict, scenario: dict = None,
@@ -81,6 +92,7 @@ def enrich_world_state(world_state: dict, player_state: dict, scenario: dict = N
 def enrich_inventory(player_vars: dict, scenario: dict) -> dict:
     """
     인벤토리 아이템을 상세 정보(이미지 포함)로 변환
+    (아이템 맵은 시나리오 버전마다 한 번만 만들어 재사용)
     """
     enriched = player_vars.copy() if player_vars else {}
     inventory = enriched.get('inventory', [])
@@ -88,71 +100,15 @@ def enrich_inventory(player_vars: dict, scenario: dict) -> dict:
     if not inventory:
         return enriched
 
-    # 시나리오 아이템 데이터 매핑 (name -> data)
-    scenario_items = {}
-    
-    # [FIX] raw_graph 내의 items도 검색 (시나리오 구조에 따라 items 위치가 다를 수 있음)
-    if scenario and 'raw_graph' in scenario and 'items' in scenario['raw_graph']:
-        for item in scenario['raw_graph']['items']:
-            if isinstance(item, dict) and 'name' in item:
-                item_name = item['name'].strip()
-                # 이미 있으면(최상위 items 우선), raw_graph 것은 덮어쓰지 않거나 병합
-                # 여기서는 raw_graph에만 이미지 정보가 있을 수도 있으므로, 없는 필드만 보강하도록 처리
-                if item_name not in scenario_items:
-                    scenario_items[item_name] = item
-                else:
-                    # 기존 정보에 이미지가 없으면 raw_graph 정보 사용
-                    if 'image' not in scenario_items[item_name] and 'image' in item:
-                        scenario_items[item_name]['image'] = item['image']
-
-    # [FIX] raw_graph 내의 nodes(씬/엔딩 등)에 정의된 items도 검색 (이미지가 여기에만 숨어있는 경우 대응)
-    if scenario and 'raw_graph' in scenario and 'nodes' in scenario['raw_graph']:
-        for node in scenario['raw_graph']['nodes']:
-            if 'data' in node and 'items' in node['data']:
-                for item in node['data']['items']:
-                    if isinstance(item, dict) and 'name' in item:
-                        item_name = item['name'].strip()
-                        # 이미지 정보가 있는 경우에만 업데이트 시도
-                        if 'image' in item and item['image']:
-                            if item_name not in scenario_items:
-                                scenario_items[item_name] = item
-                            elif 'image' not in scenario_items[item_name]:
-                                # 기존에 항목은 있지만 이미지가 없는 경우 업데이트
-                                scenario_items[item_name]['image'] = item['image']
-
-    enriched_inventory = []
-    for item in inventory:
-        # 이미 객체라면 스킵
-        if isinstance(item, dict):
-            enriched_inventory.append(item)
-            continue
-            
-        item_name = str(item)
-        item_data = {'name': item_name}
-        
-        # 상세 정보 병합
-        if item_name in scenario_items:
-            # 설명 등 기본 정보 복사 (image 필드가 있으면 덮어씌워짐)
-            item_data.update(scenario_items[item_name])
-
-        # [MOVED] 이미지 필드가 명시적으로 있는 경우에만 경로 해결 (자동 생성 제거로 404 방지)
-        if 'image' in item_data and item_data['image']:
-            # [FIX] 모든 이미지를 get_minio_url로 통과시켜 내부망 URL(internal/localhost) 등을 프록시 경로로 변환
-            # (이미 유효한 외부 URL은 그대로 반환됨)
-            original_image = item_data['image']
-            item_data['image'] = game_engine.get_minio_url('ai-images/item', original_image)
-            logger.info(f"🖼️ [INVENTORY] Resolved scenario image URL for '{item_name}': {item_data['image']}")
-        
-        enriched_inventory.append(item_data)
-        
-    enriched['inventory'] = enriched_inventory
+    assets = ScenarioAssetCache.get(scenario, game_engine.get_minio_url)
+    # 이미 객체라면 그대로, 이름이면 시나리오 아이템 정보(이미지 URL 해석 완료)와 병합
+    enriched['inventory'] = [item if isinstance(item, dict) else assets.item(str(item)) for item in inventory]
     return enriched
 
 
 @game_router.get('/session_state')
 async def get_session_state(
         session_id: str = Query(..., description="세션 ID"),
-        db: Session = Depends(get_db),
         user: CurrentUser = Depends(get_current_user_optional)
 ):
     """
@@ -161,7 +117,7 @@ async def get_session_state(
     ✅ [FIX 1-A] world_state를 enrich하여 항상 완전한 데이터 반환
     """
     try:
-        game_session = db.query(GameSession).filter_by(session_key=session_id).first()
+        game_session = await find_game_session_async(session_id)
 
         if not game_session:
             return JSONResponse(
@@ -239,83 +195,72 @@ def save_game_session(db: Session, state: dict, user_id: str = None, session_key
         session_key: 세션 키
     """
     try:
-        # [경량화] scenario 전체가 아닌 scenario_id만 사용
-        scenario_id = state.get('scenario_id', 0)
-        current_scene_id = state.get('current_scene_id', '')
-
-        # ✅ [FIX 1-1] 원본 state를 mutate하지 않도록 deepcopy 사용
-        import copy
-        world_state_data = copy.deepcopy(state.get('world_state', {}))
-
-        # 저장용 state는 world_state 제외 (deepcopy로 원본 보호)
-        state_for_db = copy.deepcopy(state)
-        state_for_db.pop('world_state', None)
-
-        # ✅ [B-2] world_state가 없어도 빈 인스턴스를 만들지 않음 (데이터 손실 방지)
-        if not world_state_data:
-            # 빈 dict로 유지하고 새 인스턴스 생성 금지
-            world_state_data = {}
-            logger.warning(f"⚠️ [DB SAVE] world_state is empty - saving empty dict (no new instance created)")
-
-        # ✅ [B-2] location 동기화는 dict 부분 수정만 허용 (world_state_data가 있을 때만)
-        if isinstance(world_state_data, dict) and current_scene_id:
-            world_state_data['location'] = current_scene_id
-            logger.info(f"🔧 [DB SAVE] Synced world_state.location = {current_scene_id}")
-
-        # ✅ [FIX 1-B] stuck_count를 world_state에 미러링 (player_state → world_state)
-        if isinstance(world_state_data, dict):
-            stuck_count_from_state = state.get('stuck_count', 0)
-            world_state_data['stuck_count'] = stuck_count_from_state
-            logger.info(f"🔧 [DB SAVE] Mirrored stuck_count to world_state: {stuck_count_from_state}")
-
-        turn_count = world_state_data.get('turn_count', 0) if isinstance(world_state_data, dict) else 0
-
-        if session_key:
-            # 기존 세션 업데이트
-            game_session = db.query(GameSession).filter_by(session_key=session_key).first()
-            if game_session:
-                game_session.player_state = state_for_db  # world_state 제외된 경량화된 상태
-                game_session.world_state = world_state_data  # 별도 컬럼에 저장
-                game_session.current_scene_id = current_scene_id
-                game_session.turn_count = turn_count
-                game_session.last_played_at = datetime.now()
-                game_session.updated_at = datetime.now()
-                db.commit()
-                logger.info(f"✅ [DB] Game session updated: {session_key}")
-
-                return session_key
-            else:
-                logger.warning(f"⚠️ [DB] Session key provided but not found, creating new: {session_key}")
-
-        # 신규 세션 생성
-        import uuid
-        new_session_key = session_key if session_key else str(uuid.uuid4())
-
-        game_session = GameSession(
-            user_id=user_id,
-            session_key=new_session_key,
-            scenario_id=scenario_id,
-            player_state=state_for_db,  # world_state 제외된 경량화된 상태
-            world_state=world_state_data,  # 별도 컬럼에 저장
-            current_scene_id=current_scene_id,
-            turn_count=turn_count
-        )
-
-        db.add(game_session)
-        db.commit()
-        logger.info(f"✅ [DB] New game session created: {new_session_key}")
+        # 원본 state는 수정하지 않고 직렬화된 스냅샷으로 저장 (deepcopy 없음)
+        snapshot = build_snapshot(state, user_id, session_key)
+        if snapshot.current_scene_id:
+            logger.info(f"🔧 [DB SAVE] Synced world_state.location = {snapshot.current_scene_id}")
+
+        # SELECT 없이 UPDATE 한 번 (행이 없으면 INSERT)
+        updated = GameSessionWriter.write_now(snapshot, db)
+        if updated:
+            logger.info(f"✅ [DB] Game session updated: {snapshot.session_key}")
+        else:
+            if session_key:
+                logger.warning(f"⚠️ [DB] Session key provided but not found, created new: {session_key}")
+            logger.info(f"✅ [DB] New game session created: {snapshot.session_key}")
 
-        return new_session_key
+        return snapshot.session_key
 
     except Exception as e:
         logger.error(f"❌ [DB] Failed to save game session: {e}")
-        db.rollback()
         return session_key  # 실패 시 기존 세션 키 반환
 
 
+def _restore_player_state(session_key: str, player_state: dict, world_state: dict, db_scene_id: str,
+                          turn_count: int) -> dict:
+    """저장된 player_state/world_state 컬럼 값 -> 게임 엔진용 PlayerState"""
+    # WorldState 복원 (싱글톤 인스턴스에 로드)
+    wsm = WorldStateManager()
+    wsm.from_dict(world_state)
+
+    # ✅ [작업 1] DB에서 로드한 current_scene_id가 최신 값인지 검증
+    state_scene_id = player_state.get('current_scene_id', '')
+    ws_location = world_state.get('location', '')
+
+    # 우선순위: DB의 current_scene_id > world_state.location > player_state.current_scene_id
+    verified_scene_id = db_scene_id or ws_location or state_scene_id
+
+    if db_scene_id != state_scene_id or db_scene_id != ws_location:
+        logger.warning(
+            f"⚠️ [DB LOAD] Scene ID mismatch detected! "
+            f"DB: {db_scene_id}, PlayerState: {state_scene_id}, WorldState: {ws_location}"
+        )
+        logger.info(f"🔧 [DB LOAD] Using verified scene_id: {verified_scene_id}")
+
+    # player_state의 current_scene_id를 검증된 값으로 강제 업데이트
+    player_state['current_scene_id'] = verified_scene_id
+    wsm.location = verified_scene_id
+
+    # ✅ [FIX] world_state를 player_state에 포함시켜 game_engine이 초기화하지 않도록 함
+    if world_state:
+        player_state['world_state'] = world_state
+        logger.info(f"🌍 [DB LOAD] world_state included in player_state (location: {verified_scene_id})")
+
+    logger.info(f"✅ [DB] Game session loaded: {session_key} (Turn: {turn_count}, Scene: {verified_scene_id})")
+    return player_state
+
+
+def _restore_from_snapshot(snapshot) -> dict:
+    # 스냅샷은 문자열이므로 매번 새 dict로 디코드됨 (호출 측이 수정해도 안전)
+    player_state, world_state = snapshot.restore()
+    return _restore_player_state(snapshot.session_key, player_state, world_state, snapshot.current_scene_id,
+                                 snapshot.turn_count)
+
+
 def load_game_session(db: Session, session_key: str):
     """
     🛠️ DB에서 WorldState 복원 (경량화 버전)
+    - 아직 DB에 기록되지 않은 턴 저장이 있으면 그 스냅샷에서 복원
 
     Args:
         db: DB 세션
@@ -325,53 +270,80 @@ def load_game_session(db: Session, session_key: str):
         PlayerState 딕셔너리 또는 None
     """
     try:
+        pending = GameSessionWriter.get_pending(session_key)
+        if pending is not None:
+            return _restore_from_snapshot(pending)
+
         game_session = db.query(GameSession).filter_by(session_key=session_key).first()
 
         if not game_session:
             logger.warning(f"⚠️ [DB] Game session not found: {session_key}")
             return None
 
-        # WorldState 복원 (싱글톤 인스턴스에 로드)
-        wsm = WorldStateManager()
-        wsm.from_dict(game_session.world_state)
+        # [경량화] PlayerState는 world_state를 포함하지 않음, 누적 로그(history)는 별도 테이블에서 합침
+        player_state, world_state = game_session.player_state, game_session.world_state
+        merge_session_logs(player_state, world_state, load_session_logs(db, session_key))
+        return _restore_player_state(session_key, player_state, world_state,
+                                     game_session.current_scene_id, game_session.turn_count)
 
-        # [경량화] PlayerState는 world_state를 포함하지 않음
-        player_state = game_session.player_state
+    except Exception as e:
+        logger.error(f"❌ [DB] Failed to load game session: {e}")
+        return None
 
-        # ✅ [작업 1] DB에서 로드한 current_scene_id가 최신 값인지 검증
-        db_scene_id = game_session.current_scene_id
-        state_scene_id = player_state.get('current_scene_id', '')
-        ws_location = game_session.world_state.get('location', '')
 
-        # 우선순위: DB의 current_scene_id > world_state.location > player_state.current_scene_id
-        verified_scene_id = db_scene_id or ws_location or state_scene_id
+def _find_game_session(db: Session, session_key: str):
+    return db.query(GameSession).filter_by(session_key=session_key).first()
 
-        if db_scene_id != state_scene_id or db_scene_id != ws_location:
-            logger.warning(
-                f"⚠️ [DB LOAD] Scene ID mismatch detected! "
-                f"DB: {db_scene_id}, PlayerState: {state_scene_id}, WorldState: {ws_location}"
-            )
-            logger.info(f"🔧 [DB LOAD] Using verified scene_id: {verified_scene_id}")
 
-        # player_state의 current_scene_id를 검증된 값으로 강제 업데이트
-        player_state['current_scene_id'] = verified_scene_id
-        wsm.location = verified_scene_id
+async def find_game_session_async(session_key: str):
+    """세션 레코드 조회 (비동기 엔진, 반환된 레코드의 컬럼 값은 세션 종료 후에도 읽을 수 있음)"""
+    # 대기 중인 턴 저장이 있으면 먼저 기록해서 최신 행을 읽음 (쓰기 잠금 대기는 이벤트 루프 밖에서)
+    if GameSessionWriter.get_pending(session_key) is not None:
+        await asyncio.to_thread(GameSessionWriter.flush_session, None, session_key)
+    return await run_with_session_async(_find_game_session, session_key)
 
-        # ✅ [FIX] world_state를 player_state에 포함시켜 game_engine이 초기화하지 않도록 함
-        if game_session.world_state:
-            player_state['world_state'] = game_session.world_state
-            logger.info(f"🌍 [DB LOAD] world_state included in player_state (location: {verified_scene_id})")
 
-        logger.info(
-            f"✅ [DB] Game session loaded: {session_key} "
-            f"(Turn: {game_session.turn_count}, Scene: {verified_scene_id})"
-        )
+async def find_session_for_turn_async(session_key: str):
+    """
+    턴 시작 시 세션 확인용 (scenario_id만 읽음)
+    - scenario_id는 바뀌지 않으므로 대기 중인 스냅샷이 있으면 기록 없이 그 스냅샷 반환
 
-        return player_state
+    Returns:
+        SessionSnapshot 또는 GameSession 레코드 (둘 다 scenario_id 보유), 없으면 None
+    """
+    pending = GameSessionWriter.get_pending(session_key)
+    if pending is not None:
+        return pending
+    return await run_with_session_async(_find_game_session, session_key)
 
-    except Exception as e:
-        logger.error(f"❌ [DB] Failed to load game session: {e}")
-        return None
+
+async def save_game_session_async(state: dict, user_id: str = None, session_key: str = None,
+                                  coalesce: bool = False):
+    """
+    save_game_session의 비동기 버전
+
+    coalesce=True: 스냅샷만 만들어 쓰기 대기열에 넣고 바로 반환 (턴 종료 저장용)
+    - SESSION_WRITE_DELAY_MS 안에 배치로 기록되며, 그 사이 같은 세션의 저장은 하나로 합쳐짐
+    """
+    if coalesce and session_key:
+        try:
+            GameSessionWriter.enqueue(build_snapshot(state, user_id, session_key))
+        except Exception as e:
+            logger.error(f"❌ [DB] Failed to queue game session save: {e}")
+        return session_key
+    return await run_with_session_async(save_game_session, state, user_id, session_key)
+
+
+async def load_game_session_async(session_key: str):
+    """load_game_session의 비동기 버전"""
+    pending = GameSessionWriter.get_pending(session_key)
+    if pending is not None:
+        try:
+            return _restore_from_snapshot(pending)
+        except Exception as e:
+            logger.error(f"❌ [DB] Failed to load game session: {e}")
+            return None
+    return await run_with_session_async(load_game_session, session_key)
 
 
 @game_router.post('/act')
@@ -384,8 +356,7 @@ async def game_act():
 async def game_act_stream(
         request: Request,
         background_tasks: BackgroundTasks,
-        user: CurrentUser = Depends(get_current_user_optional),
-        db: Session = Depends(get_db)
+        user: CurrentUser = Depends(get_current_user_optional)
 ):
     """스트리밍 방식 - SSE (LangGraph 기반) + WorldState DB 영속성 + 세션/시나리오 정합성 검증"""
 
@@ -397,6 +368,7 @@ async def game_act_stream(
         scenario_id = json_body.get('scenario_id')  # ✅ 추가: 클라이언트에서 보낸 scenario_id
         model = json_body.get('model', 'openai/tngtech/deepseek-r1t2-chimera:free')
         provider = json_body.get('provider', 'deepseek')
+        state_version = json_body.get('state_version')  # 클라이언트가 마지막으로 적용한 턴 상태 버전
     except:
         # JSON 파싱 실패 시 에러 반환
         def error_gen():
@@ -415,7 +387,7 @@ async def game_act_stream(
         logger.info(f"🔍 [SESSION] Client provided session_id: {session_id}, scenario_id: {scenario_id}")
 
         # DB에서 세션 복구 시도
-        game_session_record = db.query(GameSession).filter_by(session_key=session_id).first()
+        game_session_record = await find_session_for_turn_async(session_id)
 
         if game_session_record:
             # ✅ [중요] 세션의 scenario_id와 요청받은 scenario_id 일치 여부 검증
@@ -431,7 +403,7 @@ async def game_act_stream(
                 session_id = None  # 세션 무효화
             else:
                 # ✅ 시나리오 일치 확인됨 - 세션 복구
-                restored_state = load_game_session(db, session_id)
+                restored_state = await load_game_session_async(session_id)
 
                 if restored_state:
                     # ✅ DB에서 복구한 세션으로 로컬 game_state에 설정
@@ -563,7 +535,8 @@ async def game_act_stream(
                 current_state['is_game_start'] = False
 
                 # LangGraph invoke - 이미 world_state를 포함하고 있음
-                processed_state = game_state.game_graph.invoke(current_state)
+                # 노드의 LLM 호출/동시 실행 제한 대기가 이벤트 루프(다른 SSE 스트림)를 막지 않도록 스레드 풀에서 실행
+                processed_state = await run_in_threadpool(game_state.game_graph.invoke, current_state)
                 game_state.state = processed_state
 
                 # ✅ [치명적 버그 수정] LangGraph가 생성한 world_state를 절대 덮어쓰지 않음
@@ -605,13 +578,14 @@ async def game_act_stream(
                 logger.info(f"✨ [API] Trigger Found! Threshold: {combat_trigger.get('threshold')}")
                 try:
                     from llm_factory import LLMFactory
+                    from core.llm_limiter import LLMPriority
                     logger.info("🛠️ [API] Importing LLMFactory success")
                     
                     # [DEBUG] LLM 생성 로그
                     model_name = "google/gemini-2.0-flash-001"
                     logger.info(f"🛠️ [API] Creating LLM: {model_name}")
                     
-                    llm = LLMFactory.get_llm(model_name)
+                    llm = LLMFactory.get_llm(model_name, priority=LLMPriority.GAMEPLAY)
                     logger.info(f"✅ [API] LLM Created: {type(llm)}")
                     desc_prompt = f"""
                     [TRPG 전투 상황]
@@ -624,6 +598,7 @@ async def game_act_stream(
                     """
                     
                     # Async generation
+                    from langchain_core.messages import SystemMessage, HumanMessage
                     messages = [
                         SystemMessage(content="당신은 TRPG 전투 내레이터입니다."),
                         HumanMessage(content=desc_prompt)
@@ -661,21 +636,12 @@ async def game_act_stream(
             # ✅ 작업 4: 첫 턴(세션이 DB에 없을 때)에만 최초 저장, 이후 매 턴마다 업데이트
             if not session_id:
                 # ✅ 첫 턴: DB에 세션이 없으므로 새로 생성
-                session_id = save_game_session(db, processed_state, user_id, None)
+                session_id = await save_game_session_async(processed_state, user_id, None)
                 logger.info(f"✅ [FIRST TURN] Created new session in DB: {session_id}")
             else:
-                # ✅ DB에서 세션 존재 여부 확인
-                existing_session = db.query(GameSession).filter_by(session_key=session_id).first()
-
-                if not existing_session:
-                    # ✅ 클라이언트가 session_id를 보냈지만 DB에 없는 경우 (load_scenario 직후)
-                    # 이 경우에만 최초 저장 수행
-                    session_id = save_game_session(db, processed_state, user_id, session_id)
-                    logger.info(f"✅ [FIRST TURN AFTER LOAD] Created session in DB with provided key: {session_id}")
-                else:
-                    # ✅ 일반 턴: 기존 세션 업데이트
-                    session_id = save_game_session(db, processed_state, user_id, session_id)
-                    logger.info(f"✅ [SESSION UPDATE] Updated existing session: {session_id}")
+                # ✅ 기존 세션 업데이트 (쓰기 대기열에 넣고 배치 기록, DB에 없으면 받은 키로 최초 저장)
+                session_id = await save_game_session_async(processed_state, user_id, session_id, coalesce=True)
+                logger.info(f"✅ [SESSION UPDATE] Queued session save: {session_id}")
 
             # ✅ [작업 1] Redis 저장을 background_tasks로 비동기 처리
             cache_data = {
@@ -763,8 +729,9 @@ async def game_act_stream(
                     prologue_html = '<div class="mb-6 p-4 bg-indigo-900/20 rounded-xl border border-indigo-500/30"><div class="text-indigo-400 font-bold text-sm mb-3 uppercase tracking-wider">[ Prologue ]</div><div class="text-gray-200 leading-relaxed serif-font text-lg">'
                     yield f"data: {json.dumps({'type': 'prefix', 'content': prologue_html})}\n\n"
 
-                    for chunk in game_engine.prologue_stream_generator(processed_state):
-                        yield f"data: {json.dumps({'type': 'token', 'content': chunk})}\n\n"
+                    async for frame in iterate_in_threadpool(
+                            coalesce_tokens(game_engine.prologue_stream_generator(processed_state))):
+                        yield frame
 
                     yield f"data: {json.dumps({'type': 'section_end', 'content': '</div></div>'})}\n\n"
                     hr_content = '<hr class="border-gray-800 my-6">';
@@ -783,7 +750,7 @@ async def game_act_stream(
                 logger.info(f"🎮 [PROLOGUE -> SCENE] Moving to: {first_scene_id}")
 
                 # 첫 씬 묘사 (재시도 로직 포함)
-                for result in stream_scene_with_retry(processed_state):
+                async for result in stream_scene_with_retry(processed_state):
                     yield result
 
             # D. 엔딩
@@ -796,7 +763,7 @@ async def game_act_stream(
             else:
                 # [FIX] 전투 묘사가 생성되었으면 기본 내레이션 생략 (User Request)
                 if not combat_desc_generated:
-                    for result in stream_scene_with_retry(processed_state):
+                    async for result in stream_scene_with_retry(processed_state):
                         yield result
                 else:
                     logger.info("🚫 [NARRATOR] Skipped standard narration due to Combat Description")
@@ -805,50 +772,17 @@ async def game_act_stream(
             player_vars = processed_state.get('player_vars', {})
             # [FIX] inventory Enrich (이미지 처리)
             stats_data = enrich_inventory(player_vars, scenario)
-            yield f"data: {json.dumps({'type': 'stats', 'content': stats_data})}\n\n"
+            # stats / world_state / npc_status는 모아서 마지막에 델타(또는 전체)로 전송
+            turn_state = {'stats': stats_data}
 
             # ✅ [수정 3] World State 전송 시 processed_state의 world_state를 그대로 사용
             world_state_data = processed_state.get('world_state', {})
 
-            # 1-1. 배경 이미지 확인 및 전송
+            # 1-1. 배경 이미지 확인 및 전송 (scenes/endings -> raw_graph nodes 순, 미리 만든 맵 사용)
+            assets = ScenarioAssetCache.get(scenario, game_engine.get_minio_url)
             current_loc = processed_state.get('current_scene_id')
             if current_loc:
-                bg_image_url = ""
-                
-                # A. 시나리오 scenes/endings 모두 검색 (ID 매칭을 위해 통합)
-                search_list = scenario.get('scenes', []) + scenario.get('endings', [])
-                
-                for item in search_list:
-                    # scene_id 또는 ending_id 매칭 (대소문자 무시하지 않음 - ID는 고유해야 함. 필요시 lower() 적용)
-                    item_id = item.get('scene_id') or item.get('ending_id')
-                    
-                    if item_id == current_loc:
-                        # [FIX] Endings often use 'image' instead of 'background_image'
-                        bg_image_url = item.get('background_image', '') or item.get('image', '') or item.get('image_prompt', '')
-                        if bg_image_url:
-                            # [FIX] URL resolution for internal/external paths
-                            bg_image_url = game_engine.get_minio_url('bg', bg_image_url)
-                        break
-                
-                # B. [FIX] raw_graph 내의 nodes에서도 검색 (누락 방지)
-                if not bg_image_url and scenario and 'raw_graph' in scenario and 'nodes' in scenario['raw_graph']:
-                    for node in scenario['raw_graph']['nodes']:
-                         # Node ID가 current_loc와 일치(대소문자 무시)하거나, scene-id 매칭
-                         node_id = node.get('id', '').lower()
-                         target_id = current_loc.lower()
-                         
-                         # 매칭 조건: ID 일치 또는 data.scene_id/ending_id 일치
-                         is_match = (node_id == target_id)
-                         if not is_match and 'data' in node:
-                             data_id = node['data'].get('scene_id') or node['data'].get('ending_id')
-                             if data_id and data_id.lower() == target_id:
-                                 is_match = True
-                                 
-                         if is_match and 'data' in node:
-                             bg_image_url = node['data'].get('background_image', '') or node['data'].get('image', '')
-                             if bg_image_url:
-                                 bg_image_url = game_engine.get_minio_url('bg', bg_image_url)
-                                 break
+                bg_image_url = assets.background(current_loc)
 
                 # 배경 이미지가 있으면 클라이언트로 전송
                 if bg_image_url:
@@ -869,20 +803,9 @@ async def game_act_stream(
 
                 location_scene_title = ''
 
-                # 시나리오에서 해당 씬의 title 또는 name 찾기
+                # 시나리오에서 해당 씬의 title 또는 name 찾기 (Scenes + Endings)
                 if location_scene_id:
-                    # Scenes + Endings 모두 검색
-                    all_locations = scenario.get('scenes', []) + scenario.get('endings', [])
-                    
-                    for loc in all_locations:
-                        # scene_id 또는 ending_id 매칭
-                        current_id = loc.get('scene_id') or loc.get('ending_id')
-                        if current_id == location_scene_id:
-                            # title 필드가 있으면 사용, 없으면 name 필드 사용
-                            location_scene_title = loc.get('title') or loc.get('name', '')
-                            logger.info(
-                                f"🗺️ [WORLD STATE] Found title/name for {location_scene_id}: {location_scene_title}")
-                            break
+                    location_scene_title = assets.title(location_scene_id)
 
                     # title을 못 찾은 경우 로그
                     if not location_scene_title:
@@ -909,7 +832,7 @@ async def game_act_stream(
                     f"title={world_state_with_scene['current_scene_title']}, "
                     f"stuck_count={stuck_count_value}")
 
-                yield f"data: {json.dumps({'type': 'world_state', 'content': world_state_with_scene})}\n\n"
+                turn_state['world_state'] = world_state_with_scene
 
             # NPC 정보 전송 (WorldState에서 추출 + 시나리오 전체 NPC)
             curr_scene_id = processed_state.get('current_scene_id', '')
@@ -986,9 +909,12 @@ async def game_act_stream(
                         if isinstance(entity, dict) and entity.get('image'):
                             all_scenario_npcs[entity_name]['image'] = entity['image']
 
-            # 전체 NPC 정보 전송
             if all_scenario_npcs:
-                yield f"data: {json.dumps({'type': 'npc_status', 'content': all_scenario_npcs})}\n\n"
+                turn_state['npc_status'] = all_scenario_npcs
+
+            # 턴 상태 전송: 클라이언트 확인 버전과 일치하면 바뀐 필드만 패치로, 아니면 전체 스냅샷
+            for event in StateSyncRegistry.build_events(session_id, state_version, turn_state):
+                yield f"data: {json.dumps(event)}\n\n"
 
             # 🛠️ 세션 키 전송 (클라이언트가 다음 요청에 사용)
             if session_id:
@@ -1007,35 +933,51 @@ async def game_act_stream(
     )
 
 
-def stream_scene_with_retry(state):
-    """씬 스트리밍 with 재시도 로직"""
+async def stream_scene_with_retry(state):
+    """
+    씬 스트리밍 with 재시도 로직
+    - 동기 서사 제너레이터(LLM 스트림, 동시 실행 제한 대기)는 청크마다 스레드 풀에서 진행해 이벤트 루프를 막지 않음
+    """
     retry_count = 0
 
     while retry_count <= MAX_RETRIES:
-        buffer = ""
         need_retry = False
+        # 1~3자 청크를 시간/크기 기준으로 묶어 프레임 수를 줄임 (다른 이벤트 전에는 반드시 flush)
+        coalescer = TokenCoalescer()
 
-        for chunk in game_engine.scene_stream_generator(state, retry_count=retry_count, max_retries=MAX_RETRIES):
+        scene_stream = game_engine.scene_stream_generator(state, retry_count=retry_count, max_retries=MAX_RETRIES)
+        async for chunk in iterate_in_threadpool(scene_stream):
             # 재시도 신호 감지
             if "__RETRY_SIGNAL__" in chunk:
                 need_retry = True
+                scene_stream.close()
                 break
             
             # [FIX] 프리픽스 마커 처리 (이미지 플리커링 방지)
             if "__PREFIX_START__" in chunk:
+                pending = coalescer.flush()
+                if pending:
+                    yield pending
                 content = chunk.replace("__PREFIX_START__", "").replace("__PREFIX_END__", "")
                 if content.strip():
                     yield f"data: {json.dumps({'type': 'prefix', 'content': content})}\n\n"
                 continue
 
-            buffer += chunk
-            yield f"data: {json.dumps({'type': 'token', 'content': chunk})}\n\n"
+            frame = coalescer.push(chunk)
+            if frame:
+                yield frame
+
+        pending = coalescer.flush()
+        if pending:
+            yield pending
 
         if need_retry:
             retry_count += 1
             if retry_count <= MAX_RETRIES:
                 logger.info(f"🔄 [RETRY] Attempt {retry_count}/{MAX_RETRIES}")
                 yield f"data: {json.dumps({'type': 'retry', 'attempt': retry_count, 'max': MAX_RETRIES})}\n\n"
+                backoff = min(RETRY_BACKOFF_BASE * (2 ** (retry_count - 1)), RETRY_BACKOFF_MAX)
+                await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
             else:
                 logger.warning(f"⚠️ [FALLBACK] Max retries exceeded")
                 fallback_msg = game_engine.get_narrative_fallback_message(state.get('scenario', {}))
@@ -1053,15 +995,14 @@ def stream_scene_with_retry(state):
 
 @game_router.get('/session/{session_key}')
 async def get_game_session_data(
-        session_key: str,
-        db: Session = Depends(get_db)
+        session_key: str
 ):
     """
     🛠️ Railway DB에서 게임 세션 데이터 불러오기
     - Player Status, NPC Status, World State 포함
     """
     try:
-        game_session = db.query(GameSession).filter_by(session_key=session_key).first()
+        game_session = await find_game_session_async(session_key)
 
         if not game_session:
             return JSONResponse({
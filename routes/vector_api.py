@@ -8,12 +8,10 @@ from pydantic import BaseModel
 from typing import Optional, List
 import logging
 
-from services.npc_service import (
-    save_npc_conversation,
-    search_npc_memories,
-    save_npc_lore,
-    get_npc_context_for_ai
-)
+from core.lazy_import import LazyModule
+
+# qdrant_client/google.genai를 끌어오므로 첫 요청 시 import
+npc_service = LazyModule("services.npc_service")
 
 router = APIRouter(prefix="/api/vector", tags=["Vector DB"])
 logger = logging.getLogger(__name__)
@@ -65,7 +63,7 @@ async def api_save_conversation(request: ConversationRequest):
     ```
     """
     try:
-        success = await save_npc_conversation(
+        success = await npc_service.save_npc_conversation(
             npc_id=request.npc_id,
             scenario_id=request.scenario_id,
             user_message=request.user_message,
@@ -133,7 +131,7 @@ async def api_search_memories(request: MemorySearchRequest):
     ```
     """
     try:
-        memories = await search_npc_memories(
+        memories = await npc_service.search_npc_memories(
             npc_id=request.npc_id,
             query=request.query,
             scenario_id=request.scenario_id,
@@ -170,7 +168,7 @@ async def api_save_lore(request: LoreRequest):
     ```
     """
     try:
-        success = await save_npc_lore(
+        success = await npc_service.save_npc_lore(
             npc_id=request.npc_id,
             scenario_id=request.scenario_id,
             lore_text=request.lore_text,
@@ -224,7 +222,7 @@ async def api_get_ai_context(request: ContextRequest):
     ```
     """
     try:
-        context = await get_npc_context_for_ai(
+        context = await npc_service.get_npc_context_for_ai(
             npc_id=request.npc_id,
             current_situation=request.current_situation,
             scenario_id=request.scenario_id,
@@ -17,6 +17,8 @@ except ImportError:
     from llm_factory import LLMFactory
     # fallback default model if not defined in factory
     DEFAULT_MODEL = "openai/tngtech/deepseek-r1t2-chimera:free"
+from core.llm_limiter import LLMPriority
+from core.llm_response_cache import LLMResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +44,7 @@ class AuditResult:
     summary: str = ""
     parent_scenes: List[str] = field(default_factory=list)
     child_scenes: List[str] = field(default_factory=list)
+    llm_called: bool = False  # 실제로 LLM을 호출했는지 (캐시 적중/조기 종료면 False - 과금 판단용)
 
     def to_dict(self) -> Dict[str, Any]:
         """결과를 딕셔너리로 변환 (API 응답용)"""
@@ -55,7 +58,8 @@ class AuditResult:
             'child_scenes': self.child_scenes,
             'has_errors': any(i.severity == 'error' for i in self.issues),
             'has_warnings': any(i.severity == 'warning' for i in self.issues),
-            'issue_count': len(self.issues)
+            'issue_count': len(self.issues),
+            'llm_called': self.llm_called
         }
 
 
@@ -168,6 +172,32 @@ class AIAuditService:
 
     # --- Helper Methods ---
 
+    @staticmethod
+    def _response_text(response) -> str:
+        """LLM 응답 객체에서 본문 문자열 추출"""
+        return response.content if hasattr(response, 'content') else str(response)
+
+    @staticmethod
+    def _cached_invoke(site: str, model_name: Optional[str], prompt: str, llm, refresh: bool = False):
+        """
+        같은 모델 + 같은 프롬프트면 캐시된 감수 결과 재사용 (refresh=True면 캐시를 건너뛰고 다시 검사해 갱신)
+
+        Returns:
+            (응답 본문, 캐시 적중 여부)
+        """
+        called = []
+
+        def call():
+            called.append(True)
+            return AIAuditService._response_text(llm.invoke(prompt))
+
+        content = LLMResponseCache.get_or_call(
+            site, LLMResponseCache.make_key(site, model_name, prompt), call,
+            validate=lambda text: bool(AIAuditService._parse_json_response(text)),
+            refresh=refresh
+        )
+        return content, not called
+
     @staticmethod
     def _parse_json_response(text: str) -> dict:
         """LLM 응답에서 JSON 추출 및 파싱"""
@@ -273,7 +303,8 @@ class AIAuditService:
     def audit_scene_coherence(
         scenario_data: Dict[str, Any],
         scene_id: str,
-        model_name: str = None
+        model_name: str = None,
+        refresh: bool = False
     ) -> AuditResult:
         """씬의 전후 연결성(개연성) 검사"""
         try:
@@ -311,15 +342,14 @@ class AIAuditService:
             llm = LLMFactory.get_llm(
                 model_name=model_name or DEFAULT_MODEL,
                 api_key=api_key,
-                temperature=0.3
+                temperature=0.3,
+                priority=LLMPriority.AUDIT
             )
             
-            # 토큰 사용량 측정
+            # 토큰 사용량 측정 (캐시 적중 시 토큰 0)
             with get_openai_callback() as cb:
-                response = llm.invoke(prompt)
-                result_data = AIAuditService._parse_json_response(
-                    response.content if hasattr(response, 'content') else str(response)
-                )
+                content, cached = AIAuditService._cached_invoke('ai_audit_coherence', model_name, prompt, llm, refresh)
+                result_data = AIAuditService._parse_json_response(content)
                 
                 # 토큰 사용량 정보 저장
                 prompt_tokens = cb.prompt_tokens
@@ -352,7 +382,8 @@ class AIAuditService:
                 issues=issues,
                 summary=result_data.get('summary', '검사 완료'),
                 parent_scenes=[p['scene_id'] for p in parent_scenes],
-                child_scenes=[c['scene_id'] for c in child_scenes]
+                child_scenes=[c['scene_id'] for c in child_scenes],
+                llm_called=not cached
             )
 
         except Exception as e:
@@ -363,7 +394,8 @@ class AIAuditService:
     def audit_trigger_consistency(
         scenario_data: Dict[str, Any],
         scene_id: str,
-        model_name: str = None
+        model_name: str = None,
+        refresh: bool = False
     ) -> AuditResult:
         """선택지와 타겟 씬의 내용 일치성 검사"""
         try:
@@ -402,11 +434,10 @@ class AIAuditService:
             )
 
             api_key = os.getenv("OPENROUTER_API_KEY")
-            llm = LLMFactory.get_llm(model_name=model_name or DEFAULT_MODEL, api_key=api_key, temperature=0.3)
-            response = llm.invoke(prompt)
-            result_data = AIAuditService._parse_json_response(
-                response.content if hasattr(response, 'content') else str(response)
-            )
+            llm = LLMFactory.get_llm(model_name=model_name or DEFAULT_MODEL, api_key=api_key, temperature=0.3,
+                                      priority=LLMPriority.AUDIT)
+            content, cached = AIAuditService._cached_invoke('ai_audit_trigger', model_name, prompt, llm, refresh)
+            result_data = AIAuditService._parse_json_response(content)
 
             issues = []
             for issue in result_data.get('issues', []):
@@ -425,7 +456,8 @@ class AIAuditService:
                 scene_id=scene_id,
                 issues=issues,
                 summary=result_data.get('summary', '트리거 검사 완료'),
-                child_scenes=[t.get('target_scene_id') for t in transitions if t.get('target_scene_id')]
+                child_scenes=[t.get('target_scene_id') for t in transitions if t.get('target_scene_id')],
+                llm_called=not cached
             )
 
         except Exception as e:
@@ -436,11 +468,12 @@ class AIAuditService:
     def full_audit(
         scenario_data: Dict[str, Any],
         scene_id: str,
-        model_name: str = None
+        model_name: str = None,
+        refresh: bool = False
     ) -> Dict[str, Any]:
         """통합 검사 수행"""
-        coherence = AIAuditService.audit_scene_coherence(scenario_data, scene_id, model_name)
-        trigger = AIAuditService.audit_trigger_consistency(scenario_data, scene_id, model_name)
+        coherence = AIAuditService.audit_scene_coherence(scenario_data, scene_id, model_name, refresh)
+        trigger = AIAuditService.audit_trigger_consistency(scenario_data, scene_id, model_name, refresh)
 
         all_issues = coherence.issues + trigger.issues
 
@@ -452,13 +485,15 @@ class AIAuditService:
             'total_issues': len(all_issues),
             'has_errors': any(i.severity == 'error' for i in all_issues),
             'has_warnings': any(i.severity == 'warning' for i in all_issues),
-            'summary': f"{coherence.summary} / {trigger.summary}"
+            'summary': f"{coherence.summary} / {trigger.summary}",
+            'llm_called': coherence.llm_called or trigger.llm_called
         }
 
     @staticmethod
     def recommend_audit_targets(
         scenario_data: Dict[str, Any],
-        model_name: str = None
+        model_name: str = None,
+        refresh: bool = False
     ) -> Dict[str, Any]:
         """[신규] 전체 시나리오 구조 분석 및 검수 대상 추천"""
         try:
@@ -485,11 +520,10 @@ class AIAuditService:
             if not api_key:
                 return {"success": False, "error": "API Key Missing"}
 
-            llm = LLMFactory.get_llm(model_name=model_name or DEFAULT_MODEL, api_key=api_key, temperature=0.1)
-            response = llm.invoke(prompt)
-            result_data = AIAuditService._parse_json_response(
-                response.content if hasattr(response, 'content') else str(response)
-            )
+            llm = LLMFactory.get_llm(model_name=model_name or DEFAULT_MODEL, api_key=api_key, temperature=0.1,
+                                      priority=LLMPriority.AUDIT)
+            content, _ = AIAuditService._cached_invoke('ai_audit_recommendation', model_name, prompt, llm, refresh)
+            result_data = AIAuditService._parse_json_response(content)
 
             return {
                 "success": True,
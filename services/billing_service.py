@@ -0,0 +1,375 @@
+"""
+토큰 과금(Billing) 서비스
+- 잔액은 메모리 캐시에서 예약(reserve) -> 확정(commit) 방식으로 차감
+- TokenLog 행은 큐에 쌓았다가 백그라운드 스레드가 배치로 기록
+- Postgres 잔액은 조건부 UPDATE(잔액 >= 차감액)로 반영하고 주기적으로 메모리와 재동기화(reconcile)
+  다른 워커 프로세스가 먼저 잔액을 써서 전부 걷지 못하면 실제로 걷은 만큼만 TokenLog에 기록
+- 잔액 조회/차감은 모두 이 서비스를 거침 (UserService.get_user_balance / deduct_tokens도 여기로 위임)
+
+LLM 호출이 진행되는 동안 DB 행 잠금(SELECT ... FOR UPDATE)을 잡지 않는 것이 목적.
+"""
+import logging
+import threading
+import time
+import uuid
+from typing import Dict, Any, Optional, List
+
+from sqlalchemy import update
+
+from models import SessionLocal, User, TokenLog
+from config import TokenConfig
+from services.token_usage import TokenUsageStats
+
+logger = logging.getLogger(__name__)
+
+
+class BillingService:
+    """
+    프로세스 단위 과금 원장 (스레드 안전)
+
+    잔액 모델:
+    - _balances[user]: DB 잔액 - 아직 DB에 반영되지 않은 확정 차감액
+    - _held[user]: 진행 중인 예약 금액 합계
+    - 사용 가능 잔액 = _balances[user] - _held[user]
+    """
+
+    _lock = threading.RLock()
+    _flush_lock = threading.Lock()
+
+    _balances: Dict[str, int] = {}
+    _held: Dict[str, int] = {}
+    _last_access: Dict[str, float] = {}
+    _reservations: Dict[str, Dict[str, Any]] = {}
+
+    _pending_logs: List[Dict[str, Any]] = []
+    # 아직 DB에 반영되지 않은 차감액 합계 (= _pending_logs의 유저별 cost_deducted 합)
+    _pending_deltas: Dict[str, int] = {}
+    # DB 잔액이 모자라 걷지 못한 금액 누계 (다른 워커와 동시에 잔액을 쓴 경우)
+    _uncollected_total = 0
+
+    _worker: Optional[threading.Thread] = None
+    _stop_event = threading.Event()
+    _last_reconcile = 0.0
+
+    # --- 잔액 조회 ---
+
+    @classmethod
+    def _load_balance(cls, user_id: str) -> int:
+        """캐시에 없으면 DB에서 한 번 읽어옴 (잠금 없는 단순 SELECT)"""
+        with cls._lock:
+            if user_id in cls._balances:
+                cls._last_access[user_id] = time.monotonic()
+                return cls._balances[user_id]
+
+        db = SessionLocal()
+        try:
+            user = db.query(User.token_balance).filter(User.id == user_id).first()
+            if not user:
+                raise ValueError("User not found")
+            db_balance = user.token_balance
+        finally:
+            db.close()
+
+        with cls._lock:
+            # 다른 스레드가 먼저 적재했다면 그 값을 유지
+            if user_id not in cls._balances:
+                cls._balances[user_id] = db_balance - cls._pending_deltas.get(user_id, 0)
+            cls._last_access[user_id] = time.monotonic()
+            return cls._balances[user_id]
+
+    @classmethod
+    def get_balance(cls, user_id: str) -> int:
+        """예약분을 제외한 사용 가능 잔액"""
+        if not user_id:
+            return 0
+        try:
+            balance = cls._load_balance(user_id)
+        except ValueError:
+            return 0
+        with cls._lock:
+            return max(balance - cls._held.get(user_id, 0), 0)
+
+    # --- 예약 / 확정 / 해제 ---
+
+    @classmethod
+    def reserve(cls, user_id: str, amount: int) -> str:
+        """
+        잔액 선점 (메모리 전용)
+
+        Returns:
+            reservation_id
+        Raises:
+            ValueError: 유저가 없거나 잔액 부족
+        """
+        amount = max(int(amount or 0), 0)
+        cls._load_balance(user_id)
+
+        with cls._lock:
+            available = cls._balances[user_id] - cls._held.get(user_id, 0)
+            if amount > 0 and available < amount:
+                raise ValueError(f"토큰이 부족합니다. (필요: {amount}, 보유: {max(available, 0)})")
+
+            reservation_id = str(uuid.uuid4())
+            cls._reservations[reservation_id] = {"user_id": user_id, "amount": amount}
+            cls._held[user_id] = cls._held.get(user_id, 0) + amount
+            cls._last_access[user_id] = time.monotonic()
+
+        logger.debug(f"[BILLING] Reserved {amount} for {user_id} ({reservation_id})")
+        return reservation_id
+
+    @classmethod
+    def release(cls, reservation_id: str):
+        """예약 취소 (작업 실패 시 환불)"""
+        with cls._lock:
+            reservation = cls._reservations.pop(reservation_id, None)
+            if not reservation:
+                return
+            user_id = reservation["user_id"]
+            cls._held[user_id] = max(cls._held.get(user_id, 0) - reservation["amount"], 0)
+        logger.debug(f"[BILLING] Released reservation {reservation_id}")
+
+    @classmethod
+    def commit(cls, reservation_id: str, cost: int, action_type: str, model_name: str = None,
+               llm_tokens_used: int = 0) -> int:
+        """
+        예약을 실제 비용으로 확정
+        - 예약 금액보다 실제 비용이 크더라도 이미 소비된 토큰이므로 차감 (잔액은 0 미만으로 내려가지 않음)
+
+        Returns:
+            확정 후 사용 가능 잔액
+        """
+        with cls._lock:
+            reservation = cls._reservations.pop(reservation_id, None)
+            if not reservation:
+                raise ValueError(f"Unknown reservation: {reservation_id}")
+            user_id = reservation["user_id"]
+            cls._held[user_id] = max(cls._held.get(user_id, 0) - reservation["amount"], 0)
+            return cls._apply_charge(user_id, cost, action_type, model_name, llm_tokens_used)
+
+    @classmethod
+    def charge(cls, user_id: str, cost: int, action_type: str, model_name: str = None,
+               llm_tokens_used: int = 0) -> int:
+        """
+        예약 없이 즉시 차감 (UserService.deduct_tokens와 같은 계약, DB 잠금 없음)
+
+        Raises:
+            ValueError: 유저가 없거나 잔액 부족
+        """
+        cost = max(int(cost or 0), 0)
+        cls._load_balance(user_id)
+
+        with cls._lock:
+            available = cls._balances[user_id] - cls._held.get(user_id, 0)
+            if cost > 0 and available < cost:
+                raise ValueError(f"토큰이 부족합니다. (필요: {cost}, 보유: {max(available, 0)})")
+            return cls._apply_charge(user_id, cost, action_type, model_name, llm_tokens_used)
+
+    @classmethod
+    def _apply_charge(cls, user_id: str, cost: int, action_type: str, model_name: Optional[str],
+                      llm_tokens_used: int) -> int:
+        """메모리 잔액 차감 + 기록 대기열 적재 (호출 측에서 _lock 보유)"""
+        cost = max(int(cost or 0), 0)
+        charged = min(cost, max(cls._balances.get(user_id, 0), 0))
+        if charged < cost:
+            # 예약보다 비싸게 끝난 호출 - 이미 소비된 토큰이지만 잔액 이상은 걷지 않음 (기록은 실제 차감액)
+            cls._uncollected_total += cost - charged
+            logger.warning(f"💸 [BILLING] {user_id} {action_type}: cost {cost} exceeds balance, charged {charged}")
+
+        cls._balances[user_id] = cls._balances.get(user_id, 0) - charged
+        if charged:
+            cls._pending_deltas[user_id] = cls._pending_deltas.get(user_id, 0) + charged
+
+        cls._pending_logs.append({
+            "user_id": user_id,
+            "action_type": action_type,
+            "model_name": str(model_name)[:50] if model_name else None,
+            "tokens_used": int(llm_tokens_used or 0),
+            "cost_deducted": charged,
+        })
+        cls._last_access[user_id] = time.monotonic()
+        TokenUsageStats.record(model_name, action_type, llm_tokens_used, charged)
+
+        if charged:
+            logger.debug(f"💰 Token charged for {user_id}: -{charged} (Action: {action_type}, Model: {model_name})")
+
+        cls._ensure_worker()
+        return max(cls._balances[user_id] - cls._held.get(user_id, 0), 0)
+
+    # --- 배치 기록 / 재동기화 ---
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        대기 중인 TokenLog와 잔액 차감분을 DB에 한 번에 반영
+        - 잔액 차감액은 이번 배치 로그의 합계 (로그와 잔액이 항상 같은 트랜잭션에 반영됨)
+        - 잔액이 모자란 유저는 남은 잔액만큼만 차감하고, 걷지 못한 금액은 로그의 cost_deducted에서 뺌
+
+        Returns:
+            기록한 TokenLog 행 수
+        """
+        with cls._flush_lock:
+            with cls._lock:
+                if not cls._pending_logs:
+                    return 0
+                batch_size = TokenConfig.BILLING_FLUSH_BATCH_SIZE
+                logs = cls._pending_logs[:batch_size]
+                cls._pending_logs = cls._pending_logs[batch_size:]
+
+            deltas: Dict[str, int] = {}
+            for log in logs:
+                if log["cost_deducted"]:
+                    deltas[log["user_id"]] = deltas.get(log["user_id"], 0) + log["cost_deducted"]
+
+            db = SessionLocal()
+            uncollected: Dict[str, int] = {}
+            try:
+                for user_id, delta in deltas.items():
+                    # 조건부 원자적 차감 (잠금은 이 UPDATE 동안만 유지)
+                    result = db.execute(
+                        update(User)
+                        .where(User.id == user_id, User.token_balance >= delta)
+                        .values(token_balance=User.token_balance - delta)
+                    )
+                    if result.rowcount:
+                        continue
+                    # 다른 워커가 먼저 잔액을 썼음 -> 남은 만큼만 차감
+                    row = db.query(User.token_balance).filter(User.id == user_id).with_for_update().first()
+                    collected = min(max(row.token_balance, 0), delta) if row else 0
+                    if collected:
+                        db.execute(update(User).where(User.id == user_id)
+                                   .values(token_balance=User.token_balance - collected))
+                    uncollected[user_id] = delta - collected
+
+                logs_to_write = [dict(log) for log in logs]
+                for user_id, missing in uncollected.items():
+                    cls._deduct_from_logs(logs_to_write, user_id, missing)
+                if logs_to_write:
+                    db.bulk_insert_mappings(TokenLog, logs_to_write)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"❌ [BILLING] Flush failed, re-queueing: {e}")
+                with cls._lock:
+                    cls._pending_logs = logs + cls._pending_logs
+                return 0
+            finally:
+                db.close()
+
+            with cls._lock:
+                for user_id, delta in deltas.items():
+                    remaining = cls._pending_deltas.get(user_id, 0) - delta
+                    if remaining > 0:
+                        cls._pending_deltas[user_id] = remaining
+                    else:
+                        cls._pending_deltas.pop(user_id, None)
+                for user_id, missing in uncollected.items():
+                    cls._uncollected_total += missing
+                    # DB 잔액이 바닥났으므로 메모리 잔액도 맞춰 둠 (다음 reconcile 전까지 추가 사용 차단)
+                    if user_id in cls._balances:
+                        cls._balances[user_id] = -cls._pending_deltas.get(user_id, 0)
+                    logger.warning(f"💸 [BILLING] Could not collect {missing} credits from {user_id} "
+                                   f"(balance already spent by another worker)")
+            logger.debug(f"[BILLING] Flushed {len(logs)} logs, {len(deltas)} balance deltas")
+            return len(logs)
+
+    @staticmethod
+    def _deduct_from_logs(logs: List[Dict[str, Any]], user_id: str, missing: int):
+        """걷지 못한 금액을 해당 유저의 최근 로그부터 빼서 cost_deducted가 실제 차감액이 되도록 함"""
+        for log in reversed(logs):
+            if missing <= 0:
+                return
+            if log["user_id"] != user_id or not log["cost_deducted"]:
+                continue
+            taken = min(log["cost_deducted"], missing)
+            log["cost_deducted"] -= taken
+            missing -= taken
+
+    @classmethod
+    def uncollected_total(cls) -> int:
+        """잔액 부족으로 걷지 못한 금액 누계"""
+        with cls._lock:
+            return cls._uncollected_total
+
+    @classmethod
+    def reconcile(cls):
+        """
+        DB 잔액을 기준으로 메모리 잔액 재계산
+        - 관리자 충전, 다른 워커 프로세스의 차감 등 외부 변경 반영
+        - 오래 사용하지 않은 유저는 캐시에서 제거
+        """
+        with cls._flush_lock:
+            with cls._lock:
+                user_ids = list(cls._balances.keys())
+            if not user_ids:
+                return
+
+            db = SessionLocal()
+            try:
+                rows = db.query(User.id, User.token_balance).filter(User.id.in_(user_ids)).all()
+            except Exception as e:
+                logger.error(f"❌ [BILLING] Reconcile failed: {e}")
+                return
+            finally:
+                db.close()
+
+            db_balances = {row.id: row.token_balance for row in rows}
+            now = time.monotonic()
+            with cls._lock:
+                for user_id in user_ids:
+                    if user_id not in db_balances:
+                        cls._balances.pop(user_id, None)
+                        continue
+                    idle = now - cls._last_access.get(user_id, now)
+                    if (idle > TokenConfig.BILLING_IDLE_EVICT_SECONDS
+                            and not cls._held.get(user_id)
+                            and not cls._pending_deltas.get(user_id)):
+                        cls._balances.pop(user_id, None)
+                        cls._held.pop(user_id, None)
+                        cls._last_access.pop(user_id, None)
+                        continue
+                    cls._balances[user_id] = db_balances[user_id] - cls._pending_deltas.get(user_id, 0)
+            cls._last_reconcile = now
+
+    # --- 백그라운드 워커 ---
+
+    @classmethod
+    def _run_worker(cls):
+        logger.info("✅ [BILLING] Ledger worker started")
+        while not cls._stop_event.wait(TokenConfig.BILLING_FLUSH_INTERVAL):
+            try:
+                # 배치보다 많이 쌓였으면 연속으로 비움
+                while cls.flush() >= TokenConfig.BILLING_FLUSH_BATCH_SIZE:
+                    pass
+                if time.monotonic() - cls._last_reconcile >= TokenConfig.BILLING_RECONCILE_INTERVAL:
+                    cls.reconcile()
+            except Exception as e:
+                logger.error(f"❌ [BILLING] Worker error: {e}")
+
+    @classmethod
+    def _ensure_worker(cls):
+        if cls._worker and cls._worker.is_alive():
+            return
+        cls.start()
+
+    @classmethod
+    def start(cls):
+        """백그라운드 기록 스레드 시작 (중복 호출 안전)"""
+        with cls._lock:
+            if cls._worker and cls._worker.is_alive():
+                return
+            cls._stop_event.clear()
+            cls._last_reconcile = time.monotonic()
+            cls._worker = threading.Thread(target=cls._run_worker, name="billing-ledger", daemon=True)
+            cls._worker.start()
+
+    @classmethod
+    def shutdown(cls):
+        """워커 종료 후 남은 기록을 모두 반영"""
+        cls._stop_event.set()
+        worker = cls._worker
+        if worker and worker.is_alive():
+            worker.join(timeout=TokenConfig.BILLING_FLUSH_INTERVAL * 2)
+        cls._worker = None
+        while cls.flush() > 0:
+            pass
+        logger.info("👋 [BILLING] Ledger flushed and stopped")
@@ -10,8 +10,9 @@ import re
 from typing import Dict, Any, List, Optional, Tuple, Set
 from datetime import datetime
 from collections import deque
+from sqlalchemy.orm import Session
 
-from models import SessionLocal, Scenario, TempScenario
+from models import Scenario, TempScenario, run_with_session, run_with_session_async
 from config import DEFAULT_PLAYER_VARS
 # core.utils가 없다면 내부적으로 간단한 검증 로직을 사용할 수 있습니다.
 # 여기서는 import가 가능하다고 가정합니다.
@@ -98,7 +99,15 @@ class DraftService:
         Draft 조회. 없으면 원본 시나리오 반환.
         Returns: ({scenario: dict, is_draft: bool, ...}, error_message)
         """
-        db = SessionLocal()
+        return run_with_session(DraftService._get_draft, scenario_id, user_id)
+
+    @staticmethod
+    async def get_draft_async(scenario_id: int, user_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """get_draft의 비동기 버전"""
+        return await run_with_session_async(DraftService._get_draft, scenario_id, user_id)
+
+    @staticmethod
+    def _get_draft(db: Session, scenario_id: int, user_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
         try:
             # 1. 원본 존재 확인
             origin = db.query(Scenario).filter(Scenario.id == scenario_id).first()
@@ -132,13 +141,19 @@ class DraftService:
         except Exception as e:
             logger.error(f"Get draft error: {e}")
             return {}, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def create_or_update_draft(scenario_id: int, user_id: str, data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """Draft 생성 또는 업데이트 (내부 호출용)"""
-        db = SessionLocal()
+        return run_with_session(DraftService._create_or_update_draft, scenario_id, user_id, data)
+
+    @staticmethod
+    async def create_or_update_draft_async(scenario_id: int, user_id: str, data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """create_or_update_draft의 비동기 버전"""
+        return await run_with_session_async(DraftService._create_or_update_draft, scenario_id, user_id, data)
+
+    @staticmethod
+    def _create_or_update_draft(db: Session, scenario_id: int, user_id: str, data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         try:
             draft = db.query(TempScenario).filter(
                 TempScenario.original_scenario_id == scenario_id,
@@ -165,21 +180,32 @@ class DraftService:
             db.rollback()
             logger.error(f"Save draft error: {e}")
             return False, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def save_draft(scenario_id: int, user_id: str, data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """API용 Draft 저장 래퍼"""
         return DraftService.create_or_update_draft(scenario_id, user_id, data)
 
+    @staticmethod
+    async def save_draft_async(scenario_id: int, user_id: str, data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """save_draft의 비동기 버전"""
+        return await DraftService.create_or_update_draft_async(scenario_id, user_id, data)
+
     @staticmethod
     def publish_draft(scenario_id: int, user_id: str, force: bool = False) -> Tuple[bool, Optional[str], Optional[Dict]]:
         """
         Draft 내용을 원본 시나리오에 덮어쓰기 (최종 반영)
         Returns: (success, error, validation_result)
         """
-        db = SessionLocal()
+        return run_with_session(DraftService._publish_draft, scenario_id, user_id, force)
+
+    @staticmethod
+    async def publish_draft_async(scenario_id: int, user_id: str, force: bool = False) -> Tuple[bool, Optional[str], Optional[Dict]]:
+        """publish_draft의 비동기 버전"""
+        return await run_with_session_async(DraftService._publish_draft, scenario_id, user_id, force)
+
+    @staticmethod
+    def _publish_draft(db: Session, scenario_id: int, user_id: str, force: bool = False) -> Tuple[bool, Optional[str], Optional[Dict]]:
         try:
             draft = db.query(TempScenario).filter(
                 TempScenario.original_scenario_id == scenario_id,
@@ -223,13 +249,19 @@ class DraftService:
             db.rollback()
             logger.error(f"Publish draft error: {e}")
             return False, str(e), None
-        finally:
-            db.close()
 
     @staticmethod
     def discard_draft(scenario_id: int, user_id: str) -> Tuple[bool, Optional[str]]:
         """Draft 삭제 (변경사항 취소)"""
-        db = SessionLocal()
+        return run_with_session(DraftService._discard_draft, scenario_id, user_id)
+
+    @staticmethod
+    async def discard_draft_async(scenario_id: int, user_id: str) -> Tuple[bool, Optional[str]]:
+        """discard_draft의 비동기 버전"""
+        return await run_with_session_async(DraftService._discard_draft, scenario_id, user_id)
+
+    @staticmethod
+    def _discard_draft(db: Session, scenario_id: int, user_id: str) -> Tuple[bool, Optional[str]]:
         try:
             db.query(TempScenario).filter(
                 TempScenario.original_scenario_id == scenario_id,
@@ -240,8 +272,6 @@ class DraftService:
         except Exception as e:
             db.rollback()
             return False, str(e)
-        finally:
-            db.close()
 
     # ==========================
     #  Data Manipulation (Pure)
@@ -8,9 +8,10 @@ import logging
 import copy
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from sqlalchemy.orm import Session
 
-# models.py에 정의된 SessionLocal, ScenarioHistory, TempScenario 사용
-from models import SessionLocal, ScenarioHistory, TempScenario
+# models.py에 정의된 ScenarioHistory, TempScenario와 세션 실행 헬퍼 사용
+from models import ScenarioHistory, TempScenario, run_with_session, run_with_session_async
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +28,15 @@ class HistoryService:
         세션 ID로 기존 게임 세션 조회
         Returns: PlayerState 딕셔너리 또는 None
         """
-        db = SessionLocal()
+        return run_with_session(HistoryService._get_session, session_id)
+
+    @staticmethod
+    async def get_session_async(session_id: str) -> Optional[Dict[str, Any]]:
+        """get_session의 비동기 버전"""
+        return await run_with_session_async(HistoryService._get_session, session_id)
+
+    @staticmethod
+    def _get_session(db: Session, session_id: str) -> Optional[Dict[str, Any]]:
         try:
             from models import GameSession
             game_session = db.query(GameSession).filter_by(session_key=session_id).first()
@@ -46,14 +55,16 @@ class HistoryService:
             player_state = game_session.player_state.copy() if game_session.player_state else {}
             player_state['world_state'] = game_session.world_state if game_session.world_state else {}
 
+            # 누적 로그(history)는 game_session_logs에 분리 저장됨
+            from services.session_writer import load_session_logs, merge_session_logs
+            merge_session_logs(player_state, player_state['world_state'], load_session_logs(db, session_id))
+
             logger.info(f"✅ [GET_SESSION] Session loaded: {session_id}, Scene: {game_session.current_scene_id}")
             return player_state
 
         except Exception as e:
             logger.error(f"❌ [GET_SESSION] Error: {e}", exc_info=True)
             return None
-        finally:
-            db.close()
 
     @staticmethod
     def initialize_history(
@@ -65,7 +76,24 @@ class HistoryService:
         편집 세션 시작 시 초기 이력(Base Snapshot) 생성.
         이미 이력이 존재하면 초기화하지 않음.
         """
-        db = SessionLocal()
+        return run_with_session(HistoryService._initialize_history, scenario_id, editor_id, initial_data)
+
+    @staticmethod
+    async def initialize_history_async(
+        scenario_id: int,
+        editor_id: str,
+        initial_data: Dict[str, Any]
+    ) -> Tuple[bool, Optional[str]]:
+        """initialize_history의 비동기 버전"""
+        return await run_with_session_async(HistoryService._initialize_history, scenario_id, editor_id, initial_data)
+
+    @staticmethod
+    def _initialize_history(
+        db: Session,
+        scenario_id: int,
+        editor_id: str,
+        initial_data: Dict[str, Any]
+    ) -> Tuple[bool, Optional[str]]:
         try:
             # 기존 이력 확인
             existing = db.query(ScenarioHistory).filter_by(
@@ -96,8 +124,6 @@ class HistoryService:
             db.rollback()
             logger.error(f"History initialize error: {e}", exc_info=True)
             return False, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def add_history(
@@ -111,7 +137,28 @@ class HistoryService:
         새로운 변경 이력 추가 (스냅샷 저장).
         현재 위치 이후의 이력(Redo Stack)은 모두 삭제됨.
         """
-        db = SessionLocal()
+        return run_with_session(HistoryService._add_history, scenario_id, editor_id, action_type, action_description, snapshot_data)
+
+    @staticmethod
+    async def add_history_async(
+        scenario_id: int,
+        editor_id: str,
+        action_type: str,
+        action_description: str,
+        snapshot_data: Dict[str, Any]
+    ) -> Tuple[bool, Optional[str]]:
+        """add_history의 비동기 버전"""
+        return await run_with_session_async(HistoryService._add_history, scenario_id, editor_id, action_type, action_description, snapshot_data)
+
+    @staticmethod
+    def _add_history(
+        db: Session,
+        scenario_id: int,
+        editor_id: str,
+        action_type: str,
+        action_description: str,
+        snapshot_data: Dict[str, Any]
+    ) -> Tuple[bool, Optional[str]]:
         try:
             # 현재 활성화된 이력 찾기
             current_entry = db.query(ScenarioHistory).filter_by(
@@ -170,8 +217,6 @@ class HistoryService:
             db.rollback()
             logger.error(f"History add error: {e}", exc_info=True)
             return False, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def get_history_list(
@@ -182,7 +227,22 @@ class HistoryService:
         전체 이력 목록 조회
         Returns: (history_list, current_sequence, error)
         """
-        db = SessionLocal()
+        return run_with_session(HistoryService._get_history_list, scenario_id, editor_id)
+
+    @staticmethod
+    async def get_history_list_async(
+        scenario_id: int,
+        editor_id: str
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+        """get_history_list의 비동기 버전"""
+        return await run_with_session_async(HistoryService._get_history_list, scenario_id, editor_id)
+
+    @staticmethod
+    def _get_history_list(
+        db: Session,
+        scenario_id: int,
+        editor_id: str
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
         try:
             entries = db.query(ScenarioHistory).filter_by(
                 scenario_id=scenario_id,
@@ -212,8 +272,6 @@ class HistoryService:
         except Exception as e:
             logger.error(f"Get history list error: {e}", exc_info=True)
             return [], -1, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def get_undo_redo_status(
@@ -221,7 +279,22 @@ class HistoryService:
         editor_id: str
     ) -> Dict[str, Any]:
         """Undo/Redo 가능 여부 확인"""
-        db = SessionLocal()
+        return run_with_session(HistoryService._get_undo_redo_status, scenario_id, editor_id)
+
+    @staticmethod
+    async def get_undo_redo_status_async(
+        scenario_id: int,
+        editor_id: str
+    ) -> Dict[str, Any]:
+        """get_undo_redo_status의 비동기 버전"""
+        return await run_with_session_async(HistoryService._get_undo_redo_status, scenario_id, editor_id)
+
+    @staticmethod
+    def _get_undo_redo_status(
+        db: Session,
+        scenario_id: int,
+        editor_id: str
+    ) -> Dict[str, Any]:
         try:
             current_entry = db.query(ScenarioHistory).filter_by(
                 scenario_id=scenario_id,
@@ -256,8 +329,6 @@ class HistoryService:
         except Exception as e:
             logger.error(f"Status check error: {e}")
             return {'can_undo': False, 'can_redo': False, 'current_sequence': -1}
-        finally:
-            db.close()
 
     @staticmethod
     def undo(
@@ -265,7 +336,22 @@ class HistoryService:
         editor_id: str
     ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """Undo 실행: 이전 상태로 되돌리고 Draft 업데이트"""
-        db = SessionLocal()
+        return run_with_session(HistoryService._undo, scenario_id, editor_id)
+
+    @staticmethod
+    async def undo_async(
+        scenario_id: int,
+        editor_id: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """undo의 비동기 버전"""
+        return await run_with_session_async(HistoryService._undo, scenario_id, editor_id)
+
+    @staticmethod
+    def _undo(
+        db: Session,
+        scenario_id: int,
+        editor_id: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         try:
             current = db.query(ScenarioHistory).filter_by(
                 scenario_id=scenario_id, editor_id=editor_id, is_current=True
@@ -312,8 +398,6 @@ class HistoryService:
             db.rollback()
             logger.error(f"Undo error: {e}", exc_info=True)
             return None, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def redo(
@@ -321,7 +405,22 @@ class HistoryService:
         editor_id: str
     ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """Redo 실행: 다음 상태로 되돌리고 Draft 업데이트"""
-        db = SessionLocal()
+        return run_with_session(HistoryService._redo, scenario_id, editor_id)
+
+    @staticmethod
+    async def redo_async(
+        scenario_id: int,
+        editor_id: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """redo의 비동기 버전"""
+        return await run_with_session_async(HistoryService._redo, scenario_id, editor_id)
+
+    @staticmethod
+    def _redo(
+        db: Session,
+        scenario_id: int,
+        editor_id: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         try:
             current = db.query(ScenarioHistory).filter_by(
                 scenario_id=scenario_id, editor_id=editor_id, is_current=True
@@ -367,8 +466,6 @@ class HistoryService:
             db.rollback()
             logger.error(f"Redo error: {e}", exc_info=True)
             return None, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def restore_to_point(
@@ -377,7 +474,24 @@ class HistoryService:
         history_id: int
     ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """특정 이력 시점으로 점프 (복원)"""
-        db = SessionLocal()
+        return run_with_session(HistoryService._restore_to_point, scenario_id, editor_id, history_id)
+
+    @staticmethod
+    async def restore_to_point_async(
+        scenario_id: int,
+        editor_id: str,
+        history_id: int
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """restore_to_point의 비동기 버전"""
+        return await run_with_session_async(HistoryService._restore_to_point, scenario_id, editor_id, history_id)
+
+    @staticmethod
+    def _restore_to_point(
+        db: Session,
+        scenario_id: int,
+        editor_id: str,
+        history_id: int
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         try:
             target = db.query(ScenarioHistory).filter_by(
                 id=history_id, scenario_id=scenario_id, editor_id=editor_id
@@ -418,8 +532,6 @@ class HistoryService:
             db.rollback()
             logger.error(f"Restore error: {e}", exc_info=True)
             return None, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def clear_history(
@@ -427,7 +539,22 @@ class HistoryService:
         editor_id: str
     ) -> Tuple[bool, Optional[str]]:
         """이력 전체 삭제 (초기화)"""
-        db = SessionLocal()
+        return run_with_session(HistoryService._clear_history, scenario_id, editor_id)
+
+    @staticmethod
+    async def clear_history_async(
+        scenario_id: int,
+        editor_id: str
+    ) -> Tuple[bool, Optional[str]]:
+        """clear_history의 비동기 버전"""
+        return await run_with_session_async(HistoryService._clear_history, scenario_id, editor_id)
+
+    @staticmethod
+    def _clear_history(
+        db: Session,
+        scenario_id: int,
+        editor_id: str
+    ) -> Tuple[bool, Optional[str]]:
         try:
             db.query(ScenarioHistory).filter_by(
                 scenario_id=scenario_id, editor_id=editor_id
@@ -437,6 +564,4 @@ class HistoryService:
         except Exception as e:
             db.rollback()
             logger.error(f"Clear history error: {e}")
-            return False, str(e)
-        finally:
-            db.close()
\ No newline at end of file
+            return False, str(e)
\ No newline at end of file
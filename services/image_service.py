@@ -17,7 +17,7 @@ from google.genai import types
 
 from core.s3_client import get_s3_client
 # [NEW] 토큰 과금을 위한 모듈 임포트
-from services.user_service import UserService
+from services.billing_service import BillingService
 from config import TokenConfig
 
 logger = logging.getLogger(__name__)
@@ -106,16 +106,11 @@ class ImageService:
         if not self.is_available:
             return None
 
-        # [NEW] 토큰 차감 로직 (고정 비용)
-        # async 함수 내 동기 DB 호출이므로 트래픽이 많을 경우 주의 (필요시 executor 사용)
+        # [NEW] 토큰 선점 (고정 비용) - 메모리 예약 후 생성 성공 시 확정, 실패 시 환불
+        # 잔액 캐시 미적재 시에만 DB 조회가 발생하므로 스레드로 위임
+        cost = TokenConfig.COST_IMAGE_GENERATION
         try:
-            cost = TokenConfig.COST_IMAGE_GENERATION
-            UserService.deduct_tokens(
-                user_id=user_id,
-                cost=cost,
-                action_type="image_generation",
-                model_name=self.flux_model
-            )
+            reservation_id = await asyncio.to_thread(BillingService.reserve, user_id, cost)
         except ValueError as e:
             logger.warning(f"🚫 이미지 생성 거부 (잔액 부족): {user_id} - {e}")
             return None
@@ -138,13 +133,20 @@ class ImageService:
 
             if not image_data:
                 logger.error("❌ [Image] 모든 모델 생성 실패")
-                # (선택) 실패 시 토큰 환불 로직을 여기에 추가 가능
+                BillingService.release(reservation_id)
                 return None
 
             # 4. S3 업로드
             # 폴더 구조: ai-images/시나리오ID/타입/파일명
             image_url = await self._upload_to_s3(image_data, image_type, scenario_id, target_id)
 
+            BillingService.commit(
+                reservation_id,
+                cost=cost,
+                action_type="image_generation",
+                model_name=self.flux_model
+            )
+
             return {
                 "success": True,
                 "image_url": image_url,
@@ -154,6 +156,7 @@ class ImageService:
             }
         except Exception as e:
             logger.error(f"❌ [Image] 프로세스 오류: {e}")
+            BillingService.release(reservation_id)
             return None
 
     async def _call_together_api_with_retry(self, prompt: str, model: str) -> Optional[bytes]:
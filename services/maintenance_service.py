@@ -0,0 +1,245 @@
+"""
+DB 정리(GC) 스케줄러
+- 오래된 게임 세션(+ game_session_logs), 방치된 Draft(TempScenario), 고아 변경 이력(ScenarioHistory)을 삭제
+- 한 번에 지우지 않고 MAINTENANCE_BATCH_SIZE 행씩 나눠 삭제/commit, 배치 사이에 쉬어서
+  긴 행 잠금과 WAL 급증을 피함 (1회 실행당 최대 MAINTENANCE_MAX_BATCHES 배치, 나머지는 다음 주기)
+- 여러 워커 프로세스가 있어도 PostgreSQL advisory lock으로 한 곳에서만 실행
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+from sqlalchemy import text, and_, exists
+
+from models import engine, SessionLocal, GameSession, GameSessionLog, TempScenario, ScenarioHistory, Scenario
+from config import (
+    MAINTENANCE_ENABLED, MAINTENANCE_INTERVAL_SECONDS, MAINTENANCE_INITIAL_DELAY_SECONDS,
+    MAINTENANCE_BATCH_SIZE, MAINTENANCE_BATCH_PAUSE_MS, MAINTENANCE_MAX_BATCHES,
+    SESSION_RETENTION_DAYS, DRAFT_RETENTION_DAYS, HISTORY_ORPHAN_RETENTION_DAYS
+)
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_lock 키 (임의의 고정값)
+_ADVISORY_LOCK_KEY = 7_140_047
+
+
+def _session_cutoff(now: datetime, days: Optional[int] = None) -> datetime:
+    return now - timedelta(days=SESSION_RETENTION_DAYS if days is None else days)
+
+
+# 삭제 조건: (기준 시각, 보존 일수 - None이면 config 값)
+def _session_log_filter(now: datetime, days: Optional[int] = None):
+    # 만료된 세션의 로그 + 세션 없이 남은 로그 (SQLite는 FK CASCADE가 기본으로 꺼져 있음)
+    return ~exists().where(and_(
+        GameSession.session_key == GameSessionLog.session_key,
+        GameSession.last_played_at >= _session_cutoff(now, days),
+    ))
+
+
+def _session_filter(now: datetime, days: Optional[int] = None):
+    # 로그를 먼저 배치로 지운 세션만 삭제 -> 세션 삭제가 CASCADE로 대량의 로그 삭제를 끌고 가지 않음
+    return and_(
+        GameSession.last_played_at < _session_cutoff(now, days),
+        ~exists().where(GameSessionLog.session_key == GameSession.session_key),
+    )
+
+
+def _draft_filter(now: datetime, days: Optional[int] = None):
+    return TempScenario.updated_at < now - timedelta(days=DRAFT_RETENTION_DAYS if days is None else days)
+
+
+def _history_filter(now: datetime, days: Optional[int] = None):
+    # 같은 시나리오/편집자의 Draft가 없거나(반영/취소 완료) 원본 시나리오가 없는 오래된 이력
+    no_draft = ~exists().where(and_(
+        TempScenario.original_scenario_id == ScenarioHistory.scenario_id,
+        TempScenario.editor_id == ScenarioHistory.editor_id,
+    ))
+    no_scenario = ~exists().where(Scenario.id == ScenarioHistory.scenario_id)
+    return and_(
+        ScenarioHistory.created_at < now - timedelta(days=HISTORY_ORPHAN_RETENTION_DAYS if days is None else days),
+        no_draft | no_scenario,
+    )
+
+
+class MaintenanceService:
+    """주기적 DB 정리 (프로세스당 스레드 하나, 실행은 advisory lock으로 직렬화)"""
+
+    # 작업 이름 -> (모델, 삭제 조건), 순서대로 실행
+    JOBS = {
+        "game_session_logs": (GameSessionLog, _session_log_filter),
+        "game_sessions": (GameSession, _session_filter),
+        "drafts": (TempScenario, _draft_filter),
+        "scenario_history": (ScenarioHistory, _history_filter),
+    }
+
+    _lock = threading.Lock()
+    _run_lock = threading.Lock()
+    _worker: Optional[threading.Thread] = None
+    _stop_event = threading.Event()
+
+    _stats: Dict[str, Dict[str, Any]] = {
+        name: {"runs": 0, "deleted_total": 0, "last_deleted": 0, "last_batches": 0, "last_duration_ms": 0.0,
+               "last_run_at": None, "errors": 0}
+        for name in JOBS
+    }
+    _cycles = {"runs": 0, "skipped_locked": 0, "last_duration_ms": 0.0}
+
+    @classmethod
+    def purge(cls, name: str, now: datetime = None, days: Optional[int] = None) -> int:
+        """
+        작업 하나를 배치 단위로 실행 (days: 이번 실행에만 적용할 보존 일수, None이면 config 값)
+
+        Returns:
+            삭제한 행 수
+        """
+        model, condition = cls.JOBS[name]
+        now = now or datetime.now()
+        pause = MAINTENANCE_BATCH_PAUSE_MS / 1000.0
+        deleted, batches = 0, 0
+        started = time.perf_counter()
+        try:
+            while batches < MAINTENANCE_MAX_BATCHES:
+                db = SessionLocal()
+                try:
+                    ids = [row.id for row in
+                           db.query(model.id).filter(condition(now, days)).limit(MAINTENANCE_BATCH_SIZE).all()]
+                    if not ids:
+                        break
+                    deleted += db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+                    db.commit()
+                    batches += 1
+                except Exception:
+                    db.rollback()
+                    raise
+                finally:
+                    db.close()
+                if len(ids) < MAINTENANCE_BATCH_SIZE:
+                    break
+                # 배치 사이 대기 (종료 요청 시 중단)
+                if cls._stop_event.wait(pause):
+                    break
+        except Exception as e:
+            with cls._lock:
+                cls._stats[name]["errors"] += 1
+            logger.error(f"❌ [MAINTENANCE] {name} cleanup failed after {deleted} rows: {e}")
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        with cls._lock:
+            stats = cls._stats[name]
+            stats["runs"] += 1
+            stats["deleted_total"] += deleted
+            stats["last_deleted"] = deleted
+            stats["last_batches"] = batches
+            stats["last_duration_ms"] = round(duration_ms, 1)
+            stats["last_run_at"] = now.isoformat()
+        if deleted:
+            logger.info(f"🧹 [MAINTENANCE] {name}: deleted {deleted} rows in {batches} batches ({duration_ms:.0f}ms)")
+        return deleted
+
+    @classmethod
+    def run_once(cls) -> Optional[Dict[str, int]]:
+        """
+        모든 정리 작업 1회 실행 (다른 프로세스가 실행 중이면 건너뜀)
+
+        Returns:
+            작업별 삭제 행 수, 건너뛰었으면 None
+        """
+        if not cls._run_lock.acquire(blocking=False):
+            return None
+        try:
+            with _AdvisoryLock() as acquired:
+                if not acquired:
+                    with cls._lock:
+                        cls._cycles["skipped_locked"] += 1
+                    logger.debug("[MAINTENANCE] Another worker holds the maintenance lock, skipping")
+                    return None
+                started = time.perf_counter()
+                now = datetime.now()
+                result = {}
+                for name in cls.JOBS:
+                    if cls._stop_event.is_set():
+                        break
+                    result[name] = cls.purge(name, now)
+                with cls._lock:
+                    cls._cycles["runs"] += 1
+                    cls._cycles["last_duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                return result
+        finally:
+            cls._run_lock.release()
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        with cls._lock:
+            jobs = {name: dict(stats) for name, stats in cls._stats.items()}
+            cycles = dict(cls._cycles)
+        return {
+            "enabled": MAINTENANCE_ENABLED,
+            "interval_seconds": MAINTENANCE_INTERVAL_SECONDS,
+            "batch_size": MAINTENANCE_BATCH_SIZE,
+            **cycles,
+            "jobs": jobs,
+        }
+
+    # --- 백그라운드 워커 ---
+
+    @classmethod
+    def _run_worker(cls):
+        logger.info("✅ [MAINTENANCE] Scheduler started")
+        if cls._stop_event.wait(MAINTENANCE_INITIAL_DELAY_SECONDS):
+            return
+        while True:
+            try:
+                cls.run_once()
+            except Exception as e:
+                logger.error(f"❌ [MAINTENANCE] Worker error: {e}")
+            if cls._stop_event.wait(MAINTENANCE_INTERVAL_SECONDS):
+                return
+
+    @classmethod
+    def start(cls):
+        """스케줄러 스레드 시작 (중복 호출 안전)"""
+        with cls._lock:
+            if not MAINTENANCE_ENABLED or (cls._worker and cls._worker.is_alive()):
+                return
+            cls._stop_event.clear()
+            cls._worker = threading.Thread(target=cls._run_worker, name="db-maintenance", daemon=True)
+            cls._worker.start()
+
+    @classmethod
+    def shutdown(cls):
+        """진행 중인 배치가 끝나면 중단"""
+        cls._stop_event.set()
+        worker = cls._worker
+        if worker and worker.is_alive():
+            worker.join(timeout=5.0)
+        cls._worker = None
+        logger.info("👋 [MAINTENANCE] Scheduler stopped")
+
+
+class _AdvisoryLock:
+    """PostgreSQL 세션 advisory lock (다른 DB는 프로세스 내 잠금만 사용)"""
+
+    def __init__(self):
+        self.conn = None
+
+    def __enter__(self) -> bool:
+        if engine.dialect.name != 'postgresql':
+            return True
+        self.conn = engine.connect()
+        acquired = bool(self.conn.execute(text("SELECT pg_try_advisory_lock(:key)"),
+                                          {"key": _ADVISORY_LOCK_KEY}).scalar())
+        if not acquired:
+            self.conn.close()
+            self.conn = None
+        return acquired
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.conn is not None:
+            try:
+                self.conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+            finally:
+                self.conn.close()
+        return False
@@ -6,7 +6,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 
 from config import DEFAULT_PLAYER_VARS
-from models import SessionLocal, Scenario, ScenarioHistory, TempScenario
+from models import SessionLocal, Scenario, ScenarioHistory, TempScenario, run_with_session, run_with_session_async
 
 logger = logging.getLogger(__name__)
 
@@ -18,69 +18,83 @@ class ScenarioService:
     def list_scenarios(sort_order: str = 'newest', user_id: str = None, filter_mode: str = 'public',
                        limit: int = None) -> List[Dict[str, Any]]:
         """시나리오 목록 조회 (DB 기반)"""
-        db = SessionLocal()
-        try:
-            query = db.query(Scenario)
-
-            # 필터링 로직
-            if filter_mode == 'my' and user_id:
-                query = query.filter(Scenario.author_id == user_id)
-            elif filter_mode == 'recommended':
-                query = query.filter(Scenario.is_public == True, Scenario.is_recommended == True)
-            elif filter_mode == 'public':
+        return run_with_session(ScenarioService._list_scenarios, sort_order, user_id, filter_mode, limit)
+
+    @staticmethod
+    async def list_scenarios_async(sort_order: str = 'newest', user_id: str = None, filter_mode: str = 'public',
+                                   limit: int = None) -> List[Dict[str, Any]]:
+        """list_scenarios의 비동기 버전"""
+        return await run_with_session_async(ScenarioService._list_scenarios, sort_order, user_id, filter_mode, limit)
+
+    @staticmethod
+    def _list_scenarios(db: Session, sort_order: str = 'newest', user_id: str = None, filter_mode: str = 'public',
+                        limit: int = None) -> List[Dict[str, Any]]:
+        query = db.query(Scenario)
+
+        # 필터링 로직
+        if filter_mode == 'my' and user_id:
+            query = query.filter(Scenario.author_id == user_id)
+        elif filter_mode == 'recommended':
+            query = query.filter(Scenario.is_public == True, Scenario.is_recommended == True)
+        elif filter_mode == 'public':
+            query = query.filter(Scenario.is_public == True)
+        else:  # all
+            if user_id:
+                query = query.filter((Scenario.is_public == True) | (Scenario.author_id == user_id))
+            else:
                 query = query.filter(Scenario.is_public == True)
-            else:  # all
-                if user_id:
-                    query = query.filter((Scenario.is_public == True) | (Scenario.author_id == user_id))
-                else:
-                    query = query.filter(Scenario.is_public == True)
-
-            # 정렬 로직
-            if sort_order == 'oldest':
-                query = query.order_by(Scenario.created_at.asc())
-            elif sort_order == 'name_asc':
-                query = query.order_by(Scenario.title.asc())
-            elif sort_order == 'name_desc':
-                query = query.order_by(Scenario.title.desc())
-            else:  # newest
-                query = query.order_by(Scenario.created_at.desc())
-
-            if limit:
-                query = query.limit(limit)
-
-            scenarios = query.all()
-            file_infos = []
-
-            for s in scenarios:
-                s_data = s.data
-                if 'scenario' in s_data:
-                    s_data = s_data['scenario']
-
-                p_text = s_data.get('prologue', s_data.get('prologue_text', ''))
-                desc = (p_text[:60] + "...") if p_text else "저장된 시나리오"
-
-                file_infos.append({
-                    'filename': str(s.id),
-                    'id': s.id,
-                    'created_time': s.created_at.timestamp() if s.created_at else 0,
-                    'title': s.title,
-                    'desc': desc,
-                    'is_public': s.is_public,
-                    'is_owner': (user_id is not None) and (s.author_id == user_id),
-                    'author': s.author_id or "System/Anonymous"
-                })
-
-            return file_infos
-        finally:
-            db.close()
+
+        # 정렬 로직
+        if sort_order == 'oldest':
+            query = query.order_by(Scenario.created_at.asc())
+        elif sort_order == 'name_asc':
+            query = query.order_by(Scenario.title.asc())
+        elif sort_order == 'name_desc':
+            query = query.order_by(Scenario.title.desc())
+        else:  # newest
+            query = query.order_by(Scenario.created_at.desc())
+
+        if limit:
+            query = query.limit(limit)
+
+        scenarios = query.all()
+        file_infos = []
+
+        for s in scenarios:
+            s_data = s.data
+            if 'scenario' in s_data:
+                s_data = s_data['scenario']
+
+            p_text = s_data.get('prologue', s_data.get('prologue_text', ''))
+            desc = (p_text[:60] + "...") if p_text else "저장된 시나리오"
+
+            file_infos.append({
+                'filename': str(s.id),
+                'id': s.id,
+                'created_time': s.created_at.timestamp() if s.created_at else 0,
+                'title': s.title,
+                'desc': desc,
+                'is_public': s.is_public,
+                'is_owner': (user_id is not None) and (s.author_id == user_id),
+                'author': s.author_id or "System/Anonymous"
+            })
+
+        return file_infos
 
     @staticmethod
     def load_scenario(scenario_id: str, user_id: str = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """시나리오 로드 (DB ID 기반)"""
+        return run_with_session(ScenarioService._load_scenario, scenario_id, user_id)
+
+    @staticmethod
+    async def load_scenario_async(scenario_id: str, user_id: str = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """load_scenario의 비동기 버전"""
+        return await run_with_session_async(ScenarioService._load_scenario, scenario_id, user_id)
+
+    @staticmethod
+    def _load_scenario(db: Session, scenario_id: str, user_id: str = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         if not scenario_id:
             return None, "ID 누락"
-
-        db = SessionLocal()
         try:
             db_id = int(scenario_id)
             scenario = db.query(Scenario).filter(Scenario.id == db_id).first()
@@ -143,13 +157,19 @@ class ScenarioService:
         except Exception as e:
             logger.error(f"Load Error: {e}", exc_info=True)
             return None, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def save_scenario(scenario_json: Dict[str, Any], player_vars: Dict[str, Any] = None, user_id: str = None) -> Tuple[Optional[str], Optional[str]]:
         """시나리오 저장 (DB Insert)"""
-        db = SessionLocal()
+        return run_with_session(ScenarioService._save_scenario, scenario_json, player_vars, user_id)
+
+    @staticmethod
+    async def save_scenario_async(scenario_json: Dict[str, Any], player_vars: Dict[str, Any] = None, user_id: str = None) -> Tuple[Optional[str], Optional[str]]:
+        """save_scenario의 비동기 버전"""
+        return await run_with_session_async(ScenarioService._save_scenario, scenario_json, player_vars, user_id)
+
+    @staticmethod
+    def _save_scenario(db: Session, scenario_json: Dict[str, Any], player_vars: Dict[str, Any] = None, user_id: str = None) -> Tuple[Optional[str], Optional[str]]:
         try:
             title = scenario_json.get('title', 'Untitled_Scenario')
 
@@ -186,16 +206,21 @@ class ScenarioService:
             db.rollback()
             logger.error(f"Save Error: {e}", exc_info=True)
             return None, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def delete_scenario(scenario_id: str, user_id: str) -> Tuple[bool, Optional[str]]:
         """시나리오 삭제"""
+        return run_with_session(ScenarioService._delete_scenario, scenario_id, user_id)
+
+    @staticmethod
+    async def delete_scenario_async(scenario_id: str, user_id: str) -> Tuple[bool, Optional[str]]:
+        """delete_scenario의 비동기 버전"""
+        return await run_with_session_async(ScenarioService._delete_scenario, scenario_id, user_id)
+
+    @staticmethod
+    def _delete_scenario(db: Session, scenario_id: str, user_id: str) -> Tuple[bool, Optional[str]]:
         if not scenario_id or not user_id:
             return False, "권한이 없습니다."
-
-        db = SessionLocal()
         try:
             db_id = int(scenario_id)
             scenario = db.query(Scenario).filter(Scenario.id == db_id).first()
@@ -226,42 +251,53 @@ class ScenarioService:
             db.rollback()
             logger.error(f"Delete Error: {e}", exc_info=True)
             return False, str(e)
-        finally:
-            db.close()
 
     @staticmethod
-    def publish_scenario(scenario_id: str, user_id: str) -> Tuple[bool, Optional[str]]:
-        """시나리오 공개 전환"""
-        db = SessionLocal()
+    def publish_scenario(scenario_id: str, user_id: str) -> Tuple[bool, Optional[str], Optional[bool]]:
+        """시나리오 공개/비공개 전환 - (성공 여부, 메시지, 전환 후 공개 여부)"""
+        return run_with_session(ScenarioService._publish_scenario, scenario_id, user_id)
+
+    @staticmethod
+    async def publish_scenario_async(scenario_id: str, user_id: str) -> Tuple[bool, Optional[str], Optional[bool]]:
+        """publish_scenario의 비동기 버전"""
+        return await run_with_session_async(ScenarioService._publish_scenario, scenario_id, user_id)
+
+    @staticmethod
+    def _publish_scenario(db: Session, scenario_id: str, user_id: str) -> Tuple[bool, Optional[str], Optional[bool]]:
         try:
             db_id = int(scenario_id)
             scenario = db.query(Scenario).filter(Scenario.id == db_id).first()
 
             if not scenario:
-                return False, "시나리오를 찾을 수 없습니다."
+                return False, "시나리오를 찾을 수 없습니다.", None
 
             if scenario.author_id != user_id:
-                return False, "권한이 없습니다."
+                return False, "권한이 없습니다.", None
 
             scenario.is_public = not scenario.is_public
             db.commit()
 
             status = "공개" if scenario.is_public else "비공개"
-            return True, f"{status} 설정 완료"
+            return True, f"{status} 설정 완료", scenario.is_public
 
         except Exception as e:
             db.rollback()
-            return False, str(e)
-        finally:
-            db.close()
+            return False, str(e), None
 
     @staticmethod
     def update_scenario(scenario_id: str, updated_data: Dict[str, Any], user_id: str) -> Tuple[bool, Optional[str]]:
         """시나리오 업데이트"""
+        return run_with_session(ScenarioService._update_scenario, scenario_id, updated_data, user_id)
+
+    @staticmethod
+    async def update_scenario_async(scenario_id: str, updated_data: Dict[str, Any], user_id: str) -> Tuple[bool, Optional[str]]:
+        """update_scenario의 비동기 버전"""
+        return await run_with_session_async(ScenarioService._update_scenario, scenario_id, updated_data, user_id)
+
+    @staticmethod
+    def _update_scenario(db: Session, scenario_id: str, updated_data: Dict[str, Any], user_id: str) -> Tuple[bool, Optional[str]]:
         if not scenario_id or not user_id:
             return False, "권한이 없습니다."
-
-        db = SessionLocal()
         try:
             db_id = int(scenario_id)
             scenario = db.query(Scenario).filter(Scenario.id == db_id).first()
@@ -299,16 +335,21 @@ class ScenarioService:
             db.rollback()
             logger.error(f"Update Error: {e}", exc_info=True)
             return False, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def get_scenario_for_edit(scenario_id: str, user_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """편집용 시나리오 로드"""
+        return run_with_session(ScenarioService._get_scenario_for_edit, scenario_id, user_id)
+
+    @staticmethod
+    async def get_scenario_for_edit_async(scenario_id: str, user_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """get_scenario_for_edit의 비동기 버전"""
+        return await run_with_session_async(ScenarioService._get_scenario_for_edit, scenario_id, user_id)
+
+    @staticmethod
+    def _get_scenario_for_edit(db: Session, scenario_id: str, user_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         if not scenario_id or not user_id:
             return None, "권한이 없습니다."
-
-        db = SessionLocal()
         try:
             db_id = int(scenario_id)
             scenario = db.query(Scenario).filter(Scenario.id == db_id).first()
@@ -334,8 +375,6 @@ class ScenarioService:
         except Exception as e:
             logger.error(f"Get for Edit Error: {e}", exc_info=True)
             return None, str(e)
-        finally:
-            db.close()
 
     @staticmethod
     def is_recently_created(created_time: float, threshold_seconds: int = 600) -> bool:
@@ -485,7 +524,15 @@ class ScenarioService:
     @staticmethod
     def get_user_statistics(user_id: str) -> Dict[str, int]:
         """사용자의 시나리오 통계(전체, 공개, 비공개) 조회"""
-        db = SessionLocal()
+        return run_with_session(ScenarioService._get_user_statistics, user_id)
+
+    @staticmethod
+    async def get_user_statistics_async(user_id: str) -> Dict[str, int]:
+        """get_user_statistics의 비동기 버전"""
+        return await run_with_session_async(ScenarioService._get_user_statistics, user_id)
+
+    @staticmethod
+    def _get_user_statistics(db: Session, user_id: str) -> Dict[str, int]:
         try:
             # 전체 시나리오 수
             total = db.query(Scenario).filter(Scenario.author_id == user_id).count()
@@ -507,14 +554,20 @@ class ScenarioService:
         except Exception as e:
             logger.error(f"Statistics Error: {e}")
             return {"total": 0, "public": 0, "private": 0}
-        finally:
-            db.close()
 
 
     @staticmethod
     def toggle_public(scenario_id: int, user_id: str):
         """시나리오 공개/비공개 토글 메서드"""
-        db = SessionLocal()
+        return run_with_session(ScenarioService._toggle_public, scenario_id, user_id)
+
+    @staticmethod
+    async def toggle_public_async(scenario_id: int, user_id: str):
+        """toggle_public의 비동기 버전"""
+        return await run_with_session_async(ScenarioService._toggle_public, scenario_id, user_id)
+
+    @staticmethod
+    def _toggle_public(db: Session, scenario_id: int, user_id: str):
         try:
             scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
             if not scenario:
@@ -535,7 +588,21 @@ class ScenarioService:
             db.rollback()
             logger.error(f"Toggle Public Error: {e}")
             return False, str(e), None
-        finally:
-            db.close()
 
 
+
+    @staticmethod
+    async def increment_view_count_async(scenario_id: int):
+        """시나리오 조회수 1 증가 (view_count 컬럼이 없으면 무시)"""
+        return await run_with_session_async(ScenarioService._increment_view_count, scenario_id)
+
+    @staticmethod
+    def _increment_view_count(db: Session, scenario_id: int):
+        try:
+            scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
+            if scenario and hasattr(scenario, 'view_count'):
+                scenario.view_count = (scenario.view_count or 0) + 1
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"View count update failed: {e}")
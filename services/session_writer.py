@@ -0,0 +1,397 @@
+"""
+게임 세션 영속화 (쓰기 병합)
+- 저장 시점에 PlayerState/WorldState를 JSON 문자열로 한 번 직렬화해 불변 스냅샷으로 보관 (deepcopy 없음)
+  이후 요청이 원본 dict를 수정해도 스냅샷은 바뀌지 않음
+- DB 반영은 SELECT 없이 session_key 기준 UPDATE 한 번 (대상 행이 없을 때만 INSERT)
+- 턴 종료 저장은 큐에 넣고 백그라운드 스레드가 SESSION_WRITE_DELAY_MS마다 배치로 기록
+  같은 세션이 그 사이에 여러 번 저장되면 최신 스냅샷 하나만 기록
+- 기록 전 스냅샷도 이 프로세스의 load/find에서 보이도록 대기열을 먼저 확인 (read-your-writes)
+- 계속 늘어나는 목록(PlayerState.history, WorldState.history)은 game_sessions 컬럼에서 빼고
+  game_session_logs에 새 항목만 INSERT -> 매 턴 재작성되는 JSONB는 작은 상태만 남음
+
+다른 워커 프로세스는 대기열을 볼 수 없으므로 최대 SESSION_WRITE_DELAY_MS 동안 이전 상태를 읽을 수 있음.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from models import SessionLocal, GameSessionLog
+from config import SESSION_WRITE_COALESCE_ENABLED, SESSION_WRITE_DELAY_MS, SESSION_WRITE_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+# 로그 종류 -> (state 구분, 목록 키): append-only 목록만 대상 (narrative_history 같은 슬라이딩 윈도우는 제외)
+LOG_STREAMS = {
+    'player_history': ('player', 'history'),
+    'world_history': ('world', 'history'),
+}
+
+# (session_key, stream) -> DB에 기록된 항목 수 (이 프로세스가 쓰거나 읽은 세션만)
+_LOG_LENGTHS_MAX = 20000
+_log_lengths: "OrderedDict[tuple, int]" = OrderedDict()
+_log_lengths_lock = threading.Lock()
+
+
+def _known_log_length(session_key: str, stream: str) -> Optional[int]:
+    with _log_lengths_lock:
+        return _log_lengths.get((session_key, stream))
+
+
+def remember_log_lengths(session_key: str, lengths: Dict[str, int]):
+    with _log_lengths_lock:
+        for stream, length in lengths.items():
+            _log_lengths[(session_key, stream)] = length
+            _log_lengths.move_to_end((session_key, stream))
+        while len(_log_lengths) > _LOG_LENGTHS_MAX:
+            _log_lengths.popitem(last=False)
+
+
+class SessionSnapshot:
+    """한 시점의 게임 세션 저장 내용 (JSON 직렬화 완료, 불변)"""
+
+    __slots__ = ('session_key', 'user_id', 'scenario_id', 'player_state', 'world_state', 'logs',
+                 'current_scene_id', 'turn_count', 'played_at', 'queued_at')
+
+    def __init__(self, session_key: str, user_id: Optional[str], scenario_id: int, player_state: str,
+                 world_state: str, logs: Dict[str, tuple], current_scene_id: str, turn_count: int):
+        self.session_key = session_key
+        self.user_id = user_id
+        self.scenario_id = scenario_id
+        self.player_state = player_state
+        self.world_state = world_state
+        # stream -> 전체 항목 (튜플, 항목 자체는 추가된 뒤 수정되지 않는 값)
+        self.logs = logs
+        self.current_scene_id = current_scene_id
+        self.turn_count = turn_count
+        self.played_at = datetime.now()
+        self.queued_at = time.monotonic()
+
+    def params(self) -> Dict[str, Any]:
+        return {
+            "session_key": self.session_key,
+            "user_id": self.user_id,
+            "scenario_id": self.scenario_id,
+            "player_state": self.player_state,
+            "world_state": self.world_state,
+            "current_scene_id": self.current_scene_id,
+            "turn_count": self.turn_count,
+            "played_at": self.played_at,
+        }
+
+    def restore(self) -> tuple:
+        """(player_state, world_state) 새 dict로 복원 (호출 측이 수정해도 스냅샷은 그대로)"""
+        player_state = json.loads(self.player_state)
+        world_state = json.loads(self.world_state)
+        merge_session_logs(player_state, world_state, {k: list(v) for k, v in self.logs.items()})
+        return player_state, world_state
+
+
+def build_snapshot(state: dict, user_id: str = None, session_key: str = None) -> SessionSnapshot:
+    """
+    PlayerState -> 저장용 스냅샷
+    - player_state 컬럼: world_state를 뺀 얕은 사본
+    - world_state 컬럼: location/stuck_count만 덮어쓴 얕은 사본 (원본 state는 수정하지 않음)
+    """
+    current_scene_id = state.get('current_scene_id', '')
+    world_state = state.get('world_state', {})
+
+    # ✅ [B-2] world_state가 없어도 빈 인스턴스를 만들지 않음 (데이터 손실 방지)
+    if not world_state:
+        world_state = {}
+        logger.warning(f"⚠️ [DB SAVE] world_state is empty - saving empty dict (no new instance created)")
+
+    turn_count = 0
+    if isinstance(world_state, dict):
+        world_state = dict(world_state)
+        # ✅ [B-2] location 동기화
+        if current_scene_id:
+            world_state['location'] = current_scene_id
+        # ✅ [FIX 1-B] stuck_count를 world_state에 미러링 (player_state → world_state)
+        world_state['stuck_count'] = state.get('stuck_count', 0)
+        turn_count = world_state.get('turn_count', 0)
+
+    player_state = {k: v for k, v in state.items() if k != 'world_state'}
+
+    # 누적 로그는 컬럼에서 분리
+    parts = {'player': player_state, 'world': world_state}
+    logs = {}
+    for stream, (part, key) in LOG_STREAMS.items():
+        target = parts[part]
+        if isinstance(target, dict) and isinstance(target.get(key), list):
+            logs[stream] = tuple(target.pop(key))
+
+    return SessionSnapshot(
+        session_key=session_key or str(uuid.uuid4()),
+        user_id=user_id,
+        scenario_id=state.get('scenario_id', 0),
+        player_state=json.dumps(player_state, ensure_ascii=False),
+        world_state=json.dumps(world_state, ensure_ascii=False),
+        logs=logs,
+        current_scene_id=current_scene_id,
+        turn_count=turn_count,
+    )
+
+
+def _json_param(db: Session, name: str) -> str:
+    # PostgreSQL 컬럼은 JSONB -> 직렬화된 문자열을 캐스트해서 바인딩 (SQLAlchemy 쪽 재직렬화 없음)
+    return f"CAST(:{name} AS JSONB)" if db.bind.dialect.name == 'postgresql' else f":{name}"
+
+
+def merge_session_logs(player_state: dict, world_state: dict, logs: Dict[str, list]):
+    """분리 저장된 누적 로그를 상태 dict에 다시 넣음 (로그가 없는 종류는 컬럼 값 유지 - 분리 이전 세션)"""
+    parts = {'player': player_state, 'world': world_state}
+    for stream, (part, key) in LOG_STREAMS.items():
+        if stream in logs and isinstance(parts[part], dict):
+            parts[part][key] = logs[stream]
+
+
+def load_session_logs(db: Session, session_key: str) -> Dict[str, list]:
+    """game_session_logs -> stream별 항목 목록"""
+    logs: Dict[str, list] = {}
+    rows = db.query(GameSessionLog.stream, GameSessionLog.entry).filter(
+        GameSessionLog.session_key == session_key
+    ).order_by(GameSessionLog.stream, GameSessionLog.seq).all()
+    for stream, entry in rows:
+        logs.setdefault(stream, []).append(entry)
+    remember_log_lengths(session_key, {stream: len(logs.get(stream, ())) for stream in LOG_STREAMS})
+    return logs
+
+
+def _write_logs(db: Session, snapshot: SessionSnapshot, is_new: bool):
+    """새로 추가된 로그 항목만 INSERT"""
+    for stream, entries in snapshot.logs.items():
+        start = None if is_new else _known_log_length(snapshot.session_key, stream)
+        if start is None or start > len(entries):
+            # 새 세션 / 기록된 길이를 모름 / 목록이 줄어듦(초기화 등): 남는 행 정리 후 중복은 건너뛰며 기록
+            keep = 0 if is_new else len(entries)
+            db.execute(text(
+                "DELETE FROM game_session_logs WHERE session_key = :session_key AND stream = :stream AND seq >= :seq"
+            ), {"session_key": snapshot.session_key, "stream": stream, "seq": keep})
+            start = 0 if start is None else len(entries)
+        if start >= len(entries):
+            continue
+        db.execute(text(
+            f"INSERT INTO game_session_logs (session_key, stream, seq, entry, created_at) "
+            f"VALUES (:session_key, :stream, :seq, {_json_param(db, 'entry')}, :created_at) "
+            f"ON CONFLICT (session_key, stream, seq) DO NOTHING"
+        ), [{"session_key": snapshot.session_key, "stream": stream, "seq": seq,
+             "entry": json.dumps(entries[seq], ensure_ascii=False), "created_at": snapshot.played_at}
+            for seq in range(start, len(entries))])
+
+
+def write_snapshot(db: Session, snapshot: SessionSnapshot) -> bool:
+    """
+    스냅샷 한 건 기록 (commit은 호출 측에서, commit 후 remember_written 호출)
+
+    Returns:
+        True: 기존 세션 UPDATE, False: 새로 INSERT
+    """
+    params = snapshot.params()
+    result = db.execute(text(
+        f"UPDATE game_sessions SET player_state = {_json_param(db, 'player_state')}, "
+        f"world_state = {_json_param(db, 'world_state')}, current_scene_id = :current_scene_id, "
+        f"turn_count = :turn_count, last_played_at = :played_at, updated_at = :played_at "
+        f"WHERE session_key = :session_key"
+    ), params)
+    if result.rowcount:
+        _write_logs(db, snapshot, is_new=False)
+        return True
+
+    db.execute(text(
+        f"INSERT INTO game_sessions (user_id, session_key, scenario_id, player_state, world_state, "
+        f"current_scene_id, turn_count, created_at, updated_at, last_played_at) "
+        f"VALUES (:user_id, :session_key, :scenario_id, {_json_param(db, 'player_state')}, "
+        f"{_json_param(db, 'world_state')}, :current_scene_id, :turn_count, :played_at, :played_at, :played_at)"
+    ), params)
+    _write_logs(db, snapshot, is_new=True)
+    return False
+
+
+def remember_written(snapshot: SessionSnapshot):
+    """commit된 스냅샷의 로그 길이 기록 (다음 저장은 그 뒤 항목만 INSERT)"""
+    remember_log_lengths(snapshot.session_key, {stream: len(entries) for stream, entries in snapshot.logs.items()})
+
+
+class GameSessionWriter:
+    """프로세스 단위 세션 쓰기 대기열 (스레드 안전)"""
+
+    _lock = threading.Lock()
+    _flush_lock = threading.Lock()
+
+    # session_key -> 아직 기록하지 않은 최신 스냅샷
+    _pending: "OrderedDict[str, SessionSnapshot]" = OrderedDict()
+    # session_key -> 기록 중인 스냅샷 (commit 전까지 조회에 사용)
+    _inflight: Dict[str, SessionSnapshot] = {}
+
+    _worker: Optional[threading.Thread] = None
+    _stop_event = threading.Event()
+
+    _stats = {"queued": 0, "coalesced": 0, "written": 0, "inserted": 0, "batches": 0, "failures": 0,
+              "max_lag_ms": 0.0}
+
+    @classmethod
+    def enqueue(cls, snapshot: SessionSnapshot):
+        """턴 종료 저장 예약 (같은 세션의 이전 대기 스냅샷은 대체)"""
+        if not SESSION_WRITE_COALESCE_ENABLED:
+            cls.write_now(snapshot)
+            return
+        with cls._lock:
+            if cls._pending.pop(snapshot.session_key, None) is not None:
+                cls._stats["coalesced"] += 1
+            cls._pending[snapshot.session_key] = snapshot
+            cls._stats["queued"] += 1
+        cls._ensure_worker()
+
+    @classmethod
+    def get_pending(cls, session_key: str) -> Optional[SessionSnapshot]:
+        """아직 DB에 반영되지 않은 최신 스냅샷"""
+        with cls._lock:
+            return cls._pending.get(session_key) or cls._inflight.get(session_key)
+
+    @classmethod
+    def write_now(cls, snapshot: SessionSnapshot, db: Session = None):
+        """즉시 기록 (대기 중인 같은 세션 스냅샷은 이 스냅샷으로 대체됨)"""
+        with cls._flush_lock:
+            with cls._lock:
+                cls._pending.pop(snapshot.session_key, None)
+            should_close_db = db is None
+            if should_close_db:
+                db = SessionLocal()
+            try:
+                updated = write_snapshot(db, snapshot)
+                db.commit()
+                cls._record_written(snapshot, updated)
+                return updated
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                if should_close_db:
+                    db.close()
+
+    @classmethod
+    def flush_session(cls, db: Optional[Session], session_key: str):
+        """
+        해당 세션의 대기 스냅샷을 먼저 기록 (DB 행을 직접 읽기 전 호출)
+        - 쓰기 잠금을 기다리므로 이벤트 루프가 아닌 스레드에서 호출 (db=None이면 자체 세션 사용)
+        """
+        with cls._lock:
+            snapshot = cls._pending.get(session_key)
+            inflight = session_key in cls._inflight
+        if snapshot is not None:
+            cls.write_now(snapshot, db)
+        elif inflight:
+            # 배치 기록이 끝날 때까지 대기
+            with cls._flush_lock:
+                pass
+
+    @classmethod
+    def _record_written(cls, snapshot: SessionSnapshot, updated: bool):
+        remember_written(snapshot)
+        lag_ms = (time.monotonic() - snapshot.queued_at) * 1000
+        with cls._lock:
+            cls._stats["written"] += 1
+            if not updated:
+                cls._stats["inserted"] += 1
+            cls._stats["max_lag_ms"] = max(cls._stats["max_lag_ms"], lag_ms)
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        대기 중인 스냅샷을 한 트랜잭션으로 기록
+
+        Returns:
+            기록한 세션 수
+        """
+        with cls._flush_lock:
+            with cls._lock:
+                if not cls._pending:
+                    return 0
+                batch = []
+                while cls._pending and len(batch) < SESSION_WRITE_BATCH_SIZE:
+                    batch.append(cls._pending.popitem(last=False)[1])
+                cls._inflight = {s.session_key: s for s in batch}
+
+            db = SessionLocal()
+            try:
+                results = [write_snapshot(db, snapshot) for snapshot in batch]
+                db.commit()
+                for snapshot, updated in zip(batch, results):
+                    cls._record_written(snapshot, updated)
+                with cls._lock:
+                    cls._stats["batches"] += 1
+                logger.debug(f"[SESSION WRITE] Flushed {len(batch)} sessions")
+                return len(batch)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"❌ [SESSION WRITE] Flush failed, re-queueing: {e}")
+                with cls._lock:
+                    cls._stats["failures"] += 1
+                    # 그 사이 더 새로운 스냅샷이 들어온 세션은 새 스냅샷 유지
+                    for snapshot in reversed(batch):
+                        if snapshot.session_key not in cls._pending:
+                            cls._pending[snapshot.session_key] = snapshot
+                            cls._pending.move_to_end(snapshot.session_key, last=False)
+                return 0
+            finally:
+                with cls._lock:
+                    cls._inflight = {}
+                db.close()
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats["pending"] = len(cls._pending)
+        stats["enabled"] = SESSION_WRITE_COALESCE_ENABLED
+        stats["delay_ms"] = SESSION_WRITE_DELAY_MS
+        return stats
+
+    # --- 백그라운드 워커 ---
+
+    @classmethod
+    def _run_worker(cls):
+        logger.info("✅ [SESSION WRITE] Write-behind worker started")
+        interval = SESSION_WRITE_DELAY_MS / 1000.0
+        while not cls._stop_event.wait(interval):
+            try:
+                while cls.flush() >= SESSION_WRITE_BATCH_SIZE:
+                    pass
+            except Exception as e:
+                logger.error(f"❌ [SESSION WRITE] Worker error: {e}")
+
+    @classmethod
+    def _ensure_worker(cls):
+        if cls._worker and cls._worker.is_alive():
+            return
+        cls.start()
+
+    @classmethod
+    def start(cls):
+        """백그라운드 기록 스레드 시작 (중복 호출 안전)"""
+        with cls._lock:
+            if not SESSION_WRITE_COALESCE_ENABLED or (cls._worker and cls._worker.is_alive()):
+                return
+            cls._stop_event.clear()
+            cls._worker = threading.Thread(target=cls._run_worker, name="session-writer", daemon=True)
+            cls._worker.start()
+
+    @classmethod
+    def shutdown(cls):
+        """워커 종료 후 남은 스냅샷을 모두 기록"""
+        cls._stop_event.set()
+        worker = cls._worker
+        if worker and worker.is_alive():
+            worker.join(timeout=max(SESSION_WRITE_DELAY_MS / 1000.0 * 4, 1.0))
+        cls._worker = None
+        while cls.flush() > 0:
+            pass
+        logger.info("👋 [SESSION WRITE] Pending sessions flushed and stopped")
@@ -0,0 +1,135 @@
+"""
+모델 단가 조회 / 토큰 사용량 집계
+- ModelCostResolver: TokenConfig.MODEL_COSTS 부분 일치(가장 긴 키 우선) 결과를 한 번만 계산해 메모이즈
+- TokenUsageStats: 모델 x 액션 단위 누적 카운터 (호출마다 로그를 남기는 대신 대시보드에서 조회)
+"""
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+from config import TokenConfig
+
+logger = logging.getLogger(__name__)
+
+
+class ModelCostResolver:
+    """
+    모델명 -> 1K 토큰당 단가 조회기
+
+    매칭 규칙: 소문자 모델명에 포함되는 MODEL_COSTS 키 중 가장 긴 키의 단가를 사용
+    (예: "gpt-4o-mini"는 "gpt-4o"가 아니라 "gpt-4o-mini"). 없으면 "default".
+    """
+
+    _lock = threading.Lock()
+    _table: Dict[str, Dict[str, float]] = {}
+    _built = False
+
+    @staticmethod
+    def _match(model_lower: str) -> Dict[str, float]:
+        for key in sorted(TokenConfig.MODEL_COSTS, key=len, reverse=True):
+            if key != "default" and key in model_lower:
+                return TokenConfig.MODEL_COSTS[key]
+        return TokenConfig.MODEL_COSTS["default"]
+
+    @classmethod
+    def reload(cls):
+        """
+        단가 테이블 재구성 (TokenConfig.MODEL_COSTS 변경 시 호출)
+        - llm_factory.AVAILABLE_MODELS에 등록된 모델은 미리 계산해 둠
+        """
+        table: Dict[str, Dict[str, float]] = {}
+        try:
+            from llm_factory import AVAILABLE_MODELS
+            model_ids = list(AVAILABLE_MODELS.keys())
+        except ImportError:
+            model_ids = []
+
+        for model_id in model_ids:
+            lowered = model_id.lower()
+            table[lowered] = cls._match(lowered)
+            # 실제 API 호출 시에는 "openai/" 접두사가 제거된 이름이 넘어오기도 함
+            if lowered.startswith("openai/"):
+                stripped = lowered[len("openai/"):]
+                table[stripped] = cls._match(stripped)
+
+        with cls._lock:
+            cls._table = table
+            cls._built = True
+        logger.info(f"✅ [COST] Model cost table built ({len(table)} entries)")
+
+    @classmethod
+    def resolve(cls, model_name: Optional[str]) -> Dict[str, float]:
+        """모델명에 해당하는 {"input", "output"} 단가 반환"""
+        if not cls._built:
+            cls.reload()
+
+        if not model_name:
+            return TokenConfig.MODEL_COSTS["default"]
+
+        model_lower = model_name.lower()
+        cost_info = cls._table.get(model_lower)
+        if cost_info is None:
+            # 목록에 없는 모델은 최초 1회만 스캔 후 기억
+            cost_info = cls._match(model_lower)
+            with cls._lock:
+                cls._table[model_lower] = cost_info
+        return cost_info
+
+
+class TokenUsageStats:
+    """모델 x 액션 단위 토큰/Credit 사용량 누적 (프로세스 단위, 스레드 안전)"""
+
+    _lock = threading.Lock()
+    _counters: Dict[Tuple[str, str], Dict[str, int]] = {}
+    _since = time.time()
+
+    @classmethod
+    def record(cls, model_name: Optional[str], action_type: str, tokens: int = 0, cost: int = 0):
+        key = (model_name or "unknown", action_type or "unknown")
+        with cls._lock:
+            bucket = cls._counters.get(key)
+            if bucket is None:
+                bucket = cls._counters[key] = {"calls": 0, "tokens": 0, "cost": 0, "cached_tokens": 0}
+            bucket["calls"] += 1
+            bucket["tokens"] += int(tokens or 0)
+            bucket["cost"] += int(cost or 0)
+
+    @classmethod
+    def record_cached(cls, model_name: Optional[str], action_type: str, cached_tokens: int):
+        """프로바이더 프롬프트 캐시에 적중한 입력 토큰 (호출 수는 record에서 집계)"""
+        if not cached_tokens:
+            return
+        key = (model_name or "unknown", action_type or "unknown")
+        with cls._lock:
+            bucket = cls._counters.get(key)
+            if bucket is None:
+                bucket = cls._counters[key] = {"calls": 0, "tokens": 0, "cost": 0, "cached_tokens": 0}
+            bucket["cached_tokens"] += int(cached_tokens)
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        """대시보드용 집계 (모델별 합계 + 모델/액션 상세)"""
+        with cls._lock:
+            items = [(k, dict(v)) for k, v in cls._counters.items()]
+
+        by_model: Dict[str, Dict[str, int]] = {}
+        rows = []
+        for (model, action), bucket in items:
+            rows.append({"model": model, "action": action, **bucket})
+            total = by_model.setdefault(model, {"calls": 0, "tokens": 0, "cost": 0, "cached_tokens": 0})
+            for field in ("calls", "tokens", "cost", "cached_tokens"):
+                total[field] += bucket[field]
+
+        rows.sort(key=lambda r: r["cost"], reverse=True)
+        return {
+            "since": cls._since,
+            "by_model": by_model,
+            "by_model_action": rows,
+        }
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._counters = {}
+            cls._since = time.time()
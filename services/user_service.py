@@ -1,8 +1,10 @@
 import logging
 from werkzeug.security import generate_password_hash, check_password_hash
-from models import SessionLocal, User, TokenLog
+from models import SessionLocal, User
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from config import TokenConfig
+from services.token_usage import ModelCostResolver
+from services.billing_service import BillingService
 
 logger = logging.getLogger(__name__)
 
@@ -51,36 +53,25 @@ class UserService:
 
     @staticmethod
     def get_user_balance(user_id):
-        """유저의 현재 토큰 잔액 조회"""
-        db = SessionLocal()
-        try:
-            user = db.query(User).filter(User.id == user_id).first()
-            if user:
-                return user.token_balance
-            return 0
-        finally:
-            db.close()
+        """유저의 현재 사용 가능 토큰 잔액 (BillingService 원장 기준 - 예약분, 미반영 차감분 포함)"""
+        return BillingService.get_balance(user_id)
 
     @staticmethod
-    def calculate_llm_cost(model_name: str, prompt_tokens: int, completion_tokens: int) -> int:
+    def calculate_llm_cost(model_name: str, prompt_tokens: int, completion_tokens: int,
+                           cached_tokens: int = 0) -> int:
         """
         LLM 토큰 사용량에 따른 비용 정밀 계산
         Config 설정값은 '1,000 토큰' 기준
+        - cached_tokens: prompt_tokens 중 프로바이더 프롬프트 캐시에 적중한 토큰 (할인 단가 적용)
         """
-        # 기본값 설정
-        cost_info = TokenConfig.MODEL_COSTS["default"]
-
-        # 모델명 매칭 (대소문자 무시, 부분 일치)
-        if model_name:
-            model_lower = model_name.lower()
-            for key, val in TokenConfig.MODEL_COSTS.items():
-                if key in model_lower:
-                    cost_info = val
-                    break
+        # 모델명 매칭 (대소문자 무시, 부분 일치) - 미리 계산된 단가표 사용
+        cost_info = ModelCostResolver.resolve(model_name)
 
         # [계산] 1,000 토큰 단위로 나누어 비용 산출
         # 공식: (사용토큰 / 1,000) * 1K당_설정비용
-        input_cost = (prompt_tokens / 1000.0) * cost_info["input"]
+        cached_tokens = min(max(cached_tokens or 0, 0), prompt_tokens)
+        input_cost = ((prompt_tokens - cached_tokens) / 1000.0) * cost_info["input"]
+        input_cost += (cached_tokens / 1000.0) * cost_info["input"] * TokenConfig.CACHED_INPUT_COST_RATIO
         output_cost = (completion_tokens / 1000.0) * cost_info["output"]
 
         # 소수점 처리 - 최소 1 Credit으로 보정
@@ -90,76 +81,17 @@ class UserService:
         else:
             total_cost = int(total_cost)  # 1 이상이면 버림
 
-        logger.info(f"[COST CALC] Model: {model_name}, Input: {prompt_tokens} tokens, Output: {completion_tokens} tokens")
-        logger.info(f"[COST CALC] Cost info: {cost_info}")
-        logger.info(f"[COST CALC] Input cost: {input_cost}, Output cost: {output_cost}, Total: {total_cost}")
+        logger.debug(f"[COST CALC] Model: {model_name}, In: {prompt_tokens} (cached {cached_tokens}), "
+                     f"Out: {completion_tokens}, Total: {total_cost}")
 
         return total_cost
 
     @staticmethod
     def deduct_tokens(user_id, cost, action_type, model_name=None, llm_tokens_used=0) -> int:
         """
-        토큰 차감 및 로그 기록 (Atomic Transaction)
-        """
-        logger.info(f"[TOKEN DEDUCT START] User: {user_id}, Cost: {cost}, Action: {action_type}")
-        
-        db = SessionLocal()
-        try:
-            # Row-level locking으로 동시성 문제 방지
-            user = db.query(User).filter(User.id == user_id).with_for_update().first()
-
-            if not user:
-                logger.error(f"[TOKEN DEDUCT] User not found: {user_id}")
-                raise ValueError("User not found")
-
-            logger.info(f"[TOKEN DEDUCT] User found: {user_id}, Current balance: {user.token_balance}")
-
-            # 비용 검증 (무료 모델은 0원일 수 있음)
-            if cost > 0 and user.token_balance < cost:
-                logger.error(f"[TOKEN DEDUCT] Insufficient tokens: Need {cost}, Have {user.token_balance}")
-                raise ValueError(f"토큰이 부족합니다. (필요: {cost}, 보유: {user.token_balance})")
-
-            # 차감
-            old_balance = user.token_balance
-            original_balance = old_balance  # 롤백을 위해 원본 잔액 저장
-            user.token_balance -= cost
-            new_balance = user.token_balance
+        토큰 차감 및 로그 기록 (BillingService.charge로 위임 - 메모리 원장 차감 후 배치로 DB 반영)
 
-            logger.info(f"[TOKEN DEDUCT] Balance update: {old_balance} - {cost} = {new_balance}")
-
-            # 로그 기록
-            log = TokenLog(
-                user_id=user_id,
-                action_type=action_type,
-                model_name=model_name,
-                tokens_used=llm_tokens_used,
-                cost_deducted=cost
-            )
-            db.add(log)
-
-            db.commit()
-
-            if cost > 0:
-                logger.info(f"💰 Token deducted for {user_id}: -{cost} (Action: {action_type}, Model: {model_name})")
-
-            return user.token_balance
-
-        except ValueError as ve:
-            db.rollback()
-            # 토큰 롤백 - 이미 차감된 토큰이 있다면 복원
-            if 'original_balance' in locals():
-                user.token_balance = locals()['original_balance']
-                db.commit()
-                logger.info(f"🔄 [TOKEN ROLLBACK] Tokens restored for user {user_id}: {user.token_balance}")
-            raise ve
-        except Exception as e:
-            db.rollback()
-            # 토큰 롤백 - 이미 차감된 토큰이 있다면 복원
-            if 'original_balance' in locals():
-                user.token_balance = locals()['original_balance']
-                db.commit()
-                logger.info(f"🔄 [TOKEN ROLLBACK] Tokens restored for user {user_id}: {user.token_balance}")
-            logger.error(f"❌ Token deduction error: {e}")
-            raise e
-        finally:
-            db.close()
\ No newline at end of file
+        Raises:
+            ValueError: 유저가 없거나 잔액 부족
+        """
+        return BillingService.charge(user_id, cost, action_type, model_name, llm_tokens_used)
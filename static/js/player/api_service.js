@@ -258,6 +258,65 @@ async function fetchGameDataFromDB() {
     }
 }
 
+// 턴 상태 채널별 UI 갱신
+function applyTurnState(channel, content) {
+    if (channel === 'stats') updateStats(content);
+    else if (channel === 'world_state') updateWorldState(content);
+    else if (channel === 'npc_status') updateNPCStatus(content);
+}
+
+// JSON Pointer 경로 토큰 복원 (~1 -> /, ~0 -> ~)
+function decodePointerToken(token) {
+    return token.replace(/~1/g, '/').replace(/~0/g, '~');
+}
+
+// 서버 state_diff.json_diff 결과(add/replace/remove) 적용
+function applyJsonPatch(doc, ops) {
+    let result = structuredClone(doc);
+    for (const op of ops) {
+        const tokens = op.path.split('/').slice(1).map(decodePointerToken);
+        if (tokens.length === 0) {
+            result = op.op === 'remove' ? null : structuredClone(op.value);
+            continue;
+        }
+        let parent = result;
+        for (const token of tokens.slice(0, -1)) {
+            parent = Array.isArray(parent) ? parent[parseInt(token, 10)] : parent[token];
+        }
+        const last = tokens[tokens.length - 1];
+        if (Array.isArray(parent)) {
+            if (op.op === 'remove') parent.splice(parseInt(last, 10), 1);
+            else if (last === '-') parent.push(structuredClone(op.value));
+            else if (op.op === 'add') parent.splice(parseInt(last, 10), 0, structuredClone(op.value));
+            else parent[parseInt(last, 10)] = structuredClone(op.value);
+        } else if (op.op === 'remove') {
+            delete parent[last];
+        } else {
+            parent[last] = structuredClone(op.value);
+        }
+    }
+    return result;
+}
+
+// 턴 상태 패치 적용 (기준 버전이 다르면 버전을 비워 다음 턴에 전체 스냅샷을 받음)
+function applyStatePatch(data) {
+    if (data.base !== clientStateVersion) {
+        console.warn('⚠️ [STATE] Patch base mismatch, requesting full snapshot next turn:', data.base, clientStateVersion);
+        clientStateVersion = null;
+        return;
+    }
+    try {
+        for (const [channel, ops] of Object.entries(data.content || {})) {
+            clientStateCache[channel] = applyJsonPatch(clientStateCache[channel] || {}, ops);
+            applyTurnState(channel, clientStateCache[channel]);
+        }
+        clientStateVersion = data.version;
+    } catch (e) {
+        console.error('❌ [STATE] Failed to apply patch:', e);
+        clientStateVersion = null;
+    }
+}
+
 // SSE 스트리밍으로 게임 액션 제출
 async function submitWithStreaming(actionText) {
     if (isGameEnded) return;
@@ -344,6 +403,11 @@ async function submitWithStreaming(actionText) {
             console.warn('⚠️ No session_id available, server will create new session');
         }
 
+        // 마지막으로 적용한 턴 상태 버전 (일치하면 서버가 바뀐 필드만 보냄)
+        if (clientStateVersion) {
+            requestBody.state_version = clientStateVersion;
+        }
+
         // 현재 시나리오 ID 전송
         if (currentScenarioId) {
             requestBody.scenario_id = currentScenarioId;
@@ -458,13 +522,16 @@ async function submitWithStreaming(actionText) {
                                 disableInput();
                                 break;
                             case 'stats':
-                                updateStats(data.content);
-                                break;
                             case 'world_state':
-                                updateWorldState(data.content);
-                                break;
                             case 'npc_status':
-                                updateNPCStatus(data.content);
+                                clientStateCache[data.type] = data.content;
+                                applyTurnState(data.type, data.content);
+                                break;
+                            case 'state_version':
+                                clientStateVersion = data.content;
+                                break;
+                            case 'state_patch':
+                                applyStatePatch(data);
                                 break;
                             case 'session_key':
                                 currentSessionKey = data.content;
@@ -15,6 +15,8 @@ let currentSessionKey = '';  // 현재 세션 키 저장
 // ✅ [FIX 2&4] 세션 ID 복원 로직 단순화 - 모든 가능한 키를 체크
 let currentSessionId = sessionStorage.getItem("current_session_id") || sessionStorage.getItem("trpg_session_key") || null;
 let currentScenarioId = sessionStorage.getItem('trpg_scenario_id') || null;  // 현재 로드된 시나리오 ID 저장
+let clientStateVersion = null;  // 마지막으로 적용한 턴 상태 버전 (서버 델타 전송 기준)
+let clientStateCache = {};  // 채널별(stats/world_state/npc_status) 마지막 전체 상태
 
 // 상수 정의
 const CHAT_LOG_KEY = 'trpg_chat_log';